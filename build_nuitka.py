@@ -157,6 +157,9 @@ def build_executable():
         "--standalone",                # 创建独立的可执行文件
         "--enable-plugin=pyside6",     # 启用PySide6插件
         "--output-dir=" + output_dir,  # 输出目录
+        "--include-package=utils",     # 包内公开名称按需导入，需显式包含子模块
+        "--include-package=gui",
+        "--include-package=updater",
         f"--company-name={BUILD_CONFIG['company_name']}",        # 公司名称
         f"--product-name={BUILD_CONFIG['product_name']}",        # 产品名称
         f"--file-version={BUILD_CONFIG['file_version']}",        # 文件版本
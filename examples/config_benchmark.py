@@ -0,0 +1,157 @@
+"""
+配置基准测试
+1. 模拟在设置页面中快速连续修改 1000 次配置（每次 set() 后 save_config()），
+   比较旧的同步整文件写入与防抖后台原子写入在调用线程上的耗时和实际写盘次数
+2. 比较属性读取（如 minimize_to_tray）使用多层 dict.get 与使用只读快照的开销
+3. 配置增长到数百项（插件分组）时，比较整体校验与只校验被修改配置项的开销
+
+运行: python examples/config_benchmark.py
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import AppConfig
+from utils.config_writer import DebouncedWriter, atomic_write_text
+
+CALLS = 1000
+ACCESS_ROUNDS = 1_000_000
+PLUGIN_SECTIONS = 50  # 每个插件分组 10 项，共 500 项
+
+
+class LegacyConfig:
+    """旧的属性实现：每次读取都在配置字典上执行多层 dict.get"""
+
+    def __init__(self, config: dict):
+        self._config = config
+
+    def get(self, key, default=None):
+        return self._config.get(key, default)
+
+    @property
+    def app_name(self) -> str:
+        return self.get("app_name")
+
+    @property
+    def theme_mode(self) -> str:
+        return self.get("theme", {}).get("mode", "auto")
+
+    @property
+    def minimize_to_tray(self) -> bool:
+        return self.get("behavior", {}).get("minimize_to_tray", False)
+
+    @property
+    def log_level(self) -> str:
+        return self.get("advanced", {}).get("log_level", "INFO")
+
+
+def legacy_save(config: AppConfig):
+    """旧的 save_config()：在调用线程中同步覆盖写入整个文件"""
+    with open(config.config_file, 'w', encoding='utf-8') as f:
+        json.dump(config._config, f, indent=4, ensure_ascii=False)
+
+
+def bench(name, config, save):
+    """测量连续 CALLS 次 set() + 保存在调用线程上的耗时"""
+    start = time.perf_counter()
+    worst = 0.0
+    for i in range(CALLS):
+        call_start = time.perf_counter()
+        config.set("appearance.font_size", 8 + i % 16)
+        save(config)
+        worst = max(worst, time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    print(f"  {name:<24} 总计 {total * 1000:8.1f} ms  平均 {total / CALLS * 1e6:7.1f} µs/次  "
+          f"最慢 {worst * 1000:6.2f} ms")
+    return total
+
+
+def bench_access(name, stmt, namespace):
+    """测量一次属性读取的平均耗时（取 5 轮最小值）"""
+    per_call = min(timeit.repeat(stmt, globals=namespace, number=ACCESS_ROUNDS, repeat=5)) / ACCESS_ROUNDS
+    print(f"  {name:<36} {per_call * 1e9:7.1f} ns/次")
+    return per_call
+
+
+def bench_property_access(tmp):
+    """比较旧的 dict.get 属性与快照属性的读取开销"""
+    config = AppConfig(str(Path(tmp) / "access.json"), writer=DebouncedWriter())
+    legacy = LegacyConfig(config._config)
+    namespace = {"config": config, "legacy": legacy}
+
+    print(f"\n属性读取开销（{ACCESS_ROUNDS:,} 次）:")
+    for prop in ("app_name", "theme_mode", "minimize_to_tray", "log_level"):
+        before = bench_access(f"{prop}（dict.get，旧）", f"legacy.{prop}", namespace)
+        after = bench_access(f"{prop}（快照，新）", f"config.{prop}", namespace)
+        print(f"  {'':<36} 节省 {(before - after) * 1e9:5.1f} ns（{before / after:.1f}x）")
+    bench_access("直接读取快照 snapshot.behavior.minimize_to_tray",
+                 "config.snapshot.behavior.minimize_to_tray", namespace)
+
+    # 快照只在修改后重建一次
+    start = time.perf_counter()
+    for i in range(CALLS):
+        config.set("behavior.minimize_to_tray", bool(i % 2))
+        config.minimize_to_tray
+    per_change = (time.perf_counter() - start) / CALLS
+    print(f"  修改后首次读取（set() + 重建快照）             {per_change * 1e6:7.1f} µs/次")
+
+
+def bench_validation(tmp):
+    """比较整体校验与增量校验的开销"""
+    config = AppConfig(str(Path(tmp) / "schema.json"), writer=DebouncedWriter())
+    plugin_defaults = {f"option_{i}": i for i in range(10)}
+    for n in range(PLUGIN_SECTIONS):
+        config.schema.extend(f"plugins.plugin_{n}", plugin_defaults, {"option_0": {"min": 0}})
+    config.set("plugins", {f"plugin_{n}": dict(plugin_defaults) for n in range(PLUGIN_SECTIONS)})
+    namespace = {"config": config}
+
+    print(f"\n校验开销（默认配置 + {PLUGIN_SECTIONS * len(plugin_defaults)} 项插件配置，1 万次）:")
+    rounds = 10_000
+    full = min(timeit.repeat("config.validate_config()", globals=namespace, number=rounds, repeat=3)) / rounds
+    single = min(timeit.repeat("config.schema.validate('plugins.plugin_7.option_3', 4)",
+                               globals=namespace, number=rounds, repeat=3)) / rounds
+    section = min(timeit.repeat("config.schema.validate_changes({'appearance': {'font_size': 12}})",
+                                globals=namespace, number=rounds, repeat=3)) / rounds
+    print(f"  整体校验 validate_config()             {full * 1e6:8.2f} µs/次")
+    print(f"  修改一项 set() 时的校验                 {single * 1e6:8.2f} µs/次（{full / single:.0f}x）")
+    print(f"  导入一个分组 update() 时的校验          {section * 1e6:8.2f} µs/次")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"连续 {CALLS} 次 set() + save_config()（调用线程耗时）:")
+
+        legacy_config = AppConfig(str(Path(tmp) / "legacy.json"), writer=DebouncedWriter())
+        legacy = bench("同步写入（旧）", legacy_config, legacy_save)
+
+        atomic_config = AppConfig(str(Path(tmp) / "atomic.json"), writer=DebouncedWriter())
+        bench("同步原子写入（每次 fsync）", atomic_config,
+              lambda config: atomic_write_text(config.config_file, config._serialize() or ""))
+
+        writer = DebouncedWriter(delay=0.5)
+        config = AppConfig(str(Path(tmp) / "config.json"), writer=writer)
+        debounced = bench("防抖后台写入（新）", config, lambda config: config.save_config())
+
+        start = time.perf_counter()
+        config.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+        print(f"  调用线程节省 {(legacy - debounced) * 1000:.1f} ms（{legacy / debounced:.0f}x）")
+
+        print(f"\n写盘次数: 旧 {CALLS} 次，新 {writer.stats()['writes']} 次"
+              f"（退出时 flush() 耗时 {flush_ms:.2f} ms）")
+        print(f"写入器统计: {writer.stats()}")
+
+        bench_property_access(tmp)
+        bench_validation(tmp)
+
+
+if __name__ == "__main__":
+    main()
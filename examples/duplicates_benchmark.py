@@ -0,0 +1,116 @@
+"""
+重复文件查找基准测试
+比较逐个计算全部文件完整哈希再分组的朴素方式与 find_duplicates() 的耗时和读取的字节数：
+第一次查找（哈希缓存为空）和再次查找同一目录（未变化的文件来自哈希缓存）
+
+测试数据模拟照片目录：大部分文件大小相同但内容不同（只需读取开头和末尾），少数文件有多个副本。
+文件在创建后位于页缓存中，测得的主要是哈希计算和 Python 层的开销；机械硬盘上少读取的字节数带来的收益更大。
+
+运行: python examples/duplicates_benchmark.py [文件数，默认 400] [单个文件大小 KiB，默认 1024]
+"""
+
+import sys
+import os
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import file_utils
+from utils.duplicates import find_duplicates
+from utils.file_hash import default_workers
+from utils.hash_cache import setup_hash_cache
+
+REPEAT = 3
+
+# 每 DUPLICATE_EVERY 个文件中有一个被复制 COPIES 份
+DUPLICATE_EVERY = 10
+COPIES = 3
+
+
+def create_files(root: Path, count: int, size_kb: int) -> int:
+    """创建测试文件，返回文件总数；修改时间设为一天前，避免哈希缓存的竞态窗口"""
+    total = 0
+    for i in range(count):
+        data = os.urandom(size_kb * 1024)
+        copies = COPIES if i % DUPLICATE_EVERY == 0 else 1
+        for j in range(copies):
+            path = root / f"d{i % 20}" / f"img{i}_{j}.jpg"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            st = path.stat()
+            os.utime(path, (st.st_atime, st.st_mtime - 86400))
+            total += 1
+    return total
+
+
+def naive_duplicates(root: Path):
+    """朴素方式：对每个文件计算完整哈希后分组"""
+    groups = defaultdict(list)
+    for path in file_utils.list_files(str(root), recursive=True):
+        groups[file_utils.calculate_file_hash(path, use_cache=False)].append(path)
+    return [paths for paths in groups.values() if len(paths) > 1]
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(name, func, total_bytes, baseline=None, read=None):
+    """运行 REPEAT 次取最快一次"""
+    best, result = min((_timed(func) for _ in range(REPEAT)), key=lambda item: item[0])
+    read = total_bytes if read is None else read()
+    ratio = f"（{baseline / best:.2f}x）" if baseline else ""
+    print(f"  {name:<36} {best * 1000:8.0f} ms  {len(result):>4} 组  "
+          f"读取 {file_utils.format_file_size(read):>10} {ratio}")
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "photos"
+        total = create_files(root, count, size_kb)
+        total_bytes = total * size_kb * 1024
+        print(f"测试数据: {total} 个 {size_kb} KiB 文件，共 {file_utils.format_file_size(total_bytes)}"
+              f"（CPU 核心 {os.cpu_count()}，自动选择 {default_workers(root)} 个线程）\n")
+
+        base = run("逐个计算完整哈希（朴素）", lambda: naive_duplicates(root), total_bytes)
+
+        last = []
+
+        def find(**kwargs):
+            last.clear()
+            return list(find_duplicates([root], progress=last.append, **kwargs))
+
+        def bytes_read():
+            return last[-1].bytes_read
+
+        run("find_duplicates(use_cache=False)", lambda: find(use_cache=False), total_bytes, base, bytes_read)
+
+        def cold():
+            setup_hash_cache(os.path.join(tmp, "cache.db"))
+            try:
+                return find()
+            finally:
+                setup_hash_cache(":memory:")
+                os.remove(os.path.join(tmp, "cache.db"))
+
+        run("find_duplicates()，缓存为空", cold, total_bytes, base, bytes_read)
+
+        setup_hash_cache(os.path.join(tmp, "cache.db"))
+        try:
+            find()
+            run("find_duplicates()，再次查找（缓存命中）", find, total_bytes, base, bytes_read)
+        finally:
+            setup_hash_cache(":memory:")
+
+
+if __name__ == "__main__":
+    main()
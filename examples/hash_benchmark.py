@@ -0,0 +1,162 @@
+"""
+文件哈希基准测试
+1. 比较旧的 4 KiB f.read() 循环（calculate_file_hash / FileManager.calculate_file_sha256 原实现）
+   与复用缓冲区 readinto、mmap 以及一次读取计算多个摘要的吞吐量（MB/s）
+2. 在混合大小文件组成的目录树上，比较逐个计算与 hash_files() 线程池批量计算的耗时
+3. 比较重复校验同一目录树时不使用与使用持久化哈希缓存（HashCache）的耗时
+
+文件在第一次读取后位于页缓存中，测得的是 CPU 和内存拷贝开销，而不是磁盘速度。
+
+运行: python examples/hash_benchmark.py [文件大小MB，默认 512]
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_hash import default_workers, hash_file, hash_files
+from utils.hash_cache import HashCache
+
+REPEAT = 3
+
+# 批量测试的目录树：(文件数, 单个文件大小 KiB)
+TREE = [(2000, 16), (200, 1024), (8, 32 * 1024)]
+
+
+def legacy_hash(file_path, algorithm='sha256'):
+    """旧的实现：每 4 KiB 分配一个新的 bytes 对象"""
+    hash_obj = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4096), b''):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def bench(name, func, size_mb, baseline=None):
+    """运行 REPEAT 次取最快一次，输出吞吐量"""
+    best = min(_timed(func) for _ in range(REPEAT))
+    speed = size_mb / best
+    ratio = f"（{speed / baseline:.2f}x）" if baseline else ""
+    print(f"  {name:<40} {speed:8.0f} MB/s {ratio}")
+    return speed
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def create_file(path: Path, size_mb: int):
+    """写入伪随机内容（重复 1 MiB 随机块，避免生成数据本身耗时过长）"""
+    block = os.urandom(1024 * 1024)
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def create_tree(root: Path):
+    """创建混合大小文件组成的目录树（每 100 个文件一个子目录）"""
+    block = os.urandom(1024 * 1024)
+    paths = []
+    for count, size_kb in TREE:
+        for i in range(count):
+            directory = root / f"{size_kb}k" / f"d{i // 100}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"f{i}.bin"
+            with open(path, 'wb') as f:
+                remaining = size_kb * 1024
+                while remaining:
+                    chunk = block[:remaining]
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            paths.append(str(path))
+    return paths
+
+
+def bench_batch(tmp):
+    """比较逐个计算与线程池批量计算"""
+    root = Path(tmp) / "tree"
+    paths = create_tree(root)
+    total_mb = sum(count * size_kb for count, size_kb in TREE) / 1024
+    print(f"\n批量 sha256，{len(paths)} 个文件，共 {total_mb:.0f} MB"
+          f"（CPU 核心 {os.cpu_count()}，自动选择 {default_workers(paths[0])} 个线程）:")
+
+    def run(name, func, baseline=None):
+        best = min(_timed(func) for _ in range(REPEAT))
+        ratio = f"（{baseline / best:.2f}x）" if baseline else ""
+        print(f"  {name:<40} {best * 1000:8.0f} ms  {len(paths) / best:8.0f} 文件/s  {total_mb / best:6.0f} MB/s {ratio}")
+        return best
+
+    base = run("逐个计算，旧实现", lambda: [legacy_hash(p) for p in paths])
+    run("逐个计算，hash_file()", lambda: [hash_file(p) for p in paths], base)
+    for workers in (1, 2, 4, 8):
+        run(f"hash_files(workers={workers})", lambda: list(hash_files(paths, workers=workers)), base)
+    run("hash_files() 自动线程数", lambda: list(hash_files(paths)), base)
+    return paths, total_mb
+
+
+def bench_cache(tmp, paths, total_mb):
+    """比较重复校验时不使用与使用哈希缓存"""
+    # 把修改时间设为一分钟前，超出缓存的防抖窗口
+    mtime = time.time() - 60
+    for path in paths:
+        os.utime(path, (mtime, mtime))
+    print(f"\n重复校验 {len(paths)} 个文件（sha256）:")
+
+    def run(name, func, baseline=None):
+        best = min(_timed(func) for _ in range(REPEAT))
+        ratio = f"（{baseline / best:.2f}x）" if baseline else ""
+        print(f"  {name:<40} {best * 1000:8.0f} ms  {len(paths) / best:8.0f} 文件/s {ratio}")
+        return best
+
+    base = run("hash_file()，不使用缓存", lambda: [hash_file(p) for p in paths])
+    cache = HashCache(Path(tmp) / "hashes.db")
+    first = _timed(lambda: [cache.get_or_compute(p) for p in paths])
+    print(f"  {'首次计算并写入缓存':<40} {first * 1000:8.0f} ms")
+    run("缓存命中（已打开的数据库）", lambda: [cache.get_or_compute(p) for p in paths], base)
+    cache.close()
+
+    def reopen():
+        reopened = HashCache(Path(tmp) / "hashes.db")
+        for p in paths:
+            reopened.get_or_compute(p)
+        reopened.close()
+
+    run("缓存命中（重新打开数据库，模拟重启）", reopen, base)
+    print(f"  （不使用缓存时相当于 {total_mb / base:.0f} MB/s）")
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "package.bin"
+        create_file(path, size_mb)
+        expected = legacy_hash(path)
+        assert hash_file(path)["sha256"] == expected
+
+        print(f"sha256，{size_mb} MB 文件（最快 {REPEAT} 次）:")
+        base = bench("4 KiB f.read()（旧）", lambda: legacy_hash(path), size_mb)
+        for block_kb in (64, 256, 1024, 4096):
+            bench(f"readinto，{block_kb} KiB 缓冲区", lambda: hash_file(path, block_size=block_kb * 1024,
+                                                                        use_mmap=False), size_mb, base)
+        bench("mmap，256 KiB 切片", lambda: hash_file(path, use_mmap=True), size_mb, base)
+        bench("hash_file() 默认（自动选择）", lambda: hash_file(path), size_mb, base)
+
+        print(f"\nsha256 + md5，{size_mb} MB 文件:")
+        separate = bench("分别调用两次旧实现", lambda: (legacy_hash(path), legacy_hash(path, 'md5')), size_mb)
+        bench("hash_file(('sha256', 'md5')) 一次读取",
+              lambda: hash_file(path, ('sha256', 'md5')), size_mb, separate)
+
+        paths, total_mb = bench_batch(tmp)
+        bench_cache(tmp, paths, total_mb)
+
+
+if __name__ == "__main__":
+    main()
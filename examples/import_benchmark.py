@@ -0,0 +1,64 @@
+"""
+导入耗时基准测试
+在新的子进程中以 -X importtime 冷启动导入，统计启动早期常用导入语句的累计耗时，
+并与导入耗时预算比较（结果受机器和磁盘缓存影响，仅用于本地对比，不作为测试断言）
+
+运行: python examples/import_benchmark.py
+"""
+
+import sys
+import os
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 启动早期只访问日志和配置时的导入耗时预算（微秒）
+IMPORT_BUDGET_US = 1_500_000
+ROUNDS = 5
+
+STATEMENTS = [
+    "import utils, gui, updater",
+    "from utils import app_logger, app_config",
+    "from utils import get_logger, setup_exception_handler",
+    "from utils import get_theme_manager, get_plugin_manager",
+    "from PySide6.QtWidgets import QApplication",
+]
+
+
+def import_time_us(code: str) -> tuple:
+    """在新的子进程中运行代码，返回 (各模块自身导入耗时之和（微秒）, 导入的模块数)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        timeout=60,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    total_us = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _cumulative, _name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules += 1
+    return total_us, modules
+
+
+def main():
+    print(f"冷启动导入耗时（{ROUNDS} 次取最小值，预算 {IMPORT_BUDGET_US / 1000:.0f} ms）:\n")
+    for statement in STATEMENTS:
+        samples = [import_time_us(statement) for _ in range(ROUNDS)]
+        total_us = min(total for total, _ in samples)
+        modules = samples[0][1]
+        status = "✅" if total_us < IMPORT_BUDGET_US else "⚠️ 超出预算"
+        print(f"  {statement:<58} {total_us / 1000:8.1f} ms  {modules:4d} 个模块  {status}")
+
+
+if __name__ == "__main__":
+    main()
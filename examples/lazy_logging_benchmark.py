@@ -0,0 +1,130 @@
+"""
+延迟日志格式化基准测试
+在生产环境的日志级别（INFO）下，比较热点路径上 DEBUG 日志语句的开销：
+立即构建的 f-string、loguru 参数格式化、opt(lazy=True) 和 is_enabled() 判断。
+飞行记录器为默认的 DEBUG 级别时 DEBUG 日志会进入记录器，另外测量记录器设为 INFO（DEBUG 完全被过滤）时的开销
+
+运行: python examples/lazy_logging_benchmark.py
+"""
+
+import sys
+import os
+import io
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_flight_recorder, get_logger, is_enabled, setup_logger, shutdown_logging
+
+CALLS = 200_000
+DOWNLOAD_MB = 256
+CHUNK_SIZE = 8192
+
+logger = get_logger("benchmark")
+
+
+def bench_statement(name, func, calls=CALLS):
+    """测量一条日志语句的平均开销"""
+    start = time.process_time_ns()
+    for i in range(calls):
+        func(i)
+    per_call = (time.process_time_ns() - start) / calls
+    print(f"  {name:<28} {per_call:8.1f} ns/次")
+    return per_call
+
+
+def download_loop_before(stream, total_size, chunk_log=False):
+    """改造前的下载循环：每个数据块都计算取模，日志消息使用 f-string"""
+    downloaded_size = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        downloaded_size += len(chunk)
+        if chunk_log:
+            logger.debug(f"已接收数据块: {len(chunk)} 字节, 累计 {downloaded_size / 1024 / 1024:.2f} MB")
+        if downloaded_size % (10 * 1024 * 1024) == 0:
+            logger.debug(f"下载进度: {downloaded_size / 1024 / 1024:.2f} MB / {total_size / 1024 / 1024:.2f} MB")
+    return downloaded_size
+
+
+def download_loop_after(stream, total_size, chunk_log=False):
+    """改造后的下载循环：循环外判断一次级别，DEBUG 未启用时循环内没有日志相关的计算"""
+    downloaded_size = 0
+    debug_enabled = is_enabled("DEBUG")
+    log_interval = 10 * 1024 * 1024
+    next_log_size = log_interval if debug_enabled else None
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        downloaded_size += len(chunk)
+        if chunk_log and debug_enabled:
+            logger.debug("已接收数据块: {} 字节, 累计 {:.2f} MB", len(chunk), downloaded_size / 1024 / 1024)
+        if next_log_size is not None and downloaded_size >= next_log_size:
+            next_log_size += log_interval
+            logger.debug("下载进度: {:.2f} MB / {:.2f} MB", downloaded_size / 1024 / 1024, total_size / 1024 / 1024)
+    return downloaded_size
+
+
+def bench_download(name, loop, payload, chunk_log=False):
+    """测量每下载 1 MB 的 CPU 时间"""
+    best = None
+    for _ in range(3):
+        stream = io.BytesIO(payload)
+        start = time.process_time_ns()
+        loop(stream, len(payload), chunk_log)
+        elapsed = time.process_time_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_mb = best / DOWNLOAD_MB / 1000
+    print(f"  {name:<28} {per_mb:8.1f} µs/MB")
+    return per_mb
+
+
+def bench_statements():
+    """测量几种 DEBUG 日志语句的开销，返回 (f-string, is_enabled() 判断) 的耗时"""
+    data = "x" * 4096
+    size = 12.5 * 1024 * 1024
+    eager = bench_statement("f-string（立即格式化）",
+                            lambda i: logger.debug(f"下载进度: {size / 1024 / 1024:.2f} MB 响应: {data[:500]}"))
+    bench_statement("参数格式化",
+                    lambda i: logger.debug("下载进度: {:.2f} MB 响应: {}", size / 1024 / 1024, data[:500]))
+    bench_statement("opt(lazy=True)",
+                    lambda i: logger.opt(lazy=True).debug("响应: {}", lambda: data[:500]))
+    guarded = bench_statement("is_enabled() 判断",
+                              lambda i: is_enabled("DEBUG") and logger.debug(f"响应: {data[:500]}"))
+    return eager, guarded
+
+
+def main():
+    # 模拟生产环境：DEBUG 不写入日志文件；飞行记录器设为 INFO，DEBUG 语句在 loguru 入口直接返回
+    setup_logger(level="INFO", recorder_level="INFO")
+    print(f"DEBUG 是否启用: {is_enabled('DEBUG')}，飞行记录器: {'启用' if get_flight_recorder() else '未启用'}（INFO）\n")
+
+    print("被过滤的 DEBUG 语句开销:")
+    eager, guarded = bench_statements()
+    print(f"  判断后每条语句节省 {eager - guarded:.1f} ns\n")
+
+    payload = b"\0" * (DOWNLOAD_MB * 1024 * 1024)
+    print(f"DownloadWorker 下载循环（{DOWNLOAD_MB} MB，{CHUNK_SIZE} 字节/块）:")
+    before = bench_download("改造前", download_loop_before, payload)
+    after = bench_download("改造后", download_loop_after, payload)
+    print(f"  每 MB 节省 CPU {before - after:.1f} µs（{(1 - after / before) * 100:.0f}%）\n")
+
+    print("每个数据块记录一条 DEBUG 日志时:")
+    before = bench_download("f-string", download_loop_before, payload, chunk_log=True)
+    after = bench_download("is_enabled() 判断", download_loop_after, payload, chunk_log=True)
+    print(f"  每 MB 节省 CPU {before - after:.1f} µs（{(1 - after / before) * 100:.0f}%）\n")
+
+    # 默认配置：飞行记录器为 DEBUG 级别，DEBUG 语句需要构建记录并写入记录器
+    setup_logger(level="INFO")
+    print(f"飞行记录器为 DEBUG 级别时（默认，DEBUG 是否启用: {is_enabled('DEBUG')}）:")
+    bench_statements()
+    print()
+
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+日志性能基准测试
+比较 update.log 旧的字符串扫描过滤与按通道路由的每条记录开销
+
+运行: python examples/logging_benchmark.py
+"""
+
+import sys
+import os
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+from utils.logger import get_logger, shutdown_logging, CHANNEL_UPDATE, _channel_filter
+
+RECORDS = 200_000
+
+
+def legacy_update_filter(record) -> bool:
+    """旧的 update.log 过滤：对记录名和完整消息转小写后做子串查找"""
+    return "update" in (record.get("name", "") or "").lower() or "update" in record["message"].lower()
+
+
+def capture_records():
+    """生成用于测试过滤函数的真实记录"""
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record), level=0, format="{message}")
+    # 模拟记录来自对应模块（record["name"] 为模块名）
+    app_log = get_logger("gui.settings_tab").patch(lambda r: r.update(name="gui.settings_tab"))
+    update_log = get_logger("updater.file_manager", channel=CHANNEL_UPDATE).patch(
+        lambda r: r.update(name="updater.file_manager"))
+    app_log.info("窗口已最小化到托盘")
+    app_log.debug("拖放文件: " + "/home/user/documents/report.pdf " * 10)
+    app_log.info("设置已保存: check_update_on_startup=False")
+    update_log.info("下载进度: 52% (5.2 MB / 10.0 MB)")
+    logger.remove(handler_id)
+    return records
+
+
+def bench_filter(name, filter_func, records, rounds=RECORDS):
+    """测量过滤函数本身的开销"""
+    start = time.perf_counter_ns()
+    for i in range(rounds):
+        filter_func(records[i % len(records)])
+    per_record = (time.perf_counter_ns() - start) / rounds
+    print(f"  {name:<20} {per_record:8.1f} ns/条")
+    return per_record
+
+
+def bench_end_to_end(name, filter_func, rounds=RECORDS // 10):
+    """测量一次 logger.info 经过过滤到达（空）输出的完整开销"""
+    handler_id = logger.add(lambda message: None, level="INFO", format="{message}", filter=filter_func)
+    app_log = get_logger("gui.settings_tab")
+    message = "用户打开了设置页面，当前主题为 light，字体大小 12"
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        app_log.info(message)
+    per_record = (time.perf_counter_ns() - start) / rounds
+    logger.remove(handler_id)
+    print(f"  {name:<20} {per_record:8.1f} ns/条")
+    return per_record
+
+
+def main():
+    # 只测量过滤本身，去掉应用默认的文件输出
+    shutdown_logging()
+    logger.remove()
+
+    records = capture_records()
+    print("过滤函数开销:")
+    legacy = bench_filter("字符串扫描（旧）", legacy_update_filter, records)
+    channel = bench_filter("通道路由（新）", _channel_filter(CHANNEL_UPDATE), records)
+    print(f"  每条记录节省 {legacy - channel:.1f} ns（{legacy / channel:.1f}x）")
+
+    print("\n路由结果（旧过滤会把消息里含 update 的无关记录写进 update.log）:")
+    for record in records:
+        print(f"  {record['extra'].get('name', ''):<24} 旧: {legacy_update_filter(record)!s:<5} "
+              f"新: {_channel_filter(CHANNEL_UPDATE)(record)}")
+
+    print("\n端到端 logger.info 开销（交替运行 5 轮取最小值）:")
+    legacy_runs, channel_runs = [], []
+    for _ in range(5):
+        legacy_runs.append(bench_end_to_end("字符串扫描（旧）", legacy_update_filter))
+        channel_runs.append(bench_end_to_end("通道路由（新）", _channel_filter(CHANNEL_UPDATE)))
+    legacy, channel = min(legacy_runs), min(channel_runs)
+    print(f"  最小值: 旧 {legacy:.1f} ns/条，新 {channel:.1f} ns/条，每条记录节省 {legacy - channel:.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
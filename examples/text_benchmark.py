@@ -0,0 +1,106 @@
+"""
+文本读取基准测试
+在一个合成的日志文件（默认 1 GB，中英文混合）上比较：
+1. 原来的 read_text_file()（一次读入整个文件）、文本模式 open() 逐行迭代与 iter_text_lines() 的耗时和内存峰值
+2. 读取第 N 行：逐行跳过前 N 行与 LineIndex（扫描一次后按偏移读取）的耗时
+
+内存峰值由 tracemalloc 统计 Python 分配的内存（mmap 映射的页面属于页缓存，不计入）。
+文件在创建后位于页缓存中，测得的主要是解码和 Python 层的开销。1 GB 文件的一次读入需要约 2 GB 内存。
+
+运行: python examples/text_benchmark.py [文件大小MB，默认 1024]
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import file_utils
+from utils.text_reader import LineIndex, iter_text_lines
+
+# 随机读取的行数
+RANDOM_LINES = 10_000
+
+
+def create_log(path: str, size_mb: int) -> int:
+    """生成日志文件，返回行数"""
+    levels = ("INFO", "DEBUG", "WARNING", "ERROR")
+    block = "".join(
+        f"2026-10-17 12:{i % 60:02d}:{i % 59:02d} | {levels[i % 4]:<7} | worker-{i % 8} | "
+        f"处理请求 {i} 完成，耗时 {i % 997} ms，payload={'x' * (i % 50)}\n"
+        for i in range(10_000)
+    ).encode("utf-8")
+    lines = 0
+    with open(path, "wb") as f:
+        while f.tell() < size_mb * 1024 * 1024:
+            f.write(block)
+            lines += 10_000
+    return lines
+
+
+def _measure(func):
+    """运行一次测量耗时，再运行一次测量内存峰值"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def report(name, elapsed, peak, extra=""):
+    print(f"  {name:<42} {elapsed * 1000:9.0f} ms  峰值 {peak / 1024 / 1024:9.1f} MB  {extra}")
+
+
+def count_open_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.log")
+        total_lines = create_log(path, size_mb)
+        size = os.path.getsize(path)
+        print(f"测试文件: {file_utils.format_file_size(size)}，{total_lines} 行\n")
+
+        print("读取整个文件:")
+        elapsed, peak, _ = _measure(lambda: len(file_utils.read_text_file(path)))
+        report("read_text_file()（旧，一次读入）", elapsed, peak)
+        elapsed, peak, _ = _measure(lambda: count_open_lines(path))
+        report("open() 逐行迭代", elapsed, peak)
+        elapsed, peak, _ = _measure(lambda: sum(1 for _ in iter_text_lines(path)))
+        report("iter_text_lines()", elapsed, peak)
+
+        print(f"\n按行号读取（随机 {RANDOM_LINES} 行）:")
+        targets = [random.randrange(total_lines) for _ in range(RANDOM_LINES)]
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            skipped = next(islice(f, targets[0], None))
+        once = time.perf_counter() - start
+        report("逐行跳过读取 1 行（每次都要从头读）", once, 0, f"{RANDOM_LINES} 行约需 {once * RANDOM_LINES:.0f} s")
+
+        elapsed, peak, index = _measure(lambda: LineIndex(path))
+        report("LineIndex 建立索引（扫描一次）", elapsed, peak, f"{len(index)} 行")
+        assert index[targets[0]] == skipped.rstrip("\n")
+        start = time.perf_counter()
+        for n in targets:
+            index[n]
+        elapsed = time.perf_counter() - start
+        report(f"LineIndex 随机读取 {RANDOM_LINES} 行", elapsed, 0,
+               f"每行 {elapsed / RANDOM_LINES * 1e6:.1f} µs")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
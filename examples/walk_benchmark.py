@@ -0,0 +1,127 @@
+"""
+目录遍历基准测试
+在合成的目录树（默认 20 万个文件）上比较原来的 Path.rglob + is_file() 实现、os.walk 与基于 os.scandir 的
+scan_tree / list_files 的耗时和内存峰值，找到前 100 个匹配文件（提前停止）所需的时间，
+以及逐个 os.stat 统计目录总大小与 summarize_tree 并行统计的耗时
+
+目录树只创建一次并在第一次遍历后位于目录项缓存中，测得的主要是 Python 层和系统调用的开销。
+
+运行: python examples/walk_benchmark.py [文件数，默认 200000]
+"""
+
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import file_utils
+from utils.dir_walk import scan_tree
+from utils.tree_summary import summarize_tree
+
+REPEAT = 3
+
+# 每个目录的文件数和子目录数（目录树约 4 层）
+FILES_PER_DIR = 50
+SUBDIRS_PER_DIR = 8
+
+# 文件扩展名轮换，"*.txt" 匹配约四分之一的文件
+EXTENSIONS = (".txt", ".py", ".json", ".bin")
+
+
+def create_tree(root: Path, total: int) -> int:
+    """按广度优先创建目录树，直到达到指定的文件数，返回目录数"""
+    queue = [root]
+    created = directories = 0
+    while created < total:
+        directory = queue.pop(0)
+        directory.mkdir(parents=True, exist_ok=True)
+        directories += 1
+        for i in range(min(FILES_PER_DIR, total - created)):
+            open(directory / f"file{i}{EXTENSIONS[i % len(EXTENSIONS)]}", 'wb').close()
+        created += min(FILES_PER_DIR, total - created)
+        queue.extend(directory / f"dir{i}" for i in range(SUBDIRS_PER_DIR))
+    return directories
+
+
+def legacy_list_files(directory, pattern="*"):
+    """原来的 list_files(recursive=True) 实现"""
+    return [str(f) for f in Path(directory).rglob(pattern) if f.is_file()]
+
+
+def os_walk_list(directory):
+    """os.walk 基准"""
+    return [os.path.join(d, name) for d, _, names in os.walk(directory) for name in names]
+
+
+def count_stream(directory, pattern=None):
+    """只计数，不保存结果"""
+    return sum(1 for _ in scan_tree(directory, pattern))
+
+
+def serial_size(directory):
+    """原来只能这样统计目录大小：os.walk + 逐个 os.stat"""
+    return sum(os.stat(os.path.join(d, name)).st_size for d, _, names in os.walk(directory) for name in names)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(name, func, baseline=None):
+    """运行 REPEAT 次取最快一次，再单独运行一次测量内存峰值"""
+    best = min(_timed(func) for _ in range(REPEAT))
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    count = result if isinstance(result, int) else len(result)
+    ratio = f"（{baseline / best:.2f}x）" if baseline else ""
+    print(f"  {name:<38} {best * 1000:8.0f} ms  {count:>8} 项  峰值 {peak / 1024 / 1024:7.1f} MB {ratio}")
+    return best
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        start = time.perf_counter()
+        directories = create_tree(root, total)
+        print(f"目录树: {total} 个文件，{directories} 个目录（创建耗时 {time.perf_counter() - start:.1f} s）")
+        legacy_list_files(root)  # 预热目录项缓存
+
+        print("\n递归列出全部文件:")
+        base = run("Path.rglob + is_file()（旧）", lambda: legacy_list_files(root))
+        run("os.walk", lambda: os_walk_list(root), base)
+        run("list_files(recursive=True)", lambda: file_utils.list_files(str(root), recursive=True), base)
+        run("scan_tree() 只计数（不保存列表）", lambda: count_stream(root), base)
+
+        print("\n递归列出 *.txt:")
+        base = run("Path.rglob('*.txt') + is_file()（旧）", lambda: legacy_list_files(root, "*.txt"))
+        run("list_files('*.txt', recursive=True)",
+            lambda: file_utils.list_files(str(root), "*.txt", recursive=True), base)
+        run("scan_tree('*.txt') 只计数", lambda: count_stream(root, "*.txt"), base)
+
+        print("\n找到前 100 个 *.txt 文件:")
+        base = run("Path.rglob（旧，需要列出全部）",
+                   lambda: legacy_list_files(root, "*.txt")[:100])
+        run("scan_tree() 提前停止",
+            lambda: [e.path for e in islice(scan_tree(root, "*.txt"), 100)], base)
+
+        print(f"\n统计目录大小（CPU 核心 {os.cpu_count()}）:")
+        base = min(_timed(lambda: serial_size(root)) for _ in range(REPEAT))
+        print(f"  {'os.walk + os.stat（逐个）':<38} {base * 1000:8.0f} ms")
+        for workers in (1, 2, 4, 8):
+            best = min(_timed(lambda: summarize_tree(root, workers=workers)) for _ in range(REPEAT))
+            print(f"  {f'summarize_tree(workers={workers})':<38} {best * 1000:8.0f} ms （{base / best:.2f}x）")
+
+
+if __name__ == "__main__":
+    main()
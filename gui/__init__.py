@@ -1,14 +1,33 @@
 """
 GUI模块
 包含所有GUI相关的组件和页面
+
+公开名称在首次访问时才导入对应子模块（模块级 __getattr__）。
 """
 
-from .base_tab import BaseTab
-from .tab1 import WelcomeTab
-from .tab2 import TextEditorTab
-from .settings_tab import SettingsTab
-from .error_dialog import ErrorDialog
-from .toast import ToastWidget, ToastManager
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base_tab import BaseTab
+    from .tab1 import WelcomeTab
+    from .tab2 import TextEditorTab
+    from .settings_tab import SettingsTab
+    from .error_dialog import ErrorDialog
+    from .toast import ToastWidget, ToastManager
+    from .lazy_tab_widget import LazyTabWidget
+
+# 公开名称 -> (子模块, 属性名)
+_LAZY_EXPORTS = {
+    'BaseTab': ('.base_tab', 'BaseTab'),
+    'WelcomeTab': ('.tab1', 'WelcomeTab'),
+    'TextEditorTab': ('.tab2', 'TextEditorTab'),
+    'SettingsTab': ('.settings_tab', 'SettingsTab'),
+    'ErrorDialog': ('.error_dialog', 'ErrorDialog'),
+    'ToastWidget': ('.toast', 'ToastWidget'),
+    'ToastManager': ('.toast', 'ToastManager'),
+    'LazyTabWidget': ('.lazy_tab_widget', 'LazyTabWidget'),
+}
 
 __all__ = [
     'BaseTab',
@@ -17,9 +36,26 @@ __all__ = [
     'SettingsTab',
     'ErrorDialog',
     'ToastWidget',
-    'ToastManager'
+    'ToastManager',
+    'LazyTabWidget'
 ]
 
 __version__ = '1.0.0'
 __author__ = 'GUI Base Template'
 __description__ = 'GUI组件模块'
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入公开名称（首次访问后缓存到模块命名空间）"""
+    try:
+        module_name, attr_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
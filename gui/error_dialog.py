@@ -159,6 +159,16 @@ class ErrorDialog(QDialog):
         details.append("-" * 60)
         details.append(self.error_info.get('traceback', 'No traceback available'))
         details.append("")
+        
+        # 出错前的最近日志
+        recent_logs = self.error_info.get('recent_logs', [])
+        if recent_logs:
+            from utils.flight_recorder import format_log_entry
+            details.append("-" * 60)
+            details.append(f"最近日志（{len(recent_logs)} 条）")
+            details.append("-" * 60)
+            details.extend(format_log_entry(entry) for entry in recent_logs)
+            details.append("")
         details.append("=" * 60)
         
         return "\n".join(details)
@@ -0,0 +1,119 @@
+"""
+延迟构建的标签页容器
+标签页以工厂函数注册，首次被选中时才创建其控件树
+"""
+
+from typing import Callable, Optional
+from PySide6.QtWidgets import QTabWidget, QWidget, QVBoxLayout
+from PySide6.QtCore import QTimer, Signal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _LazyTabPage(QWidget):
+    """占位页面，持有工厂函数，首次需要时创建真正的内容"""
+
+    def __init__(self, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.content: Optional[QWidget] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def materialize(self) -> QWidget:
+        """创建内容控件（只执行一次）"""
+        if self.content is None:
+            self.content = self.factory()
+            self.factory = None
+            self.layout().addWidget(self.content)
+        return self.content
+
+
+class LazyTabWidget(QTabWidget):
+    """延迟构建的标签页控件
+
+    使用方法:
+        tabs = LazyTabWidget()
+        tabs.add_lazy_tab(lambda: SettingsTab(window), "设置")
+        tabs.set_prefetch_enabled(True)
+    """
+
+    # 信号：标签页内容已创建（索引, 内容控件）
+    tab_materialized = Signal(int, QWidget)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._prefetch_enabled = False
+        self._prefetch_delay = 300
+        self.currentChanged.connect(self._on_current_changed)
+
+    def add_lazy_tab(self, factory: Callable[[], QWidget], label: str) -> int:
+        """注册一个延迟创建的标签页
+
+        Args:
+            factory: 返回标签页内容控件的工厂函数
+            label: 标签文字
+
+        Returns:
+            int: 标签页索引
+        """
+        return self.addTab(_LazyTabPage(factory), label)
+
+    def ensure_tab(self, index: int) -> Optional[QWidget]:
+        """确保指定标签页的内容已创建
+
+        Args:
+            index: 标签页索引
+
+        Returns:
+            Optional[QWidget]: 内容控件，索引无效时返回None
+        """
+        page = self.widget(index)
+        if not isinstance(page, _LazyTabPage):
+            return page
+
+        if page.content is None:
+            content = page.materialize()
+            logger.debug(f"标签页已创建: {self.tabText(index)}")
+            self.tab_materialized.emit(index, content)
+        return page.content
+
+    def is_tab_materialized(self, index: int) -> bool:
+        """检查指定标签页的内容是否已创建"""
+        page = self.widget(index)
+        if isinstance(page, _LazyTabPage):
+            return page.content is not None
+        return page is not None
+
+    def set_prefetch_enabled(self, enabled: bool, delay_ms: int = 300):
+        """设置空闲时预创建下一个标签页
+
+        Args:
+            enabled: 是否启用预创建
+            delay_ms: 切换标签页后等待多久再预创建（毫秒）
+        """
+        self._prefetch_enabled = enabled
+        self._prefetch_delay = delay_ms
+
+    def _on_current_changed(self, index: int):
+        """当前标签页改变时创建其内容"""
+        if index < 0:
+            return
+        self.ensure_tab(index)
+        if self._prefetch_enabled:
+            QTimer.singleShot(self._prefetch_delay, self._prefetch_next)
+
+    def _prefetch_next(self):
+        """预创建当前标签页之后第一个尚未创建的标签页"""
+        # 定时器到期前可能已关闭预创建
+        if not self._prefetch_enabled:
+            return
+        count = self.count()
+        current = self.currentIndex()
+        for offset in range(1, count):
+            index = (current + offset) % count
+            if not self.is_tab_materialized(index):
+                self.ensure_tab(index)
+                return
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                                QMessageBox, QGroupBox, QRadioButton, QButtonGroup,
                                QCheckBox, QComboBox, QFileDialog, QScrollArea,
                                QWidget)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QSignalBlocker
 from .base_tab import BaseTab
 from utils.theme import get_theme_manager, ThemeMode
 from utils.config import app_config
@@ -22,6 +22,7 @@ class SettingsTab(BaseTab):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
+        self.subscribe_config_changes()
     
     def init_ui(self):
         """初始化用户界面"""
@@ -72,6 +73,46 @@ class SettingsTab(BaseTab):
         main_layout.addWidget(scroll)
         self.setLayout(main_layout)
     
+    def subscribe_config_changes(self):
+        """订阅配置变化：导入或重置配置后同步更新界面上的控件"""
+        # 配置项 -> (控件, 从配置同步控件状态的函数)
+        self._config_widgets = {
+            "theme.mode": (self.theme_button_group, self._sync_theme_radio),
+            "appearance.remember_window_size": (
+                self.remember_size_check, lambda: self.remember_size_check.setChecked(app_config.remember_window_size)),
+            "behavior.minimize_to_tray": (
+                self.minimize_to_tray_check, lambda: self.minimize_to_tray_check.setChecked(app_config.minimize_to_tray)),
+            "behavior.close_to_tray": (
+                self.close_to_tray_check, lambda: self.close_to_tray_check.setChecked(app_config.close_to_tray)),
+            "behavior.confirm_on_exit": (
+                self.confirm_exit_check, lambda: self.confirm_exit_check.setChecked(app_config.confirm_on_exit)),
+            "behavior.start_minimized": (
+                self.start_minimized_check, lambda: self.start_minimized_check.setChecked(app_config.start_minimized)),
+            "behavior.single_instance": (
+                self.single_instance_check, lambda: self.single_instance_check.setChecked(app_config.single_instance)),
+            "auto_check_updates": (
+                self.auto_update_check, lambda: self.auto_update_check.setChecked(app_config.auto_check_updates)),
+            "advanced.log_level": (
+                self.log_level_combo, lambda: self.log_level_combo.setCurrentText(app_config.log_level)),
+            "advanced.debug_mode": (
+                self.debug_mode_check, lambda: self.debug_mode_check.setChecked(app_config.debug_mode)),
+        }
+        for key in self._config_widgets:
+            app_config.subscribe(key, self._on_config_changed)
+
+    def _on_config_changed(self, key: str, old_value, new_value):
+        """配置改变时更新对应控件（阻止控件信号，避免再次写入配置）"""
+        widget, sync = self._config_widgets[key]
+        with QSignalBlocker(widget):
+            sync()
+
+    def _sync_theme_radio(self):
+        """根据配置选中主题单选按钮"""
+        radios = {"light": self.light_radio, "dark": self.dark_radio}
+        radio = radios.get(app_config.theme_mode, self.auto_radio)
+        with QSignalBlocker(radio):
+            radio.setChecked(True)
+
     def create_theme_group(self):
         """创建主题设置分组"""
         group = QGroupBox("主题设置")
@@ -155,6 +196,12 @@ class SettingsTab(BaseTab):
         self.start_minimized_check.toggled.connect(self.on_start_minimized_changed)
         layout.addWidget(self.start_minimized_check)
 
+        # 单实例运行
+        self.single_instance_check = QCheckBox("只允许运行一个实例（下次启动时生效）")
+        self.single_instance_check.setChecked(app_config.single_instance)
+        self.single_instance_check.toggled.connect(self.on_single_instance_changed)
+        layout.addWidget(self.single_instance_check)
+
         group.setLayout(layout)
         return group
     
@@ -207,33 +254,44 @@ class SettingsTab(BaseTab):
         layout = QVBoxLayout()
 
         try:
+            # 插件列表来自清单索引，不需要导入插件代码
             plugin_manager = get_plugin_manager()
-            plugins = plugin_manager.get_all_plugins()
+            manifests = plugin_manager.get_all_manifests()
 
-            if plugins:
-                for plugin_name, plugin in plugins.items():
-                    metadata = plugin.get_metadata()
+            if manifests:
+                for plugin_name, manifest in manifests.items():
+                    plugin = plugin_manager.get_plugin(plugin_name)
 
                     # 插件信息布局
                     plugin_layout = QHBoxLayout()
 
                     # 插件名称和版本
-                    info_label = QLabel(f"{metadata.name} v{metadata.version}")
+                    info_label = QLabel(f"{manifest.name} v{manifest.version}")
                     info_label.setStyleSheet("font-weight: bold;")
                     plugin_layout.addWidget(info_label)
 
                     plugin_layout.addStretch()
 
                     # 启用/禁用按钮
-                    toggle_btn = QPushButton("禁用" if plugin.is_enabled() else "启用")
+                    if plugin:
+                        toggle_btn = QPushButton("禁用" if plugin.is_enabled() else "启用")
+                        toggle_btn.clicked.connect(lambda checked, name=plugin_name: self.toggle_plugin(name))
+                    elif plugin_manager.is_lazy(plugin_name):
+                        # 延迟激活的插件：点击后才导入并初始化
+                        toggle_btn = QPushButton("激活")
+                        toggle_btn.clicked.connect(
+                            lambda checked, name=plugin_name, btn=toggle_btn: self.activate_plugin(name, btn)
+                        )
+                    else:
+                        toggle_btn = QPushButton("未加载")
+                        toggle_btn.setEnabled(False)
                     toggle_btn.setStyleSheet(get_button_style("default"))
-                    toggle_btn.clicked.connect(lambda checked, name=plugin_name: self.toggle_plugin(name))
                     plugin_layout.addWidget(toggle_btn)
 
                     layout.addLayout(plugin_layout)
 
                     # 插件描述
-                    desc_label = QLabel(metadata.description)
+                    desc_label = QLabel(manifest.description)
                     desc_label.setStyleSheet("color: gray; font-size: 10px; margin-left: 10px;")
                     layout.addWidget(desc_label)
             else:
@@ -295,44 +353,40 @@ class SettingsTab(BaseTab):
     
     def on_remember_size_changed(self, checked: bool):
         """记住窗口大小改变"""
-        if "appearance" not in app_config._config:
-            app_config._config["appearance"] = {}
-        app_config._config["appearance"]["remember_window_size"] = checked
+        app_config.set("appearance.remember_window_size", checked)
         app_config.save_config()
         self.update_status_bar(f"记住窗口大小: {'已启用' if checked else '已禁用'}", 2000)
     
     def on_minimize_to_tray_changed(self, checked: bool):
         """最小化到托盘改变"""
-        if "behavior" not in app_config._config:
-            app_config._config["behavior"] = {}
-        app_config._config["behavior"]["minimize_to_tray"] = checked
+        app_config.set("behavior.minimize_to_tray", checked)
         app_config.save_config()
         self.update_status_bar(f"最小化到托盘: {'已启用' if checked else '已禁用'}", 2000)
 
     def on_close_to_tray_changed(self, checked: bool):
         """关闭到托盘改变"""
-        if "behavior" not in app_config._config:
-            app_config._config["behavior"] = {}
-        app_config._config["behavior"]["close_to_tray"] = checked
+        app_config.set("behavior.close_to_tray", checked)
         app_config.save_config()
         self.update_status_bar(f"关闭时最小化到托盘: {'已启用' if checked else '已禁用'}", 2000)
 
     def on_confirm_exit_changed(self, checked: bool):
         """退出确认改变"""
-        if "behavior" not in app_config._config:
-            app_config._config["behavior"] = {}
-        app_config._config["behavior"]["confirm_on_exit"] = checked
+        app_config.set("behavior.confirm_on_exit", checked)
         app_config.save_config()
         self.update_status_bar(f"退出确认: {'已启用' if checked else '已禁用'}", 2000)
 
     def on_start_minimized_changed(self, checked: bool):
         """启动最小化改变"""
-        if "behavior" not in app_config._config:
-            app_config._config["behavior"] = {}
-        app_config._config["behavior"]["start_minimized"] = checked
+        app_config.set("behavior.start_minimized", checked)
         app_config.save_config()
         self.update_status_bar(f"启动时最小化: {'已启用' if checked else '已禁用'}", 2000)
     
+    def on_single_instance_changed(self, checked: bool):
+        """单实例运行改变"""
+        app_config.set("behavior.single_instance", checked)
+        app_config.save_config()
+        self.update_status_bar(f"单实例运行: {'已启用' if checked else '已禁用'}（下次启动时生效）", 2000)
+
     def on_auto_update_changed(self, checked: bool):
         """自动更新改变"""
         app_config.set_auto_check_updates(checked)
@@ -340,17 +394,13 @@ class SettingsTab(BaseTab):
     
     def on_log_level_changed(self, level: str):
         """日志级别改变"""
-        if "advanced" not in app_config._config:
-            app_config._config["advanced"] = {}
-        app_config._config["advanced"]["log_level"] = level
+        app_config.set("advanced.log_level", level)
         app_config.save_config()
-        self.update_status_bar(f"日志级别已设置为 {level}（重启后生效）", 2000)
+        self.update_status_bar(f"日志级别已设置为 {level}", 2000)
     
     def on_debug_mode_changed(self, checked: bool):
         """调试模式改变"""
-        if "advanced" not in app_config._config:
-            app_config._config["advanced"] = {}
-        app_config._config["advanced"]["debug_mode"] = checked
+        app_config.set("advanced.debug_mode", checked)
         app_config.save_config()
         self.update_status_bar(f"调试模式: {'已启用' if checked else '已禁用'}（重启后生效）", 2000)
 
@@ -377,6 +427,18 @@ class SettingsTab(BaseTab):
         except Exception as e:
             self.update_status_bar(f"切换插件状态失败: {e}", 3000)
     
+    def activate_plugin(self, plugin_name: str, button: QPushButton):
+        """激活延迟加载的插件"""
+        plugin_manager = get_plugin_manager()
+        plugin = plugin_manager.activate_plugin(plugin_name)
+        if plugin:
+            button.setText("禁用" if plugin.is_enabled() else "启用")
+            button.clicked.disconnect()
+            button.clicked.connect(lambda checked, name=plugin_name: self.toggle_plugin(name))
+            self.update_status_bar(f"插件 {plugin_name} 已激活", 2000)
+        else:
+            self.update_status_bar(f"激活插件 {plugin_name} 失败", 3000)
+
     def on_reset_config(self):
         """重置配置"""
         reply = QMessageBox.question(
@@ -387,8 +449,8 @@ class SettingsTab(BaseTab):
         
         if reply == QMessageBox.StandardButton.Yes:
             app_config.reset_to_defaults()
-            self.update_status_bar("配置已重置到默认值，请重启应用", 3000)
-            QMessageBox.information(self, "重置成功", "配置已重置到默认值，请重启应用程序使更改生效。")
+            self.update_status_bar("配置已重置到默认值", 3000)
+            QMessageBox.information(self, "重置成功", "配置已重置到默认值。\n窗口大小等外观设置在重启应用程序后生效。")
     
     def on_export_config(self):
         """导出配置"""
@@ -418,8 +480,11 @@ class SettingsTab(BaseTab):
             
             if reply == QMessageBox.StandardButton.Yes:
                 if app_config.import_config(file_path):
-                    self.update_status_bar("配置已导入，请重启应用", 3000)
-                    QMessageBox.information(self, "导入成功", "配置已成功导入，请重启应用程序使更改生效。")
+                    self.update_status_bar("配置已导入", 3000)
+                    QMessageBox.information(self, "导入成功", "配置已成功导入。\n窗口大小等外观设置在重启应用程序后生效。")
+                elif app_config.import_errors:
+                    details = "\n".join(str(error) for error in app_config.import_errors[:10])
+                    QMessageBox.warning(self, "导入失败", f"配置文件中有无效的配置项，未做任何修改:\n{details}")
                 else:
                     QMessageBox.warning(self, "导入失败", "配置导入失败，请检查文件格式。")
 
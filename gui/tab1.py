@@ -3,20 +3,48 @@
 包含欢迎信息、程序介绍和快速操作功能
 """
 
-from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox, QTextEdit)
-from PySide6.QtCore import Qt
+import os
+import threading
+from PySide6.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox, QTextEdit)
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import QMessageBox
 from .base_tab import BaseTab
 from utils.notification import get_notification_manager
 from utils import create_drag_drop_area, file_utils
 
 
+class FolderSummaryWorker(QThread):
+    """文件夹统计工作线程，统计过程中定期发送部分结果"""
+
+    # 信号：统计结果（TreeSummary，最后一次的 complete 或 cancelled 为 True）
+    summary_updated = Signal(object)
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        """执行统计"""
+        for summary in file_utils.iter_tree_summary(self.path, cancel_event=self._cancel_event):
+            self.summary_updated.emit(summary)
+
+    def cancel(self):
+        """取消统计"""
+        self._cancel_event.set()
+
+
 class WelcomeTab(BaseTab):
     """欢迎页面Tab"""
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # 当前显示的拖放文件，以及文件夹的统计结果和统计线程
+        self._dropped_files = []
+        self._folder_summaries = {}
+        self._summary_workers = []
         self.init_ui()
+        QApplication.instance().aboutToQuit.connect(self.cancel_folder_summaries)
     
     def init_ui(self):
         """初始化用户界面"""
@@ -167,27 +195,90 @@ class WelcomeTab(BaseTab):
         return group
 
     def handle_dropped_files(self, files: list):
-        """处理拖放的文件"""
+        """处理拖放的文件（文件夹在后台统计，统计过程中逐步更新显示）"""
         try:
-            info_lines = [f"收到 {len(files)} 个文件:\n"]
-
+            self.cancel_folder_summaries()
+            self._dropped_files = list(files)
+            self._folder_summaries = {}
             for file_path in files:
-                name = file_utils.get_file_name(file_path)
-                size = file_utils.get_file_size(file_path)
-                formatted_size = file_utils.format_file_size(size)
-                ext = file_utils.get_file_extension(file_path)
+                if os.path.isdir(file_path):
+                    self._start_folder_summary(file_path)
 
-                info_lines.append(f"📄 {name}")
-                info_lines.append(f"   大小: {formatted_size}")
-                info_lines.append(f"   扩展名: {ext}")
-                info_lines.append(f"   路径: {file_path}")
-                info_lines.append("")
-
-            self.file_info_text.setPlainText("\n".join(info_lines))
+            self.render_file_info()
             self.update_status_bar(f"已接收 {len(files)} 个文件", 2000)
 
+            # 激活在清单中声明了 files_dropped 触发事件的插件，并把文件交给它们
+            plugin_manager = getattr(self.main_window, 'plugin_manager', None)
+            if plugin_manager is not None:
+                plugin_manager.activate_trigger("files_dropped", list(files))
+
             # 显示通知
             notification_manager = get_notification_manager()
             notification_manager.success("文件已接收", f"成功接收 {len(files)} 个文件")
         except Exception as e:
             self.update_status_bar(f"处理文件失败: {e}", 3000)
+
+    def render_file_info(self):
+        """显示拖放的文件信息"""
+        info_lines = [f"收到 {len(self._dropped_files)} 个文件:\n"]
+
+        for file_path in self._dropped_files:
+            name = file_utils.get_file_name(file_path)
+            if file_path in self._folder_summaries or os.path.isdir(file_path):
+                info_lines.append(f"📁 {name}")
+                info_lines.extend(self._format_folder_summary(self._folder_summaries.get(file_path)))
+            else:
+                size = file_utils.get_file_size(file_path)
+                info_lines.append(f"📄 {name}")
+                info_lines.append(f"   大小: {file_utils.format_file_size(size)}")
+                info_lines.append(f"   扩展名: {file_utils.get_file_extension(file_path)}")
+            info_lines.append(f"   路径: {file_path}")
+            info_lines.append("")
+
+        self.file_info_text.setPlainText("\n".join(info_lines))
+
+    def _format_folder_summary(self, summary) -> list:
+        """格式化文件夹统计结果"""
+        if summary is None:
+            return ["   大小: 统计中..."]
+
+        state = "" if summary.complete else ("（已取消）" if summary.cancelled else "（统计中...）")
+        lines = [f"   大小: {file_utils.format_file_size(summary.total_size)}{state}",
+                 f"   包含: {summary.file_count} 个文件，{summary.dir_count} 个文件夹"]
+        if summary.extensions:
+            types = ", ".join(f"{ext or '无扩展名'} {stats.count} 个"
+                              for ext, stats in summary.top_extensions(3))
+            lines.append(f"   主要类型: {types}")
+        if summary.largest:
+            size, path = summary.largest[0]
+            lines.append(f"   最大文件: {os.path.basename(path)}（{file_utils.format_file_size(size)}）")
+        return lines
+
+    def _start_folder_summary(self, path: str):
+        """在后台统计文件夹"""
+        worker = FolderSummaryWorker(path, self)
+        worker.summary_updated.connect(lambda summary: self._on_folder_summary(worker, summary))
+        worker.finished.connect(lambda: self._on_summary_worker_finished(worker))
+        self._summary_workers.append(worker)
+        worker.start()
+
+    def _on_folder_summary(self, worker, summary):
+        """收到文件夹统计结果（部分或最终）"""
+        # 忽略已取消的线程在取消前发出、尚未处理的结果
+        if worker in self._summary_workers:
+            self._folder_summaries[summary.root] = summary
+            self.render_file_info()
+
+    def _on_summary_worker_finished(self, worker):
+        """统计线程结束"""
+        if worker in self._summary_workers:
+            self._summary_workers.remove(worker)
+            worker.deleteLater()
+
+    def cancel_folder_summaries(self):
+        """取消正在进行的文件夹统计并等待线程结束"""
+        workers, self._summary_workers = self._summary_workers, []
+        for worker in workers:
+            worker.cancel()
+            worker.wait()
+            worker.deleteLater()
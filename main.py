@@ -5,19 +5,37 @@ from pathlib import Path
 # 在导入PySide6之前设置OpenGL属性
 os.environ["QT_OPENGL"] = "desktop"
 
-from PySide6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QTabBar,
-                               QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                               QStatusBar, QTextEdit, QPushButton, QStyleOptionTab, QStyle)
-from PySide6.QtCore import Qt, QTimer, QSize
-from PySide6.QtGui import QIcon, QAction, QFont, QPainter
+# 启动性能分析（在其他导入之前启用，以便统计导入耗时）
+from utils.startup_profiler import setup_startup_profiler, get_startup_profiler
+setup_startup_profiler(enabled="--profile-startup" in sys.argv)
 
-# 导入自动更新相关模块
-from updater import UpdateManager
-from utils import app_logger, app_config, setup_exception_handler, setup_theme_manager, setup_notification_manager, get_notification_manager, SystemTray, setup_plugin_manager, get_plugin_manager
-from utils.display import setup_high_dpi_support, setup_font_rendering
-
-# 导入GUI模块
-from gui import WelcomeTab, TextEditorTab, SettingsTab, ToastManager
+# 单实例模式：已有实例在运行时把命令行参数转发给它并立即退出，
+# 不再导入界面模块、初始化日志、主题和插件
+if __name__ == "__main__":
+    from utils.config import app_config as _startup_config
+    if _startup_config.single_instance:
+        from utils.single_instance import forward_to_running_instance, instance_server_name
+        if forward_to_running_instance(instance_server_name(_startup_config.app_name), sys.argv[1:]):
+            sys.exit(0)
+
+with get_startup_profiler().phase("import_modules"):
+    from PySide6.QtWidgets import (QApplication, QMainWindow, QTabWidget, QTabBar,
+                                   QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                                   QStatusBar, QTextEdit, QPushButton, QStyleOptionTab, QStyle)
+    from PySide6.QtCore import Qt, QTimer, QSize
+    from PySide6.QtGui import QIcon, QAction, QFont, QPainter
+
+    # 导入自动更新相关模块
+    from updater import UpdateManager
+    from utils import app_logger, app_config, setup_exception_handler, setup_theme_manager, setup_notification_manager, get_notification_manager, SystemTray, setup_plugin_manager, get_plugin_manager
+    from utils.display import setup_high_dpi_support, setup_font_rendering
+    from utils.logger import set_log_level
+    from utils.config_watcher import setup_config_watcher
+    from utils.single_instance import setup_single_instance, forward_to_running_instance, instance_server_name
+
+    # 导入GUI模块
+    from gui import WelcomeTab, TextEditorTab, SettingsTab, ToastManager, LazyTabWidget
+    from utils.plugin_base import BasePlugin
 
 
 class HorizontalTabBar(QTabBar):
@@ -61,14 +79,22 @@ class MainWindow(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        profiler = get_startup_profiler()
 
         # 初始化插件系统（在UI之前）
-        self.plugin_manager = get_plugin_manager()
-        self.plugin_manager.set_main_window(self)
-        self.plugin_manager.load_all_plugins()
+        with profiler.phase("load_all_plugins"):
+            self.plugin_manager = get_plugin_manager()
+            self.plugin_manager.set_main_window(self)
+            # 插件模块在后台线程中导入，initialize 在事件循环中分批执行
+            self.plugin_loader = self.plugin_manager.load_all_plugins_async()
 
-        self.init_ui()
-        self.center_window()
+        with profiler.phase("init_ui"):
+            self.init_ui()
+            self.center_window()
+
+        self.plugin_loader.progress.connect(self.on_plugin_load_progress)
+        self.plugin_loader.plugin_loaded.connect(self.on_plugin_loaded)
+        QApplication.instance().aboutToQuit.connect(self.plugin_loader.cancel)
 
         # 初始化Toast管理器
         self.toast_manager = ToastManager(self)
@@ -78,13 +104,15 @@ class MainWindow(QMainWindow):
         notification_manager.notification_added.connect(self.on_notification_added)
 
         # 初始化系统托盘
-        self.system_tray = SystemTray(self)
-        self.system_tray.show_window_requested.connect(self.show_from_tray)
-        self.system_tray.quit_requested.connect(self.quit_from_tray)
-        self.system_tray.show()
+        with profiler.phase("system_tray"):
+            self.system_tray = SystemTray(self)
+            self.system_tray.show_window_requested.connect(self.show_from_tray)
+            self.system_tray.quit_requested.connect(self.quit_from_tray)
+            self.system_tray.show()
 
         # 初始化更新管理器
-        self.update_manager = UpdateManager(self)
+        with profiler.phase("update_manager"):
+            self.update_manager = UpdateManager(self)
 
         # 启动时检查更新（延迟执行）
         self.update_manager.check_for_updates_on_startup()
@@ -183,6 +211,9 @@ class MainWindow(QMainWindow):
         paste_action.triggered.connect(self.paste_text)
         edit_menu.addAction(paste_action)
 
+        # 插件菜单
+        self.create_plugin_menu(menubar)
+
         # 帮助菜单
         help_menu = menubar.addMenu('帮助(&H)')
 
@@ -202,8 +233,8 @@ class MainWindow(QMainWindow):
 
     def create_central_widget(self):
         """创建中央部件和标签页"""
-        # 创建标签页控件
-        self.tab_widget = QTabWidget()
+        # 创建标签页控件（标签页内容在首次选中时才创建）
+        self.tab_widget = LazyTabWidget()
 
         # 使用自定义的HorizontalTabBar替换默认tabBar
         self.tab_widget.setTabBar(HorizontalTabBar())
@@ -248,25 +279,134 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.tab_widget)
 
         # 创建第一个标签页 - 欢迎页面
-        self.welcome_tab = WelcomeTab(self)
-        self.tab_widget.addTab(self.welcome_tab, "欢迎")
+        self.tab_widget.add_lazy_tab(self.create_welcome_tab, "欢迎")
 
         # 创建第二个标签页 - 文本编辑器
-        self.text_editor_tab = TextEditorTab(self)
-        self.tab_widget.addTab(self.text_editor_tab, "文本编辑")
-
-        # 保存文本编辑器的引用，供菜单功能使用
-        self.text_edit = self.text_editor_tab.get_text_edit()
+        self.tab_widget.add_lazy_tab(self.create_text_editor_tab, "文本编辑")
 
         # 创建第三个标签页 - 设置
-        self.settings_tab = SettingsTab(self)
-        self.tab_widget.addTab(self.settings_tab, "设置")
+        self.tab_widget.add_lazy_tab(self.create_settings_tab, "设置")
 
+        # 插件提供的标签页
+        self.add_plugin_tabs()
 
+        # 空闲时预创建下一个标签页
+        self.tab_widget.set_prefetch_enabled(True)
 
+    def create_welcome_tab(self):
+        """创建欢迎页面（首次选中时调用）"""
+        self.welcome_tab = WelcomeTab(self)
+        return self.welcome_tab
 
+    def create_text_editor_tab(self):
+        """创建文本编辑器页面（首次选中时调用）"""
+        self.text_editor_tab = TextEditorTab(self)
 
+        # 保存文本编辑器的引用，供菜单功能使用
+        self.text_edit = self.text_editor_tab.get_text_edit()
+        return self.text_editor_tab
 
+    def create_settings_tab(self):
+        """创建设置页面（首次选中时调用）"""
+        self.settings_tab = SettingsTab(self)
+        return self.settings_tab
+
+    def add_plugin_tabs(self):
+        """为插件注册标签页
+
+        已加载的插件在重写了 get_widget 时注册标签页；延迟激活或正在后台加载的插件
+        根据清单中的 tab 注册占位标签页，首次选中时才激活插件。
+        """
+        self._plugin_tabs = set()
+        for plugin_name, manifest in self.plugin_manager.get_all_manifests().items():
+            if self.plugin_manager.get_plugin(plugin_name):
+                self.add_plugin_tab(plugin_name)
+            elif manifest.tab and (self.plugin_manager.is_lazy(plugin_name) or
+                                   self.plugin_manager.is_pending(plugin_name)):
+                self.tab_widget.add_lazy_tab(
+                    lambda name=plugin_name: self.create_plugin_widget(name), manifest.tab
+                )
+                self._plugin_tabs.add(plugin_name)
+
+    def add_plugin_tab(self, plugin_name: str):
+        """为已加载的插件注册标签页（只为重写了 get_widget 的插件创建）"""
+        plugin = self.plugin_manager.get_plugin(plugin_name)
+        if plugin_name in self._plugin_tabs or type(plugin).get_widget is BasePlugin.get_widget:
+            return
+        manifest = self.plugin_manager.get_manifest(plugin_name)
+        label = (manifest.tab if manifest else None) or plugin.get_metadata().name
+        self.tab_widget.add_lazy_tab(plugin.get_widget, label)
+        self._plugin_tabs.add(plugin_name)
+
+    def create_plugin_widget(self, plugin_name: str) -> QWidget:
+        """激活延迟插件并创建其UI组件（首次选中插件标签页时调用）"""
+        plugin = self.plugin_manager.activate_plugin(plugin_name)
+        widget = plugin.get_widget() if plugin else None
+        if widget is None:
+            widget = QLabel(f"插件 {plugin_name} 加载失败，请查看日志")
+            widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        return widget
+
+    def create_plugin_menu(self, menubar):
+        """创建插件菜单（没有菜单项时隐藏）
+
+        已加载插件的菜单项来自 get_menu_items()；延迟激活或正在后台加载的插件的菜单项
+        来自清单中的 menu_items，点击时才激活插件并执行对应的动作。
+        """
+        self.plugin_menu = menubar.addMenu('插件(&P)')
+        self._plugin_menus = set()
+        for plugin_name, manifest in self.plugin_manager.get_all_manifests().items():
+            if self.plugin_manager.get_plugin(plugin_name):
+                self.add_plugin_menu_items(plugin_name)
+            elif manifest.menu_items and (self.plugin_manager.is_lazy(plugin_name) or
+                                          self.plugin_manager.is_pending(plugin_name)):
+                for item_name in manifest.menu_items:
+                    self.add_plugin_menu_action(
+                        item_name,
+                        lambda checked=False, p=plugin_name, n=item_name: self.run_plugin_menu_item(p, n)
+                    )
+                self._plugin_menus.add(plugin_name)
+        self.plugin_menu.menuAction().setVisible(not self.plugin_menu.isEmpty())
+
+    def add_plugin_menu_items(self, plugin_name: str):
+        """添加已加载插件通过 get_menu_items() 提供的菜单项"""
+        if plugin_name in self._plugin_menus:
+            return
+        for item_name, callback in self.plugin_manager.get_plugin(plugin_name).get_menu_items():
+            self.add_plugin_menu_action(item_name, callback)
+        self._plugin_menus.add(plugin_name)
+
+    def add_plugin_menu_action(self, item_name: str, callback):
+        """向插件菜单添加一个动作"""
+        action = QAction(item_name, self)
+        action.triggered.connect(callback)
+        self.plugin_menu.addAction(action)
+        self.plugin_menu.menuAction().setVisible(True)
+
+    def on_plugin_loaded(self, plugin_name: str):
+        """后台加载的插件初始化完成后注册其标签页和菜单项"""
+        self.add_plugin_tab(plugin_name)
+        self.add_plugin_menu_items(plugin_name)
+
+    def on_plugin_load_progress(self, done: int, total: int):
+        """在状态栏显示插件加载进度"""
+        if done < total:
+            self.statusBar().showMessage(f"正在加载插件 {done}/{total}...")
+        else:
+            self.statusBar().showMessage("插件加载完成", 2000)
+
+    def run_plugin_menu_item(self, plugin_name: str, item_name: str):
+        """激活延迟插件并执行指定的菜单动作"""
+        plugin = self.plugin_manager.activate_plugin(plugin_name)
+        if not plugin:
+            self.statusBar().showMessage(f"插件 {plugin_name} 加载失败", 3000)
+            return
+
+        for name, callback in plugin.get_menu_items():
+            if name == item_name:
+                callback()
+                return
+        app_logger.warning(f"插件 {plugin_name} 未提供菜单项: {item_name}")
 
     def create_status_bar(self):
         """创建状态栏"""
@@ -351,6 +491,21 @@ class MainWindow(QMainWindow):
         self.raise_()
         app_logger.debug("从托盘显示主窗口")
 
+    def handle_instance_message(self, args: list):
+        """处理再次启动程序时转发过来的命令行参数：显示主窗口并处理其中的文件"""
+        self.show_from_tray()
+        files = [arg for arg in args if os.path.isfile(arg)]
+        if not files:
+            return
+        # 与拖放到欢迎页面的文件一样处理
+        self.tab_widget.ensure_tab(0)
+        self.tab_widget.setCurrentIndex(0)
+        if hasattr(self, 'welcome_tab'):
+            # 欢迎页面同时触发 files_dropped 事件
+            self.welcome_tab.handle_dropped_files(files)
+        else:
+            self.plugin_manager.activate_trigger("files_dropped", files)
+
     def quit_from_tray(self):
         """从托盘退出应用"""
         app_logger.info("从托盘退出应用")
@@ -429,35 +584,82 @@ class MainWindow(QMainWindow):
 
 def main():
     """主函数"""
+    profiler = get_startup_profiler()
+
     # 设置高DPI支持（在创建QApplication之前）
-    setup_high_dpi_support()
+    with profiler.phase("setup_high_dpi_support"):
+        setup_high_dpi_support()
 
     # 创建应用程序实例
-    app = QApplication(sys.argv)
+    with profiler.phase("create_qapplication"):
+        app = QApplication(sys.argv)
 
-    # 设置字体渲染优化
-    setup_font_rendering(app)
+        # 设置字体渲染优化
+        setup_font_rendering(app)
 
     # 设置应用程序属性
     app.setApplicationName(app_config.app_name)
     app.setApplicationVersion(app_config.current_version)
     app.setOrganizationName(app_config.organization_name)
 
+    # 单实例模式：监听本地服务器，接收之后启动的实例转发的参数
+    instance_server = None
+    if app_config.single_instance:
+        with profiler.phase("setup_single_instance"):
+            instance_server = setup_single_instance(app_config.app_name)
+        # 与另一个实例同时启动时，对方已先开始监听
+        if instance_server is None and forward_to_running_instance(
+                instance_server_name(app_config.app_name), sys.argv[1:]):
+            sys.exit(0)
+
+    # 配置在后台延迟写入，退出前写出尚未保存的修改
+    app.aboutToQuit.connect(app_config.flush)
+
+    # 设置页面修改或导入配置后，新的日志级别立即生效
+    app_config.subscribe("advanced.log_level", lambda key, old_level, new_level: set_log_level(new_level))
+
     # 设置全局异常处理器
-    setup_exception_handler(app)
+    with profiler.phase("setup_exception_handler"):
+        setup_exception_handler(app)
 
     # 设置主题系统
-    setup_theme_manager(app)
+    with profiler.phase("setup_theme_manager"):
+        setup_theme_manager(app)
 
     # 设置通知管理器
-    setup_notification_manager()
+    with profiler.phase("setup_notification_manager"):
+        setup_notification_manager()
 
     # 设置插件管理器
-    setup_plugin_manager()
+    with profiler.phase("setup_plugin_manager"):
+        plugin_manager = setup_plugin_manager()
+    app.aboutToQuit.connect(plugin_manager.flush_configs)
+
+    # 监视配置文件，被外部修改时增量重新加载
+    with profiler.phase("setup_config_watcher"):
+        setup_config_watcher()
 
     # 创建主窗口
-    window = MainWindow()
-    window.show()
+    with profiler.phase("MainWindow"):
+        window = MainWindow()
+    if instance_server is not None:
+        instance_server.message_received.connect(window.handle_instance_message)
+    with profiler.phase("window_show"):
+        window.show()
+
+    # 事件循环空闲后（首帧已绘制）记录首帧，插件后台加载结束后再输出启动分析结果
+    if profiler.enabled:
+        def finish_profiling():
+            profiler.mark("plugins_loaded")
+            profiler.finish()
+
+        def mark_first_paint():
+            profiler.mark("first_paint")
+            if window.plugin_loader.is_finished():
+                profiler.finish()
+            else:
+                window.plugin_loader.finished.connect(finish_profiling)
+        QTimer.singleShot(0, mark_first_paint)
 
     # 运行应用程序
     sys.exit(app.exec())
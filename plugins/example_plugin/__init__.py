@@ -12,6 +12,10 @@ logger = get_logger(__name__)
 
 class ExamplePlugin(BasePlugin):
     """示例插件类"""
+
+    # 插件配置的默认值和约束（保存在 plugin_configs/example_plugin.json）
+    config_defaults = {"click_count": 0}
+    config_constraints = {"click_count": {"min": 0}}
     
     def __init__(self):
         super().__init__()
@@ -77,10 +81,14 @@ class ExamplePlugin(BasePlugin):
     
     def on_button_clicked(self):
         """按钮点击事件"""
-        logger.info("示例插件按钮被点击")
+        # 点击次数保存在插件自己的配置文件中
+        count = self.config.get("click_count", 0) + 1
+        self.config.set("click_count", count)
+        self.config.save_config()
+        logger.info(f"示例插件按钮被点击，累计 {count} 次")
         from utils.notification import get_notification_manager
         notification_manager = get_notification_manager()
-        notification_manager.info("示例插件", "按钮被点击了！")
+        notification_manager.info("示例插件", f"按钮被点击了！累计 {count} 次")
     
     def get_menu_items(self) -> list:
         """获取插件的菜单项"""
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+异步日志测试
+验证有界队列的丢弃策略与计数、刷新、以及轮转压缩在后台线程中完成
+"""
+
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+class _FakeLevel:
+    def __init__(self, no: int):
+        self.no = no
+
+
+class _FakeMessage(str):
+    """模拟 loguru 传给 sink 的消息（带 record 属性的字符串）"""
+
+    def __new__(cls, text: str, level_no: int = 10):
+        message = super().__new__(cls, text)
+        message.record = {"level": _FakeLevel(level_no)}
+        return message
+
+
+def test_drop_policy_and_counters():
+    """测试队列满时丢弃新记录并计数，ERROR 记录不被直接丢弃"""
+    print("测试丢弃策略...")
+    from utils.async_logging import AsyncSink
+
+    gate = threading.Event()
+    written = []
+
+    def slow_writer(text):
+        gate.wait(5)
+        written.append(text)
+
+    sink = AsyncSink("test", slow_writer, maxsize=5, overflow="drop_newest", block_timeout=0.05)
+    try:
+        start = time.perf_counter()
+        for i in range(100):
+            sink(_FakeMessage(f"debug {i}\n"))
+        elapsed = time.perf_counter() - start
+
+        # 写出端被阻塞时，记录日志的线程不会被阻塞
+        assert elapsed < 0.5, f"写入被阻塞 {elapsed:.2f}s"
+        stats = sink.stats()
+        assert stats["dropped"] > 0, stats
+        assert stats["enqueued"] + stats["dropped"] == 100, stats
+
+        gate.set()
+        sink(_FakeMessage("error\n", level_no=40))
+        assert sink.flush(5)
+
+        text = "".join(written)
+        assert "error\n" in text
+        assert "条日志因队列已满被丢弃" in text
+        assert sink.stats()["written"] == sink.stats()["enqueued"], sink.stats()
+        print(f"  - 统计: {sink.stats()}")
+        print("✅ 丢弃策略测试通过")
+    finally:
+        gate.set()
+        sink.stop()
+
+
+def test_drop_oldest_keeps_recent():
+    """测试 drop_oldest 策略保留最新的记录"""
+    print("\n测试保留最新记录...")
+    from utils.async_logging import AsyncSink
+
+    gate = threading.Event()
+    written = []
+    sink = AsyncSink("test", lambda text: (gate.wait(5), written.append(text)), maxsize=3,
+                     overflow="drop_oldest")
+    try:
+        for i in range(50):
+            sink(_FakeMessage(f"line {i}\n"))
+        gate.set()
+        assert sink.flush(5)
+        assert "line 49\n" in "".join(written)
+        assert sink.stats()["dropped"] > 0
+        print("✅ 保留最新记录测试通过")
+    finally:
+        gate.set()
+        sink.stop()
+
+
+def test_file_sink_rotation_compressed_off_thread():
+    """测试文件输出轮转后的压缩在后台线程中完成"""
+    print("\n测试后台压缩...")
+    from loguru import logger
+    from utils.async_logging import AsyncLogging, BackgroundCompressor
+
+    log_dir = Path(tempfile.mkdtemp())
+    compress_threads = []
+    original_compress = BackgroundCompressor._compress
+
+    def recording_compress(path):
+        compress_threads.append(threading.current_thread().name)
+        original_compress(path)
+
+    BackgroundCompressor._compress = staticmethod(recording_compress)
+    async_logging = AsyncLogging(maxsize=1000)
+    sink = async_logging.file_sink("rotate", log_dir / "rotate.log", max_bytes=2048)
+    handler_id = logger.add(sink, format="{message}", level="DEBUG", filter=lambda r: r["extra"].get("rotate_test"))
+    try:
+        test_logger = logger.bind(rotate_test=True)
+        for i in range(200):
+            test_logger.debug(f"record {i:04d} " + "x" * 40)
+
+        assert async_logging.flush(5)
+        async_logging.shutdown()
+
+        archives = list(log_dir.glob("rotate.*.log.zip"))
+        assert archives, list(log_dir.iterdir())
+        assert not list(log_dir.glob("rotate.*.log")), "轮转后的原始文件应已压缩删除"
+        assert compress_threads and all(name.startswith("log-compress") for name in compress_threads), compress_threads
+        assert "record 0199" in (log_dir / "rotate.log").read_text(encoding="utf-8")
+        print(f"  - 压缩文件数: {len(archives)}")
+        print("✅ 后台压缩测试通过")
+    finally:
+        logger.remove(handler_id)
+        async_logging.shutdown()
+        BackgroundCompressor._compress = staticmethod(original_compress)
+        shutil.rmtree(log_dir)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始异步日志测试\n")
+
+    tests = [
+        test_drop_policy_and_counters,
+        test_drop_oldest_keeps_recent,
+        test_file_sink_rotation_compressed_off_thread,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -4,11 +4,34 @@
 测试全局配置组件的各项功能
 """
 
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+_test_config = None
+
+
+def get_test_config():
+    """获取使用临时配置文件（仓库中 config.json 的副本）的配置实例，测试不改写仓库中的 config.json"""
+    global _test_config
+    if _test_config is None:
+        from utils.config import AppConfig
+        from utils.config_writer import DebouncedWriter
+        tmp = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, tmp, ignore_errors=True)
+        config_file = Path(tmp) / "config.json"
+        if Path("config.json").exists():
+            shutil.copy("config.json", config_file)
+        _test_config = AppConfig(str(config_file), writer=DebouncedWriter(delay=60))
+    return _test_config
+
+
 def test_config_basic_functionality():
     """测试配置基础功能"""
     print("测试配置基础功能...")
     try:
-        from utils import app_config
+        app_config = get_test_config()
         
         # 测试基本属性访问
         print(f"  - 应用名称: {app_config.app_name}")
@@ -37,7 +60,7 @@ def test_config_version_functionality():
     """测试版本相关功能"""
     print("\n测试版本相关功能...")
     try:
-        from utils import app_config
+        app_config = get_test_config()
         
         # 测试版本获取
         current_version = app_config.current_version
@@ -70,7 +93,7 @@ def test_config_url_functionality():
     """测试URL构建功能"""
     print("\n测试URL构建功能...")
     try:
-        from utils import app_config
+        app_config = get_test_config()
         
         # 测试URL构建
         test_path = "updates/app_v2.0.0.zip"
@@ -91,7 +114,7 @@ def test_config_skip_version_functionality():
     """测试版本跳过功能"""
     print("\n测试版本跳过功能...")
     try:
-        from utils import app_config
+        app_config = get_test_config()
         
         # 测试版本跳过
         test_version = "1.5.0-test"
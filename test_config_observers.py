@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+配置订阅测试
+验证只有值真正改变的订阅者会被通知，导入/重置配置时一次性批量通知，
+以及绑定方法订阅在对象销毁后自动失效
+"""
+
+import gc
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+
+def make_config(tmp):
+    """创建使用临时文件、不会自动写盘的配置实例"""
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+    return AppConfig(str(Path(tmp) / "config.json"), writer=DebouncedWriter(delay=60))
+
+
+def test_only_changed_keys_notify():
+    """测试只有值改变时才通知对应的订阅者"""
+    print("测试按路径通知...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        events = []
+        config.subscribe("behavior.minimize_to_tray", lambda *args: events.append(args))
+        config.subscribe("behavior", lambda key, old, new: events.append((key,)))
+
+        config.set("behavior.close_to_tray", True)
+        assert events == [("behavior",)], events
+
+        events.clear()
+        config.set("behavior.minimize_to_tray", False)  # 与默认值相同
+        config.set("theme.mode", "dark")
+        assert events == [], events
+
+        config.set("behavior.minimize_to_tray", True)
+        assert events == [("behavior.minimize_to_tray", False, True), ("behavior",)], events
+    print("✅ 按路径通知测试通过")
+
+
+def test_import_and_reset_notify_once():
+    """测试导入和重置配置时每个受影响的订阅者只通知一次"""
+    print("\n测试导入与重置...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        events = []
+        for key in ("theme.mode", "behavior", "advanced.log_level", "appearance.font_size"):
+            config.subscribe(key, lambda key, old, new: events.append((key, old, new)))
+
+        imported = Path(tmp) / "imported.json"
+        behavior = dict(config.get("behavior"), minimize_to_tray=True, close_to_tray=True)
+        imported.write_text(json.dumps({
+            "theme": {"mode": "dark"},
+            "behavior": behavior,
+            "advanced": dict(config.get("advanced")),
+        }), encoding='utf-8')
+
+        assert config.import_config(str(imported))
+        keys = sorted(event[0] for event in events)
+        assert keys == ["behavior", "theme.mode"], events
+        assert ("theme.mode", "auto", "dark") in events
+        print(f"  - 导入后通知: {keys}")
+
+        events.clear()
+        config.reset_to_defaults()
+        assert sorted(event[0] for event in events) == ["behavior", "theme.mode"], events
+        assert ("theme.mode", "dark", "auto") in events
+
+        events.clear()
+        with config.batch():
+            config.set("appearance.font_size", 12)
+            config.set("appearance.font_size", 14)
+        assert events == [("appearance.font_size", 10, 14)], events
+    print("✅ 导入与重置测试通过")
+
+
+def test_bound_method_is_weak():
+    """测试对象销毁后绑定方法订阅自动失效"""
+    print("\n测试弱引用订阅...")
+
+    class Consumer:
+        def __init__(self):
+            self.calls = 0
+
+        def on_changed(self, key, old, new):
+            self.calls += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        consumer = Consumer()
+        config.subscribe("theme.mode", consumer.on_changed)
+        config.set("theme.mode", "dark")
+        assert consumer.calls == 1
+
+        del consumer
+        gc.collect()
+        config.set("theme.mode", "light")
+        assert not config._observers, "失效的订阅应被清理"
+
+        callback = lambda key, old, new: None
+        config.subscribe("theme.mode", callback)
+        assert config.unsubscribe("theme.mode", callback)
+        assert not config.unsubscribe("theme.mode", callback)
+    print("✅ 弱引用订阅测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始配置订阅测试\n")
+
+    tests = [
+        test_only_changed_keys_notify,
+        test_import_and_reset_notify_once,
+        test_bound_method_is_weak,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
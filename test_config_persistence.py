@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+配置持久化测试
+验证多次保存被合并为一次后台写入、flush() 立即落盘，写入失败时原配置文件保持完整，
+以及写入失败的修改保持未保存状态并被重试
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def test_saves_are_coalesced():
+    """测试防抖窗口内的多次保存只写入一次"""
+    print("测试保存合并...")
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.json"
+        writer = DebouncedWriter(delay=0.1, max_delay=10)
+        config = AppConfig(str(config_file), writer=writer)
+
+        for i in range(100):
+            config.set("appearance.font_size", 8 + i % 16)
+            config.save_config()
+        assert config.is_dirty
+        assert not config_file.exists(), "save_config() 不应在调用线程中写入"
+
+        deadline = time.monotonic() + 5
+        while writer.stats()["writes"] == 0:
+            assert time.monotonic() < deadline, "后台写入超时"
+            time.sleep(0.02)
+        time.sleep(0.2)
+
+        saved = json.loads(config_file.read_text(encoding='utf-8'))
+        assert saved["appearance"]["font_size"] == 8 + 99 % 16
+        assert writer.stats()["writes"] == 1, writer.stats()
+        print(f"  - 写入统计: {writer.stats()}")
+    print("✅ 保存合并测试通过")
+
+
+def test_flush_writes_immediately():
+    """测试 flush() 立即写出修改，没有修改时不再写入"""
+    print("\n测试立即写出...")
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.json"
+        writer = DebouncedWriter(delay=60)
+        config = AppConfig(str(config_file), writer=writer)
+
+        config.set("behavior.minimize_to_tray", True)
+        config.save_config()
+        assert config.flush()
+        assert not config.is_dirty and not writer.has_pending()
+        assert json.loads(config_file.read_text(encoding='utf-8'))["behavior"]["minimize_to_tray"] is True
+
+        assert config.flush()
+        assert writer.stats()["writes"] == 1, writer.stats()
+        assert config.get("behavior.minimize_to_tray") is True
+        assert config.get("behavior.missing", "默认") == "默认"
+    print("✅ 立即写出测试通过")
+
+
+def test_failed_write_keeps_original():
+    """测试写入中途失败时原文件不被截断，也不留下临时文件"""
+    print("\n测试原子写入...")
+    from utils import config_writer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "config.json"
+        target.write_text('{"ok": true}', encoding='utf-8')
+
+        original_fsync = config_writer.os.fsync
+
+        def failing_fsync(fd):
+            raise OSError("磁盘已满")
+
+        config_writer.os.fsync = failing_fsync
+        try:
+            config_writer.atomic_write_text(target, '{"ok": fal')
+            assert False, "应抛出 OSError"
+        except OSError:
+            pass
+        finally:
+            config_writer.os.fsync = original_fsync
+
+        assert target.read_text(encoding='utf-8') == '{"ok": true}'
+        assert os.listdir(tmp) == ["config.json"], os.listdir(tmp)
+
+        config_writer.atomic_write_text(target, '{"ok": false}')
+        assert json.loads(target.read_text(encoding='utf-8')) == {"ok": False}
+    print("✅ 原子写入测试通过")
+
+
+def test_failed_write_is_retried():
+    """测试写入失败后修改保持未保存状态，flush() 和后台重试都会再次写入"""
+    print("\n测试写入失败后重试...")
+    import errno
+    from utils import config_writer
+    from utils.config import AppConfig
+
+    def wait_until(condition, message):
+        deadline = time.monotonic() + 5
+        while not condition():
+            assert time.monotonic() < deadline, message
+            time.sleep(0.01)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.json"
+        writer = config_writer.DebouncedWriter(delay=0.5, max_delay=0.5)
+        config = AppConfig(str(config_file), writer=writer)
+        original_write = config_writer.atomic_write_text
+        # 接下来的写入中失败的次数
+        failures_left = [0]
+
+        def flaky_write(path, text, encoding='utf-8'):
+            if failures_left[0] > 0:
+                failures_left[0] -= 1
+                raise OSError(errno.ENOSPC, "磁盘已满")
+            original_write(path, text, encoding)
+
+        config_writer.atomic_write_text = flaky_write
+        try:
+            # 立即写入失败：修改保持未保存状态，flush() 报告失败而不是“没有需要写入的内容”
+            failures_left[0] = 2
+            config.set("appearance.font_size", 15)
+            config.save_config(immediate=True)
+            assert config.is_dirty, "写入失败后修改应保持未保存状态"
+            assert not config.flush()
+            assert config.is_dirty and writer.has_pending(config_file)
+            assert not config_file.exists()
+
+            # 失败的写入已重新排队，后台重试成功后才清除修改标记
+            wait_until(lambda: not config.is_dirty, "后台重试超时")
+            assert json.loads(config_file.read_text(encoding='utf-8'))["appearance"]["font_size"] == 15
+            assert config.flush() and not writer.has_pending()
+
+            # 延迟写入失败后同样自动重试，不需要再次调用 save_config()
+            failures_left[0] = 1
+            config.set("appearance.font_size", 16)
+            config.save_config()
+            wait_until(lambda: writer.stats()["writes"] == 2, "后台重试超时")
+            assert not config.is_dirty
+            assert json.loads(config_file.read_text(encoding='utf-8'))["appearance"]["font_size"] == 16
+            assert writer.stats()["failures"] == 3, writer.stats()
+        finally:
+            config_writer.atomic_write_text = original_write
+        print(f"  - 写入统计: {writer.stats()}")
+    print("✅ 写入失败后重试测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始配置持久化测试\n")
+
+    tests = [
+        test_saves_are_coalesced,
+        test_flush_writes_immediately,
+        test_failed_write_keeps_original,
+        test_failed_write_is_retried,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
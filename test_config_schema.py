@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+配置校验测试
+验证无效的值在写入内存和磁盘之前被拒绝、批量修改要么全部生效要么全部不生效，
+以及导入配置时返回结构化的错误信息
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+
+def make_config(tmp):
+    """创建使用临时文件、不会自动写盘的配置实例"""
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+    return AppConfig(str(Path(tmp) / "config.json"), writer=DebouncedWriter(delay=60))
+
+
+def test_set_rejects_invalid_values():
+    """测试 set() 拒绝无效的值且不修改配置"""
+    print("测试单项校验...")
+    from utils.config_schema import ConfigValidationError
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        for key, value in [("appearance.font_size", 30), ("appearance.font_size", "12"),
+                           ("behavior.close_to_tray", 1), ("theme.mode", "blue"),
+                           ("theme.mode.extra", 1), ("advanced", "DEBUG")]:
+            try:
+                config.set(key, value)
+                assert False, f"{key}={value!r} 应被拒绝"
+            except ConfigValidationError as e:
+                assert e.errors[0].key == key and e.errors[0].value == value, e.errors
+        assert not config.is_dirty
+        assert config.font_size == 10 and config.theme_mode == "auto"
+
+        config.set("appearance.font_size", 12)
+        config.set("plugin_settings", {"任意": "值"})  # 未声明的配置项不做限制
+        assert config.font_size == 12
+    print("✅ 单项校验测试通过")
+
+
+def test_update_is_all_or_nothing():
+    """测试 update() 中任一项无效时所有修改都不生效"""
+    print("\n测试批量校验...")
+    from utils.config_schema import ConfigValidationError
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        try:
+            config.update({"auto_check_updates": False,
+                           "appearance": {"font_size": 12, "window_width": 640}}, deep=True)
+            assert False, "应抛出 ConfigValidationError"
+        except ConfigValidationError as e:
+            assert [error.key for error in e.errors] == ["appearance.window_width"], e.errors
+        assert config.auto_check_updates is True and config.font_size == 10
+
+        config.update({"appearance": {"font_size": 12}}, deep=True)
+        assert config.font_size == 12 and config.window_width == 1024
+        assert config.validate_config() == (True, [])
+    print("✅ 批量校验测试通过")
+
+
+def test_import_reports_structured_errors():
+    """测试导入无效配置时不修改当前配置和配置文件，并返回结构化错误"""
+    print("\n测试导入校验...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        config.save_config(immediate=True)
+        saved = config.config_file.read_text(encoding='utf-8')
+
+        imported = Path(tmp) / "imported.json"
+        imported.write_text(json.dumps({
+            "theme": {"mode": "dark"},
+            "advanced": {"log_level": "VERBOSE", "debug_mode": "yes"},
+        }), encoding='utf-8')
+
+        assert not config.import_config(str(imported))
+        errors = {error.key: error for error in config.import_errors}
+        assert set(errors) == {"advanced.log_level", "advanced.debug_mode"}, config.import_errors
+        assert errors["advanced.log_level"].value == "VERBOSE"
+        assert config.theme_mode == "auto"
+        assert config.flush() and config.config_file.read_text(encoding='utf-8') == saved
+        for error in config.import_errors:
+            print(f"  - {error}")
+    print("✅ 导入校验测试通过")
+
+
+def test_extend_schema_for_plugin_section():
+    """测试为插件配置分组添加校验规则"""
+    print("\n测试扩展校验规则...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        config.schema.extend("plugins.example", {"interval": 5, "enabled": True},
+                             {"interval": {"min": 1, "max": 60}})
+        assert config.schema.validate("plugins.example.interval", 30) == []
+        assert config.schema.validate("plugins.example.interval", 0)[0].message == "必须在 1-60 之间"
+        errors = config.schema.validate_changes({"plugins": {"example": {"enabled": "否"}}})
+        assert [error.key for error in errors] == ["plugins.example.enabled"], errors
+    print("✅ 扩展校验规则测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始配置校验测试\n")
+
+    tests = [
+        test_set_rejects_invalid_values,
+        test_update_is_all_or_nothing,
+        test_import_reports_structured_errors,
+        test_extend_schema_for_plugin_section,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
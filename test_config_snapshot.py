@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+配置快照测试
+验证默认值深度合并且不被修改、快照不可变，以及快照只在配置修改后重建
+"""
+
+import dataclasses
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+
+def make_config(tmp, file_config=None):
+    """创建使用临时文件、不会自动写盘的配置实例"""
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+    config_file = Path(tmp) / "config.json"
+    if file_config is not None:
+        config_file.write_text(json.dumps(file_config), encoding='utf-8')
+    return AppConfig(str(config_file), writer=DebouncedWriter(delay=60))
+
+
+def test_defaults_deep_merged():
+    """测试配置文件中缺少的分组项保留默认值，且默认配置不会被修改"""
+    print("测试默认值深度合并...")
+    from utils.config import AppConfig
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp, {"behavior": {"minimize_to_tray": True}})
+        assert config.minimize_to_tray is True
+        assert config.confirm_on_exit is True, "缺少的分组项应保留默认值"
+        assert config.get("behavior.confirm_on_exit") is True
+
+        config.set("appearance.font_size", 20)
+        config.reset_to_defaults()
+        config.set("theme.mode", "dark")
+        assert AppConfig.DEFAULT_CONFIG["theme"]["mode"] == "auto"
+        assert AppConfig.DEFAULT_CONFIG["appearance"]["font_size"] == 10
+        assert AppConfig.DEFAULT_CONFIG["behavior"]["minimize_to_tray"] is False
+    print("✅ 默认值深度合并测试通过")
+
+
+def test_snapshot_immutable_and_cached():
+    """测试快照不可变、未修改时复用，修改后重建"""
+    print("\n测试快照...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp, {"behavior": "损坏的分组"})
+        snapshot = config.snapshot
+        assert snapshot is config.snapshot, "未修改时应复用快照"
+        assert snapshot.behavior.close_to_tray is False, "损坏的分组应使用默认值"
+        assert not hasattr(snapshot.behavior, "__dict__"), "快照应使用 __slots__"
+
+        try:
+            snapshot.theme.mode = "dark"
+            assert False, "快照应不可变"
+        except dataclasses.FrozenInstanceError:
+            pass
+
+        config.set("theme.mode", "dark")
+        assert config.snapshot is not snapshot
+        assert config.theme_mode == "dark" and snapshot.theme.mode == "auto"
+    print("✅ 快照测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始配置快照测试\n")
+
+    tests = [
+        test_defaults_deep_merged,
+        test_snapshot_immutable_and_cached,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+配置文件监视测试
+验证外部修改配置文件后只通知发生变化的配置项，忽略自己的写入和内容未变的修改，
+无效或未写完的文件不会被加载，以及内存中有未保存的修改时不被外部修改覆盖
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_config(tmp):
+    """创建使用临时文件的配置实例，并写出初始配置文件"""
+    from utils.config import AppConfig
+    from utils.config_writer import DebouncedWriter
+    config = AppConfig(str(Path(tmp) / "config.json"), writer=DebouncedWriter(delay=60))
+    config.save_config(immediate=True)
+    return config
+
+
+def write_external(config, **changes):
+    """模拟外部程序修改配置文件（不经过 AppConfig）"""
+    data = json.loads(config.config_file.read_text(encoding='utf-8'))
+    for key, value in changes.items():
+        section, _, leaf = key.partition('__')
+        if leaf:
+            data[section][leaf] = value
+        else:
+            data[section] = value
+    config.config_file.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+def test_external_change_dispatches_diff():
+    """测试外部修改后经过防抖重新加载，只通知变化的配置项"""
+    print("测试外部修改...")
+    from PySide6.QtWidgets import QApplication
+    from utils.config_watcher import ConfigFileWatcher
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        watcher = ConfigFileWatcher(config, debounce_ms=50)
+        events, reloaded = [], []
+        config.subscribe("behavior.minimize_to_tray", lambda *args: events.append(args))
+        config.subscribe("theme.mode", lambda *args: events.append(args))
+        watcher.config_reloaded.connect(reloaded.append)
+
+        write_external(config, behavior__minimize_to_tray=True)
+        deadline = time.monotonic() + 5
+        while not reloaded and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+
+        assert reloaded == [["behavior"]], reloaded
+        assert events == [("behavior.minimize_to_tray", False, True)], events
+        assert config.minimize_to_tray is True and not config.is_dirty
+        print(f"  - 统计: {watcher.stats}")
+    print("✅ 外部修改测试通过")
+
+
+def test_own_writes_and_touch_ignored():
+    """测试自己的写入和只改修改时间的文件不会被重新解析"""
+    print("\n测试忽略无效变化...")
+    from PySide6.QtWidgets import QApplication
+    from utils.config_watcher import ConfigFileWatcher
+
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        watcher = ConfigFileWatcher(config, debounce_ms=50)
+
+        config.set("appearance.font_size", 14)
+        config.save_config(immediate=True)
+        assert watcher.check() == []
+        assert watcher.stats["own_writes"] == 1 and watcher.stats["parsed"] == 0, watcher.stats
+
+        write_external(config, theme__mode="dark")
+        assert watcher.check() == ["theme"]
+        stat = config.config_file.stat()
+        os.utime(config.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert watcher.check() == []
+        assert watcher.stats["parsed"] == 1, watcher.stats
+        assert config.font_size == 14 and config.theme_mode == "dark"
+    print("✅ 忽略无效变化测试通过")
+
+
+def test_invalid_file_not_loaded():
+    """测试未写完或含无效配置项的文件不会被加载"""
+    print("\n测试无效文件...")
+    from PySide6.QtWidgets import QApplication
+    from utils.config_watcher import ConfigFileWatcher
+
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        watcher = ConfigFileWatcher(config, debounce_ms=50)
+        failures = []
+        watcher.reload_failed.connect(failures.append)
+
+        config.config_file.write_text('{"theme": {"mo', encoding='utf-8')
+        assert watcher.check() == []
+        config.config_file.write_text(json.dumps({"appearance": {"font_size": 99}}), encoding='utf-8')
+        assert watcher.check() == []
+        assert len(failures) == 2 and "font_size" in failures[1], failures
+        assert config.font_size == 10
+    print("✅ 无效文件测试通过")
+
+
+def test_unsaved_changes_not_overwritten():
+    """测试外部修改与内存中未保存的修改同时存在时推迟重新加载，本地修改写入后优先"""
+    print("\n测试修改冲突...")
+    from PySide6.QtWidgets import QApplication
+    from utils.config_watcher import ConfigFileWatcher
+
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(tmp)
+        watcher = ConfigFileWatcher(config, debounce_ms=50)
+        reloaded = []
+        watcher.config_reloaded.connect(reloaded.append)
+
+        # 两边都修改了配置：本地修改还在等待后台写入
+        config.set("appearance.font_size", 14)
+        config.save_config()
+        write_external(config, appearance__font_size=18, theme__mode="dark")
+        assert config.is_dirty
+        assert watcher.check() == [] and watcher.check() == []
+        assert config.font_size == 14 and config.theme_mode != "dark", "未保存的修改不应被覆盖"
+        assert watcher.stats["conflicts"] == 1 and watcher.stats["parsed"] == 0, watcher.stats
+        assert watcher._timer.isActive(), "应稍后再次检查"
+
+        # 本地修改写入后文件内容即为内存中的配置，视为自己的写入
+        assert config.flush()
+        assert watcher.check() == []
+        assert watcher.stats["own_writes"] == 1, watcher.stats
+        assert json.loads(config.config_file.read_text(encoding='utf-8'))["appearance"]["font_size"] == 14
+
+        # 没有未保存的修改时外部修改正常加载
+        write_external(config, theme__mode="dark")
+        assert watcher.check() == ["theme"]
+        assert config.theme_mode == "dark" and config.font_size == 14
+        assert reloaded == [["theme"]], reloaded
+    print("✅ 修改冲突测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始配置文件监视测试\n")
+
+    tests = [
+        test_external_change_dispatches_diff,
+        test_own_writes_and_touch_ignored,
+        test_invalid_file_not_loaded,
+        test_unsaved_changes_not_overwritten,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
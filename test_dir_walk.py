@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+目录遍历测试
+验证 list_files / list_directories 改用 scan_tree 后结果与原来的 Path.glob / Path.rglob 实现一致，
+以及包含/排除模式、最大深度、符号链接策略和提前停止
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_tree(root: str):
+    """创建测试目录树"""
+    files = [
+        "a.txt", "b.py", ".hidden", "README.md",
+        "sub/c.txt", "sub/d.PY", "sub/deep/e.txt", "sub/deep/deeper/f.log",
+        "docs/guide.md", "docs/api/index.md",
+        "__pycache__/x.pyc", "sub/__pycache__/y.pyc",
+    ]
+    for name in files:
+        path = Path(root, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name, encoding="utf-8")
+    Path(root, "empty").mkdir()
+
+
+def legacy_list(directory, pattern="*", recursive=False, want_dirs=False):
+    """原来的 pathlib 实现"""
+    path = Path(directory)
+    found = path.rglob(pattern) if recursive else path.glob(pattern)
+    return sorted(str(p) for p in found if (p.is_dir() if want_dirs else p.is_file()))
+
+
+def test_matches_legacy():
+    """测试与原实现结果一致"""
+    print("测试与原实现一致...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        patterns = ["*", "*.txt", "*.md", "?.py", "[ab].*", "sub/*", "sub/*.txt", "deep/*.txt", "**/*.md", "*.nothing"]
+        checked = 0
+        for pattern in patterns:
+            for recursive in (False, True):
+                expected = legacy_list(tmp, pattern, recursive)
+                actual = sorted(file_utils.list_files(tmp, pattern, recursive))
+                assert actual == expected, (pattern, recursive, actual, expected)
+                checked += 1
+        for recursive in (False, True):
+            assert sorted(file_utils.list_directories(tmp, recursive)) == legacy_list(tmp, "*", recursive, True)
+
+        assert file_utils.list_files(os.path.join(tmp, "missing")) == []
+        print(f"  - 已比较 {checked} 种模式组合")
+    print("✅ 与原实现一致测试通过")
+
+
+def test_relative_directory():
+    """测试相对路径和当前目录的返回格式与原实现一致"""
+    print("\n测试相对路径...")
+    from utils import file_utils
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        try:
+            os.chdir(tmp)
+            for directory in (".", "sub", "./sub", "sub/"):
+                assert sorted(file_utils.list_files(directory, recursive=True)) == legacy_list(directory, "*", True), directory
+        finally:
+            os.chdir(cwd)
+    print("✅ 相对路径测试通过")
+
+
+def test_include_exclude_depth():
+    """测试多个包含模式、排除模式（剪枝）和最大深度"""
+    print("\n测试包含/排除模式和深度...")
+    from utils.dir_walk import walk_paths
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+
+        def rel(paths):
+            return sorted(os.path.relpath(p, tmp).replace(os.sep, "/") for p in paths)
+
+        assert rel(walk_paths(tmp, ["*.txt", "*.md"], exclude=["deep", "docs"])) == \
+            ["README.md", "a.txt", "sub/c.txt"]
+        assert rel(walk_paths(tmp, exclude=["__pycache__", "*.txt", "*.md", ".*"], max_depth=1)) == \
+            ["b.py", "sub/d.PY"]
+        assert rel(walk_paths(tmp, "docs/**/*.md")) == ["docs/api/index.md", "docs/guide.md"]
+        assert rel(walk_paths(tmp, exclude="sub/deep")) == rel(walk_paths(tmp, exclude="deep"))
+        assert rel(walk_paths(tmp, files=False, dirs=True, max_depth=0)) == ["__pycache__", "docs", "empty", "sub"]
+    print("✅ 包含/排除模式和深度测试通过")
+
+
+def test_symlinks():
+    """测试符号链接策略：默认不进入链接的目录，跟随时检测循环"""
+    print("\n测试符号链接...")
+    from utils.dir_walk import walk_paths
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        try:
+            os.symlink(os.path.join(tmp, "docs"), os.path.join(tmp, "sub", "docs_link"))
+            os.symlink(tmp, os.path.join(tmp, "sub", "loop"))
+            os.symlink(os.path.join(tmp, "a.txt"), os.path.join(tmp, "a_link.txt"))
+        except (OSError, NotImplementedError):
+            print("  - 当前系统不支持符号链接，跳过")
+            return
+
+        default = walk_paths(tmp, "*.md")
+        assert len(default) == 3, default
+        assert os.path.join(tmp, "a_link.txt") in walk_paths(tmp, "*.txt"), "指向文件的链接应按文件返回"
+
+        followed = walk_paths(tmp, "*.md", follow_symlinks=True)
+        # docs 只遍历一次（经由原目录或链接），循环链接不会无限递归
+        assert len(followed) == 3, followed
+    print("✅ 符号链接测试通过")
+
+
+def test_early_termination():
+    """测试提前停止迭代和取消"""
+    print("\n测试提前停止...")
+    from utils.dir_walk import scan_tree
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(50):
+            Path(tmp, f"d{i}").mkdir()
+            for j in range(20):
+                Path(tmp, f"d{i}", f"f{j}.txt").touch()
+
+        iterator = scan_tree(tmp)
+        first = [next(iterator) for _ in range(5)]
+        iterator.close()
+        assert len(first) == 5 and all(entry.is_file() for entry in first)
+
+        cancel = threading.Event()
+        received = 0
+        for _ in scan_tree(tmp, cancel_event=cancel):
+            received += 1
+            if received == 30:
+                cancel.set()
+        assert received == 30, received
+
+        errors = []
+        assert list(scan_tree(os.path.join(tmp, "missing"), on_error=errors.append)) == []
+        assert len(errors) == 1 and isinstance(errors[0], FileNotFoundError)
+    print("✅ 提前停止测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始目录遍历测试\n")
+
+    tests = [
+        test_matches_legacy,
+        test_relative_directory,
+        test_include_exclude_depth,
+        test_symlinks,
+        test_early_termination,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
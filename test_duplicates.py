@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+重复文件查找测试
+验证按大小、部分哈希、完整哈希逐步筛选的结果与逐个计算完整哈希一致，
+开头和末尾相同但中间不同的文件不会被误报，硬链接和符号链接不算重复，以及进度、缓存复用和取消
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_file(directory: str, name: str, data: bytes) -> Path:
+    """创建文件，修改时间设为一天前（避免哈希缓存的竞态窗口）"""
+    path = Path(directory) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime - 86400))
+    return path
+
+
+def build_tree(tmp: str) -> dict:
+    """创建包含多组重复文件的目录树，返回期望的重复文件组（大小 -> 路径集合的列表）"""
+    from utils.duplicates import PARTIAL_BLOCK
+
+    big = os.urandom(PARTIAL_BLOCK * 5)
+    small = os.urandom(1000)
+    # 与 big 开头和末尾相同、只有中间不同，部分哈希相同但完整哈希不同
+    middle = bytearray(big)
+    middle[len(big) // 2] ^= 0xFF
+
+    paths = {
+        "big": [make_file(tmp, f"a/big{i}.bin", big) for i in range(3)],
+        "middle": [make_file(tmp, "b/middle.bin", bytes(middle))],
+        "small": [make_file(tmp, "a/small.txt", small), make_file(tmp, "b/c/small copy.txt", small)],
+    }
+    # 大小相同但内容不同的文件
+    make_file(tmp, "b/other.txt", os.urandom(1000))
+    # 大小唯一的文件和空文件
+    make_file(tmp, "unique.bin", os.urandom(777))
+    make_file(tmp, "empty1", b"")
+    make_file(tmp, "empty2", b"")
+    return {
+        len(big): {str(p) for p in paths["big"]},
+        len(small): {str(p) for p in paths["small"]},
+    }
+
+
+def test_find_duplicates():
+    """测试各种线程数下的结果，以及单线程时大文件优先返回"""
+    print("测试查找重复文件...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = build_tree(tmp)
+        for workers in (1, 4):
+            groups = list(file_utils.find_duplicates([tmp], workers=workers, use_cache=False))
+            assert {g.size: set(g.paths) for g in groups} == expected, (workers, groups)
+            if workers == 1:
+                assert [g.size for g in groups] == sorted(expected, reverse=True), "应先返回大文件"
+            for group in groups:
+                assert group.digest == file_utils.calculate_file_hash(group.paths[0], use_cache=False)
+                assert list(group.paths) == sorted(group.paths)
+        wasted = sum(g.wasted for g in groups)
+        assert wasted == sum(size * (len(p) - 1) for size, p in expected.items())
+        print(f"  - {len(groups)} 组重复文件，可释放 {file_utils.format_file_size(wasted)}")
+    print("✅ 查找重复文件测试通过")
+
+
+def test_links_and_paths():
+    """测试硬链接、符号链接、重叠的路径和 min_size"""
+    print("\n测试链接和路径参数...")
+    from utils.duplicates import find_duplicates
+
+    with tempfile.TemporaryDirectory() as tmp:
+        a = make_file(tmp, "a.bin", b"x" * 5000)
+        os.link(a, os.path.join(tmp, "hardlink.bin"))
+        os.symlink(a, os.path.join(tmp, "symlink.bin"))
+        # 硬链接、符号链接和重复给出的路径都指向同一个文件，不算重复
+        assert list(find_duplicates([tmp, a], use_cache=False)) == []
+
+        b = make_file(tmp, "sub/b.bin", b"x" * 5000)
+        groups = list(find_duplicates([tmp], use_cache=False))
+        assert len(groups) == 1 and len(groups[0].paths) == 2 and str(b) in groups[0].paths
+        # 单独给出文件路径
+        assert len(list(find_duplicates([a, b], use_cache=False))) == 1
+        assert list(find_duplicates([tmp], min_size=5001, use_cache=False)) == []
+        # 排除子目录
+        assert list(find_duplicates([tmp], exclude="sub", use_cache=False)) == []
+    print("✅ 链接和路径参数测试通过")
+
+
+def test_progress_and_cache():
+    """测试进度回调，以及第二次查找复用哈希缓存、不再读取文件内容"""
+    print("\n测试进度和哈希缓存...")
+    from utils.duplicates import PARTIAL_BLOCK, find_duplicates
+    from utils.hash_cache import setup_hash_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = build_tree(tmp)
+        setup_hash_cache(os.path.join(tmp, "cache.db"))
+        try:
+            updates = []
+            groups = list(find_duplicates([tmp], workers=2, progress=updates.append, progress_interval=0))
+            first = updates[-1]
+            assert {g.size: set(g.paths) for g in groups} == expected
+            assert first.groups == len(groups) and first.candidates == 7
+            assert first.partial_done == first.candidates
+            # 大文件 4 个候选需要完整哈希，中间不同的文件也要读取全部内容
+            assert first.full_done == 4
+
+            updates = []
+            groups = list(find_duplicates([tmp], workers=2, progress=updates.append, progress_interval=0))
+            second = updates[-1]
+            assert {g.size: set(g.paths) for g in groups} == expected
+            # 只读取了大文件的开头和末尾，完整哈希和小文件都来自缓存
+            assert second.bytes_read == 4 * 2 * PARTIAL_BLOCK, second
+            print(f"  - 第一次读取 {first.bytes_read} 字节，第二次读取 {second.bytes_read} 字节")
+        finally:
+            setup_hash_cache(":memory:")
+    print("✅ 进度和哈希缓存测试通过")
+
+
+def test_cancel():
+    """测试取消后停止返回结果并结束工作线程"""
+    print("\n测试取消...")
+    from utils.duplicates import find_duplicates
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(50):
+            data = os.urandom(2000 + i)
+            make_file(tmp, f"x{i}.bin", data)
+            make_file(tmp, f"y{i}.bin", data)
+        for workers in (1, 3):
+            cancel = threading.Event()
+            received = 0
+            for _ in find_duplicates([tmp], workers=workers, use_cache=False, cancel_event=cancel):
+                received += 1
+                if received == 5:
+                    cancel.set()
+            assert received == 5, (workers, received)
+        assert not any(t.name.startswith("find-duplicates") for t in threading.enumerate())
+    print("✅ 取消测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始重复文件查找测试\n")
+
+    tests = [
+        test_find_duplicates,
+        test_links_and_paths,
+        test_progress_and_cache,
+        test_cancel,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+文件复制测试
+验证各复制方式的结果一致并保留修改时间、进度回调、取消和断点续传、copy_file / move_file（包括跨设备移动）
+以及批量复制
+"""
+
+import errno
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+CHUNK = 256 * 1024
+
+
+def make_file(directory: str, name: str, size: int) -> Path:
+    """创建指定大小的伪随机内容文件，修改时间设为一天前"""
+    path = Path(directory) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime - 86400))
+    return path
+
+
+def test_methods():
+    """测试每种可用的复制方式以及小文件、大文件和空文件"""
+    print("测试复制方式...")
+    from utils.file_copy import available_methods, copy_file_data, LARGE_FILE_THRESHOLD, PARTIAL_SUFFIX
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (0, 1000, LARGE_FILE_THRESHOLD + 12345):
+            src = make_file(tmp, f"src{size}.bin", size)
+            for method in available_methods():
+                dst = Path(tmp, f"dst{size}.{method}")
+                assert copy_file_data(src, dst, method=method, chunk_size=CHUNK) == size
+                assert dst.read_bytes() == src.read_bytes(), (size, method)
+                assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns, "应复制修改时间"
+                assert not Path(str(dst) + PARTIAL_SUFFIX).exists()
+        print(f"  - 可用的复制方式: {', '.join(available_methods())}")
+    print("✅ 复制方式测试通过")
+
+
+def test_progress_and_cancel():
+    """测试进度回调，以及取消后不保留临时文件"""
+    print("\n测试进度和取消...")
+    from utils.file_copy import copy_file_data, CopyCancelled, PARTIAL_SUFFIX
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_file(tmp, "big.bin", 4 * 1024 * 1024)
+        dst = Path(tmp, "copy.bin")
+        updates = []
+        copy_file_data(src, dst, progress=lambda done, total: updates.append((done, total)),
+                       progress_interval=0, chunk_size=CHUNK)
+        assert updates[-1] == (src.stat().st_size, src.stat().st_size)
+        assert [done for done, _ in updates] == sorted(done for done, _ in updates)
+
+        cancel = threading.Event()
+
+        def on_progress(done, total):
+            if done >= total // 2:
+                cancel.set()
+
+        try:
+            copy_file_data(src, Path(tmp, "cancelled.bin"), progress=on_progress, progress_interval=0,
+                           cancel_event=cancel, chunk_size=CHUNK)
+            assert False, "应抛出 CopyCancelled"
+        except CopyCancelled:
+            pass
+        assert not Path(tmp, "cancelled.bin").exists()
+        assert not Path(tmp, "cancelled.bin" + PARTIAL_SUFFIX).exists()
+        print(f"  - 进度回调 {len(updates)} 次")
+    print("✅ 进度和取消测试通过")
+
+
+def test_resume():
+    """测试取消后保留 .part 文件并从中断处继续，.part 与源文件不一致时重新复制"""
+    print("\n测试断点续传...")
+    from utils.file_copy import copy_file_data, CopyCancelled, PARTIAL_SUFFIX
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_file(tmp, "big.bin", 12 * 1024 * 1024)
+        dst = Path(tmp, "copy.bin")
+        part = Path(str(dst) + PARTIAL_SUFFIX)
+        cancel = threading.Event()
+
+        def on_progress(done, total):
+            if done >= 5 * 1024 * 1024:
+                cancel.set()
+
+        try:
+            copy_file_data(src, dst, progress=on_progress, progress_interval=0, cancel_event=cancel,
+                           resume=True, chunk_size=CHUNK)
+            assert False, "应抛出 CopyCancelled"
+        except CopyCancelled:
+            pass
+        partial_size = part.stat().st_size
+        assert 0 < partial_size < src.stat().st_size, "预分配的 .part 文件应截短到已复制的位置"
+        assert part.read_bytes() == src.read_bytes()[:partial_size]
+
+        updates = []
+        copy_file_data(src, dst, progress=lambda done, total: updates.append(done), progress_interval=0,
+                       resume=True, chunk_size=CHUNK)
+        assert updates[0] > partial_size, "应从 .part 文件末尾继续"
+        assert dst.read_bytes() == src.read_bytes() and not part.exists()
+
+        # .part 文件内容与源文件不一致时从头复制
+        part.write_bytes(b"x" * 1000)
+        updates = []
+        copy_file_data(src, dst, progress=lambda done, total: updates.append(done), progress_interval=0,
+                       resume=True, chunk_size=CHUNK)
+        assert updates[0] <= CHUNK and dst.read_bytes() == src.read_bytes()
+        print(f"  - 取消时已复制 {partial_size} 字节")
+    print("✅ 断点续传测试通过")
+
+
+def test_copy_and_move_file():
+    """测试 copy_file / move_file，包括跨设备移动"""
+    print("\n测试 copy_file / move_file...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_file(tmp, "a.txt", 5000)
+        data = src.read_bytes()
+
+        assert file_utils.copy_file(str(src), os.path.join(tmp, "out", "b.txt"))
+        assert not file_utils.copy_file(str(src), os.path.join(tmp, "out", "b.txt")), "默认不覆盖"
+        assert file_utils.copy_file(str(src), os.path.join(tmp, "out"), overwrite=True)
+        assert Path(tmp, "out", "a.txt").read_bytes() == data
+        assert not file_utils.copy_file(str(src), str(src), overwrite=True), "复制到自身应失败"
+        assert src.read_bytes() == data
+
+        assert file_utils.move_file(os.path.join(tmp, "out", "b.txt"), os.path.join(tmp, "moved.txt"))
+        assert Path(tmp, "moved.txt").read_bytes() == data and not Path(tmp, "out", "b.txt").exists()
+
+        # 模拟跨设备：os.replace 抛出 EXDEV
+        original_replace = os.replace
+
+        def cross_device_replace(a, b):
+            if os.fspath(a) == str(src):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return original_replace(a, b)
+
+        updates = []
+        os.replace = cross_device_replace
+        try:
+            assert file_utils.move_file(str(src), os.path.join(tmp, "other", "c.txt"),
+                                        progress=lambda done, total: updates.append((done, total)))
+        finally:
+            os.replace = original_replace
+        assert Path(tmp, "other", "c.txt").read_bytes() == data and not src.exists()
+        assert updates[-1] == (5000, 5000)
+    print("✅ copy_file / move_file 测试通过")
+
+
+def test_copy_files_batch():
+    """测试批量复制：结果完整、失败文件单独报告、总体进度、取消"""
+    print("\n测试批量复制...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = [make_file(tmp, f"src/d{i % 5}/f{i}.bin", i * 100) for i in range(200)]
+        pairs = [(s, Path(tmp, "dst", s.relative_to(Path(tmp, "src")))) for s in sources]
+        pairs.append((Path(tmp, "missing.bin"), Path(tmp, "dst", "missing.bin")))
+        Path(tmp, "dst").mkdir()
+        Path(tmp, "dst", "exists.bin").write_bytes(b"keep")
+        pairs.append((sources[1], Path(tmp, "dst", "exists.bin")))
+
+        updates = []
+        results = list(file_utils.copy_files(pairs, workers=4, overwrite=False, progress=updates.append))
+        assert len(results) == 202
+        failed = [r for r in results if not r.ok]
+        assert sorted(Path(r.dst).name for r in failed) == ["exists.bin", "missing.bin"]
+        assert Path(tmp, "dst", "exists.bin").read_bytes() == b"keep"
+        for src, dst in pairs[:200]:
+            assert Path(dst).read_bytes() == src.read_bytes()
+        final = updates[-1]
+        assert final.files_done == final.files_total == 202
+        assert final.bytes_done == sum(i * 100 for i in range(200))
+
+        cancel = threading.Event()
+        received = 0
+        for _ in file_utils.copy_files(pairs[:200], workers=2, cancel_event=cancel):
+            received += 1
+            if received == 5:
+                cancel.set()
+        assert received == 5
+        assert not any(t.name.startswith("file-copy") for t in threading.enumerate())
+        print(f"  - 进度回调 {len(updates)} 次，最终进度: {final}")
+    print("✅ 批量复制测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始文件复制测试\n")
+
+    tests = [
+        test_methods,
+        test_progress_and_cancel,
+        test_resume,
+        test_copy_and_move_file,
+        test_copy_files_batch,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+文件哈希测试
+验证复用缓冲区读取、mmap 读取和一次读取计算多个摘要的结果与 hashlib 一致，
+calculate_file_hash 和 FileManager.calculate_file_sha256 使用新的哈希引擎后结果不变，
+以及批量哈希的结果、进度和取消，每个线程按大小缓存的读取缓冲区
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BLOCK = 4096
+
+
+def make_file(directory: str, name: str, size: int) -> Path:
+    """创建指定大小的伪随机内容文件"""
+    path = Path(directory) / name
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_block_boundaries():
+    """测试块边界附近各种大小的文件，readinto 与 mmap 结果一致"""
+    print("测试块边界...")
+    from utils.file_hash import hash_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (0, 1, BLOCK - 1, BLOCK, BLOCK + 1, BLOCK * 3 + 17):
+            path = make_file(tmp, f"f{size}.bin", size)
+            expected = hashlib.sha256(path.read_bytes()).hexdigest()
+            for use_mmap in (False, True):
+                digest = hash_file(path, "sha256", block_size=BLOCK, use_mmap=use_mmap)["sha256"]
+                assert digest == expected, (size, use_mmap)
+        print("  - 已验证 6 种文件大小 × readinto/mmap")
+    print("✅ 块边界测试通过")
+
+
+def test_multi_digest_and_progress():
+    """测试一次读取计算多个摘要，以及进度回调累计的字节数"""
+    print("\n测试多摘要...")
+    from utils.file_hash import hash_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_file(tmp, "data.bin", 100_000)
+        data = path.read_bytes()
+        for use_mmap in (False, True):
+            processed = []
+            digests = hash_file(path, ("sha256", "md5", "sha1"), block_size=BLOCK,
+                                use_mmap=use_mmap, progress=processed.append)
+            assert digests == {
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "md5": hashlib.md5(data).hexdigest(),
+                "sha1": hashlib.sha1(data).hexdigest(),
+            }
+            assert sum(processed) == len(data) and len(processed) == -(-len(data) // BLOCK)
+    print("✅ 多摘要测试通过")
+
+
+def test_errors():
+    """测试无效算法和块大小"""
+    print("\n测试错误处理...")
+    from utils.file_hash import hash_file
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_file(tmp, "data.bin", 10)
+        for kwargs in ({"algorithms": "not-a-hash"}, {"algorithms": ()}, {"block_size": 0}):
+            try:
+                hash_file(path, **kwargs)
+                assert False, f"应抛出 ValueError: {kwargs}"
+            except ValueError:
+                pass
+        assert file_utils.calculate_file_hash(str(Path(tmp) / "missing.bin")) is None
+        assert file_utils.calculate_file_hash(str(path), "not-a-hash") is None
+    print("✅ 错误处理测试通过")
+
+
+def test_existing_functions():
+    """测试 calculate_file_hash / calculate_file_hashes / FileManager.calculate_file_sha256"""
+    print("\n测试现有接口...")
+    from utils import file_utils
+    from updater.file_manager import FileManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_file(tmp, "package.zip", 300_000)
+        data = path.read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+
+        assert file_utils.calculate_file_hash(str(path)) == sha256
+        assert file_utils.calculate_file_hash(str(path), 'md5', block_size=1000) == hashlib.md5(data).hexdigest()
+        assert file_utils.calculate_file_hashes(str(path)) == {"sha256": sha256, "md5": hashlib.md5(data).hexdigest()}
+
+        manager = FileManager()
+        assert manager.calculate_file_sha256(str(path)) == sha256
+        assert manager.verify_file_sha256(str(path), sha256.upper())
+        assert not manager.verify_file_sha256(str(path), "0" * 64)
+    print("✅ 现有接口测试通过")
+
+
+def test_hash_files_batch():
+    """测试批量哈希：结果完整、失败文件单独报告、总体进度"""
+    print("\n测试批量哈希...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [str(make_file(tmp, f"f{i}.bin", i * 5000)) for i in range(40)]
+        missing = str(Path(tmp) / "missing.bin")
+        updates = []
+        results = list(file_utils.hash_files(paths + [missing], "sha256", workers=4,
+                                             block_size=BLOCK, progress=updates.append))
+
+        assert len(results) == 41
+        by_path = {result.path: result for result in results}
+        for path in paths:
+            assert by_path[path].digest == hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        assert not by_path[missing].ok and by_path[missing].error
+        final = updates[-1]
+        assert final.files_done == final.files_total == 41
+        assert final.bytes_done == final.bytes_total == sum(i * 5000 for i in range(40))
+        print(f"  - 进度回调 {len(updates)} 次，最终进度: {final}")
+    print("✅ 批量哈希测试通过")
+
+
+def test_hash_files_cancel():
+    """测试取消批量哈希和提前停止迭代"""
+    print("\n测试取消批量哈希...")
+    from utils.file_hash import hash_files
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [str(make_file(tmp, f"f{i}.bin", 64 * 1024)) for i in range(200)]
+
+        cancel = threading.Event()
+        received = []
+        for result in hash_files(paths, "sha256", workers=2, block_size=BLOCK, cancel_event=cancel):
+            received.append(result)
+            if len(received) == 5:
+                cancel.set()
+        assert len(received) == 5, len(received)
+
+        # 提前停止迭代时线程池随生成器关闭
+        iterator = hash_files(paths, "md5", workers=2)
+        first = next(iterator)
+        iterator.close()
+        assert first.ok
+        assert not any(t.name.startswith("file-hash") for t in threading.enumerate())
+        print(f"  - 取消前收到 {len(received)} 个结果")
+    print("✅ 取消批量哈希测试通过")
+
+
+def test_buffer_cache():
+    """测试缓冲区按大小缓存：交替使用几种大小时不重新分配，超出上限时丢弃最久未使用的"""
+    print("\n测试缓冲区缓存...")
+    from utils.file_hash import MAX_CACHED_BUFFERS, get_buffer
+
+    small, large = get_buffer(16 * 1024), get_buffer(256 * 1024)
+    assert len(small) == 16 * 1024 and len(large) == 256 * 1024
+    for _ in range(3):
+        assert get_buffer(16 * 1024) is small
+        assert get_buffer(256 * 1024) is large
+
+    # 使用更多种大小后，最久未使用的 16 KiB 缓冲区被丢弃，最近使用过的 256 KiB 保留
+    for size in range(1, MAX_CACHED_BUFFERS):
+        get_buffer(size)
+    assert get_buffer(256 * 1024) is large
+    assert get_buffer(16 * 1024) is not small
+
+    # 其他线程使用自己的缓冲区
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_buffer(256 * 1024)))
+    thread.start()
+    thread.join()
+    assert other[0] is not large and get_buffer(256 * 1024) is large
+    print("✅ 缓冲区缓存测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始文件哈希测试\n")
+
+    tests = [
+        test_block_boundaries,
+        test_multi_digest_and_progress,
+        test_errors,
+        test_existing_functions,
+        test_hash_files_batch,
+        test_hash_files_cancel,
+        test_buffer_cache,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
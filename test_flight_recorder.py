@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+飞行记录器测试
+验证环形缓冲区的容量上限、消息截断，最近日志写入错误报告和错误对话框，
+日志文件为 INFO 时记录器仍记录 DEBUG，以及记录器关闭或为 INFO 时被过滤的 DEBUG 日志不格式化参数
+"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_ring_buffer_cap():
+    """测试缓冲区只保留最近的记录，并截断过长的消息"""
+    print("测试环形缓冲区...")
+    from loguru import logger
+    from utils.flight_recorder import FlightRecorder
+
+    recorder = FlightRecorder(capacity=10, max_message_chars=20)
+    handler_id = logger.add(recorder, format="{message}", level="DEBUG",
+                            filter=lambda r: r["extra"].get("recorder_test"))
+    try:
+        test_logger = logger.bind(recorder_test=True)
+        for i in range(25):
+            test_logger.debug("记录 {}", i)
+        test_logger.info("x" * 100)
+    finally:
+        logger.remove(handler_id)
+
+    entries = recorder.to_dicts()
+    assert len(recorder) == 10, len(recorder)
+    assert entries[0]["message"] == "记录 16", entries[0]
+    assert entries[-1]["message"] == "x" * 20 + "…", entries[-1]
+    assert entries[-1]["level"] == "INFO"
+    assert "test_ring_buffer_cap" in entries[-1]["location"]
+    print(f"  - 最后一行: {recorder.format_lines()[-1]}")
+    print("✅ 环形缓冲区测试通过")
+
+
+def test_error_report_contains_recent_logs():
+    """测试错误报告和错误对话框包含出错前的日志"""
+    print("\n测试错误报告...")
+    from PySide6.QtWidgets import QApplication
+    from utils.logger import get_logger, get_flight_recorder
+    from utils.exception_handler import get_exception_handler
+    from gui.error_dialog import ErrorDialog
+
+    QApplication.instance() or QApplication(sys.argv)
+    assert get_flight_recorder() is not None, "飞行记录器默认应启用"
+
+    get_logger("test").debug("崩溃前的上下文")
+    try:
+        raise ValueError("测试异常")
+    except ValueError:
+        error_info = get_exception_handler()._format_exception(*sys.exc_info())
+
+    messages = [entry["message"] for entry in error_info["recent_logs"]]
+    assert "崩溃前的上下文" in messages, messages[-5:]
+
+    dialog = ErrorDialog(error_info)
+    details = dialog._build_details_text()
+    assert "最近日志" in details and "崩溃前的上下文" in details
+    dialog.deleteLater()
+    print("✅ 错误报告测试通过")
+
+
+class FormatCounter:
+    """记录被格式化的次数"""
+    calls = 0
+
+    def __format__(self, spec):
+        FormatCounter.calls += 1
+        return "value"
+
+    __str__ = __format__
+
+
+def test_recorder_keeps_debug_in_production():
+    """测试日志文件为 INFO 时飞行记录器仍按默认的 DEBUG 级别记录，DEBUG 日志只进入记录器"""
+    print("\n测试生产环境级别下的飞行记录器...")
+    from utils.logger import (flush_logs, get_flight_recorder, get_log_stats, get_logger, is_enabled,
+                              setup_logger)
+
+    # 模拟生产环境的日志级别
+    setup_logger(level="INFO")
+    try:
+        recorder = get_flight_recorder()
+        assert recorder is not None, "飞行记录器应启用"
+        assert is_enabled("DEBUG"), "记录器记录 DEBUG 时 is_enabled('DEBUG') 应返回 True"
+        assert not is_enabled("TRACE")
+        test_logger = get_logger("test")
+        flush_logs()
+        enqueued = get_log_stats()["app_debug"]["enqueued"]
+
+        test_logger.debug("生产环境中的上下文: {}", 42)
+        flush_logs()
+        assert recorder.to_dicts()[-1]["message"] == "生产环境中的上下文: 42"
+        assert recorder.to_dicts()[-1]["level"] == "DEBUG"
+        assert get_log_stats()["app_debug"]["enqueued"] == enqueued, "DEBUG 日志不应写入 INFO 级别的日志文件"
+
+        # 低于记录器级别的日志仍在 loguru 入口直接返回，不格式化参数
+        FormatCounter.calls = 0
+        before = len(recorder)
+        test_logger.trace("值: {}", FormatCounter())
+        assert FormatCounter.calls == 0 and len(recorder) == before
+    finally:
+        setup_logger()
+    print("✅ 生产环境级别下的飞行记录器测试通过")
+
+
+def test_filtered_debug_not_formatted():
+    """测试记录器设为 INFO 或关闭时，被过滤的 DEBUG 日志不构建记录、不格式化参数"""
+    print("\n测试被过滤的 DEBUG 日志...")
+    from utils.logger import get_flight_recorder, get_logger, is_enabled, setup_logger
+
+    try:
+        for recorder_level in ("INFO", None):
+            setup_logger(level="INFO", recorder_level=recorder_level)
+            recorder = get_flight_recorder()
+            assert (recorder is None) == (recorder_level is None)
+            assert not is_enabled("DEBUG") and is_enabled("INFO")
+
+            test_logger = get_logger("test")
+            FormatCounter.calls = 0
+            before = len(recorder) if recorder else 0
+            test_logger.debug("值: {}", FormatCounter())
+            assert FormatCounter.calls == 0, "被过滤的 DEBUG 日志不应格式化参数"
+            if recorder is not None:
+                assert len(recorder) == before
+            test_logger.info("值: {}", FormatCounter())
+            assert FormatCounter.calls == 1
+    finally:
+        setup_logger()
+    print("✅ 被过滤的 DEBUG 日志测试通过")
+
+
+def test_set_log_level_keeps_handlers():
+    """测试运行中修改日志级别时沿用异步队列和飞行记录器，不丢失已记录的日志、不重复启动信息"""
+    print("\n测试修改日志级别...")
+    from utils.logger import (flush_logs, get_flight_recorder, get_log_stats, get_logger, is_enabled,
+                              set_log_level, setup_logger)
+
+    setup_logger()
+    try:
+        recorder = get_flight_recorder()
+        test_logger = get_logger("test")
+        test_logger.info("修改级别前的日志")
+        flush_logs()
+        enqueued = get_log_stats()["app_debug"]["enqueued"]
+
+        set_log_level("INFO")
+        # 飞行记录器保持 DEBUG 级别
+        assert is_enabled("DEBUG") and is_enabled("INFO")
+        assert get_flight_recorder() is recorder
+        test_logger.debug("只进入记录器的日志")
+        test_logger.info("修改级别后的日志")
+        flush_logs()
+        # 同一个队列继续计数（setup_logger() 会创建新的队列，从 0 开始）；另一条是 "日志级别: INFO"
+        assert get_log_stats()["app_debug"]["enqueued"] == enqueued + 2
+
+        messages = [entry["message"] for entry in recorder.to_dicts()]
+        after = messages[messages.index("修改级别前的日志"):]
+        assert "修改级别后的日志" in after and "只进入记录器的日志" in after
+        assert not any(message.startswith("应用程序启动") for message in after), "不应再次记录启动信息"
+
+        set_log_level("DEBUG")
+        test_logger.debug("恢复 DEBUG 后的日志")
+        flush_logs()
+        assert get_log_stats()["app_debug"]["enqueued"] == enqueued + 4
+        assert recorder.to_dicts()[-1]["message"] == "恢复 DEBUG 后的日志"
+        try:
+            set_log_level("NOT_A_LEVEL")
+            assert False, "未知级别应抛出 ValueError"
+        except ValueError:
+            pass
+    finally:
+        setup_logger()
+    print("✅ 修改日志级别测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始飞行记录器测试\n")
+
+    tests = [
+        test_ring_buffer_cap,
+        test_error_report_contains_recent_logs,
+        test_recorder_keeps_debug_in_production,
+        test_filtered_debug_not_formatted,
+        test_set_log_level_keeps_handlers,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
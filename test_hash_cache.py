@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+文件哈希缓存测试
+验证未变化的文件命中缓存、大小/修改时间/状态变化时间变化后失效、按最近使用淘汰、
+重新打开数据库后缓存仍然有效、刚修改过的文件不写入缓存，
+以及 calculate_file_hash 和 FileManager.verify_file_sha256 使用缓存
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_file(directory: str, name: str, data: bytes, age: float = 60) -> Path:
+    """创建文件，并把修改时间设为 age 秒之前（超出缓存的防抖窗口）"""
+    path = Path(directory) / name
+    path.write_bytes(data)
+    set_age(path, age)
+    return path
+
+
+def set_age(path: Path, age: float):
+    """把文件的修改时间设为 age 秒之前"""
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_hit_and_miss():
+    """测试缓存命中和未命中计数"""
+    print("测试命中和未命中...")
+    from utils.hash_cache import HashCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HashCache(Path(tmp) / "hashes.db")
+        path = make_file(tmp, "a.bin", b"hello" * 1000)
+        expected = hashlib.sha256(path.read_bytes()).hexdigest()
+
+        assert cache.get_or_compute(path, "sha256") == expected
+        assert cache.get_or_compute(path, "sha256") == expected
+        assert cache.get_or_compute(str(path), "md5") == hashlib.md5(path.read_bytes()).hexdigest()
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2, stats
+        print(f"  - 统计: {stats}")
+        cache.close()
+    print("✅ 命中和未命中测试通过")
+
+
+def test_invalidation():
+    """测试文件变化后缓存失效"""
+    print("\n测试缓存失效...")
+    from utils.hash_cache import HashCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HashCache(Path(tmp) / "hashes.db")
+        path = make_file(tmp, "a.bin", b"a" * 100)
+        cache.get_or_compute(path)
+
+        # 内容和大小都变化
+        make_file(tmp, "a.bin", b"b" * 200)
+        assert cache.get_or_compute(path) == hashlib.sha256(b"b" * 200).hexdigest()
+        # 大小不变，修改时间变化
+        make_file(tmp, "a.bin", b"c" * 200, age=30)
+        assert cache.get_or_compute(path) == hashlib.sha256(b"c" * 200).hexdigest()
+        # 大小不变，并把修改时间改回原值（状态变化时间仍然不同）
+        old_mtime = os.stat(path).st_mtime_ns
+        time.sleep(0.05)
+        path.write_bytes(b"d" * 200)
+        os.utime(path, ns=(old_mtime, old_mtime))
+        assert cache.get_or_compute(path) == hashlib.sha256(b"d" * 200).hexdigest()
+
+        stats = cache.stats()
+        assert stats["invalidations"] == 3 and stats["hits"] == 0, stats
+        print(f"  - 统计: {stats}")
+        cache.close()
+    print("✅ 缓存失效测试通过")
+
+
+def test_lru_eviction():
+    """测试超出条目数时淘汰最久未使用的条目"""
+    print("\n测试淘汰...")
+    from utils.hash_cache import HashCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HashCache(Path(tmp) / "hashes.db", max_entries=3)
+        paths = [make_file(tmp, f"f{i}.bin", bytes([i]) * 10) for i in range(4)]
+        for path in paths[:3]:
+            cache.get_or_compute(path)
+        # 访问 f0，使 f1 成为最久未使用的条目
+        cache.get_or_compute(paths[0])
+        cache.get_or_compute(paths[3])
+
+        assert len(cache) == 3 and cache.evictions == 1
+        assert cache.get(paths[1], "sha256") is None
+        for path in (paths[0], paths[2], paths[3]):
+            assert cache.get(path, "sha256") is not None, path
+        cache.close()
+    print("✅ 淘汰测试通过")
+
+
+def test_persistence_and_racy_files():
+    """测试重新打开数据库后缓存有效，刚修改过的文件不写入缓存"""
+    print("\n测试持久化...")
+    from utils.hash_cache import HashCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "hashes.db"
+        old = make_file(tmp, "old.bin", b"old" * 100)
+        fresh = Path(tmp) / "fresh.bin"
+        fresh.write_bytes(b"fresh")
+
+        cache = HashCache(db_path)
+        cache.get_or_compute(old)
+        assert cache.get_or_compute(fresh) == hashlib.sha256(b"fresh").hexdigest()
+        assert len(cache) == 1, "刚修改过的文件不应写入缓存"
+        cache.close()
+
+        reopened = HashCache(db_path)
+        assert len(reopened) == 1
+        assert reopened.get(old, "sha256") == hashlib.sha256(b"old" * 100).hexdigest()
+        assert reopened.hits == 1
+        reopened.close()
+    print("✅ 持久化测试通过")
+
+
+def test_existing_functions_use_cache():
+    """测试 calculate_file_hash 和 FileManager.verify_file_sha256 使用全局缓存"""
+    print("\n测试现有接口使用缓存...")
+    from utils import file_utils
+    from utils.hash_cache import get_hash_cache, setup_hash_cache
+    from updater.file_manager import FileManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = setup_hash_cache(Path(tmp) / "hashes.db")
+        path = make_file(tmp, "package.zip", os.urandom(50_000))
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+
+        assert file_utils.calculate_file_hash(str(path)) == sha256
+        manager = FileManager()
+        assert manager.verify_file_sha256(str(path), sha256)
+        assert file_utils.calculate_file_hash(str(path), use_cache=False) == sha256
+        assert get_hash_cache() is cache
+        assert cache.hits == 1 and cache.misses == 1, cache.stats()
+
+        set_age(path, 10)
+        assert manager.verify_file_sha256(str(path), sha256)
+        assert cache.invalidations == 1
+        setup_hash_cache(":memory:")
+    print("✅ 现有接口使用缓存测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始文件哈希缓存测试\n")
+
+    tests = [
+        test_hit_and_miss,
+        test_invalidation,
+        test_lru_eviction,
+        test_persistence_and_racy_files,
+        test_existing_functions_use_cache,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
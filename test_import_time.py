@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+导入开销回归测试
+确保 utils / gui / updater 包按需导出，冷启动导入不拉起 PySide6 控件栈
+（导入耗时与机器和磁盘缓存有关，由 examples/import_benchmark.py 测量）
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent
+
+# 这些模块不应在仅访问日志/配置时被导入
+HEAVY_MODULES = ("PySide6", "shiboken6", "utils.theme", "utils.plugin_manager")
+
+
+def _imported_modules(code: str) -> set:
+    """在新的子进程中运行代码，返回运行后 sys.modules 中的模块名"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_utils_import_is_lazy():
+    """测试访问日志和配置不会导入 PySide6 和重量级子模块"""
+    print("测试 utils 按需导出...")
+    modules = _imported_modules("from utils import app_logger, app_config")
+
+    for module in HEAVY_MODULES:
+        imported = [name for name in modules if name == module or name.startswith(module + ".")]
+        assert not imported, f"{imported} 不应在启动早期被导入"
+    assert "utils.config" in modules and "utils.logger" in modules
+    print(f"  - 已导入 {len([m for m in modules if m.startswith('utils.')])} 个 utils 子模块")
+    print("✅ utils 按需导出测试通过")
+
+
+def test_package_import_is_cheap():
+    """测试仅导入包本身时不会导入任何子模块"""
+    print("\n测试包导入开销...")
+    modules = _imported_modules("import utils, gui, updater")
+
+    for name in modules:
+        assert not name.startswith(("utils.", "gui.", "updater.", "PySide6")), f"{name} 被提前导入"
+    print("✅ 包导入开销测试通过")
+
+
+def test_public_api_resolves():
+    """测试 __all__ 中的所有名称都能按需解析"""
+    print("\n测试公开接口解析...")
+    import gui
+    import updater
+    import utils
+
+    for package in (utils, gui, updater):
+        for name in package.__all__:
+            assert getattr(package, name) is not None, f"{package.__name__}.{name} 无法解析"
+            assert name in dir(package)
+        print(f"  - {package.__name__}: {len(package.__all__)} 个名称已解析")
+
+    try:
+        utils.not_a_public_name
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("未知名称应抛出 AttributeError")
+    print("✅ 公开接口解析测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始导入耗时测试\n")
+
+    tests = [
+        test_utils_import_is_lazy,
+        test_package_import_is_cheap,
+        test_public_api_resolves,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
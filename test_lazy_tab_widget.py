@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+延迟标签页测试
+验证标签页的工厂函数在首次被选中时才调用且只调用一次，以及空闲时预创建下一个标签页
+"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _make_tabs(count: int, prefetch: bool = False):
+    """创建带计数工厂函数的延迟标签页控件，返回 (控件, 各标签页的调用次数)"""
+    from PySide6.QtWidgets import QApplication, QLabel
+    from gui.lazy_tab_widget import LazyTabWidget
+
+    QApplication.instance() or QApplication(sys.argv)
+    tabs = LazyTabWidget()
+    tabs.set_prefetch_enabled(prefetch, delay_ms=0)
+    calls = [0] * count
+
+    def factory(index):
+        def create():
+            calls[index] += 1
+            return QLabel(f"内容 {index}")
+        return create
+
+    for i in range(count):
+        assert tabs.add_lazy_tab(factory(i), f"标签 {i}") == i
+    return tabs, calls
+
+
+def _process_events(duration_ms: int = 50):
+    """运行事件循环一段时间，处理到期的定时器"""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    QTimer.singleShot(duration_ms, loop.quit)
+    loop.exec()
+
+
+def test_factory_called_on_selection():
+    """测试工厂函数在标签页被选中时才调用，且只调用一次"""
+    print("测试按需创建标签页...")
+    tabs, calls = _make_tabs(3)
+    materialized = []
+    tabs.tab_materialized.connect(lambda index, content: materialized.append((index, content.text())))
+
+    # 添加第一个标签页时它成为当前页，立即创建；其余标签页不创建
+    assert calls == [1, 0, 0], calls
+    assert tabs.is_tab_materialized(0) and not tabs.is_tab_materialized(1)
+    _process_events()
+    assert calls == [1, 0, 0], "未启用预创建时不应创建其他标签页"
+
+    tabs.setCurrentIndex(2)
+    assert calls == [1, 0, 1], calls
+    assert materialized == [(2, "内容 2")], materialized
+
+    # 来回切换不会再次调用工厂函数
+    content = tabs.ensure_tab(2)
+    for index in (0, 2, 1, 2, 1, 0):
+        tabs.setCurrentIndex(index)
+    assert calls == [1, 1, 1], calls
+    assert tabs.ensure_tab(2) is content
+    assert content.text() == "内容 2"
+    assert [index for index, _ in materialized] == [2, 1]
+
+    assert tabs.ensure_tab(5) is None
+    assert not tabs.is_tab_materialized(5)
+    print("✅ 按需创建标签页测试通过")
+
+
+def test_ensure_tab():
+    """测试 ensure_tab 创建未选中的标签页且不切换当前页"""
+    print("\n测试 ensure_tab...")
+    tabs, calls = _make_tabs(3)
+
+    content = tabs.ensure_tab(1)
+    assert content is not None and content.text() == "内容 1"
+    assert tabs.currentIndex() == 0
+    assert calls == [1, 1, 0], calls
+    tabs.setCurrentIndex(1)
+    assert calls == [1, 1, 0], calls
+    print("✅ ensure_tab 测试通过")
+
+
+def test_prefetch():
+    """测试启用预创建后，切换标签页后的空闲时间创建下一个未创建的标签页"""
+    print("\n测试空闲时预创建...")
+    tabs, calls = _make_tabs(4, prefetch=True)
+
+    # 添加第一个标签页时它成为当前页，空闲后预创建下一个标签页
+    _process_events()
+    assert calls == [1, 1, 0, 0], calls
+
+    # 每次切换只预创建一个标签页，从当前页之后开始查找，到末尾后回到开头
+    tabs.setCurrentIndex(3)
+    assert calls == [1, 1, 0, 1], calls
+    _process_events()
+    assert calls == [1, 1, 1, 1], calls
+    assert all(tabs.is_tab_materialized(i) for i in range(4))
+
+    # 全部创建后不再调用工厂函数
+    tabs.setCurrentIndex(0)
+    _process_events()
+    assert calls == [1, 1, 1, 1], calls
+
+    # 关闭预创建后只在选中时创建（已排队的预创建也不再执行）
+    tabs, calls = _make_tabs(3, prefetch=True)
+    tabs.set_prefetch_enabled(False)
+    tabs.setCurrentIndex(1)
+    _process_events()
+    assert calls == [1, 1, 0], calls
+    print("✅ 空闲时预创建测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始延迟标签页测试\n")
+
+    tests = [
+        test_factory_called_on_selection,
+        test_ensure_tab,
+        test_prefetch,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+日志通道与级别判断测试
+验证只有绑定了通道的记录会路由到通道专用的日志输出，以及 is_enabled() 的级别判断
+"""
+
+import sys
+
+
+def test_channel_routing():
+    """测试按通道路由记录"""
+    print("测试日志通道路由...")
+    from loguru import logger
+    from utils.logger import get_logger, update_logger, CHANNEL_UPDATE, _channel_filter
+
+    routed = []
+    handler_id = logger.add(lambda message: routed.append(message.record["message"]),
+                            level="INFO", format="{message}", filter=_channel_filter(CHANNEL_UPDATE))
+    try:
+        get_logger("gui.settings_tab").info("设置已保存: check_update_on_startup=False")
+        get_logger("updater.updater_module").info("普通模块名里含 update 也不会被路由")
+        get_logger("updater.file_manager", channel=CHANNEL_UPDATE).info("下载完成")
+        update_logger.info("开始检查更新")
+        get_logger("updater.file_manager", channel=CHANNEL_UPDATE).debug("低于通道级别")
+    finally:
+        logger.remove(handler_id)
+
+    assert routed == ["下载完成", "开始检查更新"], routed
+    print(f"  - 路由到 update 通道: {routed}")
+    print("✅ 日志通道路由测试通过")
+
+
+def test_is_enabled():
+    """测试 is_enabled() 随配置的级别变化（飞行记录器的级别也计入）"""
+    print("\n测试级别判断...")
+    from utils.logger import setup_logger, is_enabled
+
+    try:
+        setup_logger(level="INFO", recorder_level=None)
+        assert not is_enabled("DEBUG")
+        assert is_enabled("INFO") and is_enabled("ERROR")
+
+        # 飞行记录器默认记录 DEBUG
+        setup_logger(level="INFO")
+        assert is_enabled("DEBUG") and not is_enabled("TRACE")
+
+        setup_logger(level="DEBUG")
+        assert is_enabled("DEBUG")
+        assert not is_enabled("TRACE")
+        print("✅ 级别判断测试通过")
+    finally:
+        setup_logger()
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始日志通道测试\n")
+
+    tests = [
+        test_channel_routing,
+        test_is_enabled,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
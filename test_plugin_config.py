@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+插件配置测试
+验证插件配置保存在独立文件中、插件激活后首次读取时才加载、经防抖写入器单独写入，
+卸载插件时写出尚未保存的配置，写入失败时配置保持未保存状态
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_lazy_load_and_debounced_save():
+    """测试配置文件首次读取时才加载，多次保存合并为一次写入"""
+    print("测试插件配置加载与保存...")
+    from utils.config_writer import DebouncedWriter
+    from utils.plugin_config import PluginConfig
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plugin_configs" / "counter.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps({"count": 5, "ui": {"color": "red"}}), encoding='utf-8')
+
+        writer = DebouncedWriter(delay=60)
+        config = PluginConfig("counter", path, {"count": 0, "ui": {"color": "blue", "size": 3}}, writer=writer)
+        assert not config.loaded
+        assert config.get("count") == 5 and config.get("ui.size") == 3 and config.loaded
+
+        for i in range(100):
+            config.set("count", i)
+            config.save_config()
+        assert writer.stats()["writes"] == 0 and config.is_dirty
+        assert config.flush()
+        assert writer.stats()["writes"] == 1 and not config.is_dirty
+        assert json.loads(path.read_text(encoding='utf-8'))["count"] == 99
+        # 没有修改时不会重复写入
+        assert config.flush() and writer.stats()["writes"] == 1
+        print(f"  - 写入器统计: {writer.stats()}")
+    print("✅ 插件配置加载与保存测试通过")
+
+
+def test_validation_and_memory_only():
+    """测试插件配置的校验规则，以及未指定文件时只保存在内存中"""
+    print("\n测试插件配置校验...")
+    from utils.config_schema import ConfigValidationError
+    from utils.plugin_config import PluginConfig
+
+    config = PluginConfig("memory", None, {"count": 0}, {"count": {"min": 0}})
+    try:
+        config.set("count", -1)
+        assert False, "负数应被拒绝"
+    except ConfigValidationError as e:
+        assert e.errors[0].key == "count"
+    assert config.get("count") == 0
+
+    config.set("extra.option", True)
+    config.save_config(immediate=True)
+    assert config.get("extra") == {"option": True}
+    assert config.flush() and config.config_file is None
+    print("✅ 插件配置校验测试通过")
+
+
+def test_plugin_manager_namespaces():
+    """测试插件管理器为每个插件提供独立的配置文件"""
+    print("\n测试插件配置命名空间...")
+    from utils.plugin_manager import PluginManager
+    from utils.plugin_base import BasePlugin, PluginMetadata
+
+    class LevelPlugin(BasePlugin):
+        config_defaults = {"level": 1}
+
+        def get_metadata(self):
+            return PluginMetadata("level", "1.0.0", "", "")
+
+        def initialize(self, main_window):
+            return True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        config_dir = root / "plugin_configs"
+        manager = PluginManager(str(root / "plugins"), config_dir=str(config_dir))
+        assert manager.initialize_plugin("alpha", LevelPlugin)
+        assert manager.initialize_plugin("beta", LevelPlugin)
+
+        alpha, beta = manager.get_plugin("alpha"), manager.get_plugin("beta")
+        assert alpha.get_config() == {"level": 1}
+        alpha.set_config({"level": 7})
+        assert not beta.config.loaded, "未使用配置的插件不应加载配置文件"
+        assert manager.flush_configs()
+
+        assert json.loads((config_dir / "alpha.json").read_text(encoding='utf-8')) == {"level": 7}
+        assert not (config_dir / "beta.json").exists()
+
+        # 卸载后写出配置；下次启动激活插件时读取已保存的配置
+        alpha.config.set("level", 8)
+        assert manager.unload_plugin("alpha")
+        restarted = PluginManager(str(root / "plugins"), config_dir=str(config_dir))
+        assert restarted.initialize_plugin("alpha", LevelPlugin)
+        assert restarted.get_plugin("alpha").config.get("level") == 8
+        print(f"  - 配置文件: {sorted(p.name for p in config_dir.iterdir())}")
+    print("✅ 插件配置命名空间测试通过")
+
+
+def test_failed_write_keeps_dirty():
+    """测试写入失败后插件配置保持未保存状态，flush() 和 flush_configs() 报告失败直到写入成功"""
+    print("\n测试插件配置写入失败...")
+    import errno
+    from utils import config_writer
+    from utils.plugin_base import BasePlugin, PluginMetadata
+    from utils.plugin_config import PluginConfig
+    from utils.plugin_manager import PluginManager
+
+    class LevelPlugin(BasePlugin):
+        config_defaults = {"level": 1}
+
+        def get_metadata(self):
+            return PluginMetadata("level", "1.0.0", "", "")
+
+        def initialize(self, main_window):
+            return True
+
+    def failing_write(path, text, encoding='utf-8'):
+        raise OSError(errno.ENOSPC, "磁盘已满")
+
+    original_write = config_writer.atomic_write_text
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plugin_configs" / "counter.json"
+        config = PluginConfig("counter", path, {"count": 0}, writer=config_writer.DebouncedWriter(delay=60))
+        manager = PluginManager(str(Path(tmp) / "plugins"), config_dir=str(Path(tmp) / "plugin_configs"))
+        assert manager.initialize_plugin("alpha", LevelPlugin)
+        plugin = manager.get_plugin("alpha")
+
+        config_writer.atomic_write_text = failing_write
+        try:
+            config.set("count", 3)
+            config.save_config(immediate=True)
+            assert config.is_dirty, "写入失败后修改应保持未保存状态"
+            assert not config.flush() and config.is_dirty
+
+            plugin.set_config({"level": 7})
+            assert not manager.flush_configs()
+            assert plugin.config.is_dirty
+            assert not manager.flush_configs(), "再次调用仍应报告失败"
+        finally:
+            config_writer.atomic_write_text = original_write
+
+        assert config.flush() and not config.is_dirty
+        assert json.loads(path.read_text(encoding='utf-8')) == {"count": 3}
+        assert manager.flush_configs() and not plugin.config.is_dirty
+        assert json.loads((path.parent / "alpha.json").read_text(encoding='utf-8')) == {"level": 7}
+    print("✅ 插件配置写入失败测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始插件配置测试\n")
+
+    tests = [
+        test_lazy_load_and_debounced_save,
+        test_validation_and_memory_only,
+        test_plugin_manager_namespaces,
+        test_failed_write_keeps_dirty,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
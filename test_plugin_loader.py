@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+插件后台加载测试
+验证插件模块在工作线程中导入，initialize 在GUI线程中按依赖顺序执行
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PLUGIN_TEMPLATE = '''
+import threading
+import time
+from utils.plugin_base import BasePlugin, PluginMetadata
+
+time.sleep({delay})
+IMPORT_THREAD = threading.current_thread().name
+
+
+class {cls}(BasePlugin):
+    def get_metadata(self):
+        return PluginMetadata("{cls}", "1.0.0", "test", "")
+
+    def initialize(self, main_window):
+        main_window.initialized.append(("{plugin_id}", threading.current_thread() is threading.main_thread()))
+        return True
+'''
+
+
+class _FakeMainWindow:
+    """记录插件初始化顺序和线程的主窗口替身"""
+
+    def __init__(self):
+        self.initialized = []
+
+
+def _create_plugin(root: Path, plugin_id: str, cls: str, delay: float, dependencies=None):
+    """创建一个可导入的测试插件"""
+    plugin_path = root / plugin_id
+    plugin_path.mkdir()
+    (plugin_path / "__init__.py").write_text(
+        PLUGIN_TEMPLATE.format(delay=delay, cls=cls, plugin_id=plugin_id), encoding="utf-8"
+    )
+    manifest = {"name": cls, "entry": cls, "dependencies": dependencies or []}
+    (plugin_path / "plugin.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def test_background_loading():
+    """测试后台导入与GUI线程分批初始化"""
+    print("测试插件后台加载...")
+    from PySide6.QtCore import QEventLoop, QTimer
+    from PySide6.QtWidgets import QApplication
+    from utils import startup_profiler
+    from utils.plugin_manager import PluginManager
+
+    QApplication.instance() or QApplication(sys.argv)
+    profiler = startup_profiler.StartupProfiler(enabled=True)
+    default_profiler = startup_profiler._startup_profiler
+    startup_profiler._startup_profiler = profiler
+    workdir = Path(tempfile.mkdtemp())
+    old_cwd = os.getcwd()
+    plugin_dir = "bg_test_plugins"
+    try:
+        os.chdir(workdir)
+        sys.path.insert(0, str(workdir))
+        root = workdir / plugin_dir
+        root.mkdir()
+        (root / "__init__.py").write_text("", encoding="utf-8")
+        _create_plugin(root, "core", "CorePlugin", 0.3)
+        _create_plugin(root, "app", "AppPlugin", 0.0, dependencies=["core"])
+        _create_plugin(root, "other", "OtherPlugin", 0.0)
+
+        window = _FakeMainWindow()
+        manager = PluginManager(plugin_dir)
+        manager.set_main_window(window)
+
+        start = time.perf_counter()
+        loader = manager.load_all_plugins_async(max_workers=3, batch_size=1)
+        elapsed = time.perf_counter() - start
+
+        # 导入在后台进行，调用本身不会等待慢插件
+        assert elapsed < 0.2, f"load_all_plugins_async 阻塞了 {elapsed:.2f}s"
+        assert manager.is_pending("core") and not manager.get_plugin("core")
+
+        progress = []
+        loaded = []
+        loader.progress.connect(lambda done, total: progress.append((done, total)))
+        loader.plugin_loaded.connect(loaded.append)
+
+        loop = QEventLoop()
+        loader.finished.connect(loop.quit)
+        QTimer.singleShot(5000, loop.quit)
+        loop.exec()
+
+        assert loader.is_finished()
+        assert sorted(loaded) == ["app", "core", "other"], loaded
+        assert progress[-1] == (3, 3), progress
+
+        order = [name for name, _ in window.initialized]
+        assert order.index("core") < order.index("app"), order
+        assert all(on_main for _, on_main in window.initialized), window.initialized
+
+        module = sys.modules[f"{plugin_dir}.core"]
+        assert module.IMPORT_THREAD.startswith("plugin-import"), module.IMPORT_THREAD
+        assert not manager.is_pending("core")
+
+        # 每个插件的导入阶段在工作线程中记录，初始化阶段在GUI线程中记录
+        phases = {p.name: p for p in profiler.phases}
+        for name in ("core", "app", "other"):
+            assert phases[f"import:{name}"].category == "plugin"
+            assert phases[f"import:{name}"].thread_id != threading.get_ident()
+            assert phases[f"init:{name}"].thread_id == threading.get_ident()
+        assert phases["import:core"].wall_ns >= 0.3e9
+        assert phases["init:app"].start_ns >= phases["import:core"].start_ns + phases["import:core"].wall_ns
+        print(f"  - 初始化顺序: {order}")
+        print("✅ 插件后台加载测试通过")
+    finally:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.finish(Path(tmp))
+        startup_profiler._startup_profiler = default_profiler
+        os.chdir(old_cwd)
+        sys.path.remove(str(workdir))
+        for name in [m for m in sys.modules if m.startswith(plugin_dir)]:
+            del sys.modules[name]
+        shutil.rmtree(workdir)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始插件后台加载测试\n")
+
+    tests = [
+        test_background_loading,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
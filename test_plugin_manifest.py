@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+插件清单与索引测试
+验证插件发现只读取清单/索引，不导入插件代码，以及触发事件激活插件并传递事件数据
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _create_plugin(root: Path, plugin_id: str, manifest: dict = None):
+    """在临时插件目录中创建一个插件包"""
+    plugin_path = root / plugin_id
+    plugin_path.mkdir()
+    (plugin_path / "__init__.py").write_text("raise RuntimeError('插件代码不应被导入')\n", encoding="utf-8")
+    if manifest is not None:
+        (plugin_path / "plugin.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return plugin_path
+
+
+def test_discover_without_import():
+    """测试发现插件时不导入插件代码"""
+    print("测试清单发现...")
+    from utils.plugin_manager import PluginManager
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        _create_plugin(root, "alpha", {"name": "Alpha", "version": "2.0.0", "entry": "AlphaPlugin", "lazy": True})
+        _create_plugin(root, "legacy")
+
+        manager = PluginManager(str(root))
+        discovered = manager.discover_plugins()
+
+        assert sorted(discovered) == ["alpha", "legacy"], discovered
+        alpha = manager.get_manifest("alpha")
+        assert alpha.name == "Alpha" and alpha.version == "2.0.0" and alpha.lazy
+        assert not manager.get_manifest("legacy").has_manifest
+        assert (root / ".plugin_index.json").exists()
+        print(f"  - 发现插件: {discovered}")
+        print("✅ 清单发现测试通过")
+    finally:
+        shutil.rmtree(root)
+
+
+def test_index_cache_and_invalidation():
+    """测试索引命中与清单修改后的失效"""
+    print("\n测试索引缓存...")
+    from utils.plugin_manager import PluginManager
+    from utils import plugin_manifest
+
+    root = Path(tempfile.mkdtemp())
+    original_read = plugin_manifest.PluginManifest.read
+    reads = []
+
+    def counting_read(plugin_path):
+        reads.append(plugin_path.name)
+        return original_read(plugin_path)
+
+    try:
+        plugin_path = _create_plugin(root, "alpha", {"name": "Alpha", "version": "1.0.0"})
+        PluginManager(str(root)).discover_plugins()
+
+        plugin_manifest.PluginManifest.read = staticmethod(counting_read)
+
+        # 签名未变化：直接使用索引
+        PluginManager(str(root)).discover_plugins()
+        assert reads == [], reads
+
+        # 清单内容变化：重新读取
+        (plugin_path / "plugin.json").write_text(json.dumps({"name": "Alpha", "version": "1.0.10"}), encoding="utf-8")
+        manager = PluginManager(str(root))
+        manager.discover_plugins()
+        assert reads == ["alpha"], reads
+        assert manager.get_manifest("alpha").version == "1.0.10"
+        print("✅ 索引缓存测试通过")
+    finally:
+        plugin_manifest.PluginManifest.read = original_read
+        shutil.rmtree(root)
+
+
+def test_dependency_order():
+    """测试依赖排序与缺失依赖"""
+    print("\n测试依赖排序...")
+    from utils.plugin_manager import PluginManager
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        _create_plugin(root, "app", {"name": "App", "dependencies": ["core"]})
+        _create_plugin(root, "core", {"name": "Core"})
+        _create_plugin(root, "broken", {"name": "Broken", "dependencies": ["missing"]})
+
+        manager = PluginManager(str(root))
+        order = manager.resolve_load_order(sorted(manager.discover_plugins()))
+        assert order == ["core", "app"], order
+        print(f"  - 加载顺序: {order}")
+        print("✅ 依赖排序测试通过")
+    finally:
+        shutil.rmtree(root)
+
+
+def test_lazy_plugins_skipped_at_startup():
+    """测试延迟激活的插件不会在启动时加载"""
+    print("\n测试延迟激活...")
+    from utils.plugin_manager import PluginManager
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        _create_plugin(root, "eager", {"name": "Eager"})
+        _create_plugin(root, "lazy_one", {"name": "Lazy", "lazy": True, "tab": "Lazy", "triggers": ["files_dropped"]})
+        _create_plugin(root, "lazy_dep", {"name": "LazyDep", "lazy": True})
+        _create_plugin(root, "needs_dep", {"name": "NeedsDep", "dependencies": ["lazy_dep"]})
+
+        manager = PluginManager(str(root))
+        loaded = []
+        manager.load_plugin = lambda name: loaded.append(name) or False
+        manager.load_all_plugins()
+
+        # 被非延迟插件依赖的延迟插件仍需在启动时加载
+        assert sorted(loaded) == ["eager", "lazy_dep", "needs_dep"], loaded
+        assert manager.is_lazy("lazy_one")
+
+        loaded.clear()
+        manager.activate_trigger("files_dropped")
+        assert loaded == ["lazy_one"], loaded
+
+        # 关闭延迟激活模式后全部在启动时加载
+        manager.lazy_activation = False
+        loaded.clear()
+        manager.load_all_plugins()
+        assert len(loaded) == 4, loaded
+        print("✅ 延迟激活测试通过")
+    finally:
+        shutil.rmtree(root)
+
+
+def test_trigger_delivers_payload():
+    """测试触发事件激活插件并调用 on_trigger()，拖放到欢迎页面的文件会触发 files_dropped"""
+    print("\n测试触发事件...")
+    from PySide6.QtWidgets import QApplication, QMainWindow
+    from utils.plugin_base import BasePlugin, PluginMetadata
+    from utils.plugin_manager import PluginManager
+
+    class RecordingPlugin(BasePlugin):
+        def __init__(self, fail=False):
+            super().__init__()
+            self.fail = fail
+            self.received = []
+
+        def get_metadata(self):
+            return PluginMetadata("Recording", "1.0.0", "", "")
+
+        def initialize(self, main_window):
+            return True
+
+        def on_trigger(self, trigger, payload=None):
+            if self.fail:
+                raise RuntimeError("处理失败")
+            self.received.append((trigger, payload))
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        _create_plugin(root, "a_broken", {"name": "Broken", "lazy": True, "triggers": ["files_dropped"]})
+        _create_plugin(root, "viewer", {"name": "Viewer", "lazy": True, "triggers": ["files_dropped"]})
+        _create_plugin(root, "other", {"name": "Other", "lazy": True, "triggers": ["opened"]})
+
+        manager = PluginManager(str(root))
+        manager.discover_plugins()
+
+        def fake_load(name):
+            manager.plugins[name] = RecordingPlugin(fail=(name == "a_broken"))
+            return True
+
+        manager.load_plugin = fake_load
+
+        # 插件处理事件出错时不影响其他插件
+        activated = manager.activate_trigger("files_dropped", ["/tmp/a.txt"])
+        assert len(activated) == 2 and "other" not in manager.plugins
+        viewer = manager.get_plugin("viewer")
+        assert viewer.received == [("files_dropped", ["/tmp/a.txt"])], viewer.received
+
+        # 已激活的插件同样收到之后的事件
+        manager.activate_trigger("files_dropped", ["/tmp/b.txt"])
+        assert viewer.received[-1] == ("files_dropped", ["/tmp/b.txt"])
+
+        # 拖放到欢迎页面的文件触发 files_dropped 事件
+        from gui.tab1 import WelcomeTab
+        from utils.notification import setup_notification_manager
+
+        QApplication.instance() or QApplication(sys.argv)
+        setup_notification_manager()
+        window = QMainWindow()
+        window.plugin_manager = manager
+        tab = WelcomeTab(window)
+        dropped = str(root / "viewer" / "plugin.json")
+        tab.handle_dropped_files([dropped])
+        assert viewer.received[-1] == ("files_dropped", [dropped]), viewer.received
+        assert len(viewer.received) == 3
+        print("✅ 触发事件测试通过")
+    finally:
+        shutil.rmtree(root)
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始插件清单测试\n")
+
+    tests = [
+        test_discover_without_import,
+        test_index_cache_and_invalidation,
+        test_dependency_order,
+        test_lazy_plugins_skipped_at_startup,
+        test_trigger_delivers_payload,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+单实例测试
+验证再次启动的进程能把命令行参数转发给已运行的实例（相对路径按发送方的工作目录解析），
+没有实例运行时立即返回，同一时刻只有一个实例能监听
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 在子进程中模拟再次启动程序：只导入单实例模块并转发参数
+FORWARD_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from utils.single_instance import forward_to_running_instance
+forwarded = forward_to_running_instance({name!r}, sys.argv[1:])
+print(f"{{(time.perf_counter() - start) * 1000:.1f}}")
+print("logger" if "utils.logger" in sys.modules else "no-logger")
+sys.exit(0 if forwarded else 1)
+"""
+
+
+def server_name():
+    """每次测试使用不同的服务器名称，避免与正在运行的程序冲突"""
+    from utils.single_instance import instance_server_name
+    return instance_server_name(f"test-single-instance-{os.getpid()}-{time.monotonic_ns()}")
+
+
+def run_second_instance(app, name, args, cwd):
+    """在子进程中转发参数，同时在当前进程中处理事件"""
+    process = subprocess.Popen([sys.executable, "-c", FORWARD_SCRIPT.format(root=ROOT, name=name), *args],
+                               cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 10
+    while process.poll() is None and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    stdout, stderr = process.communicate(timeout=5)
+    return process.returncode, stdout.split(), stderr
+
+
+def test_forward_to_running_instance():
+    """测试转发参数到已运行的实例"""
+    print("测试转发参数...")
+    from PySide6.QtWidgets import QApplication
+    from utils.single_instance import SingleInstanceServer
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    name = server_name()
+    server = SingleInstanceServer(name)
+    assert server.listen()
+    received = []
+    server.message_received.connect(received.append)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "report.txt").write_text("data", encoding="utf-8")
+            code, output, stderr = run_second_instance(app, name, ["report.txt", "--flag", "missing.txt"], tmp)
+            deadline = time.monotonic() + 2
+            while not received and time.monotonic() < deadline:
+                app.processEvents()
+
+            assert code == 0, stderr
+            assert received == [[os.path.join(tmp, "report.txt"), "--flag", "missing.txt"]], received
+            assert output[1] == "no-logger", "转发参数的进程不应初始化日志"
+            print(f"  - 转发耗时（含导入模块）: {output[0]} ms")
+    finally:
+        server.close()
+    print("✅ 转发参数测试通过")
+
+
+def test_no_running_instance():
+    """测试没有实例运行时立即返回 False"""
+    print("\n测试没有运行的实例...")
+    from PySide6.QtWidgets import QApplication
+    from utils.single_instance import forward_to_running_instance
+
+    QApplication.instance() or QApplication(sys.argv)
+    start = time.perf_counter()
+    assert forward_to_running_instance(server_name(), ["a.txt"]) is False
+    elapsed = (time.perf_counter() - start) * 1000
+    assert elapsed < 400, f"没有实例时不应等待超时: {elapsed:.1f} ms"
+    print(f"  - 耗时: {elapsed:.2f} ms")
+    print("✅ 没有运行的实例测试通过")
+
+
+def test_unresponsive_instance():
+    """测试已运行的实例不确认（卡死）或回复无效的确认时返回 False，当前进程应正常启动"""
+    print("\n测试已运行的实例无响应...")
+    import socket
+    import threading
+    from PySide6.QtNetwork import QLocalServer
+    from PySide6.QtWidgets import QApplication
+    from utils.single_instance import forward_to_running_instance
+
+    QApplication.instance() or QApplication(sys.argv)
+    # 监听但不处理事件，模拟 GUI 线程卡死的实例：连接和发送都能成功，但不会回复确认
+    hung = QLocalServer()
+    name = server_name()
+    assert hung.listen(name)
+    try:
+        start = time.perf_counter()
+        assert forward_to_running_instance(name, ["a.txt"], ack_timeout_ms=300) is False
+        elapsed = (time.perf_counter() - start) * 1000
+        assert elapsed < 2000, f"应在确认超时后返回: {elapsed:.1f} ms"
+        print(f"  - 等待确认 {elapsed:.0f} ms 后返回")
+    finally:
+        hung.close()
+
+    if hasattr(socket, "AF_UNIX"):
+        # 回复的不是确认
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "instance.sock")
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            listener.bind(path)
+            listener.listen(1)
+
+            def reply_garbage():
+                conn, _ = listener.accept()
+                with conn:
+                    while b"\n" not in conn.recv(4096):
+                        pass
+                    conn.sendall(b"busy\n")
+
+            thread = threading.Thread(target=reply_garbage, daemon=True)
+            thread.start()
+            try:
+                assert forward_to_running_instance(path, ["a.txt"]) is False
+            finally:
+                thread.join(5)
+                listener.close()
+    print("✅ 已运行的实例无响应测试通过")
+
+
+def test_only_one_server():
+    """测试同一时刻只有一个实例能监听，关闭后可以重新监听"""
+    print("\n测试唯一监听...")
+    from PySide6.QtWidgets import QApplication
+    from utils.single_instance import SingleInstanceServer
+
+    QApplication.instance() or QApplication(sys.argv)
+    name = server_name()
+    first = SingleInstanceServer(name)
+    second = SingleInstanceServer(name)
+    try:
+        assert first.listen()
+        assert not second.listen(), "已有实例在监听时不应再监听"
+        first.close()
+        assert second.listen(), "第一个实例退出后应能重新监听"
+    finally:
+        first.close()
+        second.close()
+    print("✅ 唯一监听测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始单实例测试\n")
+
+    tests = [
+        test_forward_to_running_instance,
+        test_no_running_instance,
+        test_unresponsive_instance,
+        test_only_one_server,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+启动性能分析测试
+验证阶段嵌套深度（多个线程同时记录时互不干扰）、未启用时的空上下文，
+以及 finish() 写出的 Chrome Trace 文件内容
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_phase_nesting():
+    """测试嵌套阶段的深度和时间范围"""
+    print("测试阶段嵌套...")
+    from utils.startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("outer"):
+        with profiler.phase("inner", category="plugin"):
+            with profiler.phase("innermost"):
+                pass
+        profiler.mark("point")
+    with profiler.phase("second"):
+        pass
+
+    phases = {p.name: p for p in profiler.phases}
+    assert phases["outer"].depth == 0
+    assert phases["inner"].depth == 1 and phases["inner"].category == "plugin"
+    assert phases["innermost"].depth == 2
+    assert phases["point"].depth == 1 and phases["point"].wall_ns == 0
+    assert phases["second"].depth == 0, "阶段结束后深度应恢复"
+
+    outer, inner = phases["outer"], phases["inner"]
+    assert outer.start_ns <= inner.start_ns
+    assert inner.start_ns + inner.wall_ns <= outer.start_ns + outer.wall_ns
+
+    # 阶段内抛出异常时深度同样恢复
+    try:
+        with profiler.phase("failing"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    with profiler.phase("after_error"):
+        pass
+    assert {p.name: p for p in profiler.phases}["after_error"].depth == 0
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler.finish(Path(tmp))
+    print("✅ 阶段嵌套测试通过")
+
+
+def test_thread_depth():
+    """测试多个线程同时记录阶段时嵌套深度互不影响"""
+    print("\n测试多线程阶段深度...")
+    from utils.startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler(enabled=True)
+    barrier = threading.Barrier(3)
+
+    def worker(index):
+        with profiler.phase(f"import:{index}", category="plugin"):
+            # 三个线程都已进入外层阶段后再打开内层阶段
+            barrier.wait()
+            with profiler.phase(f"import:{index}:child", category="plugin"):
+                barrier.wait()
+
+    with profiler.phase("main"):
+        threads = [threading.Thread(target=worker, args=(i,), name=f"worker-{i}") for i in range(2)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        with profiler.phase("main:child"):
+            barrier.wait()
+        for thread in threads:
+            thread.join()
+
+    phases = {p.name: p for p in profiler.phases}
+    assert phases["main"].depth == 0 and phases["main:child"].depth == 1
+    for i in range(2):
+        assert phases[f"import:{i}"].depth == 0, phases[f"import:{i}"].depth
+        assert phases[f"import:{i}:child"].depth == 1
+        assert phases[f"import:{i}"].thread_id != phases["main"].thread_id
+    # 工作线程的阶段不计入合计
+    summary = profiler.format_summary()
+    assert "[worker-0]" in summary
+    total = float(summary.splitlines()[-1].split()[-1])
+    assert abs(total - phases["main"].wall_ns / 1e6) < 0.2, summary
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler.finish(Path(tmp))
+    print("✅ 多线程阶段深度测试通过")
+
+
+def test_disabled_profiler():
+    """测试未启用和结束后 phase() 返回空上下文且不记录"""
+    print("\n测试未启用的分析器...")
+    from utils.startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler(enabled=False)
+    assert isinstance(profiler.phase("noop"), nullcontext)
+    with profiler.phase("noop"):
+        pass
+    profiler.mark("noop")
+    assert profiler.phases == []
+    assert profiler.finish() is None
+
+    profiler = StartupProfiler(enabled=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        assert profiler.finish(Path(tmp)) is not None
+        assert isinstance(profiler.phase("late"), nullcontext)
+        profiler.mark("late")
+        assert profiler.phases == []
+        assert profiler.finish(Path(tmp)) is None, "重复调用 finish() 不应再写文件"
+        assert len(os.listdir(tmp)) == 1
+    print("✅ 未启用的分析器测试通过")
+
+
+def test_chrome_trace_file():
+    """测试 finish() 写出的 Chrome Trace 文件"""
+    print("\n测试 Chrome Trace 文件...")
+    from utils.startup_profiler import StartupProfiler
+
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("create_qapplication"):
+        data = [0] * 100_000
+    worker = threading.Thread(target=_record_in_thread, args=(profiler,), name="plugin-import_1")
+    worker.start()
+    worker.join()
+    profiler.mark("first_paint")
+    del data
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = profiler.finish(Path(tmp))
+        assert trace_path is not None and trace_path.parent == Path(tmp)
+        assert trace_path.name.startswith("startup_trace_") and trace_path.suffix == ".json"
+        with open(trace_path, encoding="utf-8") as f:
+            trace = json.load(f)
+
+    assert trace["displayTimeUnit"] == "ms"
+    events = trace["traceEvents"]
+    pid = os.getpid()
+    assert all(event["pid"] == pid for event in events)
+
+    metadata = [e for e in events if e["ph"] == "M"]
+    assert metadata[0]["name"] == "process_name"
+    thread_names = {e["args"]["name"]: e["tid"] for e in metadata if e["name"] == "thread_name"}
+    assert "plugin-import_1" in thread_names and threading.main_thread().name in thread_names
+
+    complete = {e["name"]: e for e in events if e["ph"] == "X"}
+    app_event = complete["create_qapplication"]
+    assert app_event["cat"] == "startup" and app_event["dur"] >= 0
+    assert app_event["args"]["memory_kb"] > 300, "应统计阶段内分配的内存"
+    assert "cpu_ms" in app_event["args"]
+    assert complete["import:worker"]["cat"] == "plugin"
+    assert complete["import:worker"]["tid"] == thread_names["plugin-import_1"]
+    assert complete["import:worker"]["tid"] != app_event["tid"]
+
+    instant = [e for e in events if e["ph"] == "i"]
+    assert [e["name"] for e in instant] == ["first_paint"] and "dur" not in instant[0]
+
+    timed = [e for e in events if e["ph"] != "M"]
+    assert [e["ts"] for e in timed] == sorted(e["ts"] for e in timed), "事件应按开始时间排序"
+    print("✅ Chrome Trace 文件测试通过")
+
+
+def _record_in_thread(profiler):
+    with profiler.phase("import:worker", category="plugin"):
+        pass
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始启动性能分析测试\n")
+
+    tests = [
+        test_phase_nesting,
+        test_thread_depth,
+        test_disabled_profiler,
+        test_chrome_trace_file,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
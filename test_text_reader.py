@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+流式文本读取测试
+验证编码判断、按块增量解码的逐行读取（块边界截断多字节字符和 \\r\\n 时与 open() 结果一致）
+以及 mmap 行偏移索引的随机读取
+"""
+
+import codecs
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SAMPLE_TEXT = "第一行 first\r\nsecond 第二行\n\n第四行\rfifth é\r\n" + "长行" * 500 + "\nlast"
+
+
+def write(directory: str, name: str, data: bytes) -> Path:
+    path = Path(directory) / name
+    path.write_bytes(data)
+    return path
+
+
+def test_sniff_encoding():
+    """测试 BOM、UTF-16、UTF-8、GB18030 和回退编码的判断"""
+    print("测试编码判断...")
+    from utils.text_reader import sniff_encoding
+
+    cases = [
+        (codecs.BOM_UTF8 + SAMPLE_TEXT.encode("utf-8"), "utf-8-sig"),
+        (SAMPLE_TEXT.encode("utf-16"), "utf-16"),
+        (SAMPLE_TEXT.encode("utf-32"), "utf-32"),
+        ("plain ascii text\n".encode("utf-16-le"), "utf-16-le"),
+        ("plain ascii text\n".encode("utf-16-be"), "utf-16-be"),
+        (b"plain ascii\n", "utf-8"),
+        (b"", "utf-8"),
+        (SAMPLE_TEXT.encode("utf-8"), "utf-8"),
+        (SAMPLE_TEXT.replace("é", "").encode("gb18030"), "gb18030"),
+        (bytes(range(0x80, 0x100)) * 4, "latin-1"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (data, expected) in enumerate(cases):
+            path = write(tmp, f"f{i}.txt", data)
+            assert sniff_encoding(path) == expected, (expected, sniff_encoding(path))
+        # 样本在多字节字符中间截断时仍判断为 UTF-8
+        path = write(tmp, "cut.txt", ("中" * 1000).encode("utf-8"))
+        assert sniff_encoding(path, sample_size=1000) == "utf-8"
+    print(f"  - {len(cases) + 1} 种情况")
+    print("✅ 编码判断测试通过")
+
+
+def test_iter_text_lines():
+    """测试各种块大小下与文本模式 open() 逐行读取的结果一致"""
+    print("\n测试逐行读取...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoding in ("utf-8", "utf-8-sig", "gb18030", "utf-16"):
+            text = SAMPLE_TEXT if encoding != "gb18030" else SAMPLE_TEXT.replace("é", "")
+            path = write(tmp, f"{encoding}.txt", text.encode(encoding))
+            with open(path, encoding=encoding) as f:
+                expected = list(f)
+            for chunk_size in (1, 2, 3, 7, 64, 1024 * 1024):
+                lines = list(file_utils.iter_text_lines(path, keepends=True, chunk_size=chunk_size))
+                assert lines == expected, (encoding, chunk_size)
+            lines = list(file_utils.iter_text_lines(path, chunk_size=5))
+            assert lines == [line.rstrip("\n") for line in expected]
+
+        # 以换行结尾的文件没有额外的空行；块末尾恰好是 '\r'
+        path = write(tmp, "crlf.txt", b"a\r\nb\r\n")
+        assert list(file_utils.iter_text_lines(path, chunk_size=2)) == ["a", "b"]
+        assert list(file_utils.iter_text_lines(write(tmp, "empty.txt", b""))) == []
+
+        path = write(tmp, "bad.txt", b"ok\n\xff\xfe bad\n")
+        try:
+            list(file_utils.iter_text_lines(path, encoding="utf-8"))
+            assert False, "应抛出 UnicodeDecodeError"
+        except UnicodeDecodeError:
+            pass
+        assert list(file_utils.iter_text_lines(path, encoding="utf-8", errors="replace"))[1] == "�� bad"
+    print("✅ 逐行读取测试通过")
+
+
+def test_line_index():
+    """测试行偏移索引的随机读取、切片、负数索引和各种行尾"""
+    print("\n测试行偏移索引...")
+    from utils import file_utils
+    from utils.text_reader import LineIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = [f"第 {i} 行 line {i}" * (i % 7) for i in range(5000)]
+        for ending in ("\n", "\r\n"):
+            for trailing in (True, False):
+                data = ending.join(lines) + (ending if trailing else "")
+                path = write(tmp, "lines.txt", data.encode("utf-8"))
+                progress = []
+                with LineIndex(path, progress=lambda done, total: progress.append((done, total))) as index:
+                    assert len(index) == len(lines)
+                    assert index.encoding == "utf-8"
+                    for n in (0, 1, 6, 2500, 4999, -1, -5000):
+                        assert index[n] == lines[n], (ending, trailing, n)
+                    assert index[100:110] == lines[100:110]
+                    assert list(index) == lines
+                    assert index.offset(1) == len(lines[0].encode("utf-8")) + len(ending)
+                    try:
+                        index[5000]
+                        assert False, "应抛出 IndexError"
+                    except IndexError:
+                        pass
+                assert progress[-1] == (path.stat().st_size, path.stat().st_size)
+
+        # BOM、GB18030、空文件、只有换行的文件
+        path = write(tmp, "bom.txt", codecs.BOM_UTF8 + "甲\n乙".encode("utf-8"))
+        with file_utils.LineIndex(path) as index:
+            assert index[:] == ["甲", "乙"] and index.offset(0) == 3
+        path = write(tmp, "gbk.txt", "甲\n乙\n".encode("gb18030"))
+        with LineIndex(path) as index:
+            assert index.encoding == "gb18030" and index[:] == ["甲", "乙"]
+        with LineIndex(write(tmp, "empty.txt", b"")) as index:
+            assert len(index) == 0 and list(index) == []
+        with LineIndex(write(tmp, "newlines.txt", b"\n\n")) as index:
+            assert index[:] == ["", ""]
+        try:
+            LineIndex(write(tmp, "utf16.txt", "a\nb".encode("utf-16")))
+            assert False, "UTF-16 应抛出 ValueError"
+        except ValueError:
+            pass
+    print("✅ 行偏移索引测试通过")
+
+
+def test_read_text_file_encoding():
+    """测试 read_text_file(encoding=None) 自动判断编码"""
+    print("\n测试 read_text_file 自动判断编码...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write(tmp, "gbk.txt", "中文内容".encode("gb18030"))
+        assert file_utils.read_text_file(str(path), encoding=None) == "中文内容"
+        assert file_utils.read_text_file(str(path)) is None, "默认仍按 UTF-8 读取"
+    print("✅ read_text_file 自动判断编码测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始流式文本读取测试\n")
+
+    tests = [
+        test_sniff_encoding,
+        test_iter_text_lines,
+        test_line_index,
+        test_read_text_file_encoding,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
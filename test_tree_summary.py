@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+目录统计测试
+验证 summarize_tree 的总大小、文件/目录数、扩展名统计和最大文件与逐个 os.stat 的结果一致（单线程和多线程），
+以及部分结果、取消、排除模式、硬链接去重、符号链接策略、单个文件/不存在的路径和扫描异常
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def make_tree(root: str, dirs: int = 12, files_per_dir: int = 25):
+    """创建测试目录树，文件大小各不相同"""
+    extensions = (".txt", ".PY", ".json", "")
+    for d in range(dirs):
+        directory = Path(root, f"d{d % 4}", f"sub{d}")
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(files_per_dir):
+            size = (d * files_per_dir + i) * 37
+            Path(directory, f"f{i}{extensions[i % len(extensions)]}").write_bytes(b"x" * size)
+
+
+def expected_summary(root: str):
+    """用 os.walk + os.stat 逐个统计"""
+    total = files = dirs = 0
+    extensions = {}
+    sizes = []
+    for directory, subdirs, names in os.walk(root):
+        dirs += len(subdirs)
+        for name in names:
+            path = os.path.join(directory, name)
+            size = os.stat(path).st_size
+            total += size
+            files += 1
+            ext = os.path.splitext(name)[1].lower()
+            count, ext_size = extensions.get(ext, (0, 0))
+            extensions[ext] = (count + 1, ext_size + size)
+            sizes.append((size, path))
+    return total, files, dirs, extensions, sorted(sizes, reverse=True)
+
+
+def test_matches_serial_walk():
+    """测试结果与逐个统计一致"""
+    print("测试统计结果...")
+    from utils import file_utils
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp)
+        total, files, dirs, extensions, sizes = expected_summary(tmp)
+        for workers in (1, 4):
+            summary = file_utils.summarize_tree(tmp, workers=workers, top_n=5)
+            assert summary.complete and not summary.cancelled
+            assert (summary.total_size, summary.file_count, summary.dir_count) == (total, files, dirs), summary
+            assert {ext: (s.count, s.size) for ext, s in summary.extensions.items()} == extensions
+            assert list(summary.largest) == sizes[:5]
+            assert summary.top_extensions(1)[0][1].size == max(size for _, size in extensions.values())
+        print(f"  - {files} 个文件，{dirs} 个目录，{total} 字节，{summary.elapsed * 1000:.1f} ms")
+    print("✅ 统计结果测试通过")
+
+
+def test_partial_results():
+    """测试部分结果逐步增加，最后一个为完整结果"""
+    print("\n测试部分结果...")
+    from utils.file_utils import iter_tree_summary, summarize_tree
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, dirs=40, files_per_dir=5)
+        for workers in (1, 3):
+            snapshots = list(iter_tree_summary(tmp, workers=workers, interval=0))
+            assert len(snapshots) > 1, "应返回部分结果"
+            assert all(not s.complete for s in snapshots[:-1]) and snapshots[-1].complete
+            counts = [s.file_count for s in snapshots]
+            assert counts == sorted(counts), "部分结果的文件数应递增"
+
+        partial = []
+        final = summarize_tree(tmp, workers=2, progress=partial.append, interval=0)
+        assert partial and all(not s.complete for s in partial) and final.complete
+        print(f"  - 收到 {len(partial)} 个部分结果")
+    print("✅ 部分结果测试通过")
+
+
+def test_cancel():
+    """测试取消和提前停止迭代"""
+    print("\n测试取消...")
+    from utils.file_utils import iter_tree_summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_tree(tmp, dirs=60, files_per_dir=5)
+        for workers in (1, 4):
+            cancel = threading.Event()
+            snapshots = []
+            for summary in iter_tree_summary(tmp, workers=workers, cancel_event=cancel, interval=0):
+                snapshots.append(summary)
+                cancel.set()
+            assert len(snapshots) == 2, len(snapshots)
+            assert snapshots[-1].cancelled and not snapshots[-1].complete
+
+        iterator = iter_tree_summary(tmp, workers=4, interval=0)
+        next(iterator)
+        iterator.close()
+        assert not any(t.name.startswith("tree-summary") for t in threading.enumerate())
+    print("✅ 取消测试通过")
+
+
+def test_exclude_links_and_special_paths():
+    """测试排除模式、硬链接去重、符号链接策略、单个文件和不存在的路径"""
+    print("\n测试排除模式和链接...")
+    from utils.file_utils import summarize_tree
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Path(tmp, "keep").mkdir()
+        Path(tmp, "skip").mkdir()
+        Path(tmp, "keep", "a.bin").write_bytes(b"a" * 1000)
+        Path(tmp, "skip", "b.bin").write_bytes(b"b" * 5000)
+        Path(tmp, "c.log").write_bytes(b"c" * 10)
+
+        summary = summarize_tree(tmp, exclude=["skip", "*.log"])
+        assert (summary.file_count, summary.total_size, summary.dir_count) == (1, 1000, 1)
+
+        try:
+            os.link(os.path.join(tmp, "keep", "a.bin"), os.path.join(tmp, "a_hardlink.bin"))
+            os.symlink(os.path.join(tmp, "skip"), os.path.join(tmp, "keep", "skip_link"))
+        except (OSError, NotImplementedError, AttributeError):
+            print("  - 当前系统不支持链接，跳过链接测试")
+        else:
+            summary = summarize_tree(tmp, exclude="*.log", workers=2)
+            # 硬链接只计算一次；指向目录的符号链接按链接本身统计，不进入
+            link_size = os.lstat(os.path.join(tmp, "keep", "skip_link")).st_size
+            assert summary.total_size == 1000 + 5000 + link_size, summary
+            assert summary.file_count == 3 and summary.dir_count == 2
+
+            followed = summarize_tree(tmp, exclude="*.log", follow_symlinks=True, workers=2)
+            # 跟随链接时 skip 目录只遍历一次
+            assert followed.total_size == 6000 and followed.file_count == 2, followed
+
+        single = summarize_tree(os.path.join(tmp, "c.log"))
+        assert single.complete and single.file_count == 1 and single.total_size == 10
+        assert single.extensions[".log"].count == 1
+
+        missing = summarize_tree(os.path.join(tmp, "missing"))
+        assert missing.complete and missing.error_count == 1 and missing.file_count == 0
+    print("✅ 排除模式和链接测试通过")
+
+
+def test_scan_error_raised():
+    """测试扫描目录时的其他异常（如排除模式匹配出错）在调用线程中抛出，而不是一直等待"""
+    print("\n测试扫描异常...")
+    from utils.dir_walk import GlobMatcher
+    from utils.file_utils import summarize_tree
+
+    def failing_match(self, name, rel=None):
+        if name == "bad":
+            raise ValueError("匹配出错")
+        return False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("a", "b", "c"):
+            Path(tmp, name, "bad").mkdir(parents=True)
+            Path(tmp, name, "file.txt").write_bytes(b"x")
+
+        original_match = GlobMatcher.match
+        GlobMatcher.match = failing_match
+        try:
+            for workers in (1, 4):
+                outcome = []
+
+                def run():
+                    try:
+                        summarize_tree(tmp, exclude="*.log", workers=workers, interval=0)
+                    except ValueError as e:
+                        outcome.append(e)
+
+                thread = threading.Thread(target=run, daemon=True)
+                thread.start()
+                thread.join(timeout=10)
+                assert not thread.is_alive(), f"workers={workers} 时扫描异常后一直等待"
+                assert len(outcome) == 1 and str(outcome[0]) == "匹配出错", outcome
+        finally:
+            GlobMatcher.match = original_match
+        assert not any(t.name.startswith("tree-summary") for t in threading.enumerate())
+    print("✅ 扫描异常测试通过")
+
+
+def main():
+    """主测试函数"""
+    print("🚀 开始目录统计测试\n")
+
+    tests = [
+        test_matches_serial_walk,
+        test_partial_results,
+        test_cancel,
+        test_exclude_links_and_special_paths,
+        test_scan_error_raised,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n📊 测试结果: {passed}/{len(tests)} 通过")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
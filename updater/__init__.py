@@ -1,12 +1,28 @@
 """
 自动更新模块
 提供完整的应用程序自动更新功能
+
+公开名称在首次访问时才导入对应子模块（模块级 __getattr__）。
 """
 
-from .update_manager import UpdateManager
-from .update_checker import UpdateChecker, VersionInfo
-from .update_dialogs import UpdateDialog, DownloadDialog
-from .file_manager import FileManager
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .update_manager import UpdateManager
+    from .update_checker import UpdateChecker, VersionInfo
+    from .update_dialogs import UpdateDialog, DownloadDialog
+    from .file_manager import FileManager
+
+# 公开名称 -> (子模块, 属性名)
+_LAZY_EXPORTS = {
+    'UpdateManager': ('.update_manager', 'UpdateManager'),
+    'UpdateChecker': ('.update_checker', 'UpdateChecker'),
+    'VersionInfo': ('.update_checker', 'VersionInfo'),
+    'UpdateDialog': ('.update_dialogs', 'UpdateDialog'),
+    'DownloadDialog': ('.update_dialogs', 'DownloadDialog'),
+    'FileManager': ('.file_manager', 'FileManager'),
+}
 
 __all__ = [
     'UpdateManager',
@@ -20,3 +36,19 @@ __all__ = [
 __version__ = '1.0.0'
 __author__ = 'GUI Base Template'
 __description__ = '自动更新功能模块'
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入公开名称（首次访问后缓存到模块命名空间）"""
+    try:
+        module_name, attr_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,17 +4,17 @@
 """
 
 import os
-import hashlib
 import tempfile
 import urllib.request
 import urllib.error
 from pathlib import Path
 from typing import Optional, Callable
 from PySide6.QtCore import QObject, QThread, Signal
-from utils.logger import get_logger
+from utils.logger import get_logger, is_enabled, CHANNEL_UPDATE
 from utils.config import app_config
+from utils.hash_cache import get_hash_cache
 
-logger = get_logger(__name__)
+logger = get_logger(__name__, channel=CHANNEL_UPDATE)
 
 
 class DownloadWorker(QThread):
@@ -45,8 +45,8 @@ class DownloadWorker(QThread):
     
     def _download_file(self):
         """下载文件"""
-        logger.info(f"开始下载文件: {self.url}")
-        logger.info(f"保存路径: {self.file_path}")
+        logger.info("开始下载文件: {}", self.url)
+        logger.info("保存路径: {}", self.file_path)
 
         try:
             # 创建请求
@@ -57,11 +57,11 @@ class DownloadWorker(QThread):
                 }
             )
 
-            logger.debug(f"下载超时时间: {self.timeout}秒")
+            logger.debug("下载超时时间: {}秒", self.timeout)
 
             # 打开连接
             with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                logger.debug(f"下载响应状态码: {response.status}")
+                logger.debug("下载响应状态码: {}", response.status)
 
                 if response.status != 200:
                     logger.error(f"服务器返回错误状态码: {response.status}")
@@ -71,17 +71,21 @@ class DownloadWorker(QThread):
                 # 获取文件大小
                 content_length = response.headers.get('Content-Length')
                 total_size = int(content_length) if content_length else 0
-                logger.info(f"文件大小: {total_size} 字节 ({total_size / 1024 / 1024:.2f} MB)")
+                logger.info("文件大小: {} 字节 ({:.2f} MB)", total_size, total_size / 1024 / 1024)
 
                 # 创建目标目录
                 target_dir = Path(self.file_path).parent
                 target_dir.mkdir(parents=True, exist_ok=True)
-                logger.debug(f"创建目标目录: {target_dir}")
+                logger.debug("创建目标目录: {}", target_dir)
 
                 # 下载文件
                 downloaded_size = 0
                 chunk_size = 8192
 
+                # 每下载10MB记录一次进度（DEBUG 未启用时循环内不做任何日志相关的计算）
+                log_interval = 10 * 1024 * 1024
+                next_log_size = log_interval if is_enabled("DEBUG") else None
+
                 logger.info("开始下载文件内容...")
                 with open(self.file_path, 'wb') as f:
                     while not self._cancelled:
@@ -95,9 +99,10 @@ class DownloadWorker(QThread):
                         # 发送进度信号
                         self.progress_updated.emit(downloaded_size, total_size)
 
-                        # 每下载10MB记录一次进度
-                        if downloaded_size % (10 * 1024 * 1024) == 0:
-                            logger.debug(f"下载进度: {downloaded_size / 1024 / 1024:.2f} MB / {total_size / 1024 / 1024:.2f} MB")
+                        if next_log_size is not None and downloaded_size >= next_log_size:
+                            next_log_size += log_interval
+                            logger.debug("下载进度: {:.2f} MB / {:.2f} MB",
+                                         downloaded_size / 1024 / 1024, total_size / 1024 / 1024)
 
                 if self._cancelled:
                     logger.warning("下载被用户取消")
@@ -109,8 +114,8 @@ class DownloadWorker(QThread):
                         pass
                     self.download_failed.emit("下载已取消")
                 else:
-                    logger.success(f"文件下载完成: {self.file_path}")
-                    logger.info(f"最终文件大小: {downloaded_size} 字节")
+                    logger.success("文件下载完成: {}", self.file_path)
+                    logger.info("最终文件大小: {} 字节", downloaded_size)
                     self.download_finished.emit(self.file_path)
 
         except urllib.error.URLError as e:
@@ -223,14 +228,8 @@ class FileManager(QObject):
         Returns:
             SHA256值
         """
-        sha256_hash = hashlib.sha256()
-        
-        with open(file_path, "rb") as f:
-            # 分块读取文件，避免大文件占用过多内存
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        
-        return sha256_hash.hexdigest()
+        # 文件未变化时使用缓存的结果；否则复用缓冲区分块读取，大文件使用 mmap
+        return get_hash_cache().get_or_compute(file_path, 'sha256')
     
     def cleanup_temp_files(self):
         """清理临时文件"""
@@ -9,10 +9,10 @@ import urllib.error
 from typing import Dict, Any, Optional, Tuple
 from packaging import version
 from PySide6.QtCore import QObject, QThread, Signal
-from utils.logger import get_logger
+from utils.logger import get_logger, is_enabled, CHANNEL_UPDATE
 from utils.config import app_config
 
-logger = get_logger(__name__)
+logger = get_logger(__name__, channel=CHANNEL_UPDATE)
 
 
 def clean_url(url: str) -> str:
@@ -151,7 +151,7 @@ class UpdateCheckWorker(QThread):
             远程版本信息字典，失败返回None
         """
         try:
-            logger.debug(f"创建HTTP请求到: {self.check_url}")
+            logger.debug("创建HTTP请求到: {}", self.check_url)
 
             # 创建请求
             request = urllib.request.Request(
@@ -162,17 +162,18 @@ class UpdateCheckWorker(QThread):
                 }
             )
 
-            logger.debug(f"请求头: User-Agent={app_config.app_name}/{self.current_version}")
-            logger.debug(f"超时时间: {self.timeout}秒")
+            logger.debug("请求头: User-Agent={}/{}", app_config.app_name, self.current_version)
+            logger.debug("超时时间: {}秒", self.timeout)
 
             # 发送请求
             with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                logger.debug(f"收到响应，状态码: {response.status}")
+                logger.debug("收到响应，状态码: {}", response.status)
 
                 if response.status == 200:
                     data = response.read().decode('utf-8')
-                    logger.debug(f"响应数据长度: {len(data)} 字符")
-                    logger.debug(f"响应内容: {data[:500]}...")  # 只记录前500字符
+                    logger.debug("响应数据长度: {} 字符", len(data))
+                    if is_enabled("DEBUG"):
+                        logger.debug("响应内容: {}...", data[:500])  # 只记录前500字符
 
                     json_data = json.loads(data)
                     logger.info("成功解析JSON响应")
@@ -14,11 +14,11 @@ from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 from .update_checker import VersionInfo
 from .file_manager import FileManager
-from utils.logger import get_logger
+from utils.logger import get_logger, CHANNEL_UPDATE
 from utils.config import app_config
 from utils.styles import get_dialog_button_style
 
-logger = get_logger(__name__)
+logger = get_logger(__name__, channel=CHANNEL_UPDATE)
 
 
 class UpdateDialog(QDialog):
@@ -11,11 +11,11 @@ from PySide6.QtCore import QObject, QTimer
 from .update_checker import UpdateChecker, VersionInfo
 from .update_dialogs import UpdateDialog, DownloadDialog
 from .file_manager import FileManager
-from utils.logger import get_logger
+from utils.logger import get_logger, CHANNEL_UPDATE
 from utils.config import app_config
 
 # 创建日志记录器
-logger = get_logger(__name__)
+logger = get_logger(__name__, channel=CHANNEL_UPDATE)
 
 
 class UpdateManager(QObject):
@@ -32,6 +32,7 @@ class UpdateManager(QObject):
         self.startup_check_timer = QTimer(self)
         self.startup_check_timer.setSingleShot(True)
         self.startup_check_timer.timeout.connect(self.check_for_updates_silent)
+        app_config.subscribe("auto_check_updates", self._on_auto_check_changed)
     
     def setup_connections(self):
         """设置信号连接"""
@@ -48,6 +49,12 @@ class UpdateManager(QObject):
             # 延迟3秒后检查，避免影响启动速度
             self.startup_check_timer.start(3000)
     
+    def _on_auto_check_changed(self, key: str, old_value, enabled):
+        """关闭自动检查更新时取消尚未执行的启动检查"""
+        if not enabled and self.startup_check_timer.isActive():
+            self.startup_check_timer.stop()
+            logger.info("自动检查更新已关闭，取消启动时的更新检查")
+
     def check_for_updates_manual(self):
         """手动检查更新"""
         if self.parent_window:
@@ -408,7 +415,7 @@ class UpdateManager(QObject):
             logger.info(f"更新程序URL: {version_info.update_exe_url}")
 
             # 记录更新尝试到专用日志
-            update_logger = get_logger("update_attempt")
+            update_logger = get_logger("update_attempt", channel=CHANNEL_UPDATE)
             update_logger.info(f"更新尝试开始 - 从 {app_config.current_version} 到 {version_info.version}")
 
         except Exception as e:
@@ -426,7 +433,7 @@ class UpdateManager(QObject):
             logger.info(f"更新完成，新版本: {new_version}")
 
             # 记录更新完成到专用日志
-            update_logger = get_logger("update_complete")
+            update_logger = get_logger("update_complete", channel=CHANNEL_UPDATE)
             update_logger.success(f"更新完成 - 版本更新到 {new_version}")
 
             # 注意：实际的config.json版本同步会在应用程序重启时通过
@@ -1,23 +1,56 @@
 """
 工具模块
 包含全局可用的工具和组件
+
+公开名称在首次访问时才导入对应子模块（模块级 __getattr__），
+避免 `from utils import app_logger` 之类的导入提前拉起 PySide6 控件栈。
 """
 
-from .logger import get_logger, app_logger, update_logger
-from .config import app_config
-from .exception_handler import setup_exception_handler, get_exception_handler
-from .theme import setup_theme_manager, get_theme_manager
-from .notification import setup_notification_manager, get_notification_manager
-from .system_tray import SystemTray
-from .plugin_manager import setup_plugin_manager, get_plugin_manager
-from . import file_utils
-from .drag_drop import DragDropMixin, DragDropWidget, create_drag_drop_area
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .logger import get_logger, app_logger, update_logger
+    from .config import app_config
+    from .config_watcher import setup_config_watcher, get_config_watcher
+    from .exception_handler import setup_exception_handler, get_exception_handler
+    from .theme import setup_theme_manager, get_theme_manager
+    from .notification import setup_notification_manager, get_notification_manager
+    from .system_tray import SystemTray
+    from .plugin_manager import setup_plugin_manager, get_plugin_manager
+    from . import file_utils
+    from .drag_drop import DragDropMixin, DragDropWidget, create_drag_drop_area
+
+# 公开名称 -> (子模块, 属性名)；属性名为 None 表示导出子模块本身
+_LAZY_EXPORTS = {
+    'get_logger': ('.logger', 'get_logger'),
+    'app_logger': ('.logger', 'app_logger'),
+    'update_logger': ('.logger', 'update_logger'),
+    'app_config': ('.config', 'app_config'),
+    'setup_config_watcher': ('.config_watcher', 'setup_config_watcher'),
+    'get_config_watcher': ('.config_watcher', 'get_config_watcher'),
+    'setup_exception_handler': ('.exception_handler', 'setup_exception_handler'),
+    'get_exception_handler': ('.exception_handler', 'get_exception_handler'),
+    'setup_theme_manager': ('.theme', 'setup_theme_manager'),
+    'get_theme_manager': ('.theme', 'get_theme_manager'),
+    'setup_notification_manager': ('.notification', 'setup_notification_manager'),
+    'get_notification_manager': ('.notification', 'get_notification_manager'),
+    'SystemTray': ('.system_tray', 'SystemTray'),
+    'setup_plugin_manager': ('.plugin_manager', 'setup_plugin_manager'),
+    'get_plugin_manager': ('.plugin_manager', 'get_plugin_manager'),
+    'file_utils': ('.file_utils', None),
+    'DragDropMixin': ('.drag_drop', 'DragDropMixin'),
+    'DragDropWidget': ('.drag_drop', 'DragDropWidget'),
+    'create_drag_drop_area': ('.drag_drop', 'create_drag_drop_area'),
+}
 
 __all__ = [
     'get_logger',
     'app_logger',
     'update_logger',
     'app_config',
+    'setup_config_watcher',
+    'get_config_watcher',
     'setup_exception_handler',
     'get_exception_handler',
     'setup_theme_manager',
@@ -36,3 +69,20 @@ __all__ = [
 __version__ = '1.0.0'
 __author__ = 'GUI Base Template'
 __description__ = '工具组件模块'
+
+
+def __getattr__(name: str) -> Any:
+    """按需导入公开名称（首次访问后缓存到模块命名空间）"""
+    try:
+        module_name, attr_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr_name is None else getattr(module, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,362 @@
+"""
+异步日志模块
+为 loguru 提供带有界队列的非阻塞日志输出：记录日志的线程只把格式化后的消息放入队列，
+由后台线程写入文件；日志轮转后的压缩也在单独的线程中进行
+
+本模块只被 utils.logger 使用，不依赖 PySide6。
+"""
+
+import os
+import queue
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# 队列满时的处理策略
+OVERFLOW_DROP_NEWEST = "drop_newest"   # 丢弃新记录
+OVERFLOW_DROP_OLDEST = "drop_oldest"   # 丢弃队列中最旧的记录
+OVERFLOW_BLOCK = "block"               # 阻塞等待（最多 block_timeout 秒），超时后丢弃
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_BLOCK)
+
+# 达到该级别（ERROR）的记录在队列满时总是阻塞等待，不会被直接丢弃
+_ALWAYS_BLOCK_LEVEL = 40
+
+# 队列中的停止标记
+_STOP = object()
+
+
+class BackgroundCompressor:
+    """后台日志压缩器
+
+    作为 loguru 的 compression 参数使用：轮转时只提交压缩任务，
+    由单独的线程把旧日志文件压缩为 zip 并删除原文件。
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, path: str):
+        """提交压缩任务（loguru 在轮转线程中调用）"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+            self._executor.submit(self._compress, path)
+
+    @staticmethod
+    def _compress(path: str):
+        """压缩日志文件为 path.zip（与 loguru 的 compression="zip" 格式一致）"""
+        try:
+            archive_path = f"{path}.zip"
+            tmp_path = f"{archive_path}.tmp"
+            with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.write(path, os.path.basename(path))
+            os.replace(tmp_path, archive_path)
+            os.remove(path)
+        except Exception as e:
+            # 压缩失败时保留原始日志文件
+            print(f"压缩日志文件失败 {path}: {e}")
+
+    def shutdown(self, wait: bool = True):
+        """等待正在进行的压缩任务完成"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+class AsyncSink:
+    """基于有界队列的异步日志输出
+
+    作为 loguru 的可调用 sink 使用。loguru 在记录日志的线程中完成级别过滤和格式化，
+    本类只把消息放入队列，由后台线程批量交给 writer 写出。
+
+    使用方法:
+        sink = AsyncSink("app_debug", writer, maxsize=10000, overflow="drop_oldest")
+        logger.add(sink, format="...", level="DEBUG")
+    """
+
+    def __init__(self, name: str, writer: Callable[[str], None], maxsize: int = 10000,
+                 overflow: str = OVERFLOW_DROP_OLDEST, block_timeout: float = 0.5,
+                 flush: Optional[Callable[[], None]] = None, close: Optional[Callable[[], None]] = None):
+        """
+        初始化异步输出
+
+        Args:
+            name: 输出名称（用于统计）
+            writer: 写出已格式化消息的函数（在后台线程中调用，参数为一批消息拼接成的字符串）
+            maxsize: 队列容量
+            overflow: 队列满时的策略，见 OVERFLOW_POLICIES
+            block_timeout: block 策略（及 ERROR 级别记录）的最长等待时间（秒）
+            flush: 每批消息写完后调用的刷新函数
+            close: 停止时调用的关闭函数
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"未知的队列溢出策略: {overflow}")
+
+        self.name = name
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+
+        self._writer = writer
+        self._flush = flush
+        self._close = close
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._counter_lock = threading.Lock()
+        self._reported_dropped = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"log-{name}", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message):
+        """loguru 调用的写入入口（在记录日志的线程中执行，不做任何IO）"""
+        if self._closed:
+            # 已停止（如退出过程中的日志）：直接同步写出
+            self._write_batch([message])
+            return
+
+        block = self.overflow == OVERFLOW_BLOCK or message.record["level"].no >= _ALWAYS_BLOCK_LEVEL
+        try:
+            if block:
+                self._queue.put(message, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(message)
+        except queue.Full:
+            if self.overflow == OVERFLOW_DROP_OLDEST and not block:
+                self._drop_oldest_and_put(message)
+            else:
+                self._count_dropped()
+            return
+
+        with self._counter_lock:
+            self.enqueued += 1
+
+    def _drop_oldest_and_put(self, message):
+        """丢弃队列中最旧的一条记录，再放入新记录"""
+        try:
+            oldest = self._queue.get_nowait()
+            if not isinstance(oldest, str):
+                # 取到的是控制标记，放回去并丢弃新记录
+                self._queue.put_nowait(oldest)
+                self._count_dropped()
+                return
+            self._count_dropped()
+            self._queue.put_nowait(message)
+            with self._counter_lock:
+                self.enqueued += 1
+        except (queue.Empty, queue.Full):
+            self._count_dropped()
+
+    def _count_dropped(self):
+        with self._counter_lock:
+            self.dropped += 1
+
+    def _run(self):
+        """后台线程：批量取出消息并写出"""
+        while True:
+            item = self._queue.get()
+            batch: List[str] = []
+            markers = []
+            stop = False
+
+            # 尽量批量取出，减少刷新次数
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= 512:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[str]):
+        """写出一批消息，并在有新丢弃记录时写出一条说明"""
+        count = len(batch)
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            batch = [f"[日志] {dropped - self._reported_dropped} 条日志因队列已满被丢弃（{self.name}）\n"] + batch
+            self._reported_dropped = dropped
+
+        if not batch:
+            return
+        try:
+            # 整批合并为一次写入，减少后台线程占用 GIL 的时间
+            self._writer("".join(batch))
+            if self._flush is not None:
+                self._flush()
+            with self._counter_lock:
+                self.written += count
+        except Exception as e:
+            print(f"写入日志失败（{self.name}）: {e}")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """等待此前放入队列的消息全部写出
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否在超时前写完
+        """
+        if self._closed:
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """写出剩余消息并停止后台线程"""
+        if self._closed:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._closed = True
+        if self._close is not None:
+            self._close()
+
+    def stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._counter_lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "pending": self._queue.qsize(),
+            }
+
+
+class RotatingFileWriter:
+    """按大小轮转的日志文件写出端（在异步输出的后台线程中使用）
+
+    文件超过 max_bytes 时改名为 name.YYYY-MM-DD_HH-MM-SS_ffffff.log（与 loguru 的命名一致），
+    交给压缩器处理，并删除超过保留时间的旧文件。
+    """
+
+    def __init__(self, path, max_bytes: int, retention: Optional[timedelta] = None,
+                 compressor: Optional[Callable[[str], None]] = None, encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.retention = retention
+        self.compressor = compressor
+        self.encoding = encoding
+        self._file = None
+        self._size = 0
+
+    def __call__(self, text: str):
+        """写入文本，必要时先轮转"""
+        data = text.encode(self.encoding)
+        if self._file is None:
+            self._open()
+        if self._size > 0 and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        """轮转当前文件，压缩交给后台压缩器"""
+        self.close()
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        rotated = self.path.with_name(f"{self.path.stem}.{timestamp}{self.path.suffix}")
+        os.replace(self.path, rotated)
+        if self.compressor is not None:
+            self.compressor(str(rotated))
+        self._apply_retention()
+        self._open()
+
+    def _apply_retention(self):
+        """删除超过保留时间的轮转文件"""
+        if self.retention is None:
+            return
+        deadline = time.time() - self.retention.total_seconds()
+        for old_file in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"):
+            try:
+                if old_file.stat().st_mtime < deadline:
+                    old_file.unlink()
+            except OSError:
+                pass
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class AsyncLogging:
+    """异步日志输出的集合，负责创建写出端、统一刷新和退出时关闭"""
+
+    def __init__(self, maxsize: int = 10000, overflow: str = OVERFLOW_DROP_OLDEST):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.compressor = BackgroundCompressor()
+        self.sinks: List[AsyncSink] = []
+
+    def file_sink(self, name: str, path, max_bytes: int, retention: Optional[timedelta] = None,
+                  encoding: str = "utf-8") -> AsyncSink:
+        """创建写入文件的异步输出（轮转后的压缩在另一个线程中完成）
+
+        Args:
+            name: 输出名称
+            path: 日志文件路径
+            max_bytes: 单个文件的最大字节数，超过后轮转
+            retention: 轮转文件的保留时间
+            encoding: 文件编码
+        """
+        writer = RotatingFileWriter(path, max_bytes, retention, self.compressor, encoding)
+        sink = AsyncSink(name, writer, maxsize=self.maxsize, overflow=self.overflow,
+                         flush=writer.flush, close=writer.close)
+        self.sinks.append(sink)
+        return sink
+
+    def stream_sink(self, name: str, stream) -> AsyncSink:
+        """创建写入流（如 sys.stderr）的异步输出"""
+        sink = AsyncSink(name, stream.write, maxsize=self.maxsize, overflow=self.overflow,
+                         flush=getattr(stream, "flush", None))
+        self.sinks.append(sink)
+        return sink
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """等待所有异步输出写完"""
+        return all([sink.flush(timeout) for sink in self.sinks])
+
+    def shutdown(self, timeout: float = 5.0):
+        """写出剩余日志、停止后台线程并等待压缩完成"""
+        for sink in self.sinks:
+            sink.stop(timeout)
+        self.compressor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """获取各异步输出的统计信息"""
+        return {sink.name: sink.stats() for sink in self.sinks}
@@ -6,8 +6,16 @@
 import json
 import sys
 import os
+import copy
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils.config_observer import MISSING, ConfigCallback, ConfigObservers, resolve_path
+from utils.config_schema import ConfigIssue, ConfigSchema, ConfigValidationError
+from utils.config_snapshot import ConfigSnapshot, build_snapshot, deep_merge
+from utils.config_writer import DebouncedWriter, get_config_writer
 
 
 def get_exe_version() -> Optional[str]:
@@ -133,7 +141,8 @@ class AppConfig:
             "minimize_to_tray": False,  # 最小化到托盘
             "close_to_tray": False,     # 关闭到托盘
             "start_minimized": False,   # 启动时最小化
-            "confirm_on_exit": True     # 退出时确认
+            "confirm_on_exit": True,    # 退出时确认
+            "single_instance": False    # 单实例运行（再次启动时转发参数给已运行的实例）
         },
         "advanced": {                # 高级设置
             "log_level": "INFO",     # 日志级别: DEBUG, INFO, WARNING, ERROR
@@ -141,16 +150,46 @@ class AppConfig:
             "enable_console": False  # 启用控制台
         }
     }
+
+    # 取值约束（类型由默认值推断，这里只声明额外的范围和可选值）
+    CONSTRAINTS = {
+        "update_check_timeout": {"type": (int, float), "min": 1},
+        "download_timeout": {"type": (int, float), "min": 1},
+        "skip_duration_days": {"min": 1},
+        "theme.mode": {"choices": ["light", "dark", "auto"], "message": "主题模式必须是 light, dark, auto 之一"},
+        "appearance.font_size": {"min": 8, "max": 24, "message": "字体大小必须在 8-24 之间"},
+        "appearance.window_width": {"min": 800, "message": "窗口宽度不能小于 800"},
+        "appearance.window_height": {"min": 600, "message": "窗口高度不能小于 600"},
+        "advanced.log_level": {"choices": ["DEBUG", "INFO", "WARNING", "ERROR"],
+                               "message": "日志级别必须是 DEBUG, INFO, WARNING, ERROR 之一"},
+    }
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", writer: Optional[DebouncedWriter] = None):
         """
         初始化配置管理器
         
         Args:
             config_file: 配置文件路径
+            writer: 后台写入器，默认使用全局配置写入器
         """
         self.config_file = Path(config_file)
-        self._config = self.DEFAULT_CONFIG.copy()
+        self._config = copy.deepcopy(self.DEFAULT_CONFIG)
+        # 保护 _config：后台写入线程序列化时不能与修改同时进行
+        self._lock = threading.RLock()
+        self._dirty = False
+        # 已序列化、正在等待写入结果的修改（写入成功后才算已保存）
+        self._writing = False
+        self._writer = writer or get_config_writer()
+        self._observers = ConfigObservers()
+        # 批量修改的嵌套深度，以及本批次中被修改的顶层配置项在修改前的副本
+        self._batch_depth = 0
+        self._batch_old: Dict[str, Any] = {}
+        # 属性读取使用的只读快照，配置修改后置为 None，下次读取时重建
+        self._snapshot: Optional[ConfigSnapshot] = None
+        # 预先编译的校验规则，修改配置时只校验被修改的配置项
+        self.schema = ConfigSchema(self.DEFAULT_CONFIG, self.CONSTRAINTS)
+        # 最近一次 import_config() 的校验错误
+        self.import_errors: List[ConfigIssue] = []
         self.load_config()
     
     def load_config(self) -> None:
@@ -159,62 +198,266 @@ class AppConfig:
             if self.config_file.exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     file_config = json.load(f)
-                    # 更新配置，保留默认值
-                    self._config.update(file_config)
+                # 深度合并，文件中缺少的分组项保留默认值
+                self._merge(file_config, deep=True)
         except Exception as e:
             print(f"加载配置文件失败: {e}")
             # 使用默认配置
     
-    def save_config(self) -> None:
-        """保存配置到文件"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"保存配置文件失败: {e}")
+    def save_config(self, immediate: bool = False) -> None:
+        """
+        保存配置到文件
+
+        默认只登记一次延迟写入并立即返回，短时间内的多次保存会合并为一次后台原子写入；
+        程序退出时会自动写出尚未保存的修改。
+
+        Args:
+            immediate: 是否在当前线程立即写入
+        """
+        with self._lock:
+            self._dirty = True
+        if immediate:
+            self.flush()
+        else:
+            self._writer.schedule(self.config_file, self._serialize, self._on_written)
+
+    def flush(self) -> bool:
+        """
+        立即写出尚未保存的修改
+
+        Returns:
+            是否写入成功（没有需要写入的内容时也返回 True）
+        """
+        if not self.is_dirty and not self._writer.has_pending(self.config_file):
+            return True
+        return self._writer.write_now(self.config_file, self._serialize, self._on_written)
+
+    def reload(self, file_config: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        重新加载配置文件（如被外部程序修改后）
+
+        文件内容先经过校验并与默认配置深度合并，只替换值发生变化的顶层配置项，
+        并通知对应的订阅者；重新加载不会把配置写回文件。
+
+        Args:
+            file_config: 已解析的配置文件内容，为 None 时读取配置文件
+
+        Returns:
+            发生变化的顶层配置项
+
+        Raises:
+            ConfigValidationError: 文件中有无效的配置项（当前配置保持不变）
+            OSError, ValueError: 读取或解析配置文件失败
+        """
+        if file_config is None:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                file_config = json.load(f)
+        if not isinstance(file_config, dict):
+            raise ValueError("配置文件的顶层必须是对象")
+
+        errors = self.schema.validate_changes(file_config)
+        if errors:
+            raise ConfigValidationError(errors)
+
+        merged = deep_merge(self.DEFAULT_CONFIG, file_config)
+        with self._lock:
+            changed = {key: value for key, value in merged.items() if self._config.get(key, MISSING) != value}
+        if changed:
+            self._merge(changed)
+        return list(changed)
+
+    def written_fingerprint(self) -> Optional[tuple]:
+        """本实例最近一次写入配置文件后的 (大小, 修改时间纳秒)，用于忽略自己写入引起的文件变化"""
+        return self._writer.written_fingerprint(self.config_file)
+
+    @property
+    def is_dirty(self) -> bool:
+        """是否有尚未写入文件的修改（包括正在写入的修改）"""
+        return self._dirty or self._writing
+
+    def _serialize(self) -> Optional[str]:
+        """由写入器调用：序列化当前配置，没有修改时返回 None"""
+        with self._lock:
+            if not self._dirty:
+                return None
+            text = json.dumps(self._config, indent=4, ensure_ascii=False)
+            self._dirty = False
+            self._writing = True
+            return text
+
+    def _on_written(self, ok: bool) -> None:
+        """由写入器调用：写入失败时重新标记为已修改，等待写入器重试或下一次 flush()"""
+        with self._lock:
+            self._writing = False
+            if not ok:
+                self._dirty = True
     
     def get(self, key: str, default: Any = None) -> Any:
         """
         获取配置项
         
         Args:
-            key: 配置项键名
+            key: 配置项键名，支持点分路径（如 "behavior.minimize_to_tray"）
             default: 默认值
             
         Returns:
             配置项值
         """
-        return self._config.get(key, default)
+        if '.' not in key:
+            return self._config.get(key, default)
+
+        value = resolve_path(self._config, key)
+        return default if value is MISSING else value
     
     def set(self, key: str, value: Any) -> None:
         """
-        设置配置项
+        设置配置项（只修改内存中的配置，调用 save_config() 后才写入文件）
         
         Args:
-            key: 配置项键名
+            key: 配置项键名，支持点分路径（如 "behavior.minimize_to_tray"），缺少的分组会自动创建
             value: 配置项值
-        """
-        self._config[key] = value
+
+        Raises:
+            ConfigValidationError: 值未通过校验（配置保持不变）
+        """
+        errors = self.schema.validate(key, value)
+        if errors:
+            raise ConfigValidationError(errors)
+
+        *sections, leaf = key.split('.')
+        with self.batch():
+            self._remember_old((sections[0] if sections else leaf,))
+            container = self._config
+            for section in sections:
+                child = container.get(section)
+                if not isinstance(child, dict):
+                    child = container[section] = {}
+                container = child
+            container[leaf] = value
+            self._dirty = True
+            self._snapshot = None
     
-    def update(self, config_dict: Dict[str, Any]) -> None:
+    def update(self, config_dict: Dict[str, Any], deep: bool = False) -> None:
         """
         批量更新配置
         
         Args:
             config_dict: 配置字典
+            deep: 是否深度合并分组（为 False 时直接替换顶层配置项）
+
+        Raises:
+            ConfigValidationError: 任一配置项未通过校验（所有修改都不会生效）
+        """
+        errors = self.schema.validate_changes(config_dict)
+        if errors:
+            raise ConfigValidationError(errors)
+        self._merge(config_dict, deep)
+        with self._lock:
+            self._dirty = True
+
+    def _merge(self, config_dict: Dict[str, Any], deep: bool = False) -> None:
+        """合并顶层配置项（不标记为需要保存）"""
+        with self.batch():
+            self._remember_old(config_dict)
+            for key, value in config_dict.items():
+                current = self._config.get(key)
+                if deep and isinstance(value, dict) and isinstance(current, dict):
+                    self._config[key] = deep_merge(current, value)
+                else:
+                    self._config[key] = value
+            self._snapshot = None
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        当前配置的只读快照（各分组为不可变的 __slots__ 数据类）
+
+        配置未修改时总是返回同一个对象；需要连续读取多个配置项的代码可以先取出快照。
+
+        示例:
+            behavior = app_config.snapshot.behavior
+            if behavior.close_to_tray or behavior.minimize_to_tray:
+                ...
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = build_snapshot(self._config, self.DEFAULT_CONFIG)
+        return snapshot
+
+    def subscribe(self, key: str, callback: ConfigCallback) -> None:
         """
-        self._config.update(config_dict)
+        订阅配置项的变化
+
+        配置被修改（set、update、import_config、reset_to_defaults 等）后会比较新旧值，
+        只有订阅路径本身、其子项或其上级配置项的值真正改变时才调用回调；
+        同一批次中的多次修改只通知一次。回调在修改配置的线程中调用，
+        绑定方法以弱引用保存，对象销毁后自动失效。
+
+        Args:
+            key: 点分路径，如 "behavior.minimize_to_tray" 或 "behavior"
+            callback: 回调函数 callback(key, old_value, new_value)
+
+        示例:
+            app_config.subscribe("theme.mode", lambda key, old, new: print(f"{old} -> {new}"))
+        """
+        self._observers.subscribe(key, callback)
+
+    def unsubscribe(self, key: str, callback: ConfigCallback) -> bool:
+        """
+        取消订阅
+
+        Returns:
+            是否找到了该订阅
+        """
+        return self._observers.unsubscribe(key, callback)
+
+    @contextmanager
+    def batch(self):
+        """
+        批量修改配置：代码块中的所有修改结束后只比较一次新旧值并一次性通知订阅者
+
+        示例:
+            with app_config.batch():
+                app_config.set("appearance.window_width", 1280)
+                app_config.set("appearance.window_height", 800)
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._batch_old:
+                    old_root = self._batch_old
+                    self._batch_old = {}
+                    new_root = {key: self._config.get(key, MISSING) for key in old_root}
+                else:
+                    old_root = None
+        # 在锁外调用回调，回调中可以再次修改配置
+        if old_root is not None:
+            self._observers.notify(old_root, new_root)
+
+    def _remember_old(self, keys: Iterable[str]) -> None:
+        """在修改前保存顶层配置项的副本（没有订阅者时跳过，调用方需持有锁）"""
+        if not self._observers:
+            return
+        for key in keys:
+            if key not in self._batch_old:
+                value = self._config.get(key, MISSING)
+                self._batch_old[key] = value if value is MISSING else copy.deepcopy(value)
     
+    # 以下属性直接读取快照字段，快照失效（为 None）时才通过 snapshot 重建
     @property
     def app_name(self) -> str:
         """应用程序名称"""
-        return self.get("app_name")
+        return (self._snapshot or self.snapshot).app_name
     
     @property
     def current_version(self) -> str:
         """当前版本号"""
         # 首先尝试从配置文件读取
-        config_version = self.get("current_version")
+        config_version = self.snapshot.current_version
 
         # 如果配置文件中的版本为空或为默认值，尝试从exe读取
         if not config_version or config_version == "1.0.0":
@@ -227,18 +470,18 @@ class AppConfig:
     @property
     def organization_name(self) -> str:
         """组织名称"""
-        return self.get("organization_name")
+        return (self._snapshot or self.snapshot).organization_name
     
     @property
     def update_server(self) -> str:
         """更新服务器地址"""
-        return self.get("update_server")
+        return (self._snapshot or self.snapshot).update_server
     
     @property
     def update_check_url(self) -> str:
         """更新检查URL"""
         # 如果配置中有完整的URL，直接使用
-        configured_url = self.get("update_check_url")
+        configured_url = self.snapshot.update_check_url
         if configured_url and configured_url.startswith(('http://', 'https://')):
             return configured_url
 
@@ -249,22 +492,22 @@ class AppConfig:
     @property
     def auto_check_updates(self) -> bool:
         """是否自动检查更新"""
-        return self.get("auto_check_updates", True)
+        return (self._snapshot or self.snapshot).auto_check_updates
     
     @property
     def update_check_timeout(self) -> int:
         """更新检查超时时间（秒）"""
-        return self.get("update_check_timeout", 10)
+        return (self._snapshot or self.snapshot).update_check_timeout
     
     @property
     def download_timeout(self) -> int:
         """下载超时时间（秒）"""
-        return self.get("download_timeout", 300)
+        return (self._snapshot or self.snapshot).download_timeout
     
     @property
     def temp_dir_name(self) -> str:
         """临时目录名称"""
-        return self.get("temp_dir_name", "app_update")
+        return (self._snapshot or self.snapshot).temp_dir_name
     
     def set_current_version(self, version: str) -> None:
         """
@@ -356,10 +599,11 @@ class AppConfig:
         """
         import time
 
-        duration = duration_days or self.get("skip_duration_days", 30)
+        duration = duration_days or self.snapshot.skip_duration_days
         expire_time = time.time() + (duration * 24 * 60 * 60)
 
-        skipped = self.get("skipped_versions", {})
+        # 复制后再修改，订阅者才能比较出新旧值
+        skipped = dict(self.get("skipped_versions", {}))
         skipped[version] = expire_time
         self.set("skipped_versions", skipped)
         self.save_config()
@@ -385,7 +629,7 @@ class AppConfig:
         """
         import time
 
-        skipped = self.get("skipped_versions", {})
+        skipped = dict(self.get("skipped_versions", {}))
 
         if version not in skipped:
             return False
@@ -452,7 +696,7 @@ class AppConfig:
         Returns:
             是否成功移除
         """
-        skipped = self.get("skipped_versions", {})
+        skipped = dict(self.get("skipped_versions", {}))
 
         if version in skipped:
             del skipped[version]
@@ -470,28 +714,28 @@ class AppConfig:
     @property
     def exception_handler_enabled(self) -> bool:
         """异常处理器是否启用"""
-        return self.get("exception_handler", {}).get("enabled", True)
+        return (self._snapshot or self.snapshot).exception_handler.enabled
 
     @property
     def exception_handler_show_dialog(self) -> bool:
         """是否显示错误对话框"""
-        return self.get("exception_handler", {}).get("show_dialog", True)
+        return (self._snapshot or self.snapshot).exception_handler.show_dialog
 
     @property
     def exception_handler_save_report(self) -> bool:
         """是否保存错误报告"""
-        return self.get("exception_handler", {}).get("save_report", True)
+        return (self._snapshot or self.snapshot).exception_handler.save_report
 
     @property
     def exception_handler_report_dir(self) -> str:
         """错误报告目录"""
-        return self.get("exception_handler", {}).get("report_dir", "error_reports")
+        return (self._snapshot or self.snapshot).exception_handler.report_dir
 
     # 主题配置属性
     @property
     def theme_mode(self) -> str:
         """主题模式"""
-        return self.get("theme", {}).get("mode", "auto")
+        return (self._snapshot or self.snapshot).theme.mode
 
     def set_theme_mode(self, mode: str) -> None:
         """设置主题模式并保存
@@ -499,72 +743,78 @@ class AppConfig:
         Args:
             mode: 主题模式 ("light", "dark", "auto")
         """
-        if "theme" not in self._config:
-            self._config["theme"] = {}
-        self._config["theme"]["mode"] = mode
+        self.set("theme.mode", mode)
         self.save_config()
 
     # 外观设置属性
     @property
     def font_size(self) -> int:
         """字体大小"""
-        return self.get("appearance", {}).get("font_size", 10)
+        return (self._snapshot or self.snapshot).appearance.font_size
 
     @property
     def window_width(self) -> int:
         """窗口宽度"""
-        return self.get("appearance", {}).get("window_width", 1024)
+        return (self._snapshot or self.snapshot).appearance.window_width
 
     @property
     def window_height(self) -> int:
         """窗口高度"""
-        return self.get("appearance", {}).get("window_height", 768)
+        return (self._snapshot or self.snapshot).appearance.window_height
 
     @property
     def remember_window_size(self) -> bool:
         """是否记住窗口大小"""
-        return self.get("appearance", {}).get("remember_window_size", True)
+        return (self._snapshot or self.snapshot).appearance.remember_window_size
 
     # 行为设置属性
     @property
     def minimize_to_tray(self) -> bool:
         """是否最小化到托盘"""
-        return self.get("behavior", {}).get("minimize_to_tray", False)
+        return (self._snapshot or self.snapshot).behavior.minimize_to_tray
 
     @property
     def close_to_tray(self) -> bool:
         """是否关闭到托盘"""
-        return self.get("behavior", {}).get("close_to_tray", False)
+        return (self._snapshot or self.snapshot).behavior.close_to_tray
 
     @property
     def start_minimized(self) -> bool:
         """是否启动时最小化"""
-        return self.get("behavior", {}).get("start_minimized", False)
+        return (self._snapshot or self.snapshot).behavior.start_minimized
 
     @property
     def confirm_on_exit(self) -> bool:
         """是否退出时确认"""
-        return self.get("behavior", {}).get("confirm_on_exit", True)
+        return (self._snapshot or self.snapshot).behavior.confirm_on_exit
+
+    @property
+    def single_instance(self) -> bool:
+        """是否单实例运行"""
+        return (self._snapshot or self.snapshot).behavior.single_instance
 
     # 高级设置属性
     @property
     def log_level(self) -> str:
         """日志级别"""
-        return self.get("advanced", {}).get("log_level", "INFO")
+        return (self._snapshot or self.snapshot).advanced.log_level
 
     @property
     def debug_mode(self) -> bool:
         """是否调试模式"""
-        return self.get("advanced", {}).get("debug_mode", False)
+        return (self._snapshot or self.snapshot).advanced.debug_mode
 
     @property
     def enable_console(self) -> bool:
         """是否启用控制台"""
-        return self.get("advanced", {}).get("enable_console", False)
+        return (self._snapshot or self.snapshot).advanced.enable_console
 
     def reset_to_defaults(self) -> None:
         """重置所有配置到默认值"""
-        self._config = self.DEFAULT_CONFIG.copy()
+        with self.batch():
+            self._remember_old(set(self._config) | set(self.DEFAULT_CONFIG))
+            self._config = copy.deepcopy(self.DEFAULT_CONFIG)
+            self._snapshot = None
         self.save_config()
 
     def export_config(self, file_path: str) -> bool:
@@ -577,8 +827,10 @@ class AppConfig:
             是否成功导出
         """
         try:
+            with self._lock:
+                text = json.dumps(self._config, indent=4, ensure_ascii=False)
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=4, ensure_ascii=False)
+                f.write(text)
             return True
         except Exception as e:
             print(f"导出配置失败: {e}")
@@ -587,18 +839,25 @@ class AppConfig:
     def import_config(self, file_path: str) -> bool:
         """从文件导入配置
 
+        导入的配置先经过校验，任一配置项无效时不修改当前配置，错误信息保存在 import_errors 中。
+
         Args:
             file_path: 导入文件路径
 
         Returns:
             是否成功导入
         """
+        self.import_errors = []
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 imported_config = json.load(f)
-                self._config.update(imported_config)
-                self.save_config()
+            self.update(imported_config, deep=True)
+            self.save_config()
             return True
+        except ConfigValidationError as e:
+            self.import_errors = e.errors
+            print(f"导入配置失败，{len(e.errors)} 个配置项无效: {e}")
+            return False
         except Exception as e:
             print(f"导入配置失败: {e}")
             return False
@@ -606,30 +865,12 @@ class AppConfig:
     def validate_config(self) -> tuple[bool, list[str]]:
         """验证配置的有效性
 
+        需要结构化的错误信息（配置项路径、错误原因、当前值）时使用 schema.validate_changes()。
+
         Returns:
             (是否有效, 错误信息列表)
         """
-        errors = []
-
-        # 验证字体大小
-        font_size = self.font_size
-        if not isinstance(font_size, int) or font_size < 8 or font_size > 24:
-            errors.append("字体大小必须在 8-24 之间")
-
-        # 验证窗口大小
-        if self.window_width < 800 or self.window_height < 600:
-            errors.append("窗口大小不能小于 800x600")
-
-        # 验证日志级别
-        valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
-        if self.log_level not in valid_log_levels:
-            errors.append(f"日志级别必须是 {', '.join(valid_log_levels)} 之一")
-
-        # 验证主题模式
-        valid_themes = ["light", "dark", "auto"]
-        if self.theme_mode not in valid_themes:
-            errors.append(f"主题模式必须是 {', '.join(valid_themes)} 之一")
-
+        errors = [str(issue) for issue in self.schema.validate_changes(self._config)]
         return (len(errors) == 0, errors)
 
 
@@ -0,0 +1,142 @@
+"""
+配置变更订阅模块
+按点分路径（如 "behavior.minimize_to_tray"）订阅配置项；配置修改后比较新旧值，
+只通知值真正发生变化的订阅者
+
+本模块不依赖 PySide6，只被 utils.config 使用。
+"""
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# 回调函数：callback(key, old_value, new_value)，配置项不存在时值为 None
+ConfigCallback = Callable[[str, Any, Any], None]
+
+# 配置项不存在时的哨兵值
+MISSING = object()
+
+
+def resolve_path(data: Any, key: str) -> Any:
+    """按点分路径取值，路径不存在时返回 MISSING"""
+    value = data
+    for part in key.split('.'):
+        if not isinstance(value, dict):
+            return MISSING
+        value = value.get(part, MISSING)
+        if value is MISSING:
+            return MISSING
+    return value
+
+
+def diff_paths(old: Any, new: Any, prefix: str = "") -> List[str]:
+    """
+    比较新旧配置，返回发生变化的点分路径
+
+    两边都是字典时逐键递归比较，否则直接比较值；新增和删除的键也视为变化。
+
+    示例:
+        diff_paths({"a": {"b": 1, "c": 2}}, {"a": {"b": 1, "c": 3}})  # ["a.c"]
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = []
+        for key in list(old) + [key for key in new if key not in old]:
+            path = f"{prefix}.{key}" if prefix else str(key)
+            changed.extend(diff_paths(old.get(key, MISSING), new.get(key, MISSING), path))
+        return changed
+    if old is MISSING and new is MISSING:
+        return []
+    return [] if old == new else [prefix]
+
+
+def _is_affected(key: str, changed: Iterable[str]) -> bool:
+    """订阅路径本身、其子项或其所在的上级配置项发生变化时返回 True"""
+    for path in changed:
+        if path == key or path.startswith(key + '.') or key.startswith(path + '.'):
+            return True
+    return False
+
+
+class ConfigObservers:
+    """配置订阅者注册表
+
+    绑定方法以弱引用保存，对象被回收后自动失效，订阅者无需在销毁时取消订阅。
+    回调在修改配置的线程中调用，回调抛出的异常会被记录而不会影响其他订阅者。
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable[[], Any]]] = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, key: str, callback: ConfigCallback) -> None:
+        """订阅配置项"""
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda callback=callback: callback
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(ref)
+
+    def unsubscribe(self, key: str, callback: ConfigCallback) -> bool:
+        """取消订阅，返回是否找到了该订阅"""
+        with self._lock:
+            refs = self._subscribers.get(key, [])
+            for ref in refs:
+                if ref() == callback:
+                    refs.remove(ref)
+                    if not refs:
+                        del self._subscribers[key]
+                    return True
+        return False
+
+    def affected(self, changed: List[str]) -> List[Tuple[str, List[ConfigCallback]]]:
+        """找出受变化影响的订阅路径及其回调（同时清理已失效的弱引用）"""
+        result = []
+        with self._lock:
+            for key in list(self._subscribers):
+                if not _is_affected(key, changed):
+                    continue
+                refs = self._subscribers[key]
+                callbacks = [callback for callback in (ref() for ref in refs) if callback is not None]
+                if len(callbacks) != len(refs):
+                    refs[:] = [ref for ref in refs if ref() is not None]
+                    if not refs:
+                        del self._subscribers[key]
+                if callbacks:
+                    result.append((key, callbacks))
+        return result
+
+    def notify(self, old_root: Dict[str, Any], new_root: Dict[str, Any]) -> List[str]:
+        """
+        比较新旧配置并通知受影响的订阅者
+
+        Args:
+            old_root: 修改前的配置（可以只包含被修改的顶层配置项）
+            new_root: 修改后的配置（与 old_root 包含相同的顶层配置项）
+
+        Returns:
+            发生变化的点分路径
+        """
+        changed = diff_paths(old_root, new_root)
+        if not changed:
+            return changed
+
+        for key, callbacks in self.affected(changed):
+            old_value = resolve_path(old_root, key)
+            new_value = resolve_path(new_root, key)
+            old_value = None if old_value is MISSING else old_value
+            new_value = None if new_value is MISSING else new_value
+            for callback in callbacks:
+                try:
+                    callback(key, old_value, new_value)
+                except Exception as e:
+                    # 延迟导入避免循环依赖
+                    try:
+                        from utils.logger import get_logger
+                        get_logger(__name__).error(f"配置订阅回调执行失败 {key}: {e}")
+                    except ImportError:
+                        print(f"配置订阅回调执行失败 {key}: {e}")
+        return changed
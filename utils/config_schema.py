@@ -0,0 +1,188 @@
+"""
+配置校验模块
+根据默认配置和声明的约束预先编译出每个配置项的校验函数，
+修改配置时只校验被修改的配置项，校验开销与修改的大小成正比，而不是与配置总量成正比
+
+本模块不依赖 PySide6，只被 utils.config 使用。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# 校验函数：返回错误信息，校验通过时返回 None
+Validator = Callable[[Any], Optional[str]]
+
+_TYPE_NAMES = {bool: "布尔值", int: "整数", float: "数字", str: "字符串", list: "列表", dict: "对象"}
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigIssue:
+    """单个配置错误"""
+    key: str
+    message: str
+    value: Any = None
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.message}"
+
+
+class ConfigValidationError(ValueError):
+    """配置值未通过校验，errors 中包含所有错误"""
+
+    def __init__(self, errors: Iterable[ConfigIssue]):
+        self.errors: List[ConfigIssue] = list(errors)
+        super().__init__("; ".join(str(error) for error in self.errors))
+
+
+def _default_type(default: Any) -> Optional[Tuple[type, ...]]:
+    """由默认值推断允许的类型（None 表示不限制）"""
+    if isinstance(default, bool):
+        return (bool,)
+    if isinstance(default, int):
+        return (int,)
+    if isinstance(default, float):
+        return (int, float)
+    for expected in (str, list, dict):
+        if isinstance(default, expected):
+            return (expected,)
+    return None
+
+
+def build_validator(default: Any, rule: Dict[str, Any]) -> Validator:
+    """
+    构建单个配置项的校验函数
+
+    Args:
+        default: 默认值，用于推断类型
+        rule: 约束，支持 type（类型元组）、min、max、choices 和 message（自定义错误信息）
+
+    示例:
+        validate = build_validator(10, {"min": 8, "max": 24})
+        validate(30)  # "必须在 8-24 之间"
+    """
+    expected = rule.get("type") or _default_type(default)
+    minimum = rule.get("min")
+    maximum = rule.get("max")
+    choices = rule.get("choices")
+    message = rule.get("message")
+
+    if expected is not None:
+        expected = tuple(expected) if isinstance(expected, (tuple, list)) else (expected,)
+        # bool 是 int 的子类，除非显式允许，否则数字类型的配置项不接受布尔值
+        reject_bool = bool not in expected
+        type_message = message or f"类型必须是{'或'.join(_TYPE_NAMES.get(t, t.__name__) for t in expected)}"
+
+    if minimum is not None and maximum is not None:
+        range_message = message or f"必须在 {minimum}-{maximum} 之间"
+    elif minimum is not None:
+        range_message = message or f"不能小于 {minimum}"
+    else:
+        range_message = message or f"不能大于 {maximum}"
+    choices_message = message or (f"必须是 {', '.join(map(str, choices))} 之一" if choices else "")
+
+    def validate(value: Any) -> Optional[str]:
+        if expected is not None:
+            if not isinstance(value, expected) or (reject_bool and isinstance(value, bool)):
+                return type_message
+        if choices is not None and value not in choices:
+            return choices_message
+        if minimum is not None and value < minimum:
+            return range_message
+        if maximum is not None and value > maximum:
+            return range_message
+        return None
+
+    return validate
+
+
+class ConfigSchema:
+    """编译后的配置校验规则
+
+    默认配置中的每个叶子配置项对应一个校验函数，非空字典对应一个分组；
+    未声明的配置项（自定义配置、插件配置等）不做限制。
+
+    使用方法:
+        schema = ConfigSchema(DEFAULT_CONFIG, {"appearance.font_size": {"min": 8, "max": 24}})
+        errors = schema.validate("appearance.font_size", 30)
+        errors = schema.validate_changes({"theme": {"mode": "blue"}})
+    """
+
+    def __init__(self, defaults: Dict[str, Any], constraints: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        编译校验规则
+
+        Args:
+            defaults: 默认配置
+            constraints: 点分路径 -> 约束
+        """
+        self._validators: Dict[str, Validator] = {}
+        self._sections: Set[str] = set()
+        self.extend("", defaults, constraints)
+
+    def extend(self, prefix: str, defaults: Dict[str, Any],
+               constraints: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        添加一个分组的校验规则（如插件的配置分组）
+
+        Args:
+            prefix: 分组的点分路径，为空字符串时表示顶层
+            defaults: 分组的默认值
+            constraints: 分组内的相对路径 -> 约束
+        """
+        constraints = constraints or {}
+        if prefix:
+            # 上级路径也登记为分组，校验 {"plugins": {"example": {...}}} 这样的嵌套修改时才能逐层深入
+            parts = prefix.split('.')
+            self._sections.update('.'.join(parts[:i]) for i in range(1, len(parts) + 1))
+        for key, default in defaults.items():
+            self._compile(f"{prefix}.{key}" if prefix else key, key, default, constraints)
+
+    def _compile(self, path: str, relative: str, default: Any, constraints: Dict[str, Dict[str, Any]]):
+        """递归编译配置项"""
+        if isinstance(default, dict) and default:
+            self._sections.add(path)
+            for key, child in default.items():
+                self._compile(f"{path}.{key}", f"{relative}.{key}", child, constraints)
+        else:
+            self._validators[path] = build_validator(default, constraints.get(relative, {}))
+
+    def validate(self, key: str, value: Any) -> List[ConfigIssue]:
+        """
+        校验单个配置项（值为字典时只校验其中出现的子项）
+
+        Returns:
+            错误列表，为空表示校验通过
+        """
+        validator = self._validators.get(key)
+        if validator is not None:
+            message = validator(value)
+            return [ConfigIssue(key, message, value)] if message else []
+
+        if key in self._sections:
+            if not isinstance(value, dict):
+                return [ConfigIssue(key, "必须是对象", value)]
+            return self.validate_changes(value, key)
+
+        # 未声明的配置项：只检查是否把已声明的叶子配置项当作分组使用
+        parts = key.split('.')
+        for i in range(1, len(parts)):
+            parent = '.'.join(parts[:i])
+            if parent in self._validators:
+                return [ConfigIssue(key, f"{parent} 不是配置分组", value)]
+        return []
+
+    def validate_changes(self, changes: Dict[str, Any], prefix: str = "") -> List[ConfigIssue]:
+        """
+        校验一组修改（如 update() 或导入的配置）
+
+        Args:
+            changes: 要修改的配置项
+            prefix: changes 所在分组的点分路径
+
+        Returns:
+            错误列表，为空表示校验通过
+        """
+        errors = []
+        for key, value in changes.items():
+            errors.extend(self.validate(f"{prefix}.{key}" if prefix else str(key), value))
+        return errors
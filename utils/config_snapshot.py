@@ -0,0 +1,131 @@
+"""
+配置快照模块
+把配置字典转换为不可变的 __slots__ 数据类，属性读取只需一次属性查找，
+不再在每次读取时执行多层 dict.get；快照只在配置修改后重建
+
+本模块不依赖 PySide6，只被 utils.config 使用。
+"""
+
+import copy
+from dataclasses import dataclass, fields
+from typing import Any, Dict
+
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    深度合并两个配置字典，返回新字典（不修改参数，也不与参数共享可变对象）
+
+    两边都是字典的键递归合并，其余的键以 override 为准。
+
+    示例:
+        deep_merge({"a": {"x": 1, "y": 2}}, {"a": {"y": 3}})  # {"a": {"x": 1, "y": 3}}
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+@dataclass(frozen=True, slots=True)
+class ExceptionHandlerConfig:
+    """异常处理配置"""
+    enabled: bool
+    show_dialog: bool
+    save_report: bool
+    report_dir: str
+
+
+@dataclass(frozen=True, slots=True)
+class ThemeConfig:
+    """主题配置"""
+    mode: str
+
+
+@dataclass(frozen=True, slots=True)
+class AppearanceConfig:
+    """外观设置"""
+    font_size: int
+    window_width: int
+    window_height: int
+    remember_window_size: bool
+
+
+@dataclass(frozen=True, slots=True)
+class BehaviorConfig:
+    """行为设置"""
+    minimize_to_tray: bool
+    close_to_tray: bool
+    start_minimized: bool
+    confirm_on_exit: bool
+    single_instance: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AdvancedConfig:
+    """高级设置"""
+    log_level: str
+    debug_mode: bool
+    enable_console: bool
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSnapshot:
+    """配置快照：顶层配置项和各分组的只读视图"""
+    app_name: str
+    current_version: str
+    organization_name: str
+    update_server: str
+    update_check_url: str
+    auto_check_updates: bool
+    update_check_timeout: int
+    download_timeout: int
+    temp_dir_name: str
+    skip_duration_days: int
+    exception_handler: ExceptionHandlerConfig
+    theme: ThemeConfig
+    appearance: AppearanceConfig
+    behavior: BehaviorConfig
+    advanced: AdvancedConfig
+
+
+# 分组名 -> 快照类型
+SECTION_TYPES = {
+    "exception_handler": ExceptionHandlerConfig,
+    "theme": ThemeConfig,
+    "appearance": AppearanceConfig,
+    "behavior": BehaviorConfig,
+    "advanced": AdvancedConfig,
+}
+
+
+def _build_section(section_type: type, values: Any, defaults: Dict[str, Any]):
+    """构建分组快照，分组缺失或不是字典时使用默认值"""
+    if not isinstance(values, dict):
+        values = {}
+    return section_type(**{
+        field.name: values.get(field.name, defaults[field.name]) for field in fields(section_type)
+    })
+
+
+def build_snapshot(config: Dict[str, Any], defaults: Dict[str, Any]) -> ConfigSnapshot:
+    """
+    根据配置字典构建快照
+
+    Args:
+        config: 当前配置
+        defaults: 默认配置，config 中缺少的配置项从这里取值
+
+    Returns:
+        ConfigSnapshot 实例
+    """
+    values = {}
+    for field in fields(ConfigSnapshot):
+        section_type = SECTION_TYPES.get(field.name)
+        if section_type is None:
+            values[field.name] = config.get(field.name, defaults[field.name])
+        else:
+            values[field.name] = _build_section(section_type, config.get(field.name), defaults[field.name])
+    return ConfigSnapshot(**values)
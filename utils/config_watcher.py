@@ -0,0 +1,180 @@
+"""
+配置文件监视模块
+监视配置文件被外部程序修改（如运维推送新的 config.json），防抖后增量重新加载，
+只把发生变化的配置项通知给订阅者，无需重启应用程序
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from utils.config import AppConfig, app_config
+from utils.config_schema import ConfigValidationError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ConfigFileWatcher(QObject):
+    """配置文件监视器
+
+    文件变化事件经过防抖后才检查文件：大小和修改时间都没变时不读取文件，
+    与本进程最近一次写入的结果相同时视为自己的写入并忽略，内容哈希没变时不解析 JSON。
+    内存中有未保存的修改时推迟重新加载，避免覆盖这些修改（随后写入的本地修改优先）。
+    同时监视文件所在目录，原子替换（重命名）文件后也能继续监视。
+
+    使用方法:
+        watcher = ConfigFileWatcher(app_config)
+        watcher.config_reloaded.connect(lambda keys: print(f"配置已更新: {keys}"))
+    """
+
+    # 信号：重新加载后发生变化的顶层配置项
+    config_reloaded = Signal(list)
+    # 信号：重新加载失败（错误信息）
+    reload_failed = Signal(str)
+
+    def __init__(self, config: AppConfig, debounce_ms: int = 500, parent: Optional[QObject] = None):
+        """
+        初始化配置文件监视器
+
+        Args:
+            config: 要监视的配置实例
+            debounce_ms: 文件变化后等待的毫秒数（外部程序通常分多次写入文件）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._config = config
+        self._path = str(config.config_file.absolute())
+        self._directory = os.path.dirname(self._path)
+
+        self._fingerprint = self._stat()
+        self._digest = self._read_digest()[1] if self._fingerprint else None
+        self.stats = {"events": 0, "checks": 0, "own_writes": 0, "conflicts": 0, "parsed": 0, "reloaded": 0}
+        # 因本地有未保存的修改而推迟重新加载的文件指纹
+        self._deferred: Optional[Tuple[int, int]] = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.check)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._watch()
+        logger.info(f"开始监视配置文件: {self._path}")
+
+    def _watch(self):
+        """监视配置文件及其所在目录（文件被替换后需要重新添加）"""
+        if self._directory not in self._watcher.directories():
+            self._watcher.addPath(self._directory)
+        if os.path.exists(self._path) and self._path not in self._watcher.files():
+            self._watcher.addPath(self._path)
+
+    def _on_changed(self, path: str):
+        """文件或目录变化：重新开始防抖计时"""
+        self.stats["events"] += 1
+        self._timer.start()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """获取文件的 (大小, 修改时间纳秒)，文件不存在时返回 None"""
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _read_digest(self) -> Tuple[bytes, bytes]:
+        """读取文件内容并计算哈希"""
+        with open(self._path, 'rb') as f:
+            data = f.read()
+        return data, hashlib.sha256(data).digest()
+
+    def check(self) -> List[str]:
+        """
+        检查配置文件是否被外部修改，是则增量重新加载
+
+        Returns:
+            发生变化的顶层配置项（未重新加载时为空列表）
+        """
+        self.stats["checks"] += 1
+        self._watch()
+
+        fingerprint = self._stat()
+        if fingerprint is None or fingerprint == self._fingerprint:
+            return []
+
+        if fingerprint == self._config.written_fingerprint():
+            self._fingerprint = fingerprint
+            self._deferred = None
+            self.stats["own_writes"] += 1
+            # 自己写入的内容与内存中的配置一致，下次外部修改时重新比较哈希
+            self._digest = None
+            return []
+
+        if self._config.is_dirty:
+            # 不更新指纹，稍后再检查；本地修改写入后文件变为自己的写入
+            if fingerprint != self._deferred:
+                self._deferred = fingerprint
+                self.stats["conflicts"] += 1
+                logger.warning("配置文件已被外部修改，但内存中有未保存的修改，暂不重新加载（本地修改将覆盖外部修改）")
+            self._timer.start()
+            return []
+        self._fingerprint = fingerprint
+        self._deferred = None
+
+        try:
+            data, digest = self._read_digest()
+        except OSError as e:
+            logger.warning(f"读取配置文件失败: {e}")
+            return []
+        if digest == self._digest:
+            return []
+        self._digest = digest
+
+        self.stats["parsed"] += 1
+        try:
+            changed = self._config.reload(json.loads(data.decode('utf-8')))
+        except ConfigValidationError as e:
+            logger.warning(f"外部修改的配置文件中有无效的配置项，未重新加载: {e}")
+            self.reload_failed.emit(str(e))
+            return []
+        except ValueError as e:
+            # 外部程序可能还没有写完，等待下一次变化
+            logger.warning(f"解析配置文件失败，未重新加载: {e}")
+            self.reload_failed.emit(str(e))
+            return []
+
+        if changed:
+            self.stats["reloaded"] += 1
+            logger.info(f"配置文件已被外部修改，重新加载: {', '.join(changed)}")
+            self.config_reloaded.emit(changed)
+        return changed
+
+
+# 全局配置文件监视器实例
+_config_watcher: Optional[ConfigFileWatcher] = None
+
+
+def setup_config_watcher(config: Optional[AppConfig] = None, debounce_ms: int = 500) -> ConfigFileWatcher:
+    """
+    设置配置文件监视器
+
+    Args:
+        config: 要监视的配置实例，默认为全局配置
+        debounce_ms: 文件变化后等待的毫秒数
+
+    Returns:
+        ConfigFileWatcher 实例
+    """
+    global _config_watcher
+    _config_watcher = ConfigFileWatcher(config or app_config, debounce_ms)
+    return _config_watcher
+
+
+def get_config_watcher() -> Optional[ConfigFileWatcher]:
+    """获取配置文件监视器实例（未设置时返回 None）"""
+    return _config_watcher
@@ -0,0 +1,287 @@
+"""
+配置文件写入模块
+将短时间内的多次保存请求合并为一次后台写入，并以原子方式（临时文件 + fsync + 重命名）
+落盘，写入过程中崩溃或断电不会留下被截断的配置文件
+
+本模块不依赖 PySide6，可同时用于应用配置和插件配置。
+"""
+
+import atexit
+import os
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# 序列化函数：返回要写入的文本；返回 None 表示内容没有变化，无需写入
+Serializer = Callable[[], Optional[str]]
+
+# 写入完成回调：参数为是否写入成功（只在序列化函数返回了文本时调用）
+WriteCallback = Callable[[bool], None]
+
+# 写入失败后重试的最长间隔（秒）
+MAX_RETRY_DELAY = 60.0
+
+
+def atomic_write_text(path: Union[str, Path], text: str, encoding: str = 'utf-8') -> None:
+    """
+    原子写入文本文件
+
+    先写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件。
+    任何一步失败时目标文件保持原样，临时文件会被删除。
+
+    Args:
+        path: 目标文件路径
+        text: 文件内容
+        encoding: 文本编码
+
+    示例:
+        atomic_write_text("config.json", json.dumps(data, indent=4))
+    """
+    path = Path(path)
+    directory = path.parent
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 创建的文件权限为 0600，沿用原文件的权限
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """同步目录项，确保重命名本身已落盘（Windows 不支持打开目录，直接跳过）"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DebouncedWriter:
+    """防抖的后台文件写入器
+
+    schedule() 只登记文件路径和序列化函数并立即返回；同一文件在 delay 秒内的多次请求
+    合并为一次写入，持续有请求时最迟 max_delay 秒也会写入一次。序列化函数在写入时才调用，
+    因此写入的总是最新的内容。写入失败（磁盘已满、权限不足、文件被占用等）时请求重新排队，
+    重试间隔从 max_delay 开始加倍，最长 MAX_RETRY_DELAY 秒。
+
+    使用方法:
+        writer = DebouncedWriter(delay=0.5)
+        writer.schedule("config.json", lambda: json.dumps(data))
+        writer.flush()  # 立即写出所有待写入的文件
+    """
+
+    def __init__(self, delay: float = 0.5, max_delay: float = 2.0, name: str = "config-writer"):
+        """
+        初始化写入器
+
+        Args:
+            delay: 最后一次请求后等待的秒数
+            max_delay: 从第一次请求起最多等待的秒数
+            name: 后台线程名称
+        """
+        self.delay = delay
+        self.max_delay = max(delay, max_delay)
+        self.name = name
+
+        # 路径 -> (序列化函数, 完成回调, 第一次请求时间, 写入期限)
+        self._pending: Dict[Path, Tuple[Serializer, Optional[WriteCallback], float, float]] = {}
+        # 路径 -> 连续写入失败的次数
+        self._retries: Dict[Path, int] = {}
+        self._cond = threading.Condition()
+        # 保证同一时刻只有一个线程在写文件（后台线程与 flush 调用方）
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # 路径 -> 最近一次写入后的 (大小, 修改时间)，用于识别文件变化是否来自本写入器
+        self._written: Dict[Path, Tuple[int, int]] = {}
+
+        self.scheduled = 0
+        self.writes = 0
+        self.failures = 0
+
+    def schedule(self, path: Union[str, Path], serialize: Serializer,
+                 on_done: Optional[WriteCallback] = None) -> None:
+        """
+        登记一次写入请求
+
+        Args:
+            path: 目标文件路径
+            serialize: 返回文件内容的函数（在写入时调用）
+            on_done: 写入完成后调用，参数为是否成功（可用于只在写入成功后清除修改标记）
+        """
+        path = Path(path).absolute()
+        now = time.monotonic()
+        with self._cond:
+            self.scheduled += 1
+            entry = self._pending.get(path)
+            first = entry[2] if entry else now
+            self._pending[path] = (serialize, on_done, first, min(now + self.delay, first + self.max_delay))
+            self._start_thread()
+            self._cond.notify()
+
+    def _start_thread(self):
+        """启动后台写入线程（调用方需持有 _cond）"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def has_pending(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """是否有尚未写入的请求（不指定路径时检查所有文件）"""
+        with self._cond:
+            if path is None:
+                return bool(self._pending)
+            return Path(path).absolute() in self._pending
+
+    def write_now(self, path: Union[str, Path], serialize: Serializer,
+                  on_done: Optional[WriteCallback] = None) -> bool:
+        """
+        在当前线程立即写入文件，并取消该文件尚未执行的延迟写入
+
+        写入失败时与延迟写入一样重新排队，稍后在后台重试。
+
+        Returns:
+            是否写入成功
+        """
+        path = Path(path).absolute()
+        with self._cond:
+            self._pending.pop(path, None)
+        return self._write(path, serialize, on_done)
+
+    def flush(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """
+        在当前线程立即写出待写入的文件
+
+        Args:
+            path: 只写出指定文件；为 None 时写出所有文件
+
+        Returns:
+            是否全部写入成功
+        """
+        with self._cond:
+            if path is None:
+                items = [(p, entry[0], entry[1]) for p, entry in self._pending.items()]
+                self._pending.clear()
+            else:
+                path = Path(path).absolute()
+                entry = self._pending.pop(path, None)
+                items = [(path, entry[0], entry[1])] if entry else []
+
+        results = [self._write(p, serialize, on_done) for p, serialize, on_done in items]
+        return all(results)
+
+    def written_fingerprint(self, path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+        """获取本写入器最近一次写入该文件后的 (大小, 修改时间纳秒)，从未写入时返回 None"""
+        with self._cond:
+            return self._written.get(Path(path).absolute())
+
+    def stats(self) -> Dict[str, int]:
+        """获取写入统计"""
+        with self._cond:
+            return {
+                "scheduled": self.scheduled,
+                "writes": self.writes,
+                "failures": self.failures,
+                "pending": len(self._pending),
+            }
+
+    def _run(self):
+        """后台线程：等待写入期限到达后写出文件"""
+        while True:
+            with self._cond:
+                items = self._take_due()
+                while not items:
+                    if self._pending:
+                        timeout = min(entry[3] for entry in self._pending.values()) - time.monotonic()
+                        self._cond.wait(max(timeout, 0))
+                    else:
+                        self._cond.wait()
+                    items = self._take_due()
+
+            for path, serialize, on_done in items:
+                self._write(path, serialize, on_done)
+
+    def _take_due(self) -> List[Tuple[Path, Serializer, Optional[WriteCallback]]]:
+        """取出已到写入期限的请求（调用方需持有 _cond）"""
+        now = time.monotonic()
+        due = [path for path, entry in self._pending.items() if entry[3] <= now]
+        return [(path, *self._pending.pop(path)[:2]) for path in due]
+
+    def _write(self, path: Path, serialize: Serializer, on_done: Optional[WriteCallback] = None) -> bool:
+        """序列化并原子写入单个文件，失败时重新排队"""
+        with self._io_lock:
+            text = None
+            try:
+                text = serialize()
+                if text is None:
+                    return True
+                atomic_write_text(path, text)
+                st = os.stat(path)
+                with self._cond:
+                    self.writes += 1
+                    self._written[path] = (st.st_size, st.st_mtime_ns)
+                    self._retries.pop(path, None)
+                if on_done is not None:
+                    on_done(True)
+                return True
+            except Exception as e:
+                if text is not None and on_done is not None:
+                    on_done(False)
+                with self._cond:
+                    self.failures += 1
+                    self._retry_later(path, serialize, on_done)
+                # 延迟导入避免循环依赖
+                try:
+                    from utils.logger import get_logger
+                    get_logger(__name__).error(f"保存配置文件失败 {path}: {e}")
+                except ImportError:
+                    print(f"保存配置文件失败 {path}: {e}")
+                return False
+
+    def _retry_later(self, path: Path, serialize: Serializer, on_done: Optional[WriteCallback]):
+        """写入失败后重新排队（调用方需持有 _cond）；期间已有新的请求时沿用新的请求"""
+        attempts = self._retries.get(path, 0) + 1
+        self._retries[path] = attempts
+        if path in self._pending:
+            return
+        now = time.monotonic()
+        retry_delay = min(self.max_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+        self._pending[path] = (serialize, on_done, now, now + retry_delay)
+        self._start_thread()
+        self._cond.notify()
+
+
+# 全局写入器实例
+_config_writer: Optional[DebouncedWriter] = None
+_config_writer_lock = threading.Lock()
+
+
+def get_config_writer() -> DebouncedWriter:
+    """获取全局配置写入器（首次调用时创建，并在程序退出时写出剩余内容）"""
+    global _config_writer
+    with _config_writer_lock:
+        if _config_writer is None:
+            _config_writer = DebouncedWriter()
+            atexit.register(_config_writer.flush)
+        return _config_writer
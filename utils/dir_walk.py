@@ -0,0 +1,226 @@
+"""
+目录遍历模块
+基于 os.scandir 的生成器式目录遍历：直接使用 DirEntry 缓存的类型信息（大多数文件系统上判断文件/目录不需要额外的 stat），
+逐个返回结果而不是先生成完整列表；包含/排除模式只编译一次，支持最大深度、符号链接策略和随时停止
+
+本模块不依赖 PySide6，被 utils.file_utils 使用。
+"""
+
+import os
+import re
+import threading
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+# 模式参数：单个模式或模式列表
+Patterns = Optional[Union[str, Sequence[str]]]
+
+# 文件系统不区分大小写时（Windows）模式匹配也不区分大小写，与 pathlib 一致
+_CASE_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+
+def _translate(pattern: str) -> str:
+    """把 glob 模式转换为正则表达式（* 和 ? 不匹配 /，以 **/ 开头的段匹配任意层目录）"""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        segment_start = i == 0 or pattern[i - 1] == "/"
+        if c == "*":
+            if segment_start and pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")
+                i += 3
+                continue
+            if segment_start and pattern[i:] == "**":
+                parts.append(".*")
+                break
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                parts.append(re.escape(c))
+            else:
+                chars = pattern[i + 1:j].replace("\\", "\\\\")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                parts.append(f"[{chars}]")
+                i = j
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+class GlobMatcher:
+    """
+    预编译的一组 glob 模式，匹配任意一个即为匹配
+
+    不含 / 的模式匹配文件名；含 / 的模式匹配相对于遍历根目录的路径（以 / 分隔）。
+
+    示例:
+        matcher = GlobMatcher(["*.py", "docs/*.md"])
+        matcher.match("main.py", "src/main.py")  # True
+    """
+
+    def __init__(self, patterns: Union[str, Sequence[str]]):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        names, paths = [], []
+        for pattern in patterns:
+            pattern = pattern.replace(os.sep, "/").rstrip("/") if pattern else pattern
+            if not pattern:
+                continue
+            (paths if "/" in pattern else names).append(_translate(pattern))
+
+        self.patterns = list(patterns)
+        # 多个模式合并为一个正则表达式，每个路径只匹配一次
+        self._name_re = re.compile("|".join(names), _CASE_FLAGS) if names else None
+        self._path_re = re.compile("|".join(paths), _CASE_FLAGS) if paths else None
+
+    @property
+    def uses_path(self) -> bool:
+        """是否有需要相对路径的模式"""
+        return self._path_re is not None
+
+    def match(self, name: str, rel_path: Optional[str] = None) -> bool:
+        """
+        判断是否匹配
+
+        Args:
+            name: 文件或目录名
+            rel_path: 相对于遍历根目录的路径（以 / 分隔，uses_path 为 True 时需要）
+        """
+        if self._name_re is not None and self._name_re.fullmatch(name):
+            return True
+        return self._path_re is not None and rel_path is not None and bool(self._path_re.fullmatch(rel_path))
+
+
+def compile_globs(patterns: Patterns) -> Optional[GlobMatcher]:
+    """编译模式；没有模式或模式为 "*"（匹配全部）时返回 None，遍历时不做匹配"""
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    if not patterns or "*" in patterns:
+        return None
+    return GlobMatcher(patterns)
+
+
+def scan_tree(root: Union[str, os.PathLike], include: Patterns = None, exclude: Patterns = None,
+              files: bool = True, dirs: bool = False, max_depth: Optional[int] = None,
+              follow_symlinks: bool = False, cancel_event: Optional[threading.Event] = None,
+              on_error: Optional[Callable[[OSError], None]] = None) -> Iterator[os.DirEntry]:
+    """
+    遍历目录树，逐个返回匹配的 os.DirEntry
+
+    每个目录读取完毕后立即关闭，再进入其子目录（同时打开的目录句柄不随深度增加）。
+    DirEntry 缓存了类型信息，调用方需要大小等信息时使用 entry.stat()（Windows 上不需要额外的系统调用）。
+    停止迭代（break）或设置 cancel_event 即可提前结束遍历。
+
+    Args:
+        root: 根目录
+        include: 只返回匹配这些 glob 模式的条目（不影响是否进入子目录），None 表示全部
+        exclude: 跳过匹配这些 glob 模式的条目，匹配的目录不再进入
+        files: 是否返回文件
+        dirs: 是否返回目录
+        max_depth: 最大深度，0 表示只遍历根目录的直接子项，None 表示不限制
+        follow_symlinks: 是否进入指向目录的符号链接（会检测循环链接）；指向文件或目录的符号链接本身总是按目标类型返回
+        cancel_event: 取消事件
+        on_error: 无法读取目录时的回调，None 表示忽略该目录
+
+    Yields:
+        os.DirEntry（entry.path 为以 root 开头的路径）
+
+    示例:
+        for entry in scan_tree("project", include="*.py", exclude=[".git", "__pycache__"]):
+            print(entry.path, entry.stat().st_size)
+    """
+    include_matcher = compile_globs(include)
+    exclude_matcher = compile_globs(exclude)
+    need_rel = bool((include_matcher and include_matcher.uses_path)
+                    or (exclude_matcher and exclude_matcher.uses_path))
+
+    root = os.fspath(root)
+    visited = None
+    if follow_symlinks:
+        try:
+            st = os.stat(root)
+        except OSError as e:
+            if on_error is not None:
+                on_error(e)
+            return
+        visited = {(st.st_dev, st.st_ino)}
+
+    # 待遍历的目录：(路径, 深度, 相对路径前缀)
+    stack = [(root, 0, "")]
+    while stack:
+        path, depth, prefix = stack.pop()
+        descend = max_depth is None or depth < max_depth
+        subdirs = []
+        try:
+            iterator = os.scandir(path)
+        except OSError as e:
+            if on_error is not None:
+                on_error(e)
+            continue
+
+        with iterator:
+            for entry in iterator:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                name = entry.name
+                rel = prefix + name if need_rel else None
+                if exclude_matcher is not None and exclude_matcher.match(name, rel):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if dirs and (include_matcher is None or include_matcher.match(name, rel)):
+                        yield entry
+                    if descend and _should_descend(entry, follow_symlinks, visited):
+                        subdirs.append((entry.path, depth + 1, rel + "/" if need_rel else ""))
+                elif files:
+                    try:
+                        is_file = entry.is_file()
+                    except OSError:
+                        is_file = False
+                    if is_file and (include_matcher is None or include_matcher.match(name, rel)):
+                        yield entry
+
+        # 反向入栈，子目录按读取顺序遍历
+        stack.extend(reversed(subdirs))
+
+
+def _should_descend(entry: os.DirEntry, follow_symlinks: bool, visited: Optional[set]) -> bool:
+    """判断是否进入目录：不跟随符号链接时跳过链接；跟随时跳过已经遍历过的目录（循环链接）"""
+    try:
+        if not follow_symlinks:
+            return not entry.is_symlink()
+        st = entry.stat()
+    except OSError:
+        return False
+    key = (st.st_dev, st.st_ino)
+    if key in visited:
+        return False
+    visited.add(key)
+    return True
+
+
+def walk_paths(root: Union[str, os.PathLike], include: Patterns = None, **kwargs) -> List[str]:
+    """
+    遍历目录树，返回匹配条目的路径列表（参数同 scan_tree）
+
+    示例:
+        paths = walk_paths("project", "*.txt", max_depth=2)
+    """
+    return [entry.path for entry in scan_tree(root, include, **kwargs)]
@@ -105,6 +105,8 @@ class DragDropMixin:
         import os
         
         valid_files = []
+        # 扩展名集合只构建一次，避免在循环中为每个文件重建列表
+        allowed_extensions = {e.lower() for e in self._allowed_extensions or ()}
         
         for url in urls:
             if url.isLocalFile():
@@ -119,10 +121,10 @@ class DragDropMixin:
                 # 检查是否是文件
                 if os.path.isfile(file_path):
                     # 检查扩展名
-                    if self._allowed_extensions:
+                    if allowed_extensions:
                         _, ext = os.path.splitext(file_path)
-                        if ext.lower() not in [e.lower() for e in self._allowed_extensions]:
-                            logger.debug(f"文件扩展名不允许: {file_path}")
+                        if ext.lower() not in allowed_extensions:
+                            logger.debug("文件扩展名不允许: {}", file_path)
                             continue
                     
                     valid_files.append(file_path)
@@ -238,6 +240,8 @@ class DragDropWidget(QWidget):
         import os
 
         valid_files = []
+        # 扩展名集合只构建一次，避免在循环中为每个文件重建列表
+        allowed_extensions = {e.lower() for e in self._allowed_extensions or ()}
 
         for url in urls:
             if url.isLocalFile():
@@ -252,10 +256,10 @@ class DragDropWidget(QWidget):
                 # 检查是否是文件
                 if os.path.isfile(file_path):
                     # 检查扩展名
-                    if self._allowed_extensions:
+                    if allowed_extensions:
                         _, ext = os.path.splitext(file_path)
-                        if ext.lower() not in [e.lower() for e in self._allowed_extensions]:
-                            logger.debug(f"文件扩展名不允许: {file_path}")
+                        if ext.lower() not in allowed_extensions:
+                            logger.debug("文件扩展名不允许: {}", file_path)
                             continue
 
                     valid_files.append(file_path)
@@ -0,0 +1,316 @@
+"""
+重复文件查找模块
+分阶段缩小候选范围，避免读取每个文件的全部内容：
+1. 按文件大小分组，大小唯一的文件不可能重复；
+2. 对同样大小的文件只读取开头和末尾各一小块计算部分哈希；
+3. 只对部分哈希也相同的文件计算完整哈希（使用持久化的哈希缓存）。
+第 2、3 阶段在线程池中并行执行，某个大小的文件全部比较完毕后立即返回确认的重复文件组
+
+本模块不依赖 PySide6，被 utils.file_utils 使用。
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.dir_walk import Patterns, scan_tree
+from utils.file_hash import get_buffer, default_workers, hash_file
+from utils.hash_cache import get_hash_cache
+
+# 部分哈希读取的开头和末尾的字节数；不大于两倍该大小的文件直接计算完整哈希
+PARTIAL_BLOCK = 16 * 1024
+
+# 部分哈希使用的算法（只用于排除不同的文件，不需要与完整哈希相同）
+PARTIAL_ALGORITHM = "blake2b"
+
+_STAGE_PARTIAL = 1
+_STAGE_FULL = 2
+
+
+@dataclass(frozen=True, slots=True)
+class DuplicateGroup:
+    """一组内容相同的文件"""
+    size: int
+    digest: str
+    paths: Tuple[str, ...]
+
+    @property
+    def wasted(self) -> int:
+        """重复占用的空间（保留一个文件时可以释放的字节数）"""
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass(frozen=True, slots=True)
+class DuplicateProgress:
+    """重复文件查找的进度"""
+    files_total: int
+    candidates: int
+    partial_done: int
+    full_done: int
+    bytes_read: int
+    groups: int
+
+
+class _Cancelled(Exception):
+    """内部异常：查找被取消，中止正在计算的哈希"""
+
+
+def _partial_hash(path: str, size: int) -> str:
+    """读取文件开头和末尾各 PARTIAL_BLOCK 字节计算哈希"""
+    hasher = hashlib.new(PARTIAL_ALGORITHM)
+    buffer = get_buffer(PARTIAL_BLOCK)
+    with open(path, 'rb', buffering=0) as f:
+        with memoryview(buffer) as view:
+            for offset in (0, size - PARTIAL_BLOCK):
+                f.seek(offset)
+                n = f.readinto(buffer)
+                hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def _collect_files(paths: Iterable[Union[str, os.PathLike]], min_size: int, exclude: Patterns,
+                   follow_symlinks: bool, cancelled: Callable[[], bool]) -> Tuple[Dict[int, List[str]], int]:
+    """
+    收集文件并按大小分组
+
+    同一个文件（相同的设备号和 inode，例如硬链接或重叠的目录）只保留第一次出现的路径；
+    不跟随符号链接时跳过指向文件的符号链接，避免把链接和目标文件当成重复文件。
+
+    Returns:
+        (大小 -> 路径列表, 文件总数)
+    """
+    by_size: Dict[int, List[str]] = {}
+    seen = set()
+    total = 0
+
+    def add(path: str, st: os.stat_result):
+        nonlocal total
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            return
+        seen.add(key)
+        total += 1
+        if st.st_size >= min_size:
+            by_size.setdefault(st.st_size, []).append(path)
+
+    for root in paths:
+        root = os.fspath(root)
+        if cancelled():
+            break
+        if os.path.isdir(root):
+            for entry in scan_tree(root, exclude=exclude, follow_symlinks=follow_symlinks):
+                if cancelled():
+                    break
+                if not follow_symlinks and entry.is_symlink():
+                    continue
+                try:
+                    add(entry.path, entry.stat())
+                except OSError:
+                    continue
+        else:
+            try:
+                add(root, os.stat(root))
+            except OSError:
+                continue
+    return by_size, total
+
+
+def find_duplicates(paths: Iterable[Union[str, os.PathLike]], algorithm: str = 'sha256', min_size: int = 1,
+                    workers: Optional[int] = None, exclude: Patterns = None, follow_symlinks: bool = False,
+                    use_cache: bool = True, cancel_event: Optional[threading.Event] = None,
+                    progress: Optional[Callable[[DuplicateProgress], None]] = None,
+                    progress_interval: float = 0.1) -> Iterator[DuplicateGroup]:
+    """
+    查找重复文件，每确认一组就立即返回一组
+
+    大文件优先处理；多线程时小文件的组可能先于仍在计算完整哈希的大文件组返回。
+
+    Args:
+        paths: 文件或目录（目录递归遍历）
+        algorithm: 完整哈希的算法
+        min_size: 忽略小于该字节数的文件（默认忽略空文件）
+        workers: 计算哈希的线程数，None 表示根据 CPU 核心数和磁盘类型自动选择
+        exclude: 遍历目录时跳过匹配这些 glob 模式的文件和目录
+        follow_symlinks: 是否跟随符号链接
+        use_cache: 完整哈希是否使用持久化的哈希缓存（重复查找同一目录时不再读取未变化的文件）
+        cancel_event: 取消事件
+        progress: 进度回调（在迭代结果的线程中调用，最多每 progress_interval 秒一次，结束时再调用一次）
+        progress_interval: 进度回调的最小间隔（秒）
+
+    Yields:
+        DuplicateGroup（paths 按路径排序；读取失败的文件不会出现在结果中）
+
+    Raises:
+        ValueError: 算法不受支持
+
+    示例:
+        for group in find_duplicates(["D:/Photos", "E:/Backup"]):
+            print(format_file_size(group.wasted), group.paths)
+    """
+    hashlib.new(algorithm)
+    stop = threading.Event()
+
+    def cancelled() -> bool:
+        return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    by_size, files_total = _collect_files(paths, min_size, exclude, follow_symlinks, cancelled)
+    # 大小唯一的文件不可能重复；大文件优先，尽早报告占用空间最多的重复文件
+    sizes = sorted((size for size, group in by_size.items() if len(group) > 1), reverse=True)
+    if cancelled():
+        return
+
+    cache = get_hash_cache() if use_cache else None
+    lock = threading.Lock()
+    counters = {"partial": 0, "full": 0, "bytes": 0, "groups": 0}
+    candidates = sum(len(by_size[size]) for size in sizes)
+    last_report = [time.monotonic()]
+
+    def on_block(n: int):
+        if cancelled():
+            raise _Cancelled()
+        with lock:
+            counters["bytes"] += n
+
+    def full_hash(path: str) -> str:
+        if cache is not None:
+            return cache.get_or_compute(path, algorithm, progress=on_block)
+        return hash_file(path, (algorithm,), progress=on_block)[algorithm]
+
+    def run_task(task: tuple) -> Optional[tuple]:
+        """执行一个哈希任务，返回 (阶段, 分组键, 路径, 哈希值)；读取失败时哈希值为 None，取消时返回 None"""
+        stage, key, path = task
+        size = key if stage == _STAGE_PARTIAL else key[0]
+        try:
+            if stage == _STAGE_PARTIAL and size > 2 * PARTIAL_BLOCK:
+                digest = _partial_hash(path, size)
+                with lock:
+                    counters["bytes"] += 2 * PARTIAL_BLOCK
+            else:
+                digest = full_hash(path)
+        except _Cancelled:
+            return None
+        except (OSError, ValueError):
+            digest = None
+        return stage, key, path, digest
+
+    # 各分组剩余的任务数和已得到的哈希值
+    pending: Dict[object, int] = {}
+    digests: Dict[object, Dict[str, List[str]]] = {}
+
+    def initial_tasks() -> List[tuple]:
+        tasks = []
+        for size in sizes:
+            pending[size] = len(by_size[size])
+            digests[size] = {}
+            tasks.extend((_STAGE_PARTIAL, size, path) for path in by_size[size])
+        return tasks
+
+    def handle(result: tuple) -> Tuple[List[tuple], List[DuplicateGroup]]:
+        """处理一个哈希结果，返回新的任务和已确认的重复文件组"""
+        stage, key, path, digest = result
+        with lock:
+            counters["partial" if stage == _STAGE_PARTIAL else "full"] += 1
+        if digest is not None:
+            digests[key].setdefault(digest, []).append(path)
+        pending[key] -= 1
+        if pending[key]:
+            return [], []
+
+        groups = digests.pop(key)
+        del pending[key]
+        new_tasks, confirmed = [], []
+        for digest, group in groups.items():
+            if len(group) < 2:
+                continue
+            if stage == _STAGE_FULL or key <= 2 * PARTIAL_BLOCK:
+                # 完整哈希相同（小文件在第一阶段已计算完整哈希）
+                size = key[0] if stage == _STAGE_FULL else key
+                confirmed.append(DuplicateGroup(size, digest, tuple(sorted(group))))
+            else:
+                full_key = (key, digest)
+                pending[full_key] = len(group)
+                digests[full_key] = {}
+                new_tasks.extend((_STAGE_FULL, full_key, p) for p in group)
+        with lock:
+            counters["groups"] += len(confirmed)
+        return new_tasks, confirmed
+
+    def report(force: bool = False):
+        if progress is None:
+            return
+        now = time.monotonic()
+        if force or now - last_report[0] >= progress_interval:
+            last_report[0] = now
+            with lock:
+                snapshot = DuplicateProgress(files_total, candidates, counters["partial"], counters["full"],
+                                             counters["bytes"], counters["groups"])
+            progress(snapshot)
+
+    tasks_list = initial_tasks()
+    if workers is None:
+        workers = default_workers(by_size[sizes[0]][0] if sizes else None)
+    workers = max(1, min(workers, len(tasks_list)))
+
+    if workers == 1:
+        queue_inline = deque(tasks_list)
+        while queue_inline:
+            result = None if cancelled() else run_task(queue_inline.popleft())
+            if result is None:
+                return
+            new_tasks, confirmed = handle(result)
+            # 先完成当前分组的完整哈希，再继续下一个大小
+            queue_inline.extendleft(reversed(new_tasks))
+            for group in confirmed:
+                yield group
+            report()
+        report(force=True)
+        return
+
+    tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+    results: "queue.SimpleQueue" = queue.SimpleQueue()
+    for task in tasks_list:
+        tasks.put(task)
+    outstanding = len(tasks_list)
+
+    def worker():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            # 取消后只取出剩余的任务，不再计算
+            results.put(None if cancelled() else run_task(task))
+
+    threads = [threading.Thread(target=worker, name=f"find-duplicates-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while outstanding:
+            try:
+                result = results.get(timeout=progress_interval)
+            except queue.Empty:
+                if cancelled():
+                    return
+                report()
+                continue
+            if result is None or cancelled():
+                return
+            outstanding -= 1
+            new_tasks, confirmed = handle(result)
+            for task in new_tasks:
+                tasks.put(task)
+            outstanding += len(new_tasks)
+            for group in confirmed:
+                yield group
+            report()
+        report(force=True)
+    finally:
+        stop.set()
+        for _ in threads:
+            tasks.put(None)
+        for thread in threads:
+            thread.join()
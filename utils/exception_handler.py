@@ -11,7 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-from utils.logger import get_logger
+from utils.logger import get_logger, get_flight_recorder
 from utils.config import app_config
 
 logger = get_logger(__name__)
@@ -97,6 +97,10 @@ class ExceptionHandler:
         # 获取系统信息
         system_info = self._get_system_info()
         
+        # 获取出错前的最近日志（飞行记录器）
+        recorder = get_flight_recorder()
+        recent_logs = recorder.to_dicts() if recorder else []
+        
         # 构建错误信息
         error_info = {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -105,7 +109,8 @@ class ExceptionHandler:
             'exception_type': exc_type.__name__,
             'exception_message': str(exc_value),
             'traceback': tb_text,
-            'system_info': system_info
+            'system_info': system_info,
+            'recent_logs': recent_logs
         }
         
         return error_info
@@ -0,0 +1,485 @@
+"""
+文件复制模块
+优先使用内核内复制（os.copy_file_range，其次 Linux 上的 os.sendfile），数据不经过用户态；不支持时退回
+复用大缓冲区的 readinto 循环。复制前为目标文件预分配空间，按时间间隔报告进度，可以取消，
+大文件先写入 .part 临时文件并支持从中断处继续；copy_files() 在线程池中批量复制大量小文件
+
+本模块不依赖 PySide6，被 utils.file_utils 使用。
+"""
+
+import errno
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from utils.file_hash import get_buffer, default_workers
+
+# 每次内核复制调用（或一轮 readinto）处理的最大字节数，也是检查取消的粒度
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# readinto 回退方式的缓冲区大小
+BUFFER_SIZE = 1024 * 1024
+
+# 不小于该大小的文件预分配空间，并先写入 .part 临时文件（小文件直接写入目标文件，减少系统调用）
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+
+# 未完成的复制使用的临时文件后缀
+PARTIAL_SUFFIX = ".part"
+
+# 继续复制前比较源文件和 .part 文件末尾的字节数，不一致时重新复制
+RESUME_VERIFY_SIZE = 64 * 1024
+
+# 复制方式（按优先顺序）
+METHOD_COPY_FILE_RANGE = "copy_file_range"
+METHOD_SENDFILE = "sendfile"
+METHOD_READINTO = "readinto"
+
+# 内核复制不支持当前文件或文件系统时返回的错误码，遇到时改用下一种方式
+_UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EBADF,
+                       getattr(errno, "EOPNOTSUPP", errno.ENOSYS), getattr(errno, "ENOTSUP", errno.ENOSYS),
+                       getattr(errno, "ENOTSOCK", errno.ENOSYS)}
+
+# 单个文件的进度回调：参数为 (已复制字节数, 总字节数)
+ProgressCallback = Callable[[int, int], None]
+
+
+class CopyCancelled(Exception):
+    """复制被取消"""
+
+
+def _detect_methods() -> Tuple[str, ...]:
+    """检测当前系统支持的复制方式（按优先顺序）"""
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append(METHOD_COPY_FILE_RANGE)
+    # 其他系统的 sendfile 只能发送到套接字
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        methods.append(METHOD_SENDFILE)
+    methods.append(METHOD_READINTO)
+    return tuple(methods)
+
+
+_METHODS = _detect_methods()
+
+
+def available_methods() -> Tuple[str, ...]:
+    """当前系统支持的复制方式（按优先顺序）"""
+    return _METHODS
+
+
+class _Unsupported(Exception):
+    """内部异常：当前复制方式不可用"""
+
+
+class _CopyState:
+    """单个文件的复制位置、取消检查和进度节流"""
+
+    def __init__(self, position: int, total: int, cancel_event: Optional[threading.Event],
+                 progress: Optional[ProgressCallback], interval: float):
+        self.position = position
+        self.total = total
+        self._cancel_event = cancel_event
+        self._progress = progress
+        self._interval = interval
+        self._last_report = time.monotonic()
+
+    def advance(self, n: int):
+        """复制了 n 个字节"""
+        self.position += n
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise CopyCancelled()
+        if self._progress is not None:
+            now = time.monotonic()
+            if now - self._last_report >= self._interval:
+                self._last_report = now
+                self._progress(self.position, self.total)
+
+    def report(self):
+        """报告最终进度"""
+        if self._progress is not None:
+            self._progress(self.position, self.total)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, state: _CopyState, end: int, chunk_size: int):
+    """用 copy_file_range 复制到 end（支持的文件系统上可能直接共享数据块）"""
+    while state.position < end:
+        try:
+            n = os.copy_file_range(src_fd, dst_fd, min(chunk_size, end - state.position),
+                                   state.position, state.position)
+        except OSError as e:
+            if e.errno in _UNSUPPORTED_ERRNOS:
+                raise _Unsupported() from e
+            raise
+        if n == 0:
+            # 源文件被截短
+            return
+        state.advance(n)
+
+
+def _sendfile(src_fd: int, dst_fd: int, state: _CopyState, end: int, chunk_size: int):
+    """用 sendfile 复制到 end（写入目标文件的当前位置）"""
+    os.lseek(dst_fd, state.position, os.SEEK_SET)
+    while state.position < end:
+        try:
+            n = os.sendfile(dst_fd, src_fd, state.position, min(chunk_size, end - state.position))
+        except OSError as e:
+            if e.errno in _UNSUPPORTED_ERRNOS:
+                raise _Unsupported() from e
+            raise
+        if n == 0:
+            return
+        state.advance(n)
+
+
+def _readinto(src, dst, state: _CopyState, chunk_size: int):
+    """复用缓冲区循环 readinto + write，复制到源文件末尾"""
+    buffer = get_buffer(BUFFER_SIZE)
+    src.seek(state.position)
+    dst.seek(state.position)
+    with memoryview(buffer) as view:
+        pending = 0
+        while True:
+            n = src.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n]
+            written = 0
+            while written < n:
+                written += dst.write(chunk[written:])
+            pending += n
+            # 按 chunk_size 汇总进度，与内核复制方式的检查粒度一致
+            if pending >= chunk_size:
+                state.advance(pending)
+                pending = 0
+        if pending:
+            state.advance(pending)
+
+
+def _resume_offset(src, part_path: str, size: int) -> int:
+    """
+    计算可以继续复制的位置：.part 文件比源文件短，且末尾的数据与源文件相同时从其末尾继续，否则为 0
+
+    预分配的 .part 文件在取消或出错时会被截短到已复制的位置；程序异常退出留下的完整大小的 .part 文件无法判断
+    已复制的位置，重新复制。
+    """
+    try:
+        offset = os.path.getsize(part_path)
+    except OSError:
+        return 0
+    if offset == 0 or offset >= size:
+        return 0
+    verify = min(RESUME_VERIFY_SIZE, offset)
+    with open(part_path, 'rb') as part:
+        part.seek(offset - verify)
+        tail = part.read(verify)
+    src.seek(offset - verify)
+    return offset if src.read(verify) == tail else 0
+
+
+def _preallocate(fd: int, offset: int, length: int):
+    """为目标文件预分配空间（文件系统不支持时忽略；空间不足时抛出 OSError）"""
+    if length <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, offset, length)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+
+
+def copy_file_data(src: Union[str, os.PathLike], dst: Union[str, os.PathLike],
+                   progress: Optional[ProgressCallback] = None, progress_interval: float = 0.1,
+                   cancel_event: Optional[threading.Event] = None, resume: bool = False,
+                   preallocate: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   method: Optional[str] = None, copy_metadata: bool = True) -> int:
+    """
+    复制文件内容（以及权限和时间，与 shutil.copy2 相同）
+
+    大文件（不小于 LARGE_FILE_THRESHOLD）或 resume 为 True 时先写入 dst + ".part"，完成后原子地替换 dst；
+    小文件直接写入 dst。取消或出错时，resume 为 True 则保留 .part 文件（截短到已复制的位置），
+    下次以 resume=True 复制同一文件时从该位置继续，否则删除。
+
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径（已存在时覆盖；目录需已存在）
+        progress: 进度回调 (已复制字节数, 总字节数)，最多每 progress_interval 秒一次，结束时再调用一次
+        progress_interval: 进度回调的最小间隔（秒）
+        cancel_event: 取消事件，每复制 chunk_size 字节检查一次
+        resume: 是否从已有的 .part 文件继续，并在取消或出错时保留 .part 文件
+        preallocate: 是否为大文件预分配空间（减少碎片，空间不足时立即失败）
+        chunk_size: 每次复制调用处理的最大字节数
+        method: 指定复制方式（METHOD_*，不可用时退回 readinto），None 表示按 available_methods() 的顺序自动选择
+        copy_metadata: 是否复制权限和时间
+
+    Returns:
+        复制后的文件大小
+
+    Raises:
+        CopyCancelled: 复制被取消
+        OSError: 读写失败
+        shutil.SameFileError: 源文件和目标文件相同
+        ValueError: 复制方式或块大小无效
+
+    示例:
+        copy_file_data("big.iso", "backup/big.iso", progress=lambda done, total: print(done, total))
+    """
+    src = os.fspath(src)
+    dst = os.fspath(dst)
+    if chunk_size <= 0:
+        raise ValueError("块大小必须大于 0")
+    if method is not None and method not in (METHOD_COPY_FILE_RANGE, METHOD_SENDFILE, METHOD_READINTO):
+        raise ValueError(f"不支持的复制方式: {method}")
+    methods = available_methods() if method is None else (method,)
+
+    with open(src, 'rb', buffering=0) as fsrc:
+        src_st = os.fstat(fsrc.fileno())
+        size = src_st.st_size
+        _check_not_same_file(src_st, src, dst)
+        use_partial = resume or size >= LARGE_FILE_THRESHOLD
+        target = dst + PARTIAL_SUFFIX if use_partial else dst
+        offset = _resume_offset(fsrc, target, size) if resume else 0
+
+        state = _CopyState(offset, size, cancel_event, progress, progress_interval)
+        try:
+            with open(target, 'r+b' if offset else 'wb', buffering=0) as fdst:
+                try:
+                    if preallocate and size >= LARGE_FILE_THRESHOLD:
+                        _preallocate(fdst.fileno(), offset, size - offset)
+                    _copy_data(fsrc, fdst, state, size, chunk_size, methods)
+                except BaseException:
+                    # 去掉预分配但没有写入的部分，.part 文件的大小即为已复制的位置
+                    os.ftruncate(fdst.fileno(), state.position)
+                    raise
+                if state.position < size:
+                    # 源文件在复制过程中变短
+                    os.ftruncate(fdst.fileno(), state.position)
+        except BaseException:
+            if not resume:
+                _remove_quietly(target)
+            raise
+    return _finish(src, dst, target, state, copy_metadata)
+
+
+def _check_not_same_file(src_st: os.stat_result, src: str, dst: str):
+    """目标文件与源文件相同时抛出 shutil.SameFileError"""
+    try:
+        dst_st = os.stat(dst)
+    except OSError:
+        return
+    if (dst_st.st_dev, dst_st.st_ino) == (src_st.st_dev, src_st.st_ino):
+        raise shutil.SameFileError(f"{src} 和 {dst} 是同一个文件")
+
+
+_KERNEL_COPIERS = {METHOD_COPY_FILE_RANGE: _copy_file_range, METHOD_SENDFILE: _sendfile}
+
+
+def _copy_data(fsrc, fdst, state: _CopyState, size: int, chunk_size: int, methods):
+    """按顺序尝试内核复制方式，都不可用时使用 readinto"""
+    for method in methods:
+        # 大小为 0 的可能是 /proc 等虚拟文件，需要读取到文件末尾
+        if method == METHOD_READINTO or size == 0:
+            break
+        try:
+            _KERNEL_COPIERS[method](fsrc.fileno(), fdst.fileno(), state, size, chunk_size)
+            return
+        except _Unsupported:
+            continue
+    _readinto(fsrc, fdst, state, chunk_size)
+
+
+def _remove_quietly(path: str):
+    """删除文件，忽略错误"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _finish(src: str, dst: str, target: str, state: _CopyState, copy_metadata: bool) -> int:
+    """复制权限和时间，把临时文件替换为目标文件"""
+    if copy_metadata:
+        shutil.copystat(src, target)
+    if target != dst:
+        os.replace(target, dst)
+    state.report()
+    return state.position
+
+
+@dataclass(frozen=True, slots=True)
+class CopyResult:
+    """批量复制中单个文件的结果（失败时 error 为错误信息）"""
+    src: str
+    dst: str
+    size: int
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """是否复制成功"""
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class CopyProgress:
+    """批量复制的总体进度"""
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+
+def copy_files(pairs: Iterable[Tuple[Union[str, os.PathLike], Union[str, os.PathLike]]],
+               workers: Optional[int] = None, overwrite: bool = True,
+               cancel_event: Optional[threading.Event] = None,
+               progress: Optional[Callable[[CopyProgress], None]] = None,
+               progress_interval: float = 0.1, resume: bool = False,
+               copy_metadata: bool = True) -> Iterator[CopyResult]:
+    """
+    在线程池中批量复制文件，按完成顺序逐个返回结果
+
+    大量小文件的耗时主要在打开、创建和设置元数据等系统调用上（执行期间释放 GIL），多个线程同时复制可以
+    让这些调用在磁盘和文件系统中重叠；大文件同样使用 copy_file_data 的内核复制。目标目录自动创建。
+    设置 cancel_event 或提前停止迭代时，不再开始新的文件，正在复制的文件在下一个数据块处中止。
+
+    Args:
+        pairs: (源文件, 目标文件) 列表
+        workers: 线程数，None 表示根据 CPU 核心数和磁盘类型自动选择
+        overwrite: 目标文件已存在时是否覆盖（不覆盖时该文件返回错误）
+        cancel_event: 取消事件
+        progress: 总体进度回调（在迭代结果的线程中调用，最多每 progress_interval 秒一次，结束时再调用一次）
+        progress_interval: 进度回调的最小间隔（秒）
+        resume: 传给 copy_file_data，大文件从已有的 .part 文件继续
+        copy_metadata: 是否复制权限和时间
+
+    Yields:
+        CopyResult（失败的文件也会返回，error 为错误信息）
+
+    示例:
+        for result in copy_files([("a.txt", "backup/a.txt"), ("b.txt", "backup/b.txt")]):
+            print(result.dst, "成功" if result.ok else result.error)
+    """
+    entries = []
+    for src, dst in pairs:
+        src, dst = os.fspath(src), os.fspath(dst)
+        try:
+            size = os.stat(src).st_size
+        except OSError:
+            size = 0
+        entries.append((src, dst, size))
+    if workers is None:
+        workers = default_workers(entries[0][0] if entries else None)
+    workers = max(1, min(workers, len(entries)))
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {"files": 0, "bytes": 0}
+    bytes_total = sum(size for _, _, size in entries)
+    last_report = [time.monotonic()]
+    # 已创建的目标目录，避免对同一目录重复调用 makedirs
+    created_dirs = set()
+
+    def cancelled() -> bool:
+        return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    # 所有文件共用一个取消事件，stop 或 cancel_event 设置时都会中止正在复制的文件
+    abort = _AnyEvent(stop, cancel_event)
+
+    def on_progress(previous: list):
+        def callback(done: int, total: int):
+            with lock:
+                totals["bytes"] += done - previous[0]
+            previous[0] = done
+        return callback
+
+    def task(src: str, dst: str, size: int) -> Optional[CopyResult]:
+        try:
+            if not overwrite and os.path.exists(dst):
+                raise FileExistsError(f"目标文件已存在: {dst}")
+            directory = os.path.dirname(dst)
+            if directory and directory not in created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                created_dirs.add(directory)
+            copied = copy_file_data(src, dst, progress=on_progress([0]), progress_interval=0,
+                                    cancel_event=abort, resume=resume, copy_metadata=copy_metadata)
+            return CopyResult(src, dst, copied)
+        except CopyCancelled:
+            return None
+        except Exception as e:
+            return CopyResult(src, dst, size, error=str(e))
+
+    def report(force: bool = False):
+        if progress is None:
+            return
+        now = time.monotonic()
+        if force or now - last_report[0] >= progress_interval:
+            last_report[0] = now
+            with lock:
+                snapshot = CopyProgress(totals["files"], len(entries), totals["bytes"], bytes_total)
+            progress(snapshot)
+
+    def finished(result: CopyResult):
+        with lock:
+            totals["files"] += 1
+        report()
+
+    if workers == 1:
+        for entry in entries:
+            result = None if cancelled() else task(*entry)
+            if result is None:
+                return
+            finished(result)
+            yield result
+        report(force=True)
+        return
+
+    tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+    results: "queue.SimpleQueue" = queue.SimpleQueue()
+    for entry in entries:
+        tasks.put(entry)
+
+    def worker():
+        while not cancelled():
+            try:
+                entry = tasks.get_nowait()
+            except queue.Empty:
+                return
+            results.put(task(*entry))
+
+    threads = [threading.Thread(target=worker, name=f"file-copy-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(len(entries)):
+            while True:
+                try:
+                    result = results.get(timeout=progress_interval)
+                    break
+                except queue.Empty:
+                    if cancelled():
+                        return
+                    report()
+            if result is None or cancelled():
+                return
+            finished(result)
+            yield result
+        report(force=True)
+    finally:
+        # 取消或提前停止迭代：中止正在复制的文件，不再领取新的文件
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+class _AnyEvent:
+    """把多个事件组合为一个：任意一个被设置时 is_set() 返回 True"""
+
+    def __init__(self, *events: Optional[threading.Event]):
+        self._events = [event for event in events if event is not None]
+
+    def is_set(self) -> bool:
+        return any(event.is_set() for event in self._events)
@@ -0,0 +1,370 @@
+"""
+文件哈希模块
+用可复用的 bytearray 缓冲区 + readinto + memoryview 读取文件，读取过程中不再为每个数据块分配新的 bytes 对象；
+大文件使用 mmap 直接把页缓存交给哈希函数，并支持一次读取同时计算多个摘要（如 sha256 + md5）；
+hash_files() 在线程池中批量计算（hashlib 处理大块数据时会释放 GIL），按完成顺序逐个返回结果
+
+本模块不依赖 PySide6，被 utils.file_utils 和 updater.file_manager 使用。
+"""
+
+import hashlib
+import mmap
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+# 默认块大小：64 KiB 以上吞吐已基本不再增长（见 examples/hash_benchmark.py），256 KiB 同时保持进度回调足够频繁
+DEFAULT_BLOCK_SIZE = 256 * 1024
+
+# 不小于该大小的文件默认使用 mmap 读取（更小的文件建立映射的开销超过节省的拷贝）
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# 进度回调：参数为本次处理的字节数
+ProgressCallback = Callable[[int], None]
+
+# 每个线程最多缓存的缓冲区大小种数（find_duplicates 交替使用 16 KiB 和 256 KiB 两种，复制文件使用 1 MiB）
+MAX_CACHED_BUFFERS = 4
+
+# 每个线程复用自己的读取缓冲区（块大小 -> bytearray，按最近使用排序）
+_buffers = threading.local()
+
+
+def get_buffer(block_size: int) -> bytearray:
+    """
+    获取当前线程指定大小的可复用缓冲区
+
+    每个线程按大小分别缓存，交替使用几种大小时不会重新分配；缓存的大小种数超过
+    MAX_CACHED_BUFFERS 时丢弃最久未使用的缓冲区。返回的缓冲区在同一线程中会被后续调用复用，
+    不能跨线程使用，也不能在下一次读取之后继续持有其中的数据。
+
+    Args:
+        block_size: 缓冲区大小（字节）
+
+    示例:
+        buffer = get_buffer(64 * 1024)
+        view = memoryview(buffer)
+        while (n := f.readinto(buffer)):
+            process(view[:n])
+    """
+    cache = getattr(_buffers, "cache", None)
+    if cache is None:
+        cache = _buffers.cache = {}
+    buffer = cache.pop(block_size, None)
+    if buffer is None:
+        buffer = bytearray(block_size)
+        if len(cache) >= MAX_CACHED_BUFFERS:
+            del cache[next(iter(cache))]
+    # 重新插入到末尾，字典的顺序即使用顺序
+    cache[block_size] = buffer
+    return buffer
+
+
+def new_hashers(algorithms: Iterable[str]) -> List["hashlib._Hash"]:
+    """
+    创建哈希对象
+
+    Args:
+        algorithms: 哈希算法名称（md5, sha1, sha256 等，hashlib.new 支持的名称）
+
+    Raises:
+        ValueError: 算法不受支持，或者没有指定算法
+    """
+    hashers = [hashlib.new(name) for name in algorithms]
+    if not hashers:
+        raise ValueError("至少需要指定一种哈希算法")
+    return hashers
+
+
+def hash_file(file_path: Union[str, os.PathLike], algorithms: Union[str, Sequence[str]] = ('sha256',),
+              block_size: int = DEFAULT_BLOCK_SIZE, use_mmap: Optional[bool] = None,
+              progress: Optional[ProgressCallback] = None) -> Dict[str, str]:
+    """
+    计算文件的一个或多个哈希值（只读取文件一次）
+
+    Args:
+        file_path: 文件路径
+        algorithms: 哈希算法名称或名称列表
+        block_size: 每次读取（或交给哈希函数）的字节数
+        use_mmap: 是否使用 mmap；None 表示文件不小于 MMAP_THRESHOLD 时使用
+        progress: 进度回调，每处理一个数据块调用一次
+
+    Returns:
+        算法名称 -> 十六进制哈希值
+
+    Raises:
+        OSError: 读取文件失败
+        ValueError: 算法不受支持或块大小无效
+
+    示例:
+        digests = hash_file("update.zip", ("sha256", "md5"))
+        print(digests["sha256"], digests["md5"])
+    """
+    if isinstance(algorithms, str):
+        algorithms = (algorithms,)
+    if block_size <= 0:
+        raise ValueError("块大小必须大于 0")
+    hashers = new_hashers(algorithms)
+
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= MMAP_THRESHOLD
+        # 空文件无法映射
+        if use_mmap and size > 0:
+            _hash_mmap(f, size, hashers, block_size, progress)
+        else:
+            _hash_readinto(f, hashers, block_size, progress)
+
+    return {name: hasher.hexdigest() for name, hasher in zip(algorithms, hashers)}
+
+
+def _hash_readinto(f, hashers: List, block_size: int, progress: Optional[ProgressCallback]) -> None:
+    """用复用的缓冲区循环 readinto"""
+    buffer = get_buffer(block_size)
+    with memoryview(buffer) as view:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n] if n < block_size else view
+            for hasher in hashers:
+                hasher.update(chunk)
+            if progress is not None:
+                progress(n)
+
+
+def _hash_mmap(f, size: int, hashers: List, block_size: int, progress: Optional[ProgressCallback]) -> None:
+    """映射整个文件，按块把 memoryview 切片交给哈希函数（切片不复制数据）"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        # memoryview 必须在关闭 mmap 之前释放
+        with memoryview(mapped) as view:
+            for offset in range(0, size, block_size):
+                with view[offset:offset + block_size] as chunk:
+                    for hasher in hashers:
+                        hasher.update(chunk)
+                if progress is not None:
+                    progress(min(block_size, size - offset))
+
+
+@dataclass(frozen=True, slots=True)
+class HashResult:
+    """单个文件的哈希结果（失败时 digests 为 None，error 为错误信息）"""
+    path: str
+    size: int
+    digests: Optional[Dict[str, str]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """是否计算成功"""
+        return self.digests is not None
+
+    @property
+    def digest(self) -> Optional[str]:
+        """第一个算法的哈希值（只计算一种算法时使用）"""
+        return next(iter(self.digests.values())) if self.digests else None
+
+
+@dataclass(frozen=True, slots=True)
+class HashProgress:
+    """批量哈希的总体进度"""
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+
+# 批量进度回调
+BatchProgressCallback = Callable[[HashProgress], None]
+
+
+class _Cancelled(Exception):
+    """内部异常：批量哈希被取消，中止正在计算的文件"""
+
+
+def is_rotational(path: Union[str, os.PathLike]) -> Optional[bool]:
+    """
+    判断路径所在的磁盘是否为机械硬盘（只支持 Linux，无法判断时返回 None）
+
+    示例:
+        is_rotational("/home")  # False（SSD）
+    """
+    try:
+        st = os.stat(path)
+        device = f"/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+        # 分区没有 queue 目录，使用所属磁盘的
+        for candidate in (os.path.join(device, "queue", "rotational"),
+                          os.path.join(device, "..", "queue", "rotational")):
+            if os.path.exists(candidate):
+                with open(candidate, 'r') as f:
+                    return f.read().strip() == "1"
+    except (OSError, AttributeError, ValueError):
+        pass
+    return None
+
+
+def default_workers(sample_path: Optional[Union[str, os.PathLike]] = None) -> int:
+    """
+    根据 CPU 核心数和磁盘类型选择批量哈希的线程数
+
+    机械硬盘并发读取会导致磁头来回寻道，最多使用 2 个线程；SSD 或无法判断时按 CPU 核心数（最多 16）。
+
+    Args:
+        sample_path: 用于判断磁盘类型的路径
+    """
+    cores = os.cpu_count() or 1
+    if sample_path is not None and is_rotational(sample_path):
+        return min(2, cores)
+    return max(1, min(16, cores))
+
+
+def hash_files(paths: Iterable[Union[str, os.PathLike]], algorithm: Union[str, Sequence[str]] = 'sha256',
+               workers: Optional[int] = None, block_size: int = DEFAULT_BLOCK_SIZE,
+               cancel_event: Optional[threading.Event] = None,
+               progress: Optional[BatchProgressCallback] = None,
+               progress_interval: float = 0.1) -> Iterator[HashResult]:
+    """
+    在线程池中批量计算文件哈希，按完成顺序逐个返回结果
+
+    工作线程从共享队列中领取文件，结果通过队列交给迭代结果的线程；workers 为 1 时直接在当前线程中计算。
+    设置 cancel_event 或提前停止迭代时，不再开始新的文件，正在计算的文件在下一个数据块处中止。
+
+    Args:
+        paths: 文件路径
+        algorithm: 哈希算法名称或名称列表
+        workers: 线程数，None 表示根据 CPU 核心数和磁盘类型自动选择
+        block_size: 每次读取的字节数
+        cancel_event: 取消事件
+        progress: 总体进度回调（在迭代结果的线程中调用，最多每 progress_interval 秒一次，结束时再调用一次）
+        progress_interval: 进度回调的最小间隔（秒）
+
+    Yields:
+        HashResult（读取失败的文件也会返回，error 为错误信息）
+
+    Raises:
+        ValueError: 算法不受支持
+
+    示例:
+        for result in hash_files(paths, "sha256"):
+            print(result.path, result.digest or result.error)
+    """
+    algorithms = (algorithm,) if isinstance(algorithm, str) else tuple(algorithm)
+    new_hashers(algorithms)
+
+    # 预先获取文件大小，用于总体进度
+    entries = []
+    for path in paths:
+        path = os.fspath(path)
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = 0
+        entries.append((path, size))
+    if workers is None:
+        workers = default_workers(entries[0][0] if entries else None)
+    workers = max(1, min(workers, len(entries)))
+
+    stop = threading.Event()
+    progress_state = _BatchProgress(len(entries), sum(size for _, size in entries), progress)
+
+    def cancelled() -> bool:
+        return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    def on_block(n: int):
+        if cancelled():
+            raise _Cancelled()
+        progress_state.add_bytes(n)
+
+    def task(path: str, size: int) -> Optional[HashResult]:
+        try:
+            return HashResult(path, size, hash_file(path, algorithms, block_size, progress=on_block))
+        except _Cancelled:
+            return None
+        except Exception as e:
+            return HashResult(path, size, error=str(e))
+
+    if workers == 1:
+        for entry in entries:
+            result = None if cancelled() else task(*entry)
+            if result is None:
+                return
+            progress_state.file_done(progress_interval)
+            yield result
+        progress_state.report()
+        return
+
+    tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+    results: "queue.SimpleQueue" = queue.SimpleQueue()
+    for entry in entries:
+        tasks.put(entry)
+
+    def worker():
+        while not cancelled():
+            try:
+                entry = tasks.get_nowait()
+            except queue.Empty:
+                return
+            results.put(task(*entry))
+
+    threads = [threading.Thread(target=worker, name=f"file-hash-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(len(entries)):
+            while True:
+                try:
+                    result = results.get(timeout=progress_interval)
+                    break
+                except queue.Empty:
+                    if cancelled():
+                        return
+                    progress_state.report_if_due(progress_interval)
+            if result is None or cancelled():
+                return
+            progress_state.file_done(progress_interval)
+            yield result
+        progress_state.report()
+    finally:
+        # 取消或提前停止迭代：中止正在计算的文件，不再领取新的文件
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+class _BatchProgress:
+    """批量哈希的进度统计（字节数由工作线程累加，回调在迭代结果的线程中调用）"""
+
+    def __init__(self, files_total: int, bytes_total: int, callback: Optional[BatchProgressCallback]):
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_done = 0
+        self.bytes_done = 0
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._last_report = time.monotonic()
+
+    def add_bytes(self, n: int):
+        """工作线程处理了 n 个字节"""
+        with self._lock:
+            self.bytes_done += n
+
+    def file_done(self, interval: float):
+        """完成了一个文件"""
+        self.files_done += 1
+        self.report_if_due(interval)
+
+    def report_if_due(self, interval: float):
+        """距离上次回调超过 interval 秒时调用进度回调"""
+        if self._callback is not None and time.monotonic() - self._last_report >= interval:
+            self.report()
+
+    def report(self):
+        """调用进度回调"""
+        if self._callback is not None:
+            self._last_report = time.monotonic()
+            self._callback(HashProgress(self.files_done, self.files_total, self.bytes_done, self.bytes_total))
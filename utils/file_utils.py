@@ -3,15 +3,73 @@
 提供常用的文件和目录操作功能
 """
 
+import errno
 import os
 import shutil
-import hashlib
+import threading
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Sequence, Tuple
+from utils.file_hash import DEFAULT_BLOCK_SIZE, hash_file
+# 批量哈希在 file_hash 中实现，这里重新导出为 file_utils.hash_files
+from utils.file_hash import HashProgress, HashResult, hash_files
+from utils.hash_cache import get_hash_cache
+# 目录遍历在 dir_walk 中实现，这里重新导出为 file_utils.scan_tree
+from utils.dir_walk import scan_tree, walk_paths
+# 目录统计在 tree_summary 中实现，这里重新导出为 file_utils.summarize_tree
+from utils.tree_summary import ExtensionStats, TreeSummary, iter_tree_summary, summarize_tree
+# 复制引擎在 file_copy 中实现，这里重新导出批量复制
+from utils.file_copy import (CopyCancelled, CopyProgress, CopyResult, ProgressCallback,
+                             copy_file_data, copy_files)
+# 重复文件查找在 duplicates 中实现，这里重新导出为 file_utils.find_duplicates
+from utils.duplicates import DuplicateGroup, DuplicateProgress, find_duplicates
+# 流式文本读取在 text_reader 中实现，这里重新导出
+from utils.text_reader import LineIndex, iter_text_lines, sniff_encoding
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+__all__ = [
+    'ensure_dir',
+    'file_exists',
+    'dir_exists',
+    'get_file_size',
+    'format_file_size',
+    'calculate_file_hash',
+    'calculate_file_hashes',
+    'copy_file',
+    'move_file',
+    'delete_file',
+    'delete_directory',
+    'list_files',
+    'list_directories',
+    'get_file_extension',
+    'get_file_name',
+    'read_text_file',
+    'write_text_file',
+    # 以下为从其他模块重新导出的名称
+    'HashProgress',
+    'HashResult',
+    'hash_files',
+    'scan_tree',
+    'walk_paths',
+    'ExtensionStats',
+    'TreeSummary',
+    'iter_tree_summary',
+    'summarize_tree',
+    'CopyCancelled',
+    'CopyProgress',
+    'CopyResult',
+    'ProgressCallback',
+    'copy_file_data',
+    'copy_files',
+    'DuplicateGroup',
+    'DuplicateProgress',
+    'find_duplicates',
+    'LineIndex',
+    'iter_text_lines',
+    'sniff_encoding',
+]
+
 
 def ensure_dir(directory: str) -> bool:
     """确保目录存在，如果不存在则创建
@@ -87,39 +145,65 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.2f} PB"
 
 
-def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> Optional[str]:
+def calculate_file_hash(file_path: str, algorithm: str = 'sha256',
+                        block_size: int = DEFAULT_BLOCK_SIZE, use_cache: bool = True) -> Optional[str]:
     """计算文件哈希值
     
     Args:
         file_path: 文件路径
         algorithm: 哈希算法（md5, sha1, sha256等）
+        block_size: 每次读取的字节数（大文件自动使用 mmap）
+        use_cache: 是否使用持久化的哈希缓存（文件未变化时直接返回上次的结果）
         
     Returns:
         Optional[str]: 哈希值，失败返回None
     """
     try:
-        hash_obj = hashlib.new(algorithm)
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        if use_cache:
+            return get_hash_cache().get_or_compute(file_path, algorithm, block_size)
+        return hash_file(file_path, (algorithm,), block_size)[algorithm]
+    except Exception as e:
+        logger.error(f"计算文件哈希失败 {file_path}: {e}")
+        return None
+
+
+def calculate_file_hashes(file_path: str, algorithms: Sequence[str] = ('sha256', 'md5'),
+                          block_size: int = DEFAULT_BLOCK_SIZE) -> Optional[Dict[str, str]]:
+    """只读取一次文件，同时计算多个哈希值
+    
+    Args:
+        file_path: 文件路径
+        algorithms: 哈希算法列表
+        block_size: 每次读取的字节数（大文件自动使用 mmap）
+        
+    Returns:
+        Optional[Dict[str, str]]: 算法名称 -> 哈希值，失败返回None
+    """
+    try:
+        return hash_file(file_path, algorithms, block_size)
     except Exception as e:
         logger.error(f"计算文件哈希失败 {file_path}: {e}")
         return None
 
 
-def copy_file(src: str, dst: str, overwrite: bool = False) -> bool:
-    """复制文件
+def copy_file(src: str, dst: str, overwrite: bool = False, progress: Optional[ProgressCallback] = None,
+              cancel_event: Optional[threading.Event] = None, resume: bool = False) -> bool:
+    """复制文件（内核内复制，大文件支持进度、取消和断点续传）
     
     Args:
         src: 源文件路径
-        dst: 目标文件路径
+        dst: 目标文件路径（为已存在的目录时复制到该目录下）
         overwrite: 是否覆盖已存在的文件
+        progress: 进度回调 (已复制字节数, 总字节数)
+        cancel_event: 取消事件
+        resume: 是否从上次取消或失败时保留的 .part 文件继续
         
     Returns:
-        bool: 操作是否成功
+        bool: 操作是否成功（取消时返回 False）
     """
     try:
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
         if not overwrite and file_exists(dst):
             logger.warning(f"目标文件已存在: {dst}")
             return False
@@ -129,26 +213,35 @@ def copy_file(src: str, dst: str, overwrite: bool = False) -> bool:
         if dst_dir:
             ensure_dir(dst_dir)
         
-        shutil.copy2(src, dst)
+        copy_file_data(src, dst, progress=progress, cancel_event=cancel_event, resume=resume)
         logger.info(f"文件已复制: {src} -> {dst}")
         return True
+    except CopyCancelled:
+        logger.info(f"复制已取消: {src} -> {dst}")
+        return False
     except Exception as e:
         logger.error(f"复制文件失败 {src} -> {dst}: {e}")
         return False
 
 
-def move_file(src: str, dst: str, overwrite: bool = False) -> bool:
-    """移动文件
+def move_file(src: str, dst: str, overwrite: bool = False, progress: Optional[ProgressCallback] = None,
+              cancel_event: Optional[threading.Event] = None, resume: bool = False) -> bool:
+    """移动文件（跨设备时复制后删除源文件，复制过程支持进度、取消和断点续传）
     
     Args:
         src: 源文件路径
-        dst: 目标文件路径
+        dst: 目标文件路径（为已存在的目录时移动到该目录下）
         overwrite: 是否覆盖已存在的文件
+        progress: 进度回调 (已复制字节数, 总字节数)，只在跨设备复制时调用
+        cancel_event: 取消事件（取消时源文件保持不变）
+        resume: 跨设备复制时是否从上次保留的 .part 文件继续
         
     Returns:
-        bool: 操作是否成功
+        bool: 操作是否成功（取消时返回 False）
     """
     try:
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
         if not overwrite and file_exists(dst):
             logger.warning(f"目标文件已存在: {dst}")
             return False
@@ -158,9 +251,23 @@ def move_file(src: str, dst: str, overwrite: bool = False) -> bool:
         if dst_dir:
             ensure_dir(dst_dir)
         
-        shutil.move(src, dst)
+        # 目录和符号链接仍交给 shutil.move
+        if os.path.isdir(src) or os.path.islink(src):
+            shutil.move(src, dst)
+        else:
+            try:
+                os.replace(src, dst)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                logger.info(f"跨设备移动，复制后删除源文件: {src} -> {dst}")
+                copy_file_data(src, dst, progress=progress, cancel_event=cancel_event, resume=resume)
+                os.remove(src)
         logger.info(f"文件已移动: {src} -> {dst}")
         return True
+    except CopyCancelled:
+        logger.info(f"移动已取消: {src} -> {dst}")
+        return False
     except Exception as e:
         logger.error(f"移动文件失败 {src} -> {dst}: {e}")
         return False
@@ -227,11 +334,7 @@ def list_files(directory: str, pattern: str = "*", recursive: bool = False) -> L
         List[str]: 文件路径列表
     """
     try:
-        path = Path(directory)
-        if recursive:
-            files = [str(f) for f in path.rglob(pattern) if f.is_file()]
-        else:
-            files = [str(f) for f in path.glob(pattern) if f.is_file()]
+        files = _list_entries(directory, pattern, recursive, files=True, dirs=False)
         logger.debug(f"在 {directory} 中找到 {len(files)} 个文件")
         return files
     except Exception as e:
@@ -250,11 +353,7 @@ def list_directories(directory: str, recursive: bool = False) -> List[str]:
         List[str]: 目录路径列表
     """
     try:
-        path = Path(directory)
-        if recursive:
-            dirs = [str(d) for d in path.rglob("*") if d.is_dir()]
-        else:
-            dirs = [str(d) for d in path.glob("*") if d.is_dir()]
+        dirs = _list_entries(directory, "*", recursive, files=False, dirs=True)
         logger.debug(f"在 {directory} 中找到 {len(dirs)} 个目录")
         return dirs
     except Exception as e:
@@ -262,6 +361,28 @@ def list_directories(directory: str, recursive: bool = False) -> List[str]:
         return []
 
 
+def _list_entries(directory: str, pattern: str, recursive: bool, files: bool, dirs: bool) -> List[str]:
+    """list_files / list_directories 的实现：用 scan_tree 遍历，模式语义与 Path.glob / Path.rglob 相同"""
+    pattern = pattern.replace(os.sep, "/")
+    if "**" in pattern:
+        max_depth = None
+    elif recursive:
+        max_depth = None
+        # rglob 的模式可以从任意一层目录开始匹配
+        if "/" in pattern:
+            pattern = "**/" + pattern
+    else:
+        max_depth = pattern.count("/")
+
+    root = str(Path(directory))
+    paths = walk_paths(root, pattern, files=files, dirs=dirs, max_depth=max_depth)
+    if root == os.curdir:
+        # 与 Path(".").glob() 一致，不带 "./" 前缀
+        start = len(os.curdir) + len(os.sep)
+        paths = [p[start:] for p in paths]
+    return paths
+
+
 def get_file_extension(file_path: str) -> str:
     """获取文件扩展名
     
@@ -290,17 +411,21 @@ def get_file_name(file_path: str, with_extension: bool = True) -> str:
     return name
 
 
-def read_text_file(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
+def read_text_file(file_path: str, encoding: Optional[str] = 'utf-8') -> Optional[str]:
     """读取文本文件
     
+    一次读入整个文件；大文件请使用 iter_text_lines() 逐行读取或 LineIndex 按行号随机读取。
+    
     Args:
         file_path: 文件路径
-        encoding: 文件编码
+        encoding: 文件编码，None 表示根据文件开头的内容判断（见 sniff_encoding）
         
     Returns:
         Optional[str]: 文件内容，失败返回None
     """
     try:
+        if encoding is None:
+            encoding = sniff_encoding(file_path)
         with open(file_path, 'r', encoding=encoding) as f:
             content = f.read()
         logger.debug(f"文件已读取: {file_path}")
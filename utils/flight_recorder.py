@@ -0,0 +1,95 @@
+"""
+日志飞行记录器模块
+在内存环形缓冲区中保留最近的日志记录，程序崩溃时写入错误报告，
+生产环境无需开启 DEBUG 级别的文件日志也能获得出错前的上下文
+
+本模块只被 utils.logger 使用，不依赖 PySide6。
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+# 单条记录：(时间戳, 级别, 模块名, 函数名, 行号, 线程名, 消息)
+RecordTuple = Tuple[float, str, str, str, int, str, str]
+
+
+def format_log_entry(entry: Dict[str, Any]) -> str:
+    """将 to_dicts() 返回的一条记录格式化为与日志文件相同风格的文本行"""
+    return f"{entry['time']} | {entry['level']: <8} | {entry['location']} - {entry['message']}"
+
+
+class FlightRecorder:
+    """日志环形缓冲区
+
+    作为 loguru 的 sink 使用，每条记录只保存一个紧凑的元组，消息按 max_message_chars 截断，
+    缓冲区满后自动丢弃最旧的记录，因此内存占用有固定上限。
+
+    使用方法:
+        recorder = FlightRecorder(capacity=1000)
+        logger.add(recorder, level="DEBUG", format="{message}")
+        lines = recorder.format_lines()
+    """
+
+    def __init__(self, capacity: int = 1000, max_message_chars: int = 500):
+        """
+        初始化飞行记录器
+
+        Args:
+            capacity: 保留的最大记录数
+            max_message_chars: 单条消息保留的最大字符数
+        """
+        self.capacity = capacity
+        self.max_message_chars = max_message_chars
+        # deque 的 append 在 CPython 中是原子操作，多线程记录日志无需加锁
+        self._buffer: "deque[RecordTuple]" = deque(maxlen=capacity)
+
+    def __call__(self, message):
+        """loguru 调用的写入入口"""
+        record = message.record
+        text = record["message"]
+        if len(text) > self.max_message_chars:
+            text = text[:self.max_message_chars] + "…"
+        self._buffer.append((
+            record["time"].timestamp(),
+            record["level"].name,
+            record["name"] or "",
+            record["function"],
+            record["line"],
+            record["thread"].name,
+            text,
+        ))
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def snapshot(self) -> List[RecordTuple]:
+        """获取当前缓冲区中记录的副本（按时间从旧到新）"""
+        # 复制时可能有其他线程正在追加，重试几次直到得到一致的副本
+        for _ in range(3):
+            try:
+                return list(self._buffer)
+            except RuntimeError:
+                continue
+        return []
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """将记录转换为字典列表（用于写入 JSON 错误报告）"""
+        return [
+            {
+                "time": datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+                "level": level,
+                "location": f"{name}:{function}:{line}",
+                "thread": thread,
+                "message": text,
+            }
+            for timestamp, level, name, function, line, thread, text in self.snapshot()
+        ]
+
+    def format_lines(self) -> List[str]:
+        """将记录格式化为与日志文件相同风格的文本行"""
+        return [format_log_entry(entry) for entry in self.to_dicts()]
+
+    def clear(self):
+        """清空缓冲区"""
+        self._buffer.clear()
@@ -0,0 +1,303 @@
+"""
+文件哈希缓存模块
+把计算过的文件哈希保存在 SQLite 数据库中，以 (路径, 大小, 修改时间, 状态变化时间, inode/设备号, 算法) 识别文件，
+重新校验同一安装目录或再次计算同一批文件时，文件未变化就直接返回缓存的哈希值
+
+本模块不依赖 PySide6，被 utils.file_utils 和 updater.file_manager 使用。
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from utils.file_hash import DEFAULT_BLOCK_SIZE, hash_file
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 默认缓存文件
+DEFAULT_CACHE_FILE = os.path.join("cache", "file_hashes.db")
+
+# 默认最多保存的条目数，超出后淘汰最久未使用的条目
+DEFAULT_MAX_ENTRIES = 100_000
+
+# 修改时间距现在不足该秒数的文件不写入缓存：文件系统的时间精度有限（FAT 为 2 秒），
+# 在同一时间刻度内再次修改的文件大小和修改时间可能都不变
+RACY_WINDOW = 2.0
+
+# 未提交的修改达到该数量或距上次提交超过 COMMIT_INTERVAL 秒时提交
+COMMIT_BATCH = 64
+COMMIT_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    device INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (path, algorithm)
+);
+CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used);
+"""
+
+
+def _identity(st: os.stat_result) -> tuple:
+    """文件身份：(大小, 修改时间, 状态变化时间, inode, 设备号)
+
+    修改时间可以被 os.utime 改回原值，状态变化时间（Windows 上为创建时间）不能，
+    因此保留原修改时间重写的文件也会被识别为已变化。
+    """
+    return st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, st.st_dev
+
+
+def _key(path: Union[str, os.PathLike]) -> str:
+    """缓存使用的路径（绝对路径，Windows 上不区分大小写）"""
+    return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+
+class HashCache:
+    """持久化的文件哈希缓存
+
+    查询时比较文件当前的大小、修改时间、状态变化时间、inode 和设备号，任一项不同就删除该条目并视为未命中。
+    条目按最近使用顺序淘汰；修改先在内存中累积，批量提交，程序退出时自动提交。
+
+    使用方法:
+        cache = HashCache("cache/file_hashes.db")
+        digest = cache.get_or_compute("update.zip", "sha256")
+        print(cache.stats())
+    """
+
+    def __init__(self, db_path: Union[str, os.PathLike] = DEFAULT_CACHE_FILE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        打开（或创建）缓存数据库
+
+        Args:
+            db_path: 数据库文件路径，":memory:" 表示只保存在内存中
+            max_entries: 最多保存的条目数
+        """
+        self.db_path = str(db_path)
+        self.max_entries = max(1, max_entries)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 工作线程（如 hash_files）也会访问缓存，所有操作都在 _lock 中执行
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._count = self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        self._clock = self._db.execute("SELECT COALESCE(MAX(last_used), 0) FROM hashes").fetchone()[0]
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, path: Union[str, os.PathLike], algorithm: str,
+            st: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        查询缓存的哈希值
+
+        Args:
+            path: 文件路径
+            algorithm: 哈希算法
+            st: 文件当前的 os.stat 结果（为 None 时自动获取）
+
+        Returns:
+            哈希值；未命中或文件已变化时返回 None
+        """
+        key = _key(path)
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, ctime_ns, inode, device, digest FROM hashes WHERE path = ? AND algorithm = ?",
+                (key, algorithm)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if tuple(row[:5]) != _identity(st):
+                self._db.execute("DELETE FROM hashes WHERE path = ? AND algorithm = ?", (key, algorithm))
+                self._count -= 1
+                self.invalidations += 1
+                self.misses += 1
+                self._changed()
+                return None
+
+            self._clock += 1
+            self._db.execute("UPDATE hashes SET last_used = ? WHERE path = ? AND algorithm = ?",
+                             (self._clock, key, algorithm))
+            self.hits += 1
+            self._changed()
+            return row[5]
+
+    def put(self, path: Union[str, os.PathLike], algorithm: str, digest: str, st: os.stat_result) -> bool:
+        """
+        保存哈希值
+
+        Args:
+            path: 文件路径
+            algorithm: 哈希算法
+            digest: 哈希值
+            st: 计算哈希之前获取的 os.stat 结果
+
+        Returns:
+            是否已保存（刚修改过的文件不保存）
+        """
+        if time.time_ns() - st.st_mtime_ns < RACY_WINDOW * 1e9:
+            return False
+
+        key = _key(path)
+        with self._lock:
+            self._clock += 1
+            exists = self._db.execute("SELECT 1 FROM hashes WHERE path = ? AND algorithm = ?",
+                                      (key, algorithm)).fetchone() is not None
+            self._db.execute(
+                "INSERT OR REPLACE INTO hashes (path, algorithm, size, mtime_ns, ctime_ns, inode, device, digest, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, algorithm, *_identity(st), digest, self._clock))
+            if not exists:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._changed()
+        return True
+
+    def get_or_compute(self, path: Union[str, os.PathLike], algorithm: str = 'sha256',
+                       block_size: int = DEFAULT_BLOCK_SIZE,
+                       progress: Optional[Callable[[int], None]] = None) -> str:
+        """
+        获取文件哈希值：缓存命中时直接返回，否则计算后写入缓存
+
+        Args:
+            progress: 计算时的进度回调（参数为本次处理的字节数，见 hash_file）；回调抛出异常时中止计算，不写入缓存
+
+        Raises:
+            OSError: 读取文件失败
+            ValueError: 算法不受支持
+        """
+        st = os.stat(path)
+        digest = self.get(path, algorithm, st)
+        if digest is None:
+            digest = hash_file(path, (algorithm,), block_size, progress=progress)[algorithm]
+            # 计算期间文件被修改时不写入缓存
+            if _identity(os.stat(path)) == _identity(st):
+                self.put(path, algorithm, digest, st)
+        return digest
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._db.execute("DELETE FROM hashes")
+            self._db.commit()
+            self._count = 0
+            self._uncommitted = 0
+
+    def flush(self) -> None:
+        """提交尚未写入数据库文件的修改"""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """提交修改并关闭数据库"""
+        with self._lock:
+            if self._db is None:
+                return
+            self._commit()
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def stats(self) -> Dict[str, int]:
+        """获取缓存统计"""
+        with self._lock:
+            return {
+                "entries": self._count,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目（调用方需持有 _lock）"""
+        excess = self._count - self.max_entries
+        self._db.execute(
+            "DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)", (excess,))
+        self._count -= excess
+        self.evictions += excess
+
+    def _changed(self) -> None:
+        """记录一次修改，达到批量大小或时间间隔时提交（调用方需持有 _lock）"""
+        self._uncommitted += 1
+        if self._uncommitted >= COMMIT_BATCH or time.monotonic() - self._last_commit >= COMMIT_INTERVAL:
+            self._commit()
+
+    def _commit(self) -> None:
+        """提交修改（调用方需持有 _lock）"""
+        if self._db is not None and self._uncommitted:
+            self._db.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+
+# 全局哈希缓存实例
+_hash_cache: Optional[HashCache] = None
+_hash_cache_lock = threading.Lock()
+
+
+def setup_hash_cache(db_path: Union[str, os.PathLike] = DEFAULT_CACHE_FILE,
+                     max_entries: int = DEFAULT_MAX_ENTRIES) -> HashCache:
+    """
+    设置全局哈希缓存（替换已有的缓存实例）
+
+    Args:
+        db_path: 数据库文件路径
+        max_entries: 最多保存的条目数
+    """
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is not None:
+            _hash_cache.close()
+        _hash_cache = HashCache(db_path, max_entries)
+        return _hash_cache
+
+
+def get_hash_cache() -> HashCache:
+    """获取全局哈希缓存（首次调用时使用默认设置创建，并在程序退出时提交修改）"""
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            try:
+                _hash_cache = HashCache()
+            except (sqlite3.Error, OSError) as e:
+                # 缓存目录不可写等情况下退回内存缓存，不影响哈希计算
+                logger.warning(f"打开哈希缓存失败，本次运行只在内存中缓存: {e}")
+                _hash_cache = HashCache(":memory:")
+        return _hash_cache
+
+
+@atexit.register
+def _close_hash_cache():
+    """程序退出时提交全局哈希缓存的修改"""
+    if _hash_cache is not None:
+        _hash_cache.close()
@@ -3,28 +3,97 @@
 使用 loguru 提供统一的日志记录功能
 """
 
+import atexit
 import sys
+from datetime import timedelta
 from pathlib import Path
+from typing import Dict, List
 from loguru import logger
 
+# 日志文件格式
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
+# 日志通道：通过 get_logger(name, channel=...) 绑定通道的记录，除写入通用日志外，
+# 还会写入该通道专用的日志文件（logs/<通道>.log）
+CHANNEL_UPDATE = "update"
+LOG_CHANNELS = {
+    CHANNEL_UPDATE: {"level": "INFO", "rotation_mb": 5, "retention_days": 30},
+}
+
+# loguru 实际处理的最低级别编号：控制台、日志文件和飞行记录器中的最低级别（由 setup_logger 设置）
+_min_level_no = 0
+
+# 控制台和日志文件（不含飞行记录器）中的最低级别编号
+_sink_min_level_no = 0
+
+# 级别名称到编号的缓存
+_level_numbers: Dict[str, int] = {}
+
+# 当前的异步日志输出（未启用异步模式时为 None）
+_async_logging = None
+
+# 当前的飞行记录器（未启用时为 None）
+_flight_recorder = None
+
+# 级别随 level 参数变化的输出（控制台和详细日志文件）：handler id -> logger.add 的其他参数，
+# set_log_level() 用同样的参数重新添加这些输出
+_level_sinks: Dict[int, dict] = {}
+
+# 级别固定的输出（错误日志和通道日志）的级别编号
+_fixed_level_nos: List[int] = []
+
+# 飞行记录器的 handler id 和请求的级别
+_recorder_handler_id = None
+_recorder_level = None
+
+
+def is_compiled_app() -> bool:
+    """检测是否为编译后的应用程序"""
+    is_frozen = getattr(sys, 'frozen', False)  # PyInstaller, cx_Freeze
+    is_nuitka_compiled = hasattr(sys.modules.get(__name__.split('.')[0], sys.modules[__name__]), '__compiled__')  # Nuitka
+    return is_frozen or is_nuitka_compiled
+
+
+def get_log_dir() -> Path:
+    """获取日志目录
+
+    Returns:
+        Path: 打包后为exe同目录下的 logs，开发环境为项目根目录下的 logs
+    """
+    if is_compiled_app():
+        return Path(sys.executable).parent / "logs"
+    return Path(__file__).parent.parent / "logs"
+
+
+def setup_logger(async_mode: bool = True, queue_size: int = 10000, overflow: str = "drop_oldest",
+                 level: str | None = None, recorder_level: str | None = "DEBUG",
+                 recorder_capacity: int = 1000):
+    """设置日志配置
+
+    Args:
+        async_mode: 是否使用异步输出。启用后记录日志的线程（包括GUI线程）只把消息放入
+            有界队列，文件写入和轮转压缩都在后台线程中进行
+        queue_size: 每个输出的队列容量
+        overflow: 队列满时的策略："drop_oldest"（丢弃最旧记录）、"drop_newest"（丢弃新记录）
+            或 "block"（短暂阻塞后丢弃）；ERROR 及以上级别的记录总是短暂阻塞等待
+        level: 控制台和详细日志文件的级别，默认开发环境为 DEBUG、生产环境为 INFO
+        recorder_level: 飞行记录器（内存环形缓冲区）的级别，None 表示不启用。默认 DEBUG：生产环境
+            不写 DEBUG 日志文件时，错误报告中仍有出错前的 DEBUG 上下文，代价是 DEBUG 调用需要构建记录
+            并格式化参数（is_enabled("DEBUG") 也返回 True）；热点路径开销敏感时可设为 "INFO" 或 None
+        recorder_capacity: 飞行记录器保留的最大记录数
+    """
+    global _async_logging, _sink_min_level_no, _flight_recorder, _fixed_level_nos, _recorder_level
 
-def setup_logger():
-    """设置日志配置"""
     # 移除默认的控制台输出
     logger.remove()
+    shutdown_logging()
+    _forget_handlers()
 
     # 检测是否为编译后的应用程序
-    is_frozen = getattr(sys, 'frozen', False)  # PyInstaller, cx_Freeze
-    is_nuitka_compiled = hasattr(sys.modules.get(__name__.split('.')[0], sys.modules[__name__]), '__compiled__')  # Nuitka
-    is_compiled = is_frozen or is_nuitka_compiled
+    is_compiled = is_compiled_app()
 
     # 获取日志目录
-    if is_compiled:
-        # 打包后的应用程序，日志放在exe同目录下
-        log_dir = Path(sys.executable).parent / "logs"
-    else:
-        # 开发环境，日志放在项目根目录下
-        log_dir = Path(__file__).parent.parent / "logs"
+    log_dir = get_log_dir()
 
     # 创建日志目录
     log_dir.mkdir(exist_ok=True)
@@ -38,50 +107,71 @@ def setup_logger():
         # 开发环境：使用DEBUG级别
         console_level = "DEBUG"
         file_level = "DEBUG"
+    if level:
+        console_level = file_level = level
+
+    if async_mode:
+        from utils.async_logging import AsyncLogging
+        _async_logging = AsyncLogging(maxsize=queue_size, overflow=overflow)
+
+    def file_sink(name: str, rotation_mb: int, retention_days: int):
+        """创建文件输出：异步模式下为队列输出，否则为 loguru 的文件输出"""
+        path = log_dir / f"{name}.log"
+        if _async_logging is not None:
+            return {"sink": _async_logging.file_sink(name, path, max_bytes=rotation_mb * 1024 * 1024,
+                                                     retention=timedelta(days=retention_days))}
+        return {"sink": path, "rotation": f"{rotation_mb} MB", "retention": f"{retention_days} days",
+                "compression": "zip", "encoding": "utf-8"}
 
     # 控制台输出（开发环境）
     if not is_compiled:
-        logger.add(
-            sys.stderr,
+        _add_level_sink(
+            console_level,
+            sink=_async_logging.stream_sink("console", sys.stderr) if _async_logging else sys.stderr,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            level=console_level,
             colorize=True
         )
     
     # 详细日志文件
-    logger.add(
-        log_dir / "app_debug.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        level=file_level,
-        rotation="10 MB",
-        retention="7 days",
-        compression="zip",
-        encoding="utf-8"
+    _add_level_sink(
+        file_level,
+        format=FILE_FORMAT,
+        **file_sink("app_debug", rotation_mb=10, retention_days=7)
     )
     
     # 错误日志文件（只记录错误）
     logger.add(
-        log_dir / "app_error.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+        format=FILE_FORMAT,
         level="ERROR",
-        rotation="5 MB",
-        retention="30 days",
-        compression="zip",
-        encoding="utf-8"
+        **file_sink("app_error", rotation_mb=5, retention_days=30)
     )
     
-    # 更新相关的专用日志文件
-    logger.add(
-        log_dir / "update.log",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="INFO",
-        rotation="5 MB",
-        retention="30 days",
-        compression="zip",
-        encoding="utf-8",
-        filter=lambda record: "update" in (record.get("name", "") or "").lower() or "update" in record["message"].lower()
-    )
+    # 通道专用日志文件（如更新相关的 update.log），按记录绑定的通道路由
+    for channel, options in LOG_CHANNELS.items():
+        logger.add(
+            format=FILE_FORMAT,
+            level=options["level"],
+            filter=_channel_filter(channel),
+            **file_sink(channel, rotation_mb=options["rotation_mb"], retention_days=options["retention_days"])
+        )
     
+    # 记录各输出中的最低级别，与飞行记录器的级别一起供 is_enabled() 快速判断
+    _fixed_level_nos = [logger.level(name).no
+                        for name in ["ERROR"] + [options["level"] for options in LOG_CHANNELS.values()]]
+    _sink_min_level_no = min([logger.level(file_level).no] + _fixed_level_nos)
+
+    # 飞行记录器：在内存中保留最近的日志，崩溃时写入错误报告
+    # （运行中修改日志级别时沿用原记录器，保留其中的日志）
+    previous_recorder, _flight_recorder = _flight_recorder, None
+    if recorder_level:
+        from utils.flight_recorder import FlightRecorder
+        if previous_recorder is not None and previous_recorder.capacity == recorder_capacity:
+            _flight_recorder = previous_recorder
+        else:
+            _flight_recorder = FlightRecorder(capacity=recorder_capacity)
+    _recorder_level = recorder_level
+    _attach_recorder()
+
     # 记录启动信息（延迟导入app_config避免循环依赖）
     try:
         from updater.config import app_config
@@ -92,28 +182,172 @@ def setup_logger():
     logger.info(f"日志目录: {log_dir}")
     logger.info(f"运行环境: {'生产环境 (exe)' if is_compiled else '开发环境'}")
     logger.info(f"日志级别: {file_level}")
+    logger.info(f"日志输出: {'异步' if _async_logging else '同步'}")
     
     return logger
 
 
-def get_logger(name: str | None = None):
+def set_log_level(level: str):
+    """运行中修改控制台和详细日志文件的级别
+
+    只用新的级别重新添加这两个输出的 handler，沿用原来的异步队列和文件；错误日志、通道日志不受影响，
+    飞行记录器中已有的日志也会保留（setup_logger() 会重新创建全部输出并再次记录启动信息）。
+
+    Args:
+        level: 级别名称，如 "DEBUG"
+
+    Raises:
+        ValueError: 级别不存在
+
+    示例:
+        >>> app_config.subscribe("advanced.log_level", lambda key, old, new: set_log_level(new))
+    """
+    global _sink_min_level_no
+    level_no = logger.level(level).no
+    for handler_id, options in list(_level_sinks.items()):
+        logger.remove(handler_id)
+        del _level_sinks[handler_id]
+        _add_level_sink(level_no, **options)
+    _sink_min_level_no = min([level_no] + _fixed_level_nos)
+    _attach_recorder()
+    logger.info(f"日志级别: {level}")
+
+
+def _add_level_sink(level, **options):
+    """添加级别可在运行中修改的输出"""
+    _level_sinks[logger.add(level=level, **options)] = options
+
+
+def _attach_recorder():
+    """按记录器自己的级别（重新）添加飞行记录器的 handler（记录器中的日志保留），并更新最低级别
+
+    记录器的级别可以低于日志文件（生产环境 INFO、记录器 DEBUG），此时 DEBUG 日志只进入记录器。
+    """
+    global _recorder_handler_id, _min_level_no
+    if _recorder_handler_id is not None:
+        logger.remove(_recorder_handler_id)
+        _recorder_handler_id = None
+    _min_level_no = _sink_min_level_no
+    if _flight_recorder is not None and _recorder_level:
+        recorder_level_no = logger.level(_recorder_level).no
+        _recorder_handler_id = logger.add(_flight_recorder, format="{message}", level=recorder_level_no)
+        _min_level_no = min(_min_level_no, recorder_level_no)
+
+
+def _forget_handlers():
+    """logger.remove() 之后清除记录的 handler id"""
+    global _recorder_handler_id
+    _level_sinks.clear()
+    _recorder_handler_id = None
+
+
+def is_enabled(level: str) -> bool:
+    """快速判断某级别的日志是否会被写入控制台、日志文件或飞行记录器
+
+    用于在热点路径上跳过昂贵的日志参数计算。只需格式化的消息可以直接使用
+    logger.debug("... {}", value) 或 logger.opt(lazy=True).debug("... {}", lambda: value)，
+    loguru 会在级别被过滤时跳过格式化。
+
+    Args:
+        level: 级别名称，如 "DEBUG"
+
+    Returns:
+        bool: 该级别是否达到已配置输出（包括飞行记录器）中的最低级别
+
+    示例:
+        >>> if is_enabled("DEBUG"):
+        ...     logger.debug("响应内容: {}", response_text[:500])
+    """
+    level_no = _level_numbers.get(level)
+    if level_no is None:
+        level_no = _level_numbers[level] = logger.level(level).no
+    return level_no >= _min_level_no
+
+
+def get_flight_recorder():
+    """获取飞行记录器（保留最近日志的内存环形缓冲区），未启用时返回 None
+
+    示例:
+        >>> recorder = get_flight_recorder()
+        >>> lines = recorder.format_lines() if recorder else []
+    """
+    return _flight_recorder
+
+
+def _channel_filter(channel: str):
+    """创建按通道过滤的函数（每条记录只做一次字典查找）"""
+    def channel_filter(record) -> bool:
+        return record["extra"].get("channel") == channel
+    return channel_filter
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """等待已记录的日志全部写出（同步模式下直接返回）
+
+    Args:
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        bool: 是否在超时前写完
+    """
+    if _async_logging is None:
+        return True
+    return _async_logging.flush(timeout)
+
+
+def get_log_stats() -> Dict[str, Dict[str, int]]:
+    """获取异步日志输出的统计信息（入队、写出、丢弃和待写出的记录数）
+
+    示例:
+        >>> stats = get_log_stats()
+        >>> stats.get("app_debug", {}).get("dropped", 0)
+        0
+    """
+    if _async_logging is None:
+        return {}
+    return _async_logging.stats()
+
+
+def shutdown_logging(timeout: float = 5.0):
+    """写出剩余日志并停止异步输出的后台线程（程序退出时自动调用）"""
+    global _async_logging
+    if _async_logging is None:
+        return
+    current, _async_logging = _async_logging, None
+    logger.remove()
+    _forget_handlers()
+    current.shutdown(timeout)
+
+
+def get_logger(name: str | None = None, channel: str | None = None):
     """
     获取日志记录器
     
     Args:
         name: 日志记录器名称，通常使用 __name__
+        channel: 日志通道（如 CHANNEL_UPDATE），记录会额外写入该通道的专用日志文件
         
     Returns:
         配置好的日志记录器
+
+    示例:
+        >>> logger = get_logger(__name__, channel=CHANNEL_UPDATE)
+        >>> logger.info("开始下载更新")  # 同时写入 app_debug.log 和 update.log
     """
+    extra = {}
     if name:
-        return logger.bind(name=name)
+        extra["name"] = name
+    if channel:
+        extra["channel"] = channel
+    if extra:
+        return logger.bind(**extra)
     return logger
 
 
 # 初始化日志系统
 setup_logger()
+atexit.register(shutdown_logging)
 
 # 导出常用的日志记录器
 app_logger = get_logger("app")
-update_logger = get_logger("updater")
+update_logger = get_logger("updater", channel=CHANNEL_UPDATE)
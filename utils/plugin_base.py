@@ -7,6 +7,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any
 from PySide6.QtWidgets import QWidget
 from utils.logger import get_logger
+from utils.plugin_config import PluginConfig
 
 logger = get_logger(__name__)
 
@@ -34,12 +35,20 @@ class BasePlugin(ABC):
     """插件基类
     
     所有插件都应该继承此类并实现必要的方法
+
+    插件可以通过 config_defaults / config_constraints 声明配置的默认值和校验规则，
+    由插件管理器加载的插件使用独立的配置文件（见 utils.plugin_config）。
     """
+
+    # 插件配置的默认值
+    config_defaults: Dict[str, Any] = {}
+    # 插件配置的约束（配置项的点分路径 -> 约束）
+    config_constraints: Dict[str, Dict[str, Any]] = {}
     
     def __init__(self):
         self._enabled = False
         self._main_window = None
-        self._config = {}
+        self._config: Optional[PluginConfig] = None
     
     @abstractmethod
     def get_metadata(self) -> PluginMetadata:
@@ -98,13 +107,26 @@ class BasePlugin(ABC):
         """检查插件是否已启用"""
         return self._enabled
     
-    def get_config(self) -> Dict[str, Any]:
-        """获取插件配置"""
+    @property
+    def config(self) -> PluginConfig:
+        """插件配置（未通过插件管理器加载时只保存在内存中）"""
+        if self._config is None:
+            self._config = PluginConfig(type(self).__name__, None,
+                                        self.config_defaults, self.config_constraints)
         return self._config
+
+    def attach_config(self, config: PluginConfig):
+        """由插件管理器调用：使用持久化的插件配置"""
+        self._config = config
+    
+    def get_config(self) -> Dict[str, Any]:
+        """获取插件配置（直接修改返回的字典后需调用 set_config() 才会保存）"""
+        return self.config.as_dict()
     
     def set_config(self, config: Dict[str, Any]):
-        """设置插件配置"""
-        self._config = config
+        """设置插件配置并保存（防抖后在后台写入插件的配置文件）"""
+        self.config.replace(config)
+        self.config.save_config()
     
     def get_widget(self) -> Optional[QWidget]:
         """获取插件的UI组件（可选）
@@ -121,4 +143,16 @@ class BasePlugin(ABC):
             list: 菜单项列表，每个元素是 (name, callback) 元组
         """
         return []
+    
+    def on_trigger(self, trigger: str, payload: Any = None):
+        """处理清单中声明的触发事件（可选）
+        
+        插件因触发事件被激活后（或已加载时）由插件管理器调用，
+        例如 "files_dropped" 事件的 payload 为文件路径列表。
+        
+        Args:
+            trigger: 触发事件名称
+            payload: 事件数据
+        """
+        pass
 
@@ -0,0 +1,222 @@
+"""
+插件配置模块
+每个插件的配置保存在独立的文件中（默认 plugin_configs/<插件ID>.json），插件激活后首次读取时才加载，
+修改后通过与应用配置相同的防抖原子写入器单独写入，插件频繁保存配置不会增加 config.json 的加载和保存开销
+
+本模块不依赖 PySide6。
+"""
+
+import copy
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from utils.config_observer import MISSING, resolve_path
+from utils.config_schema import ConfigSchema, ConfigValidationError
+from utils.config_snapshot import deep_merge
+from utils.config_writer import DebouncedWriter, get_config_writer
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 插件配置文件的默认目录
+PLUGIN_CONFIG_DIR = "plugin_configs"
+
+
+class PluginConfig:
+    """单个插件的配置
+
+    配置文件在第一次读取或修改配置时才加载；config_file 为 None 时只保存在内存中
+    （未通过插件管理器创建的插件实例，与旧的 get_config/set_config 行为一致）。
+
+    使用方法:
+        config = PluginConfig("my_plugin", "plugin_configs/my_plugin.json", defaults={"count": 0})
+        config.set("count", config.get("count") + 1)
+        config.save_config()  # 防抖后在后台写入 plugin_configs/my_plugin.json
+    """
+
+    def __init__(self, plugin_id: str, config_file: Optional[Union[str, Path]] = None,
+                 defaults: Optional[Dict[str, Any]] = None,
+                 constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+                 writer: Optional[DebouncedWriter] = None):
+        """
+        初始化插件配置（不读取文件）
+
+        Args:
+            plugin_id: 插件ID
+            config_file: 配置文件路径，为 None 时不持久化
+            defaults: 默认配置，同时用于推断校验规则
+            constraints: 配置项的点分路径 -> 约束（见 utils.config_schema.build_validator）
+            writer: 后台写入器，默认使用全局配置写入器
+        """
+        self.plugin_id = plugin_id
+        self.config_file = Path(config_file) if config_file is not None else None
+        self.defaults = copy.deepcopy(defaults or {})
+        self.schema = ConfigSchema(self.defaults, constraints)
+        self._writer = writer or get_config_writer()
+        self._lock = threading.RLock()
+        self._config: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        # 已序列化、正在等待写入结果的修改（写入成功后才算已保存）
+        self._writing = False
+
+    @property
+    def loaded(self) -> bool:
+        """配置文件是否已加载"""
+        return self._config is not None
+
+    @property
+    def is_dirty(self) -> bool:
+        """是否有尚未写入文件的修改（包括正在写入的修改）"""
+        return self._dirty or self._writing
+
+    def _data(self) -> Dict[str, Any]:
+        """获取配置字典，首次调用时加载配置文件"""
+        config = self._config
+        if config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = self._load()
+                config = self._config
+        return config
+
+    def _load(self) -> Dict[str, Any]:
+        """读取配置文件并与默认配置深度合并（文件不存在或损坏时使用默认配置）"""
+        if self.config_file is None or not self.config_file.exists():
+            return copy.deepcopy(self.defaults)
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                file_config = json.load(f)
+            if not isinstance(file_config, dict):
+                raise ValueError("配置文件的顶层必须是对象")
+            logger.debug(f"已加载插件配置: {self.config_file}")
+            return deep_merge(self.defaults, file_config)
+        except Exception as e:
+            logger.error(f"加载插件 {self.plugin_id} 的配置失败: {e}")
+            return copy.deepcopy(self.defaults)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        获取配置项
+
+        Args:
+            key: 配置项键名，支持点分路径
+            default: 默认值
+
+        Returns:
+            配置项值
+        """
+        value = resolve_path(self._data(), key)
+        return default if value is MISSING else value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        设置配置项（调用 save_config() 后才写入文件）
+
+        Args:
+            key: 配置项键名，支持点分路径，缺少的分组会自动创建
+            value: 配置项值
+
+        Raises:
+            ConfigValidationError: 值未通过校验（配置保持不变）
+        """
+        errors = self.schema.validate(key, value)
+        if errors:
+            raise ConfigValidationError(errors)
+
+        *sections, leaf = key.split('.')
+        with self._lock:
+            container = self._data()
+            for section in sections:
+                child = container.get(section)
+                if not isinstance(child, dict):
+                    child = container[section] = {}
+                container = child
+            container[leaf] = value
+            self._dirty = True
+
+    def update(self, config_dict: Dict[str, Any]) -> None:
+        """
+        深度合并一组配置项
+
+        Raises:
+            ConfigValidationError: 任一配置项未通过校验（所有修改都不会生效）
+        """
+        errors = self.schema.validate_changes(config_dict)
+        if errors:
+            raise ConfigValidationError(errors)
+        with self._lock:
+            self._config = deep_merge(self._data(), config_dict)
+            self._dirty = True
+
+    def replace(self, config_dict: Dict[str, Any]) -> None:
+        """
+        用新的配置整体替换当前配置（缺少的配置项使用默认值）
+
+        Raises:
+            ConfigValidationError: 任一配置项未通过校验（配置保持不变）
+        """
+        errors = self.schema.validate_changes(config_dict)
+        if errors:
+            raise ConfigValidationError(errors)
+        with self._lock:
+            self._config = deep_merge(self.defaults, config_dict)
+            self._dirty = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        """获取配置字典（直接修改返回的字典后需调用 mark_dirty() 才会保存）"""
+        return self._data()
+
+    def mark_dirty(self) -> None:
+        """标记配置已被修改（用于直接修改了 as_dict() 返回的字典的情况）"""
+        with self._lock:
+            self._data()
+            self._dirty = True
+
+    def save_config(self, immediate: bool = False) -> None:
+        """
+        保存配置到文件（默认防抖后在后台写入）
+
+        Args:
+            immediate: 是否在当前线程立即写入
+        """
+        if self.config_file is None:
+            return
+        with self._lock:
+            self._dirty = True
+        if immediate:
+            self.flush()
+        else:
+            self._writer.schedule(self.config_file, self._serialize, self._on_written)
+
+    def flush(self) -> bool:
+        """
+        立即写出尚未保存的修改
+
+        Returns:
+            是否写入成功（没有需要写入的内容时也返回 True）
+        """
+        if self.config_file is None:
+            return True
+        if not self.is_dirty and not self._writer.has_pending(self.config_file):
+            return True
+        return self._writer.write_now(self.config_file, self._serialize, self._on_written)
+
+    def _serialize(self) -> Optional[str]:
+        """由写入器调用：序列化当前配置，没有修改或尚未加载时返回 None"""
+        with self._lock:
+            if not self._dirty or self._config is None:
+                return None
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            text = json.dumps(self._config, indent=4, ensure_ascii=False)
+            self._dirty = False
+            self._writing = True
+            return text
+
+    def _on_written(self, ok: bool) -> None:
+        """由写入器调用：写入失败时重新标记为已修改，等待写入器重试或下一次 flush()"""
+        with self._lock:
+            self._writing = False
+            if not ok:
+                self._dirty = True
@@ -0,0 +1,163 @@
+"""
+插件后台加载模块
+在线程池中导入插件模块并查找插件类，再通过事件循环分批在GUI线程中初始化插件，
+使主窗口可以在插件（例如导入大型数值计算库的插件）加载期间先显示出来
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+from PySide6.QtCore import QObject, QTimer, Signal
+from utils.logger import get_logger
+from utils.startup_profiler import get_startup_profiler
+
+logger = get_logger(__name__)
+
+
+class PluginLoader(QObject):
+    """插件后台加载器
+
+    工作线程只执行纯 Python 的模块导入和插件类查找，不创建插件实例和任何控件；
+    插件的实例化和 initialize(main_window) 按依赖顺序在GUI线程中执行，每批
+    batch_size 个插件之后返回事件循环，避免界面长时间无响应。
+    启用启动性能分析时，每个插件的导入和初始化分别记录为 "import:<插件>" 和
+    "init:<插件>" 阶段。
+
+    使用方法:
+        loader = plugin_manager.load_all_plugins_async()
+        loader.progress.connect(lambda done, total: print(f"{done}/{total}"))
+        loader.finished.connect(on_plugins_ready)
+    """
+
+    # 信号：加载进度（已处理数, 总数）
+    progress = Signal(int, int)
+    # 信号：插件已加载（插件名称）
+    plugin_loaded = Signal(str)
+    # 信号：插件加载失败（插件名称, 原因）
+    plugin_failed = Signal(str, str)
+    # 信号：全部插件处理完毕
+    finished = Signal()
+
+    # 内部信号：工作线程完成了一个导入（跨线程时自动排队投递到GUI线程）
+    _import_done = Signal()
+
+    def __init__(self, plugin_manager, plugin_names: List[str], max_workers: int = 4,
+                 batch_size: int = 2, parent=None):
+        """
+        初始化插件加载器
+
+        Args:
+            plugin_manager: 插件管理器
+            plugin_names: 需要加载的插件名称（已按依赖排序）
+            max_workers: 导入插件模块的线程数
+            batch_size: 每次事件循环迭代中初始化的插件数
+        """
+        super().__init__(parent)
+        self.plugin_names = list(plugin_names)
+        self._manager = plugin_manager
+        self._max_workers = max(1, max_workers)
+        self._batch_size = max(1, batch_size)
+        self._futures: Dict[str, Future] = {}
+        self._next = 0
+        self._drain_scheduled = False
+        self._cancelled = False
+        self._finished = False
+
+        self._import_done.connect(self._schedule_drain)
+
+    def start(self):
+        """提交所有插件的导入任务"""
+        logger.info(f"开始后台加载 {len(self.plugin_names)} 个插件")
+        if self.plugin_names:
+            executor = ThreadPoolExecutor(
+                max_workers=min(self._max_workers, len(self.plugin_names)),
+                thread_name_prefix="plugin-import"
+            )
+            for plugin_name in self.plugin_names:
+                future = executor.submit(self._import_plugin, plugin_name)
+                future.add_done_callback(self._on_import_done)
+                self._futures[plugin_name] = future
+            # 不等待任务完成，线程在任务结束后自动退出
+            executor.shutdown(wait=False)
+        self._schedule_drain()
+
+    def cancel(self):
+        """取消尚未开始的导入，并停止初始化剩余插件"""
+        if self._finished:
+            return
+        self._cancelled = True
+        for future in self._futures.values():
+            future.cancel()
+        logger.info("插件后台加载已取消")
+        self._finish()
+
+    def is_pending(self, plugin_name: str) -> bool:
+        """检查插件是否还在等待加载"""
+        return not self._finished and plugin_name in self.plugin_names[self._next:]
+
+    def is_finished(self) -> bool:
+        """检查是否已处理完所有插件"""
+        return self._finished
+
+    def _import_plugin(self, plugin_name: str) -> Optional[type]:
+        """导入插件模块并查找插件类（在工作线程中执行）"""
+        with get_startup_profiler().phase(f"import:{plugin_name}", category="plugin"):
+            return self._manager.import_plugin_class(plugin_name)
+
+    def _on_import_done(self, future: Future):
+        """导入任务完成回调（在工作线程中执行）"""
+        if not self._cancelled:
+            self._import_done.emit()
+
+    def _schedule_drain(self):
+        """在下一次事件循环迭代中初始化已导入的插件"""
+        if not self._drain_scheduled and not self._finished:
+            self._drain_scheduled = True
+            QTimer.singleShot(0, self._drain)
+
+    def _drain(self):
+        """按依赖顺序初始化已完成导入的插件，每次最多 batch_size 个"""
+        self._drain_scheduled = False
+        if self._finished:
+            return
+
+        total = len(self.plugin_names)
+        processed = 0
+        while self._next < total and processed < self._batch_size:
+            plugin_name = self.plugin_names[self._next]
+            future = self._futures[plugin_name]
+            if not future.done():
+                # 等待该插件导入完成，完成时会再次调度
+                return
+
+            self._next += 1
+            processed += 1
+            with get_startup_profiler().phase(f"init:{plugin_name}", category="plugin"):
+                self._initialize(plugin_name, future)
+            self.progress.emit(self._next, total)
+
+        if self._next >= total:
+            self._finish()
+        else:
+            # 还有已导入的插件，先返回事件循环再继续
+            self._schedule_drain()
+
+    def _initialize(self, plugin_name: str, future: Future):
+        """在GUI线程中初始化一个插件"""
+        # 插件可能已被按需激活（例如用户在加载完成前打开了它的标签页）
+        if self._manager.get_plugin(plugin_name) is None:
+            plugin_class: Optional[type] = future.result()
+            if plugin_class is None:
+                self.plugin_failed.emit(plugin_name, "插件导入失败")
+                return
+            if not self._manager.initialize_plugin(plugin_name, plugin_class):
+                self.plugin_failed.emit(plugin_name, "插件初始化失败")
+                return
+        self.plugin_loaded.emit(plugin_name)
+
+    def _finish(self):
+        """结束加载"""
+        if self._finished:
+            return
+        self._finished = True
+        logger.info(f"插件后台加载结束，已加载 {len(self._manager.get_all_plugins())} 个插件")
+        self.finished.emit()
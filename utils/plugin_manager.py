@@ -7,10 +7,13 @@ import os
 import sys
 import importlib
 import importlib.util
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 from utils.logger import get_logger
 from utils.plugin_base import BasePlugin
+from utils.plugin_config import PLUGIN_CONFIG_DIR, PluginConfig
+from utils.plugin_manifest import PluginManifest, PluginIndex
+from utils.startup_profiler import get_startup_profiler
 
 logger = get_logger(__name__)
 
@@ -18,13 +21,23 @@ logger = get_logger(__name__)
 class PluginManager:
     """插件管理器"""
     
-    def __init__(self, plugin_dir: str = "plugins"):
+    def __init__(self, plugin_dir: str = "plugins", lazy_activation: bool = True,
+                 config_dir: str = PLUGIN_CONFIG_DIR):
         self.plugin_dir = plugin_dir
+        self.lazy_activation = lazy_activation
+        self.config_dir = config_dir
         self.plugins: Dict[str, BasePlugin] = {}
+        # 插件ID -> 插件配置（插件激活时才创建，卸载后保留以便再次激活时复用）
+        self._configs: Dict[str, PluginConfig] = {}
+        self.manifests: Dict[str, PluginManifest] = {}
         self._main_window = None
+        self._loader = None
         
         # 确保插件目录存在
         os.makedirs(self.plugin_dir, exist_ok=True)
+
+        # 插件清单索引（发现插件时无需导入插件代码）
+        self._index = PluginIndex(Path(self.plugin_dir))
         
         logger.info(f"插件管理器已初始化，插件目录: {self.plugin_dir}")
     
@@ -35,6 +48,8 @@ class PluginManager:
     def discover_plugins(self) -> List[str]:
         """发现所有可用的插件
         
+        只读取插件清单（plugin.json，并经索引缓存），不导入插件代码。
+        
         Returns:
             List[str]: 发现的插件名称列表
         """
@@ -45,50 +60,112 @@ class PluginManager:
             logger.warning(f"插件目录不存在: {self.plugin_dir}")
             return discovered
         
+        manifests = {}
+        
         # 遍历插件目录
         for item in plugin_path.iterdir():
-            if item.is_dir() and not item.name.startswith('_'):
+            if item.is_dir() and not item.name.startswith(('_', '.')):
                 # 检查是否有 __init__.py
                 init_file = item / "__init__.py"
-                if init_file.exists():
-                    discovered.append(item.name)
-                    logger.debug(f"发现插件: {item.name}")
+                if not init_file.exists():
+                    continue
+                
+                try:
+                    manifests[item.name] = self._index.get_manifest(item)
+                except ValueError as e:
+                    logger.error(f"插件 {item.name} 的清单无效: {e}")
+                    continue
+                
+                discovered.append(item.name)
+                logger.debug(f"发现插件: {item.name}")
+        
+        self.manifests = manifests
+        self._index.prune(discovered)
+        self._index.save()
         
         logger.info(f"共发现 {len(discovered)} 个插件")
         return discovered
     
-    def load_plugin(self, plugin_name: str) -> bool:
-        """加载指定的插件
+    def get_manifest(self, plugin_name: str) -> Optional[PluginManifest]:
+        """获取插件清单（需先调用 discover_plugins）"""
+        return self.manifests.get(plugin_name)
+    
+    def get_all_manifests(self) -> Dict[str, PluginManifest]:
+        """获取所有已发现插件的清单"""
+        return self.manifests.copy()
+    
+    def _find_plugin_class(self, module, manifest: Optional[PluginManifest]):
+        """在插件模块中查找插件类"""
+        # 清单指定了入口类时直接获取
+        if manifest and manifest.entry:
+            attr = getattr(module, manifest.entry, None)
+            if isinstance(attr, type) and issubclass(attr, BasePlugin):
+                return attr
+            logger.error(f"插件入口类无效: {manifest.entry}")
+            return None
+        
+        # 没有清单的旧插件：扫描模块查找插件类（应该继承自BasePlugin）
+        for attr_name in dir(module):
+            attr = getattr(module, attr_name)
+            if (isinstance(attr, type) and 
+                issubclass(attr, BasePlugin) and 
+                attr is not BasePlugin):
+                return attr
+        return None
+    
+    def _check_dependencies(self, plugin_name: str) -> bool:
+        """检查插件的依赖是否都已加载"""
+        manifest = self.manifests.get(plugin_name)
+        if manifest:
+            missing = [dep for dep in manifest.dependencies if dep not in self.plugins]
+            if missing:
+                logger.error(f"插件 {plugin_name} 的依赖未加载: {', '.join(missing)}")
+                return False
+        return True
+    
+    def import_plugin_class(self, plugin_name: str) -> Optional[type]:
+        """导入插件模块并查找插件类
+        
+        只执行模块导入和类查找，不创建插件实例或任何控件，可以在工作线程中调用。
         
         Args:
             plugin_name: 插件名称
             
         Returns:
-            bool: 加载是否成功
+            Optional[type]: 插件类，失败返回None
         """
         try:
-            # 构建插件模块路径
+            # 构建插件模块路径并导入插件模块
             module_path = f"{self.plugin_dir}.{plugin_name}"
-            
-            # 导入插件模块
             module = importlib.import_module(module_path)
             
-            # 查找插件类（应该继承自BasePlugin）
-            plugin_class = None
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (isinstance(attr, type) and 
-                    issubclass(attr, BasePlugin) and 
-                    attr is not BasePlugin):
-                    plugin_class = attr
-                    break
-            
+            # 查找插件类
+            plugin_class = self._find_plugin_class(module, self.manifests.get(plugin_name))
             if plugin_class is None:
                 logger.error(f"插件 {plugin_name} 中未找到有效的插件类")
+            return plugin_class
+            
+        except Exception as e:
+            logger.error(f"导入插件 {plugin_name} 失败: {e}")
+            return None
+    
+    def initialize_plugin(self, plugin_name: str, plugin_class: type) -> bool:
+        """实例化并初始化插件（必须在GUI线程中调用）
+        
+        Args:
+            plugin_name: 插件名称
+            plugin_class: import_plugin_class() 返回的插件类
+            
+        Returns:
+            bool: 初始化是否成功
+        """
+        try:
+            if not self._check_dependencies(plugin_name):
                 return False
             
             # 实例化插件
             plugin = plugin_class()
+            plugin.attach_config(self.get_plugin_config(plugin_name, plugin_class))
             
             # 初始化插件
             if self._main_window:
@@ -106,6 +183,53 @@ class PluginManager:
             logger.error(f"加载插件 {plugin_name} 失败: {e}")
             return False
     
+    def get_plugin_config(self, plugin_name: str, plugin_class: Optional[type] = None) -> PluginConfig:
+        """获取插件的配置（配置文件在插件第一次读取配置时才加载）
+        
+        Args:
+            plugin_name: 插件名称
+            plugin_class: 插件类，用于读取 config_defaults / config_constraints
+            
+        Returns:
+            PluginConfig: 插件配置
+        """
+        config = self._configs.get(plugin_name)
+        if config is None:
+            config = PluginConfig(
+                plugin_name,
+                Path(self.config_dir) / f"{plugin_name}.json",
+                getattr(plugin_class, "config_defaults", None),
+                getattr(plugin_class, "config_constraints", None),
+            )
+            self._configs[plugin_name] = config
+        return config
+    
+    def flush_configs(self) -> bool:
+        """立即写出所有插件尚未保存的配置
+        
+        Returns:
+            bool: 是否全部写入成功
+        """
+        return all([config.flush() for config in self._configs.values()])
+    
+    def load_plugin(self, plugin_name: str) -> bool:
+        """加载指定的插件
+        
+        Args:
+            plugin_name: 插件名称
+            
+        Returns:
+            bool: 加载是否成功
+        """
+        # 检查依赖是否已加载
+        if not self._check_dependencies(plugin_name):
+            return False
+        
+        plugin_class = self.import_plugin_class(plugin_name)
+        if plugin_class is None:
+            return False
+        return self.initialize_plugin(plugin_name, plugin_class)
+    
     def unload_plugin(self, plugin_name: str) -> bool:
         """卸载指定的插件
         
@@ -129,6 +253,11 @@ class PluginManager:
             # 清理插件资源
             plugin.cleanup()
             
+            # 写出插件尚未保存的配置
+            config = self._configs.get(plugin_name)
+            if config is not None:
+                config.flush()
+            
             # 从字典中移除
             del self.plugins[plugin_name]
             
@@ -184,11 +313,133 @@ class PluginManager:
         """获取所有已加载的插件"""
         return self.plugins.copy()
     
-    def load_all_plugins(self):
-        """加载所有发现的插件"""
+    def resolve_load_order(self, plugin_names: List[str]) -> List[str]:
+        """按依赖关系排序插件（依赖在前），跳过依赖缺失或循环依赖的插件
+        
+        Args:
+            plugin_names: 插件名称列表
+            
+        Returns:
+            List[str]: 排序后的插件名称列表
+        """
+        order = []
+        state: Dict[str, str] = {}  # "visiting" / "done" / "failed"
+        
+        def visit(name: str) -> bool:
+            if state.get(name) == "done":
+                return True
+            if state.get(name) == "failed":
+                return False
+            if state.get(name) == "visiting":
+                logger.error(f"插件存在循环依赖: {name}")
+                return False
+            if name not in self.manifests:
+                logger.error(f"依赖的插件不存在: {name}")
+                return False
+            
+            state[name] = "visiting"
+            for dep in self.manifests[name].dependencies:
+                if not visit(dep):
+                    state[name] = "failed"
+                    return False
+            state[name] = "done"
+            order.append(name)
+            return True
+        
+        for plugin_name in plugin_names:
+            if not visit(plugin_name):
+                logger.error(f"跳过插件 {plugin_name}：依赖无法满足")
+        return order
+    
+    def is_lazy(self, plugin_name: str) -> bool:
+        """检查插件是否延迟到首次使用时再激活"""
+        manifest = self.manifests.get(plugin_name)
+        return self.lazy_activation and manifest is not None and manifest.lazy
+    
+    def _eager_load_order(self) -> List[str]:
+        """发现插件并返回启动时需要加载的插件（按依赖排序）"""
         discovered = self.discover_plugins()
-        for plugin_name in discovered:
-            self.load_plugin(plugin_name)
+        eager = [name for name in discovered if not self.is_lazy(name)]
+        if len(eager) < len(discovered):
+            logger.info(f"{len(discovered) - len(eager)} 个插件将在首次使用时激活")
+        return self.resolve_load_order(eager)
+    
+    def load_all_plugins(self):
+        """加载所有发现的插件
+        
+        延迟激活模式下，清单声明 lazy 的插件不会在这里导入，
+        而是在首次使用时由 activate_plugin() 激活（被非延迟插件依赖的除外）。
+        """
+        profiler = get_startup_profiler()
+        for plugin_name in self._eager_load_order():
+            with profiler.phase(f"plugin:{plugin_name}", category="plugin"):
+                self.load_plugin(plugin_name)
+    
+    def load_all_plugins_async(self, max_workers: int = 4, batch_size: int = 2):
+        """在后台加载所有需要在启动时加载的插件
+        
+        插件模块在线程池中导入，插件的 initialize() 通过事件循环分批在GUI线程中执行，
+        主窗口可以在插件加载期间先显示。需要在创建 QApplication 之后调用。
+        
+        Args:
+            max_workers: 导入插件模块的线程数
+            batch_size: 每次事件循环迭代中初始化的插件数
+            
+        Returns:
+            PluginLoader: 已启动的加载器，可连接其 progress / finished 等信号
+        """
+        from utils.plugin_loader import PluginLoader
+        
+        self._loader = PluginLoader(self, self._eager_load_order(), max_workers, batch_size)
+        self._loader.start()
+        return self._loader
+    
+    def is_pending(self, plugin_name: str) -> bool:
+        """检查插件是否正在后台加载（尚未完成初始化）"""
+        return self._loader is not None and self._loader.is_pending(plugin_name)
+    
+    def activate_plugin(self, plugin_name: str) -> Optional[BasePlugin]:
+        """激活插件（如未加载则连同依赖一起加载）
+        
+        Args:
+            plugin_name: 插件名称
+            
+        Returns:
+            Optional[BasePlugin]: 插件实例，激活失败返回None
+        """
+        if plugin_name in self.plugins:
+            return self.plugins[plugin_name]
+        
+        for name in self.resolve_load_order([plugin_name]):
+            if name not in self.plugins and not self.load_plugin(name):
+                return None
+        
+        plugin = self.plugins.get(plugin_name)
+        if plugin:
+            logger.info(f"插件已按需激活: {plugin_name}")
+        return plugin
+    
+    def activate_trigger(self, trigger: str, payload: Any = None) -> List[BasePlugin]:
+        """激活所有在清单中声明了该触发事件的插件，并把事件交给插件的 on_trigger() 处理
+        
+        Args:
+            trigger: 触发事件名称（如 "files_dropped"）
+            payload: 事件数据（如 "files_dropped" 的文件路径列表）
+            
+        Returns:
+            List[BasePlugin]: 已激活的插件实例
+        """
+        activated = []
+        for plugin_name, manifest in self.manifests.items():
+            if trigger in manifest.triggers:
+                plugin = self.activate_plugin(plugin_name)
+                if plugin:
+                    activated.append(plugin)
+                    try:
+                        plugin.on_trigger(trigger, payload)
+                    except Exception as e:
+                        logger.error(f"插件 {plugin_name} 处理触发事件 {trigger} 失败: {e}")
+        return activated
     
     def cleanup_all(self):
         """清理所有插件"""
@@ -200,11 +451,16 @@ class PluginManager:
 _plugin_manager: Optional[PluginManager] = None
 
 
-def setup_plugin_manager(plugin_dir: str = "plugins") -> PluginManager:
-    """设置插件管理器"""
+def setup_plugin_manager(plugin_dir: str = "plugins", lazy_activation: bool = True) -> PluginManager:
+    """设置插件管理器
+    
+    Args:
+        plugin_dir: 插件目录
+        lazy_activation: 是否启用延迟激活（清单声明 lazy 的插件首次使用时才加载）
+    """
     global _plugin_manager
     if _plugin_manager is None:
-        _plugin_manager = PluginManager(plugin_dir)
+        _plugin_manager = PluginManager(plugin_dir, lazy_activation)
         logger.info("全局插件管理器已创建")
     return _plugin_manager
 
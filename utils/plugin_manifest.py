@@ -0,0 +1,245 @@
+"""
+插件清单模块
+读取插件目录中的 plugin.json 清单，并维护按目录状态缓存的磁盘索引，
+使发现插件、列出插件时无需导入插件代码
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 插件清单文件名
+MANIFEST_FILE = "plugin.json"
+
+# 插件索引文件名（位于插件目录下）
+INDEX_FILE = ".plugin_index.json"
+
+# 索引格式版本，格式变化时递增以丢弃旧索引
+INDEX_VERSION = 2
+
+
+def _string_list(data: Dict[str, Any], key: str) -> List[str]:
+    """读取字符串列表字段
+
+    Raises:
+        ValueError: 字段不是字符串列表
+    """
+    value = data.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{key} 必须是字符串列表")
+    return value
+
+
+class PluginManifest:
+    """插件清单
+
+    清单示例（plugins/my_plugin/plugin.json）:
+        {
+            "name": "我的插件",
+            "version": "1.0.0",
+            "author": "Your Name",
+            "description": "插件说明",
+            "entry": "MyPlugin",
+            "dependencies": [],
+            "lazy": true,
+            "tab": "我的插件",
+            "menu_items": ["我的插件动作"],
+            "triggers": ["files_dropped"]
+        }
+
+    延迟激活的插件在启动时不会被导入，主窗口根据 tab / menu_items 创建占位的
+    标签页和菜单项，首次使用它们或触发 triggers 中声明的事件时才激活插件。
+    """
+
+    def __init__(self, plugin_id: str, name: str, version: str = "0.0.0", author: str = "",
+                 description: str = "", entry: Optional[str] = None,
+                 dependencies: Optional[List[str]] = None, lazy: bool = False,
+                 tab: Optional[str] = None, menu_items: Optional[List[str]] = None,
+                 triggers: Optional[List[str]] = None, has_manifest: bool = True):
+        """
+        初始化插件清单
+
+        Args:
+            plugin_id: 插件ID（插件目录名）
+            name: 插件显示名称
+            version: 插件版本
+            author: 作者
+            description: 描述
+            entry: 插件类名，为空时导入后扫描模块查找插件类
+            dependencies: 依赖的插件ID列表
+            lazy: 是否延迟到首次使用时再激活
+            tab: 插件标签页标题（插件提供 get_widget 时）
+            menu_items: 插件菜单项名称，需与 get_menu_items() 返回的名称一致
+            triggers: 激活插件的事件名称列表
+            has_manifest: 是否来自 plugin.json（旧插件没有清单）
+        """
+        self.plugin_id = plugin_id
+        self.name = name
+        self.version = version
+        self.author = author
+        self.description = description
+        self.entry = entry
+        self.dependencies = dependencies or []
+        self.lazy = lazy
+        self.tab = tab
+        self.menu_items = menu_items or []
+        self.triggers = triggers or []
+        self.has_manifest = has_manifest
+
+    @classmethod
+    def from_dict(cls, plugin_id: str, data: Dict[str, Any], has_manifest: bool = True) -> "PluginManifest":
+        """从字典创建清单
+
+        Raises:
+            ValueError: 清单字段类型不正确
+        """
+        entry = data.get("entry")
+        if entry is not None and not isinstance(entry, str):
+            raise ValueError("entry 必须是插件类名字符串")
+
+        tab = data.get("tab")
+        if tab is not None and not isinstance(tab, str):
+            raise ValueError("tab 必须是字符串")
+
+        return cls(
+            plugin_id=plugin_id,
+            name=str(data.get("name") or plugin_id),
+            version=str(data.get("version", "0.0.0")),
+            author=str(data.get("author", "")),
+            description=str(data.get("description", "")),
+            entry=entry,
+            dependencies=_string_list(data, "dependencies"),
+            lazy=bool(data.get("lazy", False)),
+            tab=tab,
+            menu_items=_string_list(data, "menu_items"),
+            triggers=_string_list(data, "triggers"),
+            has_manifest=has_manifest,
+        )
+
+    @classmethod
+    def read(cls, plugin_path: Path) -> "PluginManifest":
+        """读取插件目录中的清单，没有清单时返回仅包含目录名的默认清单
+
+        Raises:
+            ValueError: 清单文件格式错误
+        """
+        manifest_path = plugin_path / MANIFEST_FILE
+        if not manifest_path.is_file():
+            return cls(plugin_id=plugin_path.name, name=plugin_path.name, has_manifest=False)
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"清单不是有效的JSON: {e}") from e
+
+        if not isinstance(data, dict):
+            raise ValueError("清单顶层必须是对象")
+        return cls.from_dict(plugin_path.name, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "name": self.name,
+            "version": self.version,
+            "author": self.author,
+            "description": self.description,
+            "entry": self.entry,
+            "dependencies": list(self.dependencies),
+            "lazy": self.lazy,
+            "tab": self.tab,
+            "menu_items": list(self.menu_items),
+            "triggers": list(self.triggers),
+        }
+
+    def to_metadata(self):
+        """转换为插件元数据（PluginMetadata）"""
+        from utils.plugin_base import PluginMetadata
+        return PluginMetadata(self.name, self.version, self.author, self.description)
+
+
+class PluginIndex:
+    """插件清单索引
+
+    以插件目录和清单文件的 mtime/size 作为签名缓存解析后的清单，
+    签名未变化时直接使用缓存，不再读取清单文件。
+    """
+
+    def __init__(self, plugin_dir: Path):
+        self.index_path = Path(plugin_dir) / INDEX_FILE
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """从磁盘加载索引"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and isinstance(data.get("plugins"), dict):
+                return data["plugins"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"插件索引无效，将重新建立: {e}")
+        return {}
+
+    @staticmethod
+    def _signature(plugin_path: Path) -> List[Optional[int]]:
+        """计算插件目录签名：[目录mtime, 清单mtime, 清单大小]"""
+        dir_stat = plugin_path.stat()
+        try:
+            manifest_stat = (plugin_path / MANIFEST_FILE).stat()
+        except FileNotFoundError:
+            return [dir_stat.st_mtime_ns, None, None]
+        return [dir_stat.st_mtime_ns, manifest_stat.st_mtime_ns, manifest_stat.st_size]
+
+    def get_manifest(self, plugin_path: Path) -> PluginManifest:
+        """获取插件清单，签名匹配时使用索引缓存
+
+        Raises:
+            ValueError: 清单文件格式错误
+        """
+        plugin_id = plugin_path.name
+        signature = self._signature(plugin_path)
+
+        cached = self._entries.get(plugin_id)
+        if cached and cached.get("signature") == signature:
+            try:
+                return PluginManifest.from_dict(plugin_id, cached["manifest"], cached.get("has_manifest", True))
+            except (KeyError, ValueError):
+                pass
+
+        manifest = PluginManifest.read(plugin_path)
+        self._entries[plugin_id] = {
+            "signature": signature,
+            "has_manifest": manifest.has_manifest,
+            "manifest": manifest.to_dict(),
+        }
+        self._dirty = True
+        logger.debug(f"插件清单已更新到索引: {plugin_id}")
+        return manifest
+
+    def prune(self, plugin_ids: Iterable[str]):
+        """移除不再存在的插件条目"""
+        keep = set(plugin_ids)
+        for plugin_id in list(self._entries):
+            if plugin_id not in keep:
+                del self._entries[plugin_id]
+                self._dirty = True
+
+    def save(self):
+        """索引有变化时写回磁盘（先写临时文件再替换）"""
+        if not self._dirty:
+            return
+        try:
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "plugins": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"保存插件索引失败: {e}")
@@ -0,0 +1,241 @@
+"""
+单实例模块
+基于本地套接字（QLocalServer/QLocalSocket）实现单实例运行：再次启动程序时（如通过文件关联或托盘快捷方式），
+新进程把命令行参数转发给已运行的实例后立即退出，不再重复初始化日志、主题、插件和更新检查，
+已运行的实例收到参数后显示主窗口并处理其中的文件
+"""
+
+import getpass
+import hashlib
+import json
+import os
+import time
+from typing import List, Optional, Sequence
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# 单条消息的最大长度，防止异常的连接占用过多内存
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+# 已运行的实例收到完整消息后回复的确认
+ACK = b"ok"
+
+
+def _logger():
+    """延迟获取日志记录器：转发参数的进程会在初始化日志之前退出，导入本模块时不能初始化日志"""
+    from utils.logger import get_logger
+    return get_logger(__name__)
+
+
+def instance_server_name(app_id: str) -> str:
+    """
+    生成本地服务器名称（按应用和当前用户区分，不同用户可以各自运行一个实例）
+
+    示例:
+        instance_server_name("GUI Base Template")  # "GUI_Base_Template-3f2a9c1b7d4e"
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = os.environ.get("USERNAME", "")
+    digest = hashlib.sha1(f"{app_id}|{user}".encode('utf-8')).hexdigest()[:12]
+    safe_id = "".join(c if c.isalnum() else "_" for c in app_id)[:32]
+    return f"{safe_id}-{digest}"
+
+
+def _connect(server_name: str, timeout_ms: int) -> Optional[QLocalSocket]:
+    """连接已运行实例的本地服务器，连接失败时返回 None"""
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    if socket.waitForConnected(timeout_ms):
+        return socket
+    socket.abort()
+    return None
+
+
+def forward_to_running_instance(server_name: str, args: Sequence[str], timeout_ms: int = 500,
+                                ack_timeout_ms: int = 2000) -> bool:
+    """
+    把命令行参数转发给已运行的实例（不需要 QApplication，可在导入界面模块之前调用）
+
+    Args:
+        server_name: instance_server_name() 返回的服务器名称
+        args: 命令行参数（不含程序名）
+        timeout_ms: 连接和发送的超时时间（毫秒）
+        ack_timeout_ms: 等待确认的超时时间（毫秒）
+
+    Returns:
+        bool: 已运行的实例是否确认收到（True 表示当前进程应退出；已运行的实例卡死或正在退出、
+            没有在超时前回复确认时返回 False，当前进程应正常启动）
+
+    示例:
+        if forward_to_running_instance(instance_server_name(app_config.app_name), sys.argv[1:]):
+            sys.exit(0)
+    """
+    socket = _connect(server_name, timeout_ms)
+    if socket is None:
+        return False
+    try:
+        message = json.dumps({"cwd": os.getcwd(), "args": list(args)}, ensure_ascii=False)
+        socket.write((message + "\n").encode('utf-8'))
+        if not socket.waitForBytesWritten(timeout_ms):
+            return False
+        # 等待确认，确保已运行的实例收到了完整的消息
+        deadline = time.monotonic() + ack_timeout_ms / 1000
+        reply = bytearray()
+        while True:
+            reply.extend(socket.readAll().data())
+            if b"\n" in reply:
+                return reply.split(b"\n", 1)[0] == ACK
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0 or len(reply) > MAX_MESSAGE_SIZE or not socket.waitForReadyRead(remaining):
+                return False
+    finally:
+        socket.disconnectFromServer()
+
+
+class SingleInstanceServer(QObject):
+    """单实例服务器
+
+    第一个启动的实例监听本地服务器，之后启动的实例通过 forward_to_running_instance() 转发参数。
+    消息为一行 JSON：{"cwd": 发送方的工作目录, "args": 命令行参数}，相对路径会按发送方的工作目录转换为绝对路径。
+
+    使用方法:
+        server = SingleInstanceServer(instance_server_name(app_config.app_name))
+        if server.listen():
+            server.message_received.connect(window.handle_instance_message)
+    """
+
+    # 信号：其他实例转发的命令行参数
+    message_received = Signal(list)
+
+    def __init__(self, server_name: str, parent: Optional[QObject] = None):
+        """
+        初始化单实例服务器
+
+        Args:
+            server_name: instance_server_name() 返回的服务器名称
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.server_name = server_name
+        self._server = QLocalServer(self)
+        # 只允许当前用户连接
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self) -> bool:
+        """
+        开始监听
+
+        设置了访问权限时 Qt 会直接替换已存在的套接字文件，因此先尝试连接确认没有实例在运行；
+        程序崩溃后残留的套接字文件会导致监听失败，此时删除它再重试。
+
+        Returns:
+            bool: 是否监听成功（False 表示已有其他实例在运行）
+        """
+        socket = _connect(self.server_name, 100)
+        if socket is not None:
+            socket.abort()
+            _logger().warning("已有其他实例在运行，单实例服务器未启动")
+            return False
+
+        if not self._server.listen(self.server_name):
+            QLocalServer.removeServer(self.server_name)
+            if not self._server.listen(self.server_name):
+                _logger().error(f"单实例服务器启动失败: {self._server.errorString()}")
+                return False
+        _logger().info(f"单实例服务器已启动: {self.server_name}")
+        return True
+
+    def is_listening(self) -> bool:
+        """是否正在监听"""
+        return self._server.isListening()
+
+    def close(self):
+        """停止监听"""
+        self._server.close()
+
+    def _on_new_connection(self):
+        """接受新的连接"""
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = bytearray()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+
+    def _on_ready_read(self, socket: QLocalSocket):
+        """读取消息，收到完整的一行后处理"""
+        buffer = self._buffers.get(socket)
+        if buffer is None:
+            return
+        buffer.extend(socket.readAll().data())
+        if len(buffer) > MAX_MESSAGE_SIZE:
+            _logger().warning("收到的消息过长，已断开连接")
+            socket.abort()
+            return
+        if b"\n" not in buffer:
+            return
+
+        line = bytes(buffer).split(b"\n", 1)[0]
+        buffer.clear()
+        socket.write(ACK + b"\n")
+        socket.flush()
+        args = self._parse(line)
+        if args is not None:
+            _logger().info(f"收到其他实例转发的参数: {args}")
+            self.message_received.emit(args)
+
+    def _on_disconnected(self, socket: QLocalSocket):
+        """连接断开后释放缓冲区"""
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[List[str]]:
+        """解析消息，把相对路径按发送方的工作目录转换为绝对路径"""
+        try:
+            message = json.loads(line.decode('utf-8'))
+            cwd = str(message.get("cwd", ""))
+            args = [str(arg) for arg in message.get("args", [])]
+        except (ValueError, AttributeError, TypeError) as e:
+            _logger().warning(f"无法解析其他实例转发的消息: {e}")
+            return None
+
+        resolved = []
+        for arg in args:
+            if cwd and not arg.startswith("-") and not os.path.isabs(arg):
+                candidate = os.path.join(cwd, arg)
+                if os.path.exists(candidate):
+                    arg = os.path.normpath(candidate)
+            resolved.append(arg)
+        return resolved
+
+
+# 全局单实例服务器实例
+_instance_server: Optional[SingleInstanceServer] = None
+
+
+def setup_single_instance(app_id: str) -> Optional[SingleInstanceServer]:
+    """
+    启动单实例服务器
+
+    Args:
+        app_id: 应用标识（通常为应用名称）
+
+    Returns:
+        SingleInstanceServer 实例；已有其他实例在运行或监听失败时返回 None
+    """
+    global _instance_server
+    server = SingleInstanceServer(instance_server_name(app_id))
+    if not server.listen():
+        return None
+    _instance_server = server
+    return _instance_server
+
+
+def get_single_instance_server() -> Optional[SingleInstanceServer]:
+    """获取单实例服务器实例（未启动时返回 None）"""
+    return _instance_server
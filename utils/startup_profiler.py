@@ -0,0 +1,242 @@
+"""
+启动性能分析模块
+按阶段记录启动过程的耗时、CPU时间和内存分配，输出 Chrome Trace 格式文件
+
+本模块只依赖标准库，以便在导入 PySide6 之前启用并统计导入耗时。
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class StartupPhase:
+    """一个已完成的启动阶段"""
+
+    __slots__ = ("name", "category", "depth", "start_ns", "wall_ns", "cpu_ns", "memory_bytes", "thread_id")
+
+    def __init__(self, name: str, category: str, depth: int, start_ns: int, wall_ns: int,
+                 cpu_ns: int, memory_bytes: int, thread_id: int):
+        self.name = name
+        self.category = category
+        self.depth = depth
+        self.start_ns = start_ns
+        self.wall_ns = wall_ns
+        self.cpu_ns = cpu_ns
+        self.memory_bytes = memory_bytes
+        self.thread_id = thread_id
+
+    def to_trace_event(self, pid: int) -> Dict[str, Any]:
+        """转换为 Chrome Trace 的完整事件（ph = "X"）"""
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start_ns / 1000,
+            "dur": self.wall_ns / 1000,
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": {
+                "cpu_ms": round(self.cpu_ns / 1e6, 3),
+                "memory_kb": round(self.memory_bytes / 1024, 1),
+            },
+        }
+
+
+class StartupProfiler:
+    """启动性能分析器
+
+    使用方法:
+        profiler = setup_startup_profiler(enabled=True)
+        with profiler.phase("setup_theme_manager"):
+            setup_theme_manager(app)
+        profiler.finish()
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: List[StartupPhase] = []
+        self._origin_ns = time.perf_counter_ns()
+        # 嵌套深度按线程分别记录（插件在工作线程中导入时也会记录阶段）
+        self._local = threading.local()
+        self._main_thread_id = threading.get_ident()
+        self._thread_names: Dict[int, str] = {}
+        self._finished = False
+
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name: str, category: str = "startup"):
+        """记录一个启动阶段（上下文管理器）
+
+        未启用时返回空上下文，几乎没有额外开销。
+
+        Args:
+            name: 阶段名称
+            category: 阶段分类（如 "startup", "plugin"）
+        """
+        if not self.enabled or self._finished:
+            return nullcontext()
+        return self._record(name, category)
+
+    def _current_depth(self) -> int:
+        """当前线程中已打开的阶段数"""
+        return getattr(self._local, "depth", 0)
+
+    @contextmanager
+    def _record(self, name: str, category: str):
+        depth = self._current_depth()
+        self._local.depth = depth + 1
+        memory_before = tracemalloc.get_traced_memory()[0]
+        cpu_before = time.process_time_ns()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - start
+            cpu = time.process_time_ns() - cpu_before
+            memory = tracemalloc.get_traced_memory()[0] - memory_before
+            self._local.depth = depth
+            thread = threading.current_thread()
+            self._thread_names[thread.ident] = thread.name
+            self.phases.append(StartupPhase(
+                name, category, depth, start - self._origin_ns, wall, cpu, memory, thread.ident
+            ))
+
+    def mark(self, name: str, category: str = "startup"):
+        """记录一个瞬时事件（如首帧绘制），耗时为0"""
+        if not self.enabled or self._finished:
+            return
+        now = time.perf_counter_ns() - self._origin_ns
+        self.phases.append(StartupPhase(
+            name, category, self._current_depth(), now, 0, 0, 0, threading.get_ident()
+        ))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """生成 Chrome Trace 格式数据（可在 chrome://tracing 或 Perfetto 中查看）"""
+        pid = os.getpid()
+        events = [{
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "args": {"name": Path(sys.argv[0]).name or "python"},
+        }]
+        for thread_id, thread_name in self._thread_names.items():
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            })
+        for phase in sorted(self.phases, key=lambda p: p.start_ns):
+            event = phase.to_trace_event(pid)
+            if phase.wall_ns == 0:
+                event["ph"] = "i"
+                event["s"] = "p"
+                del event["dur"]
+            events.append(event)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, output_dir: Optional[Path] = None) -> Optional[Path]:
+        """将分析结果写入 Chrome Trace JSON 文件
+
+        Args:
+            output_dir: 输出目录，默认使用日志目录
+
+        Returns:
+            Optional[Path]: 文件路径，失败返回None
+        """
+        try:
+            if output_dir is None:
+                from utils.logger import get_log_dir
+                output_dir = get_log_dir()
+
+            output_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            trace_path = output_dir / f"startup_trace_{timestamp}.json"
+
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+            return trace_path
+        except Exception as e:
+            print(f"保存启动分析文件失败: {e}")
+            return None
+
+    def format_summary(self) -> str:
+        """格式化各阶段的耗时汇总"""
+        lines = [
+            f"{'阶段':<40} {'耗时(ms)':>10} {'CPU(ms)':>10} {'内存(KB)':>10}",
+            "-" * 74,
+        ]
+        for phase in sorted(self.phases, key=lambda p: p.start_ns):
+            name = "  " * phase.depth + phase.name
+            if phase.thread_id != self._main_thread_id:
+                name += f" [{self._thread_names.get(phase.thread_id, phase.thread_id)}]"
+            if phase.wall_ns == 0:
+                lines.append(f"{name:<40} @ {phase.start_ns / 1e6:.1f} ms")
+                continue
+            lines.append(
+                f"{name:<40} {phase.wall_ns / 1e6:>10.1f} {phase.cpu_ns / 1e6:>10.1f} "
+                f"{phase.memory_bytes / 1024:>10.1f}"
+            )
+
+        # 其他线程中的阶段与主线程重叠，不计入合计
+        top_level = [p for p in self.phases if p.depth == 0 and p.thread_id == self._main_thread_id]
+        total_ms = sum(p.wall_ns for p in top_level) / 1e6
+        lines.append("-" * 74)
+        lines.append(f"{'合计（顶层阶段）':<40} {total_ms:>10.1f}")
+        return "\n".join(lines)
+
+    def finish(self, output_dir: Optional[Path] = None) -> Optional[Path]:
+        """结束分析：写入 Trace 文件并打印汇总
+
+        Args:
+            output_dir: Trace 文件的输出目录，默认使用日志目录
+
+        Returns:
+            Optional[Path]: Trace 文件路径，未启用时返回None
+        """
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+
+        trace_path = self.write_chrome_trace(output_dir)
+        print(self.format_summary())
+        if trace_path:
+            print(f"启动分析文件: {trace_path}")
+
+        tracemalloc.stop()
+        return trace_path
+
+
+# 全局启动分析器实例（默认禁用）
+_startup_profiler = StartupProfiler(enabled=False)
+
+
+def setup_startup_profiler(enabled: bool = False) -> StartupProfiler:
+    """设置启动性能分析器
+
+    Args:
+        enabled: 是否启用（通常由 --profile-startup 参数决定）
+
+    Returns:
+        StartupProfiler: 全局分析器实例
+    """
+    global _startup_profiler
+    if enabled and not _startup_profiler.enabled:
+        _startup_profiler = StartupProfiler(enabled=True)
+    return _startup_profiler
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """获取启动性能分析器"""
+    return _startup_profiler
@@ -44,6 +44,7 @@ class SystemTray(QObject):
         
         # 设置提示文字
         self.tray_icon.setToolTip(app_config.app_name)
+        app_config.subscribe("app_name", self._on_app_name_changed)
         
         # 创建托盘菜单
         self.create_tray_menu()
@@ -73,6 +74,11 @@ class SystemTray(QObject):
         # 设置菜单
         self.tray_icon.setContextMenu(self.tray_menu)
     
+    def _on_app_name_changed(self, key: str, old_name, new_name):
+        """应用名称改变时更新托盘提示文字"""
+        if self.tray_icon:
+            self.tray_icon.setToolTip(new_name or "")
+
     def show(self):
         """显示托盘图标"""
         if self.tray_icon:
@@ -0,0 +1,281 @@
+"""
+文本文件流式读取模块
+提供不把整个文件读入内存的文本读取方式：
+1. sniff_encoding: 根据文件开头的少量数据判断编码（BOM、UTF-16、UTF-8、GB18030）
+2. iter_text_lines: 按块读取并增量解码，逐行返回，内存占用与文件大小无关
+3. LineIndex: 用 mmap 扫描一次文件建立行偏移索引，之后按行号随机读取任意一行
+
+本模块不依赖 PySide6，被 utils.file_utils 使用。
+"""
+
+import codecs
+import mmap
+import os
+from array import array
+from itertools import accumulate, count
+from operator import add
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+# iter_text_lines 每次读取的字节数（解码后的文本能留在 CPU 缓存中时分行最快，更大的块反而更慢）
+DEFAULT_CHUNK_SIZE = 128 * 1024
+
+# LineIndex 建立索引时每次扫描的字节数
+INDEX_CHUNK_SIZE = 1024 * 1024
+
+# 判断编码时读取的文件开头字节数
+SNIFF_SIZE = 64 * 1024
+
+# 没有 BOM 时依次尝试的编码；都无法解码时使用 FALLBACK_ENCODING（任何字节序列都能解码）
+CANDIDATE_ENCODINGS = ('utf-8', 'gb18030')
+FALLBACK_ENCODING = 'latin-1'
+
+# UTF-32 的 BOM 以 UTF-16 LE 的 BOM 开头，必须先判断
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _sniff_bytes(sample: bytes, complete: bool, candidates: Sequence[str]) -> str:
+    """根据样本数据判断编码，complete 表示样本是否包含整个文件"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # 没有 BOM 的 UTF-16：ASCII 字符的高字节为 0，零字节集中在奇数或偶数位置
+    if b'\x00' in sample:
+        half = len(sample) // 2
+        even = sample[0::2].count(0)
+        odd = sample[1::2].count(0)
+        if odd > half * 0.3 and even < half * 0.05:
+            return 'utf-16-le'
+        if even > half * 0.3 and odd < half * 0.05:
+            return 'utf-16-be'
+
+    for encoding in candidates:
+        # 样本末尾可能截断了一个多字节字符，不完整的样本不要求解码到结尾
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, complete)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return FALLBACK_ENCODING
+
+
+def sniff_encoding(file_path: Union[str, os.PathLike], sample_size: int = SNIFF_SIZE,
+                   candidates: Sequence[str] = CANDIDATE_ENCODINGS) -> str:
+    """
+    根据文件开头的 sample_size 字节判断文本编码
+
+    依次检查 BOM（返回 'utf-8-sig'、'utf-16' 或 'utf-32'，解码时会去掉 BOM）、没有 BOM 的 UTF-16，
+    再按顺序尝试 candidates 中的编码；都无法解码时返回 'latin-1'。纯 ASCII 文件返回 'utf-8'。
+
+    Args:
+        file_path: 文件路径
+        sample_size: 读取的字节数
+        candidates: 没有 BOM 时依次尝试的编码
+
+    Raises:
+        OSError: 读取文件失败
+
+    示例:
+        encoding = sniff_encoding("data.csv")
+        with open("data.csv", encoding=encoding) as f:
+            ...
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+        complete = len(sample) < sample_size or not f.read(1)
+    return _sniff_bytes(sample, complete, candidates)
+
+
+def iter_text_lines(file_path: Union[str, os.PathLike], encoding: Optional[str] = None, errors: str = 'strict',
+                    keepends: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    逐行读取文本文件，每次读取 chunk_size 字节并增量解码
+
+    与文本模式的 open() 相同，'\\n'、'\\r\\n' 和 '\\r' 都视为换行（keepends=True 时统一返回 '\\n'）。
+    内存占用只与块大小和最长的一行有关，与文件大小无关。
+
+    Args:
+        file_path: 文件路径
+        encoding: 文件编码，None 表示用 sniff_encoding() 判断
+        errors: 解码错误的处理方式（同 bytes.decode）
+        keepends: 是否保留行尾的换行符
+        chunk_size: 每次读取的字节数
+
+    Yields:
+        每一行的文本
+
+    Raises:
+        OSError: 读取文件失败
+        UnicodeDecodeError: errors='strict' 时遇到无法解码的数据
+
+    示例:
+        for line in iter_text_lines("logs/app_debug.log"):
+            if "ERROR" in line:
+                print(line)
+    """
+    if encoding is None:
+        encoding = sniff_encoding(file_path)
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    pending = ''
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            data = f.read(chunk_size)
+            final = not data
+            text = decoder.decode(data, final)
+            if pending:
+                text = pending + text
+            # 块末尾的 '\r' 可能与下一块开头的 '\n' 组成一个换行，留到下一块处理
+            carry = ''
+            if not final and text.endswith('\r'):
+                text, carry = text[:-1], '\r'
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            lines = text.split('\n')
+            pending = lines.pop() + carry
+            if keepends:
+                for line in lines:
+                    yield line + '\n'
+            else:
+                yield from lines
+            if final:
+                break
+    if pending:
+        yield pending
+
+
+class LineIndex:
+    """
+    文本文件的行偏移索引
+
+    创建时用 mmap 扫描一次文件，记录每一行的起始偏移（文件小于 4 GiB 时每行 4 字节，否则 8 字节）；
+    之后 index[n] 直接从映射中切出第 n 行并解码，不需要从头读取。只以 '\\n' 作为行分隔符（'\\r\\n' 行尾的
+    '\\r' 会被去掉，单独的 '\\r' 不换行），因此只支持换行符为单字节 0x0A 的编码（UTF-8、GB18030、Latin-1 等），
+    不支持 UTF-16/UTF-32。文件在索引建立后被修改时结果不确定，需要重新建立索引。
+
+    示例:
+        with LineIndex("logs/app_debug.log") as index:
+            print(len(index), index[0], index[-1])
+            for line in index[1000:1050]:
+                print(line)
+    """
+
+    def __init__(self, file_path: Union[str, os.PathLike], encoding: Optional[str] = None,
+                 errors: str = 'replace', progress: Optional[Callable[[int, int], None]] = None):
+        """
+        扫描文件建立索引
+
+        Args:
+            file_path: 文件路径
+            encoding: 文件编码，None 表示用 sniff_encoding() 判断
+            errors: 解码错误的处理方式（同 bytes.decode），默认用替换字符代替无法解码的数据
+            progress: 进度回调（已扫描的字节数, 文件大小），每扫描 INDEX_CHUNK_SIZE 字节调用一次
+
+        Raises:
+            OSError: 读取文件失败
+            ValueError: 编码的换行符不是单字节 0x0A
+        """
+        self.path = os.fspath(file_path)
+        if encoding is None:
+            encoding = sniff_encoding(self.path)
+        start = 0
+        if codecs.lookup(encoding).name == 'utf-8-sig':
+            # 索引中跳过 BOM，按 UTF-8 解码
+            encoding = 'utf-8'
+            start = len(codecs.BOM_UTF8)
+        elif '\n'.encode(encoding) != b'\n':
+            raise ValueError(f"LineIndex 不支持编码 {encoding}（换行符不是单字节 0x0A）")
+        self.encoding = encoding
+        self.errors = errors
+
+        self._file = open(self.path, 'rb')
+        try:
+            self._size = os.fstat(self._file.fileno()).st_size
+            # 空文件无法映射
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else None
+            if self._mm is not None and self._mm[:start] != codecs.BOM_UTF8[:start]:
+                start = 0
+            self._offsets = self._scan(start, progress)
+        except BaseException:
+            self.close()
+            raise
+
+    def _scan(self, start: int, progress: Optional[Callable[[int, int], None]]) -> array:
+        """扫描换行符，返回每一行的起始偏移"""
+        size = self._size
+        offsets = array('I' if size < 2 ** 32 else 'Q')
+        if start >= size:
+            return offsets
+        offsets.append(start)
+        pos = start
+        while pos < size:
+            end = min(pos + INDEX_CHUNK_SIZE, size)
+            parts = self._mm[pos:end].split(b'\n')
+            # 第 k 个换行之后一行的起始偏移 = pos + 前 k 段的长度之和 + k，全部在 C 层计算
+            del parts[-1]
+            offsets.extend(map(add, accumulate(map(len, parts)), count(pos + 1)))
+            pos = end
+            if progress is not None:
+                progress(pos, size)
+        # 以换行结尾的文件最后没有空行
+        if offsets[-1] == size:
+            offsets.pop()
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[str, List[str]]:
+        """读取第 item 行（不含换行符），支持负数索引和切片"""
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        return self.line_bytes(item).decode(self.encoding, self.errors)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def offset(self, line_number: int) -> int:
+        """第 line_number 行在文件中的起始字节偏移"""
+        return self._offsets[line_number]
+
+    def line_bytes(self, line_number: int) -> bytes:
+        """读取第 line_number 行的原始字节（不含换行符）"""
+        if self._mm is None and self._offsets:
+            raise ValueError("索引已关闭")
+        n = len(self._offsets)
+        if line_number < 0:
+            line_number += n
+        if not 0 <= line_number < n:
+            raise IndexError("行号超出范围")
+        begin = self._offsets[line_number]
+        if line_number + 1 < n:
+            end = self._offsets[line_number + 1] - 1
+        else:
+            end = self._size
+            if self._mm[end - 1:end] == b'\n':
+                end -= 1
+        if end > begin and self._mm[end - 1] == 0x0D:
+            end -= 1
+        return self._mm[begin:end]
+
+    def close(self):
+        """关闭映射和文件（Windows 上映射期间无法删除或替换文件）"""
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "LineIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -68,6 +68,8 @@ class ThemeManager:
         self.app = app
         self._current_theme: ThemeMode = "light"
         self._is_dark = False
+        # 导入配置或重置配置时自动应用新的主题
+        app_config.subscribe("theme.mode", self._on_theme_config_changed)
         logger.info("主题管理器已初始化")
     
     def detect_system_theme(self) -> Literal["light", "dark"]:
@@ -379,6 +381,11 @@ class ThemeManager:
             app_config.set_theme_mode(theme_mode)
             logger.info(f"主题设置已保存: {theme_mode}")
 
+    def _on_theme_config_changed(self, key: str, old_mode: Optional[str], new_mode: Optional[str]):
+        """配置中的主题模式改变时应用新主题（set_theme 保存时主题已应用，不会重复应用）"""
+        if new_mode and new_mode != self._current_theme:
+            self.apply_theme(new_mode)  # type: ignore[arg-type]
+
 
 # 全局主题管理器实例
 _theme_manager: Optional[ThemeManager] = None
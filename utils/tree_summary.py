@@ -0,0 +1,374 @@
+"""
+目录统计模块
+在线程池中并行扫描目录树（os.scandir + DirEntry.stat，系统调用期间释放 GIL），汇总总大小、文件/目录数、
+各扩展名的数量和大小以及最大的文件；统计过程中定期返回部分结果，便于界面逐步显示，并且可以随时取消
+
+本模块不依赖 PySide6，被 utils.file_utils 使用。
+"""
+
+import heapq
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.dir_walk import Patterns, compile_globs
+from utils.file_hash import default_workers
+
+# 默认保留的最大文件数
+DEFAULT_TOP_N = 10
+
+# 默认返回部分结果的最小间隔（秒）
+DEFAULT_INTERVAL = 0.2
+
+# 等待工作线程结果的最长时间（秒），用于及时响应取消
+_POLL_INTERVAL = 0.05
+
+# 扫描目录时每处理该数量的条目检查一次是否已取消
+_CANCEL_CHECK_EVERY = 256
+
+
+@dataclass(frozen=True, slots=True)
+class ExtensionStats:
+    """某个扩展名的文件数和总大小"""
+    count: int
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class TreeSummary:
+    """目录统计结果（部分结果的 complete 为 False）"""
+    root: str
+    total_size: int = 0
+    file_count: int = 0
+    dir_count: int = 0
+    error_count: int = 0
+    # 扩展名（小写，包含点；没有扩展名为 ""） -> 统计
+    extensions: Dict[str, ExtensionStats] = field(default_factory=dict)
+    # 最大的文件：(大小, 路径)，按大小降序
+    largest: Tuple[Tuple[int, str], ...] = ()
+    complete: bool = False
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+    def top_extensions(self, n: int = 5) -> List[Tuple[str, ExtensionStats]]:
+        """按总大小降序返回前 n 个扩展名"""
+        return heapq.nlargest(n, self.extensions.items(), key=lambda item: item[1].size)
+
+
+class _DirResult:
+    """单个目录的扫描结果（由工作线程生成，在迭代结果的线程中合并）"""
+    __slots__ = ("size", "files", "errors", "extensions", "largest", "subdirs", "linked")
+
+    def __init__(self):
+        self.size = 0
+        self.files = 0
+        self.errors = 0
+        self.extensions: Dict[str, List[int]] = {}
+        self.largest: List[Tuple[int, str]] = []
+        # 子目录：(路径, 相对路径前缀, 跟随符号链接时的 (设备号, inode))
+        self.subdirs: List[Tuple[str, str, Optional[tuple]]] = []
+        # 有多个硬链接的文件：((设备号, inode), 大小, 文件名, 路径)，合并时去重
+        self.linked: List[Tuple[tuple, int, str, str]] = []
+
+
+def _extension(name: str) -> str:
+    """小写扩展名，与 os.path.splitext 相同（以点开头的文件名如 .bashrc 没有扩展名）"""
+    i = name.rfind(".")
+    if i <= 0:
+        return ""
+    if name[0] == ".":
+        return os.path.splitext(name)[1].lower()
+    return name[i:].lower()
+
+
+def _add_file(result, name: str, path: str, size: int, top_n: int):
+    """把一个文件计入统计（result 为 _DirResult 或 _Accumulator）"""
+    result.size += size
+    result.files += 1
+    ext = _extension(name)
+    stats = result.extensions.get(ext)
+    if stats is None:
+        result.extensions[ext] = [1, size]
+    else:
+        stats[0] += 1
+        stats[1] += size
+    if len(result.largest) < top_n:
+        heapq.heappush(result.largest, (size, path))
+    elif top_n and size > result.largest[0][0]:
+        heapq.heapreplace(result.largest, (size, path))
+
+
+def _scan_directory(path: str, prefix: str, exclude, follow_symlinks: bool, top_n: int,
+                    cancelled: Callable[[], bool]) -> _DirResult:
+    """扫描一个目录的直接子项（符号链接按链接本身统计，除非 follow_symlinks）"""
+    result = _DirResult()
+    need_rel = exclude is not None and exclude.uses_path
+    extensions = result.extensions
+    largest = result.largest
+    size_total = files = 0
+    try:
+        with os.scandir(path) as iterator:
+            for n, entry in enumerate(iterator):
+                if n % _CANCEL_CHECK_EVERY == 0 and cancelled():
+                    break
+                name = entry.name
+                rel = prefix + name if need_rel else None
+                if exclude is not None and exclude.match(name, rel):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        key = None
+                        if follow_symlinks:
+                            st = entry.stat()
+                            key = (st.st_dev, st.st_ino)
+                        result.subdirs.append((entry.path, rel + "/" if need_rel else "", key))
+                        continue
+                    st = entry.stat(follow_symlinks=follow_symlinks)
+                except OSError:
+                    result.errors += 1
+                    continue
+                size = st.st_size
+                if st.st_nlink > 1:
+                    result.linked.append(((st.st_dev, st.st_ino), size, name, entry.path))
+                    continue
+
+                # 与 _add_file 相同，展开在循环中以减少每个文件的开销
+                size_total += size
+                files += 1
+                ext = _extension(name)
+                stats = extensions.get(ext)
+                if stats is None:
+                    extensions[ext] = [1, size]
+                else:
+                    stats[0] += 1
+                    stats[1] += size
+                if len(largest) < top_n:
+                    heapq.heappush(largest, (size, entry.path))
+                elif top_n and size > largest[0][0]:
+                    heapq.heapreplace(largest, (size, entry.path))
+    except OSError:
+        result.errors += 1
+    result.size = size_total
+    result.files = files
+    return result
+
+
+class _Accumulator:
+    """汇总各目录的扫描结果"""
+
+    def __init__(self, root: str, top_n: int, follow_symlinks: bool):
+        self.root = root
+        self.top_n = top_n
+        self.size = 0
+        self.files = 0
+        self.dirs = 0
+        self.errors = 0
+        self.extensions: Dict[str, List[int]] = {}
+        self.largest: List[Tuple[int, str]] = []
+        self._linked_seen = set()
+        self._visited = set() if follow_symlinks else None
+        self._start = time.monotonic()
+
+    def mark_visited(self, key: Optional[tuple]) -> bool:
+        """跟随符号链接时记录已遍历的目录，已遍历过返回 False"""
+        if self._visited is None or key is None:
+            return True
+        if key in self._visited:
+            return False
+        self._visited.add(key)
+        return True
+
+    def merge(self, result: _DirResult) -> List[Tuple[str, str]]:
+        """合并一个目录的结果，返回需要继续扫描的子目录"""
+        self.size += result.size
+        self.files += result.files
+        self.errors += result.errors
+        for ext, (count, size) in result.extensions.items():
+            stats = self.extensions.get(ext)
+            if stats is None:
+                self.extensions[ext] = [count, size]
+            else:
+                stats[0] += count
+                stats[1] += size
+        for item in result.largest:
+            if len(self.largest) < self.top_n:
+                heapq.heappush(self.largest, item)
+            elif self.top_n and item[0] > self.largest[0][0]:
+                heapq.heapreplace(self.largest, item)
+        # 硬链接的文件只计算一次（与 du 一致）
+        for key, size, name, path in result.linked:
+            if key not in self._linked_seen:
+                self._linked_seen.add(key)
+                _add_file(self, name, path, size, self.top_n)
+
+        subdirs = [(path, prefix) for path, prefix, key in result.subdirs if self.mark_visited(key)]
+        self.dirs += len(subdirs)
+        return subdirs
+
+    def snapshot(self, complete: bool = False, cancelled: bool = False) -> TreeSummary:
+        """生成当前的统计结果"""
+        return TreeSummary(
+            root=self.root,
+            total_size=self.size,
+            file_count=self.files,
+            dir_count=self.dirs,
+            error_count=self.errors,
+            extensions={ext: ExtensionStats(count, size) for ext, (count, size) in self.extensions.items()},
+            largest=tuple(sorted(self.largest, reverse=True)),
+            complete=complete,
+            cancelled=cancelled,
+            elapsed=time.monotonic() - self._start,
+        )
+
+
+def iter_tree_summary(path: Union[str, os.PathLike], workers: Optional[int] = None, top_n: int = DEFAULT_TOP_N,
+                      exclude: Patterns = None, follow_symlinks: bool = False,
+                      cancel_event: Optional[threading.Event] = None,
+                      interval: float = DEFAULT_INTERVAL) -> Iterator[TreeSummary]:
+    """
+    统计目录树，每隔 interval 秒返回一次部分结果，最后返回完整结果（complete 为 True）
+
+    工作线程各自扫描一个目录并把结果交给迭代结果的线程，由它汇总并把子目录分派给工作线程；
+    workers 为 1 时直接在当前线程中扫描。设置 cancel_event 后返回一个 cancelled 为 True 的部分结果并结束，
+    提前停止迭代时工作线程随生成器关闭。扫描目录时出现的非 OSError 异常在迭代结果的线程中重新抛出。
+
+    Args:
+        path: 目录路径（为文件时统计该文件）
+        workers: 线程数，None 表示根据 CPU 核心数和磁盘类型自动选择
+        top_n: 保留的最大文件数
+        exclude: 跳过匹配这些 glob 模式的文件和目录
+        follow_symlinks: 是否跟随符号链接（会检测循环链接）；默认按链接本身统计，不进入链接的目录
+        cancel_event: 取消事件
+        interval: 返回部分结果的最小间隔（秒）
+
+    Yields:
+        TreeSummary
+
+    示例:
+        for summary in iter_tree_summary("D:/Projects"):
+            print(summary.file_count, format_file_size(summary.total_size))
+    """
+    root = os.fspath(path)
+    accumulator = _Accumulator(root, max(0, top_n), follow_symlinks)
+    exclude_matcher = compile_globs(exclude)
+
+    try:
+        st = os.stat(root)
+    except OSError:
+        accumulator.errors += 1
+        yield accumulator.snapshot(complete=True)
+        return
+    if not os.path.isdir(root):
+        _add_file(accumulator, os.path.basename(root), root, st.st_size, accumulator.top_n)
+        yield accumulator.snapshot(complete=True)
+        return
+    accumulator.mark_visited((st.st_dev, st.st_ino))
+
+    if workers is None:
+        workers = default_workers(root)
+    stop = threading.Event()
+    last_report = time.monotonic()
+
+    def cancelled() -> bool:
+        return stop.is_set() or (cancel_event is not None and cancel_event.is_set())
+
+    def due() -> bool:
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report >= interval:
+            last_report = now
+            return True
+        return False
+
+    def scan(task: Tuple[str, str]) -> _DirResult:
+        return _scan_directory(task[0], task[1], exclude_matcher, follow_symlinks, accumulator.top_n, cancelled)
+
+    if workers <= 1:
+        pending = deque([(root, "")])
+        while pending:
+            if cancelled():
+                yield accumulator.snapshot(cancelled=True)
+                return
+            pending.extend(accumulator.merge(scan(pending.popleft())))
+            if pending and due():
+                yield accumulator.snapshot()
+        yield accumulator.snapshot(complete=not cancelled(), cancelled=cancelled())
+        return
+
+    tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+    results: "queue.SimpleQueue" = queue.SimpleQueue()
+
+    def worker():
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            # 取消后只取出剩余的任务，不再扫描
+            if not cancelled():
+                try:
+                    result = scan(task)
+                except Exception as e:
+                    # 交给迭代结果的线程抛出，否则它会一直等待这个目录的结果
+                    result = e
+                results.put(result)
+
+    threads = [threading.Thread(target=worker, name=f"tree-summary-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        tasks.put((root, ""))
+        outstanding = 1
+        # 上次返回部分结果之后是否合并过新的结果
+        changed = False
+        while outstanding and not cancelled():
+            try:
+                result = results.get(timeout=max(interval, _POLL_INTERVAL))
+            except queue.Empty:
+                if changed and not cancelled() and due():
+                    changed = False
+                    yield accumulator.snapshot()
+                continue
+            if isinstance(result, Exception):
+                raise result
+            outstanding -= 1
+            changed = True
+            for task in accumulator.merge(result):
+                tasks.put(task)
+                outstanding += 1
+            if outstanding and not cancelled() and due():
+                changed = False
+                yield accumulator.snapshot()
+        was_cancelled = cancelled()
+        yield accumulator.snapshot(complete=not was_cancelled, cancelled=was_cancelled)
+    finally:
+        stop.set()
+        for _ in threads:
+            tasks.put(None)
+        for thread in threads:
+            thread.join()
+
+
+def summarize_tree(path: Union[str, os.PathLike], workers: Optional[int] = None, top_n: int = DEFAULT_TOP_N,
+                   exclude: Patterns = None, follow_symlinks: bool = False,
+                   cancel_event: Optional[threading.Event] = None,
+                   progress: Optional[Callable[[TreeSummary], None]] = None,
+                   interval: float = DEFAULT_INTERVAL) -> TreeSummary:
+    """
+    统计目录树并返回最终结果（参数同 iter_tree_summary）
+
+    Args:
+        progress: 部分结果回调（在调用线程中执行，最多每 interval 秒一次）
+
+    示例:
+        summary = summarize_tree("downloads")
+        print(summary.file_count, summary.total_size, summary.largest[:3])
+    """
+    summary = None
+    for summary in iter_tree_summary(path, workers, top_n, exclude, follow_symlinks, cancel_event, interval):
+        if progress is not None and not (summary.complete or summary.cancelled):
+            progress(summary)
+    return summary